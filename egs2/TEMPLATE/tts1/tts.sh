@@ -76,6 +76,7 @@ tts_stats_dir=""   # Specify the direcotry path for statistics. If empty, automa
 num_splits=1       # Number of splitting for tts corpus.
 teacher_dumpdir="" # Directory of teacher outputs (needed if tts=fastspeech).
 write_collected_feats=false # Whether to dump features in stats collection.
+extract_pitch_energy=false  # Whether to extract the token-averaged pitch and energy in advance (needs teacher_dumpdir).
 
 # Decoding related
 inference_config="" # Config for decoding.
@@ -158,6 +159,8 @@ Options:
                     # If empty, automatically decided (default="${tts_stats_dir}").
     --num_splits    # Number of splitting for tts corpus (default="${num_splits}").
     --write_collected_feats # Whether to dump features in statistics collection (default="${write_collected_feats}").
+    --extract_pitch_energy  # Whether to extract the token-averaged pitch and energy in advance
+                            # with ${nj} processes (needs teacher_dumpdir, default="${extract_pitch_energy}").
 
     # Decoding related
     --inference_config  # Config for decoding (default="${inference_config}").
@@ -643,6 +646,28 @@ if ! "${skip_train}"; then
         <"${tts_stats_dir}/valid/text_shape" \
             awk -v N="$(<${token_list} wc -l)" '{ print $0 "," N }' \
             >"${tts_stats_dir}/valid/text_shape.${token_type}"
+
+        # 5. [Option] Extract the token-averaged pitch and energy in advance
+        # NOTE: The extraction is skipped if the existing features are up to date
+        if "${extract_pitch_energy}" && [ -n "${teacher_dumpdir}" ]; then
+            for dset in train valid; do
+                if [ "${dset}" = train ]; then
+                    _data_dir="${_train_dir}"
+                    _teacher_dir="${teacher_dumpdir}/${train_set}"
+                else
+                    _data_dir="${_valid_dir}"
+                    _teacher_dir="${teacher_dumpdir}/${valid_set}"
+                fi
+                log "Extract pitch and energy: ${tts_stats_dir}/${dset}/feats_cache"
+                ${train_cmd} "${_logdir}/extract_feats.${dset}.log" \
+                    ${python} -m espnet2.bin.tts_extract_feats \
+                        --config "${_logdir}/stats.1/config.yaml" \
+                        --data_path_and_name_and_type "${_data_dir}/${_scp},speech,${_type}" \
+                        --data_path_and_name_and_type "${_teacher_dir}/durations,durations,text_int" \
+                        --output_dir "${tts_stats_dir}/${dset}/feats_cache" \
+                        --nj "${nj}"
+            done
+        fi
     fi
 
 
@@ -776,7 +801,13 @@ if ! "${skip_train}"; then
 
         # If there are dumped files of additional inputs, we use it to reduce computational cost
         # NOTE (kan-bayashi): Use dumped files of the target features as well?
-        if [ -e "${tts_stats_dir}/train/collect_feats/pitch.scp" ]; then
+        if [ -e "${tts_stats_dir}/train/feats_cache/pitch/meta.json" ]; then
+            _opts+="--train_data_path_and_name_and_type ${tts_stats_dir}/train/feats_cache/pitch,pitch,packed_array "
+            _opts+="--valid_data_path_and_name_and_type ${tts_stats_dir}/valid/feats_cache/pitch,pitch,packed_array "
+        elif [ -e "${tts_stats_dir}/train/collect_feats/pitch/meta.json" ]; then
+            _opts+="--train_data_path_and_name_and_type ${tts_stats_dir}/train/collect_feats/pitch,pitch,packed_array "
+            _opts+="--valid_data_path_and_name_and_type ${tts_stats_dir}/valid/collect_feats/pitch,pitch,packed_array "
+        elif [ -e "${tts_stats_dir}/train/collect_feats/pitch.scp" ]; then
             _scp=pitch.scp
             _type=npy
             _train_collect_dir=${tts_stats_dir}/train/collect_feats
@@ -784,7 +815,13 @@ if ! "${skip_train}"; then
             _opts+="--train_data_path_and_name_and_type ${_train_collect_dir}/${_scp},pitch,${_type} "
             _opts+="--valid_data_path_and_name_and_type ${_valid_collect_dir}/${_scp},pitch,${_type} "
         fi
-        if [ -e "${tts_stats_dir}/train/collect_feats/energy.scp" ]; then
+        if [ -e "${tts_stats_dir}/train/feats_cache/energy/meta.json" ]; then
+            _opts+="--train_data_path_and_name_and_type ${tts_stats_dir}/train/feats_cache/energy,energy,packed_array "
+            _opts+="--valid_data_path_and_name_and_type ${tts_stats_dir}/valid/feats_cache/energy,energy,packed_array "
+        elif [ -e "${tts_stats_dir}/train/collect_feats/energy/meta.json" ]; then
+            _opts+="--train_data_path_and_name_and_type ${tts_stats_dir}/train/collect_feats/energy,energy,packed_array "
+            _opts+="--valid_data_path_and_name_and_type ${tts_stats_dir}/valid/collect_feats/energy,energy,packed_array "
+        elif [ -e "${tts_stats_dir}/train/collect_feats/energy.scp" ]; then
             _scp=energy.scp
             _type=npy
             _train_collect_dir=${tts_stats_dir}/train/collect_feats
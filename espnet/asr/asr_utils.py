@@ -893,6 +893,127 @@ def add_results_to_json(js, nbest_hyps, char_list):
     return new_js
 
 
+class StreamingResultsWriter(object):
+    """Write decoding results per utterance and merge them into a json file.
+
+    Each result is appended to ``<result_label>.part`` as a JSON line while
+    decoding, and the file is fsynced periodically. If decoding is restarted,
+    the utterances found in the part file are regarded as done and can be skipped.
+    ``merge`` finally writes the legacy ``{"utts": {...}}`` json file.
+
+    Args:
+        result_label (str): Path of the final json file.
+        fsync_interval (int): Number of results between two fsyncs.
+
+    Examples:
+        >>> with StreamingResultsWriter("result.json") as writer:
+        ...     for name in js:
+        ...         if name not in writer:
+        ...             writer[name] = add_results_to_json(...)
+        >>> writer.merge()
+
+    """
+
+    def __init__(self, result_label, fsync_interval=100):
+        """Initialize the writer and load the results of a previous run."""
+        self.result_label = result_label
+        self.part_file = result_label + ".part"
+        self.fsync_interval = fsync_interval
+
+        # key -> offset of the line in the part file
+        self.offsets = {}
+        if os.path.exists(self.part_file):
+            self._load_part_file()
+            logging.info(
+                "Resuming from %s: %d utterances are already decoded",
+                self.part_file,
+                len(self.offsets),
+            )
+
+        self.f = open(self.part_file, "ab")
+        self.n_unsynced = 0
+
+    def _load_part_file(self):
+        offset = 0
+        with open(self.part_file, "rb") as f:
+            for line in f:
+                try:
+                    if not line.endswith(b"\n"):
+                        raise ValueError("Incomplete line")
+                    key = json.loads(line.decode("utf-8"))[0]
+                except ValueError:
+                    # The last result may be broken if the previous run was killed
+                    break
+                self.offsets[key] = offset
+                offset += len(line)
+        with open(self.part_file, "r+b") as f:
+            f.truncate(offset)
+
+    def __contains__(self, key):
+        """Return whether the result of the utterance is already written."""
+        return key in self.offsets
+
+    def __len__(self):
+        """Return the number of written results."""
+        return len(self.offsets)
+
+    def __setitem__(self, key, value):
+        """Append the result of an utterance."""
+        line = json.dumps([key, value], ensure_ascii=False) + "\n"
+        self.offsets[key] = self.f.tell()
+        self.f.write(line.encode("utf_8"))
+        self.f.flush()
+
+        self.n_unsynced += 1
+        if self.n_unsynced >= self.fsync_interval:
+            os.fsync(self.f.fileno())
+            self.n_unsynced = 0
+
+    def close(self):
+        """Flush and close the part file."""
+        if not self.f.closed:
+            self.f.flush()
+            os.fsync(self.f.fileno())
+            self.f.close()
+
+    def __enter__(self):
+        """Enter the context."""
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Close the part file."""
+        self.close()
+
+    def merge(self):
+        """Write the legacy json file and remove the part file.
+
+        The output is identical to ``json.dumps({"utts": results}, indent=4,
+        ensure_ascii=False, sort_keys=True)``, but the results are read from
+        the part file one by one instead of being held in memory all together.
+
+        """
+        self.close()
+
+        with open(self.part_file, "rb") as fin, open(self.result_label, "wb") as fout:
+            if len(self.offsets) == 0:
+                fout.write('{\n    "utts": {}\n}'.encode("utf_8"))
+            else:
+                fout.write('{\n    "utts": {\n'.encode("utf_8"))
+                for i, key in enumerate(sorted(self.offsets)):
+                    fin.seek(self.offsets[key])
+                    value = json.loads(fin.readline().decode("utf-8"))[1]
+                    value = json.dumps(
+                        value, indent=4, ensure_ascii=False, sort_keys=True
+                    ).replace("\n", "\n" + " " * 8)
+                    entry = " " * 8 + json.dumps(key, ensure_ascii=False) + ": "
+                    entry += value
+                    entry += ",\n" if i < len(self.offsets) - 1 else "\n"
+                    fout.write(entry.encode("utf_8"))
+                fout.write("    }\n}".encode("utf_8"))
+
+        os.remove(self.part_file)
+
+
 def plot_spectrogram(
     plt,
     spec,
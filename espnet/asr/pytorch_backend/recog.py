@@ -7,6 +7,7 @@ import torch
 
 from espnet.asr.asr_utils import add_results_to_json
 from espnet.asr.asr_utils import get_model_conf
+from espnet.asr.asr_utils import StreamingResultsWriter
 from espnet.asr.asr_utils import torch_load
 from espnet.asr.pytorch_backend.asr import load_trained_model
 from espnet.nets.asr_interface import ASRInterface
@@ -139,9 +140,12 @@ def recog_v2(args):
     # read json data
     with open(args.recog_json, "rb") as f:
         js = json.load(f)["utts"]
-    new_js = {}
+    # write results per utterance to resume decoding after a crash
+    new_js = StreamingResultsWriter(args.result_label)
     with torch.no_grad():
         for idx, name in enumerate(js.keys(), 1):
+            if name in new_js:
+                continue
             logging.info("(%d/%d) decoding " + name, idx, len(js.keys()))
             batch = [(name, js[name])]
             feat = load_inputs_and_targets(batch)[0][0]
@@ -156,9 +160,4 @@ def recog_v2(args):
                 js[name], nbest_hyps, train_args.char_list
             )
 
-    with open(args.result_label, "wb") as f:
-        f.write(
-            json.dumps(
-                {"utts": new_js}, indent=4, ensure_ascii=False, sort_keys=True
-            ).encode("utf_8")
-        )
+    new_js.merge()
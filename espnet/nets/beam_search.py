@@ -14,6 +14,7 @@ import torch
 from espnet.nets.e2e_asr_common import end_detect
 from espnet.nets.scorer_interface import PartialScorerInterface
 from espnet.nets.scorer_interface import ScorerInterface
+from espnet.utils.profiling import span
 
 
 class Hypothesis(NamedTuple):
@@ -169,7 +170,8 @@ class BeamSearch(torch.nn.Module):
         scores = dict()
         states = dict()
         for k, d in self.full_scorers.items():
-            scores[k], states[k] = d.score(hyp.yseq, hyp.states[k], x)
+            with span(f"scorer_{k}"):
+                scores[k], states[k] = d.score(hyp.yseq, hyp.states[k], x)
         return scores, states
 
     def score_partial(
@@ -193,7 +195,8 @@ class BeamSearch(torch.nn.Module):
         scores = dict()
         states = dict()
         for k, d in self.part_scorers.items():
-            scores[k], states[k] = d.score_partial(hyp.yseq, ids, hyp.states[k], x)
+            with span(f"scorer_{k}"):
+                scores[k], states[k] = d.score_partial(hyp.yseq, ids, hyp.states[k], x)
         return scores, states
 
     def beam(
@@ -364,9 +367,12 @@ class BeamSearch(torch.nn.Module):
         ended_hyps = []
         for i in range(maxlen):
             logging.debug("position " + str(i))
-            best = self.search(running_hyps, x)
-            # post process of one iteration
-            running_hyps = self.post_process(i, maxlen, maxlenratio, best, ended_hyps)
+            with span("beam_search_step"):
+                best = self.search(running_hyps, x)
+                # post process of one iteration
+                running_hyps = self.post_process(
+                    i, maxlen, maxlenratio, best, ended_hyps
+                )
             # end detection
             if maxlenratio == 0.0 and end_detect([h.asdict() for h in ended_hyps], i):
                 logging.info(f"end detected at {i}")
@@ -1,12 +1,16 @@
 """Search algorithms for transducer models."""
 
+import heapq
 from typing import List
+from typing import Optional
+from typing import Tuple
 from typing import Union
 
 import numpy as np
 import torch
 
 from espnet.nets.pytorch_backend.transducer.utils import create_lm_batch_state
+from espnet.nets.pytorch_backend.transducer.utils import DecoderStateCache
 from espnet.nets.pytorch_backend.transducer.utils import init_lm_state
 from espnet.nets.pytorch_backend.transducer.utils import is_prefix
 from espnet.nets.pytorch_backend.transducer.utils import recombine_hyps
@@ -34,6 +38,7 @@ class BeamSearchTransducer:
         prefix_alpha: int = 1,
         score_norm: bool = True,
         nbest: int = 1,
+        cache_size: int = 4096,
     ):
         """Initialize transducer beam search.
 
@@ -50,6 +55,7 @@ class BeamSearchTransducer:
             prefix_alpha: maximum prefix length in prefix search ("nsc")
             score_norm: normalize final scores by length ("default")
             nbest: number of returned final hypothesis
+            cache_size: maximum number of cached decoder states (no bound if <= 0)
         """
         self.decoder = decoder
         self.joint_network = joint_network
@@ -90,6 +96,7 @@ class BeamSearchTransducer:
         self.score_norm = score_norm
 
         self.nbest = nbest
+        self.cache_size = cache_size
 
     def __call__(self, h: torch.Tensor) -> Union[List[Hypothesis], List[NSCHypothesis]]:
         """Perform beam search.
@@ -129,6 +136,47 @@ class BeamSearchTransducer:
 
         return hyps[: self.nbest]
 
+    def select_k_expansions(
+        self,
+        hyps: List[Hypothesis],
+        beam_topk: Tuple[torch.Tensor, torch.Tensor],
+        beam: int,
+        beam_lm_scores: Optional[torch.Tensor] = None,
+    ) -> List[Tuple[int, int, float]]:
+        """Select the k-best non-blank expansions over a batch of hypotheses.
+
+        Scores of all candidate expansions are computed at once and only the
+        selected ones need to be turned into hypotheses by the caller.
+
+        Args:
+            hyps: Hypotheses to expand (B)
+            beam_topk: Top-k log probabilities and indices (blank excluded)
+                for each hypothesis ((B, K), (B, K))
+            beam: Number of expansions to select
+            beam_lm_scores: LM scores for each hypothesis (B, V)
+
+        Returns:
+            expansions: (hypothesis index, token id, score) of the selected
+                expansions, sorted by descending score
+
+        """
+        topk_logp, topk_ids = beam_topk
+        topk_ids = topk_ids + 1
+
+        scores = topk_logp.double() + topk_logp.new_tensor(
+            [float(hyp.score) for hyp in hyps], dtype=torch.float64
+        ).unsqueeze(1)
+
+        if beam_lm_scores is not None:
+            lm_scores = torch.gather(beam_lm_scores, 1, topk_ids)
+            scores += self.lm_weight * lm_scores.double()
+
+        k_scores, k_ids = scores.view(-1).topk(min(beam, scores.numel()))
+        k_hyps = (k_ids // scores.size(1)).tolist()
+        k_tokens = topk_ids.view(-1)[k_ids].tolist()
+
+        return list(zip(k_hyps, k_tokens, k_scores.tolist()))
+
     def greedy_search(self, h: torch.Tensor) -> List[Hypothesis]:
         """Greedy search implementation for transformer-transducer.
 
@@ -142,7 +190,7 @@ class BeamSearchTransducer:
         dec_state = self.decoder.init_state(1)
 
         hyp = Hypothesis(score=0.0, yseq=[self.blank], dec_state=dec_state)
-        cache = {}
+        cache = DecoderStateCache(self.cache_size)
 
         y, state, _ = self.decoder.score(hyp, cache)
 
@@ -176,15 +224,18 @@ class BeamSearchTransducer:
         dec_state = self.decoder.init_state(1)
 
         kept_hyps = [Hypothesis(score=0.0, yseq=[self.blank], dec_state=dec_state)]
-        cache = {}
+        cache = DecoderStateCache(self.cache_size)
 
         for hi in h:
-            hyps = kept_hyps
+            # heap of (-score, insertion order, hyp), the best hypothesis on top
+            hyps = [(-hyp.score, i, hyp) for i, hyp in enumerate(kept_hyps)]
+            heapq.heapify(hyps)
+            n_pushed = len(hyps)
+
             kept_hyps = []
 
             while True:
-                max_hyp = max(hyps, key=lambda x: x.score)
-                hyps.remove(max_hyp)
+                max_hyp = heapq.heappop(hyps)[2]
 
                 y, state, lm_tokens = self.decoder.score(max_hyp, cache)
 
@@ -196,37 +247,36 @@ class BeamSearchTransducer:
                         score=(max_hyp.score + float(ytu[0:1])),
                         yseq=max_hyp.yseq[:],
                         dec_state=max_hyp.dec_state,
+                        yseq_key=max_hyp.yseq_key,
                         lm_state=max_hyp.lm_state,
                     )
                 )
 
+                topk_logp, topk_ids = top_k[0], top_k[1] + 1
+
                 if self.use_lm:
                     lm_state, lm_scores = self.lm.predict(max_hyp.lm_state, lm_tokens)
+                    topk_logp = topk_logp + self.lm_weight * lm_scores[0][topk_ids]
                 else:
                     lm_state = max_hyp.lm_state
 
-                for logp, k in zip(*top_k):
-                    score = max_hyp.score + float(logp)
+                for logp, k in zip(topk_logp.tolist(), topk_ids.tolist()):
+                    new_hyp = Hypothesis(
+                        score=(max_hyp.score + logp),
+                        yseq=max_hyp.yseq[:] + [k],
+                        dec_state=state,
+                        lm_state=lm_state,
+                        yseq_key=max_hyp.yseq_key,
+                    )
 
-                    if self.use_lm:
-                        score += self.lm_weight * lm_scores[0][k + 1]
+                    heapq.heappush(hyps, (-new_hyp.score, n_pushed, new_hyp))
+                    n_pushed += 1
 
-                    hyps.append(
-                        Hypothesis(
-                            score=score,
-                            yseq=max_hyp.yseq[:] + [int(k + 1)],
-                            dec_state=state,
-                            lm_state=lm_state,
-                        )
-                    )
+                hyps_max = -hyps[0][0]
+                kept_most_prob = [hyp for hyp in kept_hyps if hyp.score > hyps_max]
 
-                hyps_max = float(max(hyps, key=lambda x: x.score).score)
-                kept_most_prob = sorted(
-                    [hyp for hyp in kept_hyps if hyp.score > hyps_max],
-                    key=lambda x: x.score,
-                )
                 if len(kept_most_prob) >= beam:
-                    kept_hyps = kept_most_prob
+                    kept_hyps = sorted(kept_most_prob, key=lambda x: x.score)
                     break
 
         return self.sort_nbest(kept_hyps)
@@ -254,7 +304,7 @@ class BeamSearchTransducer:
                 dec_state=self.decoder.select_state(beam_state, 0),
             )
         ]
-        cache = {}
+        cache = DecoderStateCache(self.cache_size)
 
         if self.use_lm and not self.is_wordlm:
             B[0].lm_state = init_lm_state(self.lm_predictor)
@@ -288,6 +338,7 @@ class BeamSearchTransducer:
                                 yseq=hyp.yseq[:],
                                 dec_state=hyp.dec_state,
                                 lm_state=hyp.lm_state,
+                                yseq_key=hyp.yseq_key,
                             )
                         )
                     else:
@@ -306,26 +357,28 @@ class BeamSearchTransducer:
                         beam_lm_states, beam_lm_scores = self.lm.buff_predict(
                             beam_lm_states, beam_lm_tokens, len(C)
                         )
+                    else:
+                        beam_lm_scores = None
 
-                    for i, hyp in enumerate(C):
-                        for logp, k in zip(beam_topk[0][i], beam_topk[1][i] + 1):
-                            new_hyp = Hypothesis(
-                                score=(hyp.score + float(logp)),
-                                yseq=(hyp.yseq + [int(k)]),
-                                dec_state=self.decoder.select_state(beam_state, i),
-                                lm_state=hyp.lm_state,
-                            )
-
-                            if self.use_lm:
-                                new_hyp.score += self.lm_weight * beam_lm_scores[i, k]
+                    for i, k, score in self.select_k_expansions(
+                        C, beam_topk, beam, beam_lm_scores
+                    ):
+                        new_hyp = Hypothesis(
+                            score=score,
+                            yseq=(C[i].yseq + [k]),
+                            dec_state=self.decoder.select_state(beam_state, i),
+                            lm_state=C[i].lm_state,
+                            yseq_key=C[i].yseq_key,
+                        )
 
-                                new_hyp.lm_state = select_lm_state(
-                                    beam_lm_states, i, self.lm_layers, self.is_wordlm
-                                )
+                        if self.use_lm:
+                            new_hyp.lm_state = select_lm_state(
+                                beam_lm_states, i, self.lm_layers, self.is_wordlm
+                            )
 
-                            D.append(new_hyp)
+                        D.append(new_hyp)
 
-                C = sorted(D, key=lambda x: x.score, reverse=True)[:beam]
+                C = D
 
             B = sorted(A, key=lambda x: x.score, reverse=True)[:beam]
 
@@ -358,7 +411,7 @@ class BeamSearchTransducer:
             )
         ]
         final = []
-        cache = {}
+        cache = DecoderStateCache(self.cache_size)
 
         if self.use_lm and not self.is_wordlm:
             B[0].lm_state = init_lm_state(self.lm_predictor)
@@ -399,6 +452,8 @@ class BeamSearchTransducer:
                     beam_lm_states, beam_lm_scores = self.lm.buff_predict(
                         beam_lm_states, beam_lm_tokens, len(B_)
                     )
+                else:
+                    beam_lm_scores = None
 
                 for i, hyp in enumerate(B_):
                     new_hyp = Hypothesis(
@@ -406,6 +461,7 @@ class BeamSearchTransducer:
                         yseq=hyp.yseq[:],
                         dec_state=hyp.dec_state,
                         lm_state=hyp.lm_state,
+                        yseq_key=hyp.yseq_key,
                     )
 
                     A.append(new_hyp)
@@ -413,22 +469,23 @@ class BeamSearchTransducer:
                     if h_states[i][0] == (h_length - 1):
                         final.append(new_hyp)
 
-                    for logp, k in zip(beam_topk[0][i], beam_topk[1][i] + 1):
-                        new_hyp = Hypothesis(
-                            score=(hyp.score + float(logp)),
-                            yseq=(hyp.yseq[:] + [int(k)]),
-                            dec_state=self.decoder.select_state(beam_state, i),
-                            lm_state=hyp.lm_state,
-                        )
-
-                        if self.use_lm:
-                            new_hyp.score += self.lm_weight * beam_lm_scores[i, k]
+                for i, k, score in self.select_k_expansions(
+                    B_, beam_topk, beam, beam_lm_scores
+                ):
+                    new_hyp = Hypothesis(
+                        score=score,
+                        yseq=(B_[i].yseq[:] + [k]),
+                        dec_state=self.decoder.select_state(beam_state, i),
+                        lm_state=B_[i].lm_state,
+                        yseq_key=B_[i].yseq_key,
+                    )
 
-                            new_hyp.lm_state = select_lm_state(
-                                beam_lm_states, i, self.lm_layers, self.is_wordlm
-                            )
+                    if self.use_lm:
+                        new_hyp.lm_state = select_lm_state(
+                            beam_lm_states, i, self.lm_layers, self.is_wordlm
+                        )
 
-                        A.append(new_hyp)
+                    A.append(new_hyp)
 
                 B = sorted(A, key=lambda x: x.score, reverse=True)[:beam]
                 B = recombine_hyps(B)
@@ -468,7 +525,7 @@ class BeamSearchTransducer:
             )
         ]
 
-        cache = {}
+        cache = DecoderStateCache(self.cache_size)
 
         beam_y, beam_state, beam_lm_tokens = self.decoder.batch_score(
             init_tokens,
@@ -545,6 +602,7 @@ class BeamSearchTransducer:
                         NSCHypothesis(
                             yseq=hyp.yseq[:],
                             score=hyp.score + float(beam_logp[i, 0:1]),
+                            yseq_key=hyp.yseq_key,
                             y=hyp.y[:],
                             dec_state=hyp.dec_state,
                             lm_state=hyp.lm_state,
@@ -562,6 +620,7 @@ class BeamSearchTransducer:
                             NSCHypothesis(
                                 yseq=hyp.yseq[:] + [int(k)],
                                 score=score,
+                                yseq_key=hyp.yseq_key,
                                 y=hyp.y[:],
                                 dec_state=hyp.dec_state,
                                 lm_state=hyp.lm_state,
@@ -2,13 +2,97 @@ from distutils.version import LooseVersion
 import logging
 
 import numpy as np
-import six
 import torch
 import torch.nn.functional as F
 
 from espnet.nets.pytorch_backend.nets_utils import to_device
 
 
+@torch.no_grad()
+def ctc_forced_align(log_probs, ilens, ys, olens, blank_id=0):
+    """Find the best CTC alignments of a batch by the Viterbi algorithm.
+
+    The recursion is vectorized over the batch and the states of the label
+    sequences extended with blanks, [blank, y_1, blank, y_2, ..., y_L, blank],
+    and the loop runs only over the frames.
+    The back pointers are kept as an int32 tensor and traced back at last.
+
+    :param torch.Tensor log_probs: log probabilities of frames (B, Tmax, odim)
+    :param torch.Tensor ilens: lengths of frames (B)
+    :param torch.Tensor ys: padded label sequences (B, Lmax)
+    :param torch.Tensor olens: lengths of label sequences (B)
+    :param int blank_id: blank symbol index
+    :return: the label id of each frame (B, Tmax), padded with -1
+    :rtype: torch.Tensor
+    :return: the index of the extended label sequence of each frame (B, Tmax),
+        i.e. 2 * l + 1 for the l-th label and even numbers for blanks,
+        padded with -1
+    :rtype: torch.Tensor
+    """
+    batch, tmax, _ = log_probs.size()
+    device = log_probs.device
+    ilens = torch.as_tensor(ilens, device=device)
+    olens = torch.as_tensor(olens, device=device)
+    ys = ys.to(device)
+    num_states = 2 * ys.size(1) + 1
+
+    # ext_ys: (B, S)
+    ext_ys = ys.new_full((batch, num_states), blank_id)
+    ext_ys[:, 1::2] = ys
+    # Padded labels are replaced with blank to gather the valid log probs
+    ext_ys[:, 1::2].masked_fill_(
+        torch.arange(ys.size(1), device=device)[None] >= olens[:, None], blank_id
+    )
+    # emission: (B, Tmax, S)
+    emission = log_probs.gather(2, ext_ys[:, None].expand(-1, tmax, -1)).float()
+
+    # The transition from s-2 is allowed if s is not blank and y_s != y_{s-2}
+    skip = torch.zeros(batch, num_states, dtype=torch.bool, device=device)
+    skip[:, 2:] = (ext_ys[:, 2:] != blank_id) & (ext_ys[:, 2:] != ext_ys[:, :-2])
+    states = torch.arange(num_states, device=device)
+    neg_inf = float("-inf")
+
+    delta = emission.new_full((batch, num_states), neg_inf)
+    delta[:, :2] = emission[:, 0, :2]
+    # back_pointers[:, t, s]: The best previous state of s at t
+    back_pointers = torch.empty(
+        batch, tmax, num_states, dtype=torch.int32, device=device
+    )
+    back_pointers[:, 0] = states.int()
+    for t in range(1, tmax):
+        # Shift the scores to the right by 1 and 2 states
+        padded = F.pad(delta, (2, 0), value=neg_inf)
+        prev1 = padded[:, 1:-1]
+        prev2 = padded[:, :-2].masked_fill(~skip, neg_inf)
+        # NOTE: max() returns the first one among the ties, i.e. prefers staying
+        best, step = torch.stack([delta, prev1, prev2], dim=2).max(dim=2)
+        # The padded frames keep the previous scores and states
+        valid = (t < ilens)[:, None]
+        delta = torch.where(valid, best + emission[:, t], delta)
+        back_pointers[:, t] = torch.where(valid, states - step, states).int()
+
+    # The path must end with the last blank or the last label
+    last = 2 * olens
+    end_scores = torch.stack(
+        [
+            delta.gather(1, last[:, None])[:, 0],
+            delta.gather(1, (last - 1).clamp(min=0)[:, None])[:, 0],
+        ],
+        dim=1,
+    )
+    end_scores[:, 1].masked_fill_(olens == 0, neg_inf)
+    state = last - end_scores.argmax(dim=1)
+
+    state_seq = torch.empty(batch, tmax, dtype=torch.long, device=device)
+    for t in range(tmax - 1, -1, -1):
+        state_seq[:, t] = state
+        state = back_pointers[:, t].gather(1, state[:, None])[:, 0].long()
+
+    pad = torch.arange(tmax, device=device)[None] >= ilens[:, None]
+    alignment = ext_ys.gather(1, state_seq).masked_fill(pad, -1)
+    return alignment, state_seq.masked_fill(pad, -1)
+
+
 class CTC(torch.nn.Module):
     """CTC module
 
@@ -179,67 +263,22 @@ class CTC(torch.nn.Module):
     def forced_align(self, h, y, blank_id=0):
         """forced alignment.
 
-        :param torch.Tensor h: hidden state sequence, 2d tensor (T, D)
+        :param torch.Tensor h: hidden state sequence, 3d tensor (1, T, D)
         :param torch.Tensor y: id sequence tensor 1d tensor (L)
         :param int y: blank symbol index
         :return: best alignment results
         :rtype: list
         """
-
-        def interpolate_blank(label, blank_id=0):
-            """Insert blank token between every two label token."""
-            label = np.expand_dims(label, 1)
-            blanks = np.zeros((label.shape[0], 1), dtype=np.int64) + blank_id
-            label = np.concatenate([blanks, label], axis=1)
-            label = label.reshape(-1)
-            label = np.append(label, label[0])
-            return label
-
         lpz = self.log_softmax(h)
-        lpz = lpz.squeeze(0)
-
-        y_int = interpolate_blank(y, blank_id)
-
-        logdelta = np.zeros((lpz.size(0), len(y_int))) - 100000000000.0  # log of zero
-        state_path = (
-            np.zeros((lpz.size(0), len(y_int)), dtype=np.int16) - 1
-        )  # state path
-
-        logdelta[0, 0] = lpz[0][y_int[0]]
-        logdelta[0, 1] = lpz[0][y_int[1]]
-
-        for t in six.moves.range(1, lpz.size(0)):
-            for s in six.moves.range(len(y_int)):
-                if y_int[s] == blank_id or s < 2 or y_int[s] == y_int[s - 2]:
-                    candidates = np.array([logdelta[t - 1, s], logdelta[t - 1, s - 1]])
-                    prev_state = [s, s - 1]
-                else:
-                    candidates = np.array(
-                        [
-                            logdelta[t - 1, s],
-                            logdelta[t - 1, s - 1],
-                            logdelta[t - 1, s - 2],
-                        ]
-                    )
-                    prev_state = [s, s - 1, s - 2]
-                logdelta[t, s] = np.max(candidates) + lpz[t][y_int[s]]
-                state_path[t, s] = prev_state[np.argmax(candidates)]
-
-        state_seq = -1 * np.ones((lpz.size(0), 1), dtype=np.int16)
-
-        candidates = np.array(
-            [logdelta[-1, len(y_int) - 1], logdelta[-1, len(y_int) - 2]]
+        y = torch.as_tensor(np.asarray(y), dtype=torch.long, device=lpz.device)
+        alignment, _ = ctc_forced_align(
+            lpz,
+            lpz.new_full((1,), lpz.size(1), dtype=torch.long),
+            y[None],
+            y.new_full((1,), len(y)),
+            blank_id=blank_id,
         )
-        prev_state = [len(y_int) - 1, len(y_int) - 2]
-        state_seq[-1] = prev_state[np.argmax(candidates)]
-        for t in six.moves.range(lpz.size(0) - 2, -1, -1):
-            state_seq[t] = state_path[t + 1, state_seq[t + 1, 0]]
-
-        output_state_seq = []
-        for t in six.moves.range(0, lpz.size(0)):
-            output_state_seq.append(y_int[state_seq[t, 0]])
-
-        return output_state_seq
+        return alignment[0].tolist()
 
 
 def ctc_for(args, odim, reduce=True):
@@ -37,6 +37,7 @@ from espnet.nets.pytorch_backend.transducer.rnn_encoder import encoder_for
 from espnet.nets.pytorch_backend.transducer.utils import prepare_loss_inputs
 from espnet.nets.pytorch_backend.transducer.utils import valid_aux_task_layer_list
 from espnet.nets.pytorch_backend.transformer.attention import (
+    capture_attention,  # noqa: H301
     MultiHeadedAttention,  # noqa: H301
     RelPositionMultiHeadedAttention,  # noqa: H301
 )
@@ -561,7 +562,7 @@ class E2E(ASRInterface, torch.nn.Module):
         if "custom" not in self.etype and "custom" not in self.dtype:
             return []
         else:
-            with torch.no_grad():
+            with torch.no_grad(), capture_attention():
                 self.forward(xs_pad, ilens, ys_pad)
 
             ret = dict()
@@ -26,6 +26,7 @@ from espnet.nets.pytorch_backend.transformer.argument import (
     add_arguments_transformer_common,  # noqa: H301
 )
 from espnet.nets.pytorch_backend.transformer.attention import (
+    capture_attention,  # noqa: H301
     MultiHeadedAttention,  # noqa: H301
     RelPositionMultiHeadedAttention,  # noqa: H301
 )
@@ -490,7 +491,7 @@ class E2E(ASRInterface, torch.nn.Module):
         :rtype: float ndarray
         """
         self.eval()
-        with torch.no_grad():
+        with torch.no_grad(), capture_attention():
             self.forward(xs_pad, ilens, ys_pad)
         ret = dict()
         for name, m in self.named_modules():
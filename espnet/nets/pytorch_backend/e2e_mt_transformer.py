@@ -22,6 +22,7 @@ from espnet.nets.pytorch_backend.transformer.add_sos_eos import add_sos_eos
 from espnet.nets.pytorch_backend.transformer.argument import (
     add_arguments_transformer_common,  # noqa: H301
 )
+from espnet.nets.pytorch_backend.transformer.attention import capture_attention
 from espnet.nets.pytorch_backend.transformer.attention import MultiHeadedAttention
 from espnet.nets.pytorch_backend.transformer.decoder import Decoder
 from espnet.nets.pytorch_backend.transformer.encoder import Encoder
@@ -400,7 +401,7 @@ class E2E(MTInterface, torch.nn.Module):
         :rtype: float ndarray
         """
         self.eval()
-        with torch.no_grad():
+        with torch.no_grad(), capture_attention():
             self.forward(xs_pad, ilens, ys_pad)
         ret = dict()
         for name, m in self.named_modules():
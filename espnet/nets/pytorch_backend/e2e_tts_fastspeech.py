@@ -21,6 +21,7 @@ from espnet.nets.pytorch_backend.fastspeech.length_regulator import LengthRegula
 from espnet.nets.pytorch_backend.nets_utils import make_non_pad_mask
 from espnet.nets.pytorch_backend.nets_utils import make_pad_mask
 from espnet.nets.pytorch_backend.tacotron2.decoder import Postnet
+from espnet.nets.pytorch_backend.transformer.attention import capture_attention
 from espnet.nets.pytorch_backend.transformer.attention import MultiHeadedAttention
 from espnet.nets.pytorch_backend.transformer.embedding import PositionalEncoding
 from espnet.nets.pytorch_backend.transformer.embedding import ScaledPositionalEncoding
@@ -701,7 +702,7 @@ class FeedForwardTransformer(TTSInterface, torch.nn.Module):
             dict: Dict of attention weights and outputs.
 
         """
-        with torch.no_grad():
+        with torch.no_grad(), capture_attention():
             # remove unnecessary padded part (for multi-gpus)
             xs = xs[:, : max(ilens)]
             ys = ys[:, : max(olens)]
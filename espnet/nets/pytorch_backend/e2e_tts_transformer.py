@@ -16,6 +16,7 @@ from espnet.nets.pytorch_backend.nets_utils import make_non_pad_mask
 from espnet.nets.pytorch_backend.tacotron2.decoder import Postnet
 from espnet.nets.pytorch_backend.tacotron2.decoder import Prenet as DecoderPrenet
 from espnet.nets.pytorch_backend.tacotron2.encoder import Encoder as EncoderPrenet
+from espnet.nets.pytorch_backend.transformer.attention import capture_attention
 from espnet.nets.pytorch_backend.transformer.attention import MultiHeadedAttention
 from espnet.nets.pytorch_backend.transformer.decoder import Decoder
 from espnet.nets.pytorch_backend.transformer.embedding import PositionalEncoding
@@ -662,6 +663,17 @@ class Transformer(TTSInterface, torch.nn.Module):
                 sigma=args.guided_attn_loss_sigma,
                 alpha=args.guided_attn_loss_lambda,
             )
+            # keep attention weights of the layers used in the guided attention loss
+            num_layers = self.num_layers_applied_guided_attn
+            if "encoder" in self.modules_applied_guided_attn:
+                for layer in list(self.encoder.encoders)[-num_layers:]:
+                    layer.self_attn.store_attn = True
+            if "decoder" in self.modules_applied_guided_attn:
+                for layer in list(self.decoder.decoders)[-num_layers:]:
+                    layer.self_attn.store_attn = True
+            if "encoder-decoder" in self.modules_applied_guided_attn:
+                for layer in list(self.decoder.decoders)[-num_layers:]:
+                    layer.src_attn.store_attn = True
 
         # initialize parameters
         self._reset_parameters(
@@ -893,9 +905,10 @@ class Transformer(TTSInterface, torch.nn.Module):
 
             # calculate output and stop prob at idx-th step
             y_masks = subsequent_mask(idx).unsqueeze(0).to(x.device)
-            z, z_cache = self.decoder.forward_one_step(
-                ys, y_masks, hs, cache=z_cache
-            )  # (B, adim)
+            with capture_attention():
+                z, z_cache = self.decoder.forward_one_step(
+                    ys, y_masks, hs, cache=z_cache
+                )  # (B, adim)
             outs += [
                 self.feat_out(z).view(self.reduction_factor, self.odim)
             ]  # [(r, odim), ...]
@@ -968,7 +981,7 @@ class Transformer(TTSInterface, torch.nn.Module):
 
         """
         self.eval()
-        with torch.no_grad():
+        with torch.no_grad(), capture_attention():
             # forward encoder
             x_masks = self._source_mask(ilens)
             hs, h_masks = self.encoder(xs, x_masks)
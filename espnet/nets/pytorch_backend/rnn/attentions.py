@@ -20,27 +20,29 @@ def _apply_attention_constraint(
     Text-to-Speech with Convolutional Sequence Learning`_.
 
     Args:
-        e (Tensor): Attention energy before applying softmax (1, T).
-        last_attended_idx (int): The index of the inputs of the last attended [0, T].
+        e (Tensor): Attention energy before applying softmax (B, T).
+        last_attended_idx (Union[int, LongTensor]): The index of the inputs of
+            the last attended [0, T], an int or a tensor (B,) for each sample.
         backward_window (int, optional): Backward window size in attention constraint.
         forward_window (int, optional): Forward window size in attetion constraint.
 
     Returns:
-        Tensor: Monotonic constrained attention energy (1, T).
+        Tensor: Monotonic constrained attention energy (B, T).
 
     .. _`Deep Voice 3: Scaling Text-to-Speech with Convolutional Sequence Learning`:
         https://arxiv.org/abs/1710.07654
 
     """
-    if e.size(0) != 1:
-        raise NotImplementedError("Batch attention constraining is not yet supported.")
-    backward_idx = last_attended_idx - backward_window
-    forward_idx = last_attended_idx + forward_window
-    if backward_idx > 0:
-        e[:, :backward_idx] = -float("inf")
-    if forward_idx < e.size(1):
-        e[:, forward_idx:] = -float("inf")
-    return e
+    last_attended_idx = torch.as_tensor(last_attended_idx, device=e.device).view(-1, 1)
+    if last_attended_idx.size(0) not in (1, e.size(0)):
+        raise ValueError(
+            f"Mismatched batch size: {last_attended_idx.size(0)} != {e.size(0)}"
+        )
+    idx = torch.arange(e.size(1), device=e.device).unsqueeze(0)
+    outside = (idx < last_attended_idx - backward_window) | (
+        idx >= last_attended_idx + forward_window
+    )
+    return e.masked_fill_(outside, -float("inf"))
 
 
 class NoAtt(torch.nn.Module):
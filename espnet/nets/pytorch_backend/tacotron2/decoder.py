@@ -516,12 +516,63 @@ class Decoder(torch.nn.Module):
         .. _`Deep Voice 3`: https://arxiv.org/abs/1710.07654
 
         """
-        # setup
         assert len(h.size()) == 2
-        hs = h.unsqueeze(0)
-        ilens = [h.size(0)]
-        maxlen = int(h.size(0) * maxlenratio)
-        minlen = int(h.size(0) * minlenratio)
+        outs, probs, att_ws, _ = self.batch_inference(
+            h.unsqueeze(0),
+            [h.size(0)],
+            threshold=threshold,
+            minlenratio=minlenratio,
+            maxlenratio=maxlenratio,
+            use_att_constraint=use_att_constraint,
+            backward_window=backward_window,
+            forward_window=forward_window,
+        )
+        return outs[0], probs[0], att_ws[0]
+
+    def batch_inference(
+        self,
+        hs,
+        hlens,
+        threshold=0.5,
+        minlenratio=0.0,
+        maxlenratio=10.0,
+        use_att_constraint=False,
+        backward_window=None,
+        forward_window=None,
+    ):
+        """Generate the batch of feature sequences given the encoder hidden states.
+
+        All of the samples are decoded step by step at once, and each sample
+        stops independently; the states of the finished ones are kept being
+        updated but their outputs are never written.
+
+        Args:
+            hs (Tensor): Batch of the padded encoder hidden states (B, Tmax, C).
+            hlens (LongTensor): Batch of lengths of each input batch (B,).
+            threshold (float, optional): Threshold to stop generation.
+            minlenratio (float, optional): Minimum length ratio.
+            maxlenratio (float, optional): Maximum length ratio.
+            use_att_constraint (bool):
+                Whether to apply attention constraint introduced in `Deep Voice 3`_.
+            backward_window (int): Backward window size in attention constraint.
+            forward_window (int): Forward window size in attention constraint.
+
+        Returns:
+            Tensor: Batch of the padded output features (B, Lmax, odim).
+            Tensor: Batch of the padded stop probabilities (B, Lmax).
+            Tensor: Batch of the padded attention weights (B, Lmax // r, Tmax).
+            LongTensor: Batch of the lengths of the outputs (B,).
+
+        """
+        # setup
+        assert len(hs.size()) == 3
+        batch = hs.size(0)
+        hlens = list(map(int, hlens))
+        maxlens = torch.tensor([int(hl * maxlenratio) for hl in hlens])
+        minlens = torch.tensor([int(hl * minlenratio) for hl in hlens])
+        r = self.reduction_factor
+        # The number of steps to reach both of maxlen and minlen
+        max_steps = max(1, -(-int(torch.max(maxlens.max(), minlens.max())) // r))
 
         # initialize hidden states of decoder
         c_list = [self._zero_state(hs)]
@@ -529,7 +580,7 @@ class Decoder(torch.nn.Module):
         for _ in six.moves.range(1, len(self.lstm)):
             c_list += [self._zero_state(hs)]
             z_list += [self._zero_state(hs)]
-        prev_out = hs.new_zeros(1, self.odim)
+        prev_out = hs.new_zeros(batch, self.odim)
 
         # initialize attention
         prev_att_w = None
@@ -537,22 +588,27 @@ class Decoder(torch.nn.Module):
 
         # setup for attention constraint
         if use_att_constraint:
-            last_attended_idx = 0
+            last_attended_idx = torch.zeros(batch, dtype=torch.long, device=hs.device)
         else:
             last_attended_idx = None
 
+        # preallocate the outputs
+        outs = hs.new_zeros(batch, self.odim, max_steps * r)
+        probs = hs.new_zeros(batch, max_steps * r)
+        att_ws = hs.new_zeros(batch, max_steps, hs.size(1))
+        olens = torch.zeros(batch, dtype=torch.long)
+        finished = torch.zeros(batch, dtype=torch.bool)
+
         # loop for an output sequence
-        idx = 0
-        outs, att_ws, probs = [], [], []
-        while True:
+        for step in six.moves.range(max_steps):
             # updated index
-            idx += self.reduction_factor
+            idx = (step + 1) * r
 
             # decoder calculation
             if self.use_att_extra_inputs:
                 att_c, att_w = self.att(
                     hs,
-                    ilens,
+                    hlens,
                     z_list[0],
                     prev_att_w,
                     prev_out,
@@ -563,7 +619,7 @@ class Decoder(torch.nn.Module):
             else:
                 att_c, att_w = self.att(
                     hs,
-                    ilens,
+                    hlens,
                     z_list[0],
                     prev_att_w,
                     last_attended_idx=last_attended_idx,
@@ -571,7 +627,7 @@ class Decoder(torch.nn.Module):
                     forward_window=forward_window,
                 )
 
-            att_ws += [att_w]
+            att_ws[:, step] = att_w
             prenet_out = self.prenet(prev_out) if self.prenet is not None else prev_out
             xs = torch.cat([att_c, prenet_out], dim=1)
             z_list[0], c_list[0] = self.lstm[0](xs, (z_list[0], c_list[0]))
@@ -584,36 +640,47 @@ class Decoder(torch.nn.Module):
                 if self.use_concate
                 else z_list[-1]
             )
-            outs += [self.feat_out(zcs).view(1, self.odim, -1)]  # [(1, odim, r), ...]
-            probs += [torch.sigmoid(self.prob_out(zcs))[0]]  # [(r), ...]
+            out = self.feat_out(zcs).view(batch, self.odim, -1)  # (B, odim, r)
+            prob = torch.sigmoid(self.prob_out(zcs))  # (B, r)
+            outs[:, :, idx - r : idx] = out
+            probs[:, idx - r : idx] = prob
             if self.output_activation_fn is not None:
-                prev_out = self.output_activation_fn(outs[-1][:, :, -1])  # (1, odim)
+                prev_out = self.output_activation_fn(out[:, :, -1])  # (B, odim)
             else:
-                prev_out = outs[-1][:, :, -1]  # (1, odim)
+                prev_out = out[:, :, -1]  # (B, odim)
             if self.cumulate_att_w and prev_att_w is not None:
                 prev_att_w = prev_att_w + att_w  # Note: error when use +=
             else:
                 prev_att_w = att_w
             if use_att_constraint:
-                last_attended_idx = int(att_w.argmax())
-
-            # check whether to finish generation
-            if int(sum(probs[-1] >= threshold)) > 0 or idx >= maxlen:
-                # check mininum length
-                if idx < minlen:
-                    continue
-                outs = torch.cat(outs, dim=2)  # (1, odim, L)
-                if self.postnet is not None:
-                    outs = outs + self.postnet(outs)  # (1, odim, L)
-                outs = outs.transpose(2, 1).squeeze(0)  # (L, odim)
-                probs = torch.cat(probs, dim=0)
-                att_ws = torch.cat(att_ws, dim=0)
-                break
+                last_attended_idx = att_w.argmax(dim=1)
 
-        if self.output_activation_fn is not None:
-            outs = self.output_activation_fn(outs)
+            # check whether to finish generation of each sample
+            stop = ((prob >= threshold).any(dim=1).cpu() | (idx >= maxlens)) & (
+                idx >= minlens
+            )
+            olens[stop & ~finished] = idx
+            finished |= stop
+            if bool(finished.all()):
+                break
 
-        return outs, probs, att_ws
+        # apply postnet to each sample not to be affected by the padded frames
+        lmax = int(olens.max())
+        after_outs = hs.new_zeros(batch, lmax, self.odim)
+        for i, olen in enumerate(olens.tolist()):
+            out = outs[i : i + 1, :, :olen]  # (1, odim, L)
+            if self.postnet is not None:
+                out = out + self.postnet(out)  # (1, odim, L)
+            out = out.transpose(2, 1)[0]  # (L, odim)
+            if self.output_activation_fn is not None:
+                out = self.output_activation_fn(out)
+            after_outs[i, :olen] = out
+        mask = torch.arange(lmax)[None] < olens[:, None]
+        probs = probs[:, :lmax].masked_fill(~mask.to(hs.device), 0.0)
+        att_ws = att_ws[:, : lmax // r].masked_fill(
+            ~mask[:, r - 1 :: r, None].to(hs.device), 0.0
+        )
+        return after_outs, probs, att_ws, olens
 
     def calculate_all_attentions(self, hs, hlens, ys):
         """Calculate all of the attention weights.
@@ -117,7 +117,7 @@ class CustomDecoder(TransducerDecoderInterface, torch.nn.Module):
 
         Args:
             hyp (dataclass): hypothesis
-            cache (dict): states cache
+            cache (DecoderStateCache): states cache
 
         Returns:
             y (torch.Tensor): decoder outputs (1, dec_dim)
@@ -129,10 +129,10 @@ class CustomDecoder(TransducerDecoderInterface, torch.nn.Module):
         tgt = torch.tensor([hyp.yseq], device=self.device)
         lm_tokens = tgt[:, -1]
 
-        str_yseq = "".join(list(map(str, hyp.yseq)))
+        key_yseq = cache.key(hyp)
 
-        if str_yseq in cache:
-            y, new_state = cache[str_yseq]
+        if key_yseq in cache:
+            y, new_state = cache[key_yseq]
         else:
             tgt_mask = subsequent_mask(len(hyp.yseq)).unsqueeze_(0)
 
@@ -147,7 +147,7 @@ class CustomDecoder(TransducerDecoderInterface, torch.nn.Module):
 
             y = self.after_norm(tgt[:, -1])
 
-            cache[str_yseq] = (y, new_state)
+            cache[key_yseq] = (y, new_state)
 
         return y[0], new_state, lm_tokens
 
@@ -158,7 +158,7 @@ class CustomDecoder(TransducerDecoderInterface, torch.nn.Module):
             hyps (list): batch of hypotheses
             batch_states (list): decoder states
                 [L x (B, max_len, dec_dim)]
-            cache (dict): states cache
+            cache (DecoderStateCache): states cache
 
         Returns:
             batch_y (torch.Tensor): decoder output (B, dec_dim)
@@ -173,12 +173,12 @@ class CustomDecoder(TransducerDecoderInterface, torch.nn.Module):
         done = [None for _ in range(final_batch)]
 
         for i, hyp in enumerate(hyps):
-            str_yseq = "".join(list(map(str, hyp.yseq)))
+            key_yseq = cache.key(hyp)
 
-            if str_yseq in cache:
-                done[i] = cache[str_yseq]
+            if key_yseq in cache:
+                done[i] = cache[key_yseq]
             else:
-                process.append((str_yseq, hyp.yseq, hyp.dec_state))
+                process.append((key_yseq, hyp.yseq, hyp.dec_state))
 
         if process:
             _tokens = pad_sequence([p[1] for p in process], self.blank)
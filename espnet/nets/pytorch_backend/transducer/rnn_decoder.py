@@ -170,7 +170,7 @@ class DecoderRNNT(TransducerDecoderInterface, torch.nn.Module):
 
         Args:
             hyp (dataclass): hypothesis
-            cache (dict): states cache
+            cache (DecoderStateCache): states cache
 
         Returns:
             y (torch.Tensor): decoder outputs (1, dec_dim)
@@ -181,15 +181,15 @@ class DecoderRNNT(TransducerDecoderInterface, torch.nn.Module):
         """
         vy = torch.full((1, 1), hyp.yseq[-1], dtype=torch.long, device=self.device)
 
-        str_yseq = "".join(list(map(str, hyp.yseq)))
+        key_yseq = cache.key(hyp)
 
-        if str_yseq in cache:
-            y, state = cache[str_yseq]
+        if key_yseq in cache:
+            y, state = cache[key_yseq]
         else:
             ey = self.embed(vy)
 
             y, state = self.rnn_forward(ey, hyp.dec_state)
-            cache[str_yseq] = (y, state)
+            cache[key_yseq] = (y, state)
 
         return y[0][0], state, vy[0]
 
@@ -200,7 +200,7 @@ class DecoderRNNT(TransducerDecoderInterface, torch.nn.Module):
             hyps (list): batch of hypotheses
             batch_states (tuple): batch of decoder states
                 ((L, B, dec_dim), (L, B, dec_dim))
-            cache (dict): states cache
+            cache (DecoderStateCache): states cache
             use_lm (bool): whether a LM is used for decoding
 
         Returns:
@@ -216,12 +216,12 @@ class DecoderRNNT(TransducerDecoderInterface, torch.nn.Module):
         done = [None] * final_batch
 
         for i, hyp in enumerate(hyps):
-            str_yseq = "".join(list(map(str, hyp.yseq)))
+            key_yseq = cache.key(hyp)
 
-            if str_yseq in cache:
-                done[i] = cache[str_yseq]
+            if key_yseq in cache:
+                done[i] = cache[key_yseq]
             else:
-                process.append((str_yseq, hyp.yseq[-1], hyp.dec_state))
+                process.append((key_yseq, hyp.yseq[-1], hyp.dec_state))
 
         if process:
             tokens = torch.LongTensor([[p[1]] for p in process], device=self.device)
@@ -1,5 +1,7 @@
 """Utility functions for transducer models."""
 
+from collections import OrderedDict
+import itertools
 import os
 
 import numpy as np
@@ -8,6 +10,86 @@ import torch
 from espnet.nets.pytorch_backend.nets_utils import pad_list
 
 
+class DecoderStateCache:
+    """Bounded LRU cache for decoder outputs and states during search.
+
+    Entries are keyed by the integer id of the token sequence of a hypothesis
+    given by ``key()``, so lookups don't hash the whole sequence.
+    When more than ``max_size`` entries are stored, the least recently used one
+    is evicted together with its id. Evicted entries are simply recomputed by
+    the decoder if needed.
+
+    Args:
+        max_size (int): maximum number of entries (no bound if <= 0)
+
+    """
+
+    def __init__(self, max_size=4096):
+        """Construct a DecoderStateCache object."""
+        self.max_size = max_size
+        self._cache = OrderedDict()
+        # (id of a sequence, token) -> id of the extended sequence, and its inverse
+        self._ids = {}
+        self._prefixes = {}
+        # NOTE: The ids are never reused, so a hypothesis keeping an evicted id
+        #   just misses the cache
+        self._counter = itertools.count()
+
+    def key(self, hyp):
+        """Return the id of the token sequence of hyp.
+
+        The id is derived from the id of the prefix one token at a time and is
+        kept on the hypothesis as ``yseq_key=(length, id)``. Thus a hypothesis
+        created with the yseq_key of its parent, or extended in place,
+        only costs the lookups of the new tokens.
+        The ids are valid only in this cache, i.e. in one search.
+
+        Args:
+            hyp (dataclass): hypothesis
+
+        Returns:
+            (int): id of hyp.yseq
+
+        """
+        length, key = getattr(hyp, "yseq_key", None) or (0, -1)
+        for token in hyp.yseq[length:]:
+            prefix = (key, token)
+            key = self._ids.get(prefix)
+            if key is None:
+                key = next(self._counter)
+                self._ids[prefix] = key
+                self._prefixes[key] = prefix
+        hyp.yseq_key = (len(hyp.yseq), key)
+
+        return key
+
+    def __contains__(self, key):
+        """Check whether an entry exists for key."""
+        return key in self._cache
+
+    def __getitem__(self, key):
+        """Get entry for key and mark it as recently used."""
+        value = self._cache[key]
+        self._cache.move_to_end(key)
+
+        return value
+
+    def __setitem__(self, key, value):
+        """Add entry for key, evicting the least recently used if needed."""
+        self._cache[key] = value
+        self._cache.move_to_end(key)
+
+        if 0 < self.max_size < len(self._cache):
+            key, _ = self._cache.popitem(last=False)
+            prefix = self._prefixes.pop(key, None)
+            if prefix is not None:
+                del self._ids[prefix]
+
+    def __len__(self):
+        """Return the number of cached entries."""
+        return len(self._cache)
+
+
 def prepare_loss_inputs(ys_pad, hlens, blank_id=0, ignore_id=-1):
     """Prepare tensors for transducer loss computation.
 
@@ -6,16 +6,58 @@
 
 """Multi-Head Attention layer definition."""
 
+from contextlib import contextmanager
+from functools import lru_cache
 import math
+import threading
 
-import numpy
 import torch
 from torch import nn
+import torch.nn.functional as F
+
+
+# NOTE: Thread local not to keep the attention of the other threads
+_capture_state = threading.local()
+
+
+def _capture_depth():
+    return getattr(_capture_state, "depth", 0)
+
+
+@contextmanager
+def capture_attention():
+    """Keep attention weights in ``MultiHeadedAttention.attn`` within this context.
+
+    Outside of this context, ``attn`` is only kept for the modules whose
+    ``store_attn`` attribute is set, so that the (#batch, n_head, time1, time2)
+    tensors are not kept alive after the forward computation.
+
+    Examples:
+        >>> with capture_attention():
+        ...     model(*batch)
+        >>> attn = model.encoder.encoders[0].self_attn.attn
+
+    """
+    _capture_state.depth = _capture_depth() + 1
+    try:
+        yield
+    finally:
+        _capture_state.depth -= 1
+
+
+@lru_cache(maxsize=None)
+def _min_value(dtype):
+    return float(torch.finfo(dtype).min)
 
 
 class MultiHeadedAttention(nn.Module):
     """Multi-Head Attention layer.
 
+    For self-attention (query, key and value are the same tensor), the three
+    projections are computed with a single matrix multiplication. The parameters
+    are still held in linear_q, linear_k and linear_v, and are concatenated once
+    and cached if no gradient is required, e.g. in inference.
+
     Args:
         n_head (int): The number of heads.
         n_feat (int): The number of features.
@@ -35,8 +77,46 @@ class MultiHeadedAttention(nn.Module):
         self.linear_v = nn.Linear(n_feat, n_feat)
         self.linear_out = nn.Linear(n_feat, n_feat)
         self.attn = None
+        # keep self.attn even outside of capture_attention(), e.g. for guided loss
+        self.store_attn = False
         self.dropout = nn.Dropout(p=dropout_rate)
 
+    def _packed_linear(self, names):
+        """Return the weight and the bias of the linear layers concatenated.
+
+        Args:
+            names (tuple): The names of the linear layers, e.g. ("linear_k", "linear_v")
+
+        Returns:
+            torch.Tensor: Weight (len(names) * n_feat, n_feat).
+            torch.Tensor: Bias (len(names) * n_feat,).
+
+        """
+        linears = [getattr(self, name) for name in names]
+        params = [p for m in linears for p in (m.weight, m.bias)]
+        if torch.is_grad_enabled() and any(p.requires_grad for p in params):
+            # The gradients are propagated to each linear layer
+            return (
+                torch.cat([m.weight for m in linears]),
+                torch.cat([m.bias for m in linears]),
+            )
+
+        # NOTE: The version is bumped by in-place updates, e.g. load_state_dict(),
+        #   and the data is replaced by e.g. to()
+        version = tuple((p.data_ptr(), p._version, p.dtype, p.device) for p in params)
+        # NOTE: Created here for the subclasses not calling __init__() of this class
+        packed_cache = self.__dict__.setdefault("_packed_cache", {})
+        cache = packed_cache.get(names)
+        if cache is None or cache[0] != version:
+            with torch.no_grad():
+                cache = (
+                    version,
+                    torch.cat([m.weight for m in linears]),
+                    torch.cat([m.bias for m in linears]),
+                )
+            packed_cache[names] = cache
+        return cache[1], cache[2]
+
     def forward_qkv(self, query, key, value):
         """Transform query, key and value.
 
@@ -52,9 +132,23 @@ class MultiHeadedAttention(nn.Module):
 
         """
         n_batch = query.size(0)
-        q = self.linear_q(query).view(n_batch, -1, self.h, self.d_k)
-        k = self.linear_k(key).view(n_batch, -1, self.h, self.d_k)
-        v = self.linear_v(value).view(n_batch, -1, self.h, self.d_k)
+        # NOTE: Dynamically quantized linear layers don't expose weight tensors
+        packable = isinstance(self.linear_k.weight, torch.Tensor)
+        if packable and query is key and key is value:
+            # self-attention: packed QKV projection
+            weight, bias = self._packed_linear(("linear_q", "linear_k", "linear_v"))
+            q, k, v = F.linear(query, weight, bias).chunk(3, dim=-1)
+        elif packable and key is value:
+            q = self.linear_q(query)
+            weight, bias = self._packed_linear(("linear_k", "linear_v"))
+            k, v = F.linear(key, weight, bias).chunk(2, dim=-1)
+        else:
+            q = self.linear_q(query)
+            k = self.linear_k(key)
+            v = self.linear_v(value)
+        q = q.reshape(n_batch, -1, self.h, self.d_k)
+        k = k.reshape(n_batch, -1, self.h, self.d_k)
+        v = v.reshape(n_batch, -1, self.h, self.d_k)
         q = q.transpose(1, 2)  # (batch, head, time1, d_k)
         k = k.transpose(1, 2)  # (batch, head, time2, d_k)
         v = v.transpose(1, 2)  # (batch, head, time2, d_k)
@@ -77,17 +171,19 @@ class MultiHeadedAttention(nn.Module):
         n_batch = value.size(0)
         if mask is not None:
             mask = mask.unsqueeze(1).eq(0)  # (batch, 1, *, time2)
-            min_value = float(
-                numpy.finfo(torch.tensor(0, dtype=scores.dtype).numpy().dtype).min
-            )
-            scores = scores.masked_fill(mask, min_value)
-            self.attn = torch.softmax(scores, dim=-1).masked_fill(
+            scores = scores.masked_fill(mask, _min_value(scores.dtype))
+            attn = torch.softmax(scores, dim=-1).masked_fill(
                 mask, 0.0
             )  # (batch, head, time1, time2)
         else:
-            self.attn = torch.softmax(scores, dim=-1)  # (batch, head, time1, time2)
+            attn = torch.softmax(scores, dim=-1)  # (batch, head, time1, time2)
+
+        if self.store_attn or _capture_depth() > 0:
+            self.attn = attn
+        else:
+            self.attn = None
 
-        p_attn = self.dropout(self.attn)
+        p_attn = self.dropout(attn)
         x = torch.matmul(p_attn, value)  # (batch, head, time1, d_k)
         x = (
             x.transpose(1, 2).contiguous().view(n_batch, -1, self.h * self.d_k)
@@ -248,13 +344,15 @@ class RelPositionMultiHeadedAttention(MultiHeadedAttention):
             torch.Tensor: Output tensor.
 
         """
-        zero_pad = torch.zeros((*x.size()[:3], 1), device=x.device, dtype=x.dtype)
-        x_padded = torch.cat([zero_pad, x], dim=-1)
-
-        x_padded = x_padded.view(*x.size()[:2], x.size(3) + 1, x.size(2))
-        x = x_padded[:, :, 1:].view_as(x)[
-            :, :, :, : x.size(-1) // 2 + 1
-        ]  # only keep the positions from 0 to time2
+        # out[..., i, j] = x[..., i, j + time1 - 1 - i] for the positions 0 to time2,
+        # which is a strided view of x instead of a padded copy
+        x = x.contiguous()
+        n_batch, n_head, time1, n = x.size()
+        x = x.as_strided(
+            (n_batch, n_head, time1, n // 2 + 1),
+            (x.stride(0), x.stride(1), n - 1, 1),
+            storage_offset=x.storage_offset() + time1 - 1,
+        )
 
         if self.zero_triu:
             ones = torch.ones((x.size(2), x.size(3)), device=x.device)
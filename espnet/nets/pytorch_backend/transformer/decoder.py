@@ -285,6 +285,58 @@ class Decoder(BatchScorerInterface, torch.nn.Module):
 
         return y, new_cache
 
+    def init_incremental_state(self, memory, maxlen):
+        """Initialize the states for forward_incremental().
+
+        Args:
+            memory (torch.Tensor): Encoded memory, float32 (#batch, maxlen_in, feat).
+            maxlen (int): The maximum number of frames to be decoded.
+
+        Returns:
+            List[Dict[str, Any]]: The state of each decoder layer.
+
+        """
+        if self.selfattention_layer_type != "selfattn":
+            raise NotImplementedError(
+                f"{self.selfattention_layer_type} does not support "
+                "incremental decoding."
+            )
+        return [
+            decoder.init_incremental_state(memory, maxlen) for decoder in self.decoders
+        ]
+
+    def forward_incremental(self, tgt, memory_mask, state, offset):
+        """Forward one step given only the next input frame.
+
+        Unlike forward_one_step(), the input layer and the keys and values of
+        the self-attention are computed only for the new frame.
+
+        Args:
+            tgt (torch.Tensor): Input of the next frame, int64 (#batch, 1) if
+                input_layer == "embed". In the other case, (#batch, 1, odim).
+            memory_mask (torch.Tensor): Encoded memory mask (#batch, 1, maxlen_in).
+            state (List[Dict[str, Any]]): The states given by
+                init_incremental_state(), which are updated in place.
+            offset (int): The position of the input frame, i.e. the current step.
+
+        Returns:
+            torch.Tensor: Output tensor (batch, odim).
+
+        """
+        # the last module of embed is the positional encoding
+        x = self.embed[-1](self.embed[:-1](tgt), offset=offset)
+        for s, decoder in zip(state, self.decoders):
+            x = decoder.forward_incremental(x, memory_mask, s)
+
+        if self.normalize_before:
+            y = self.after_norm(x[:, -1])
+        else:
+            y = x[:, -1]
+        if self.output_layer is not None:
+            y = torch.log_softmax(self.output_layer(y), dim=-1)
+
+        return y
+
     # beam search API (see ScorerInterface)
     def score(self, ys, state, x):
         """Score."""
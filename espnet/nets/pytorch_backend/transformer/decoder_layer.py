@@ -6,6 +6,8 @@
 
 """Decoder self-attention layer definition."""
 
+import math
+
 import torch
 from torch import nn
 
@@ -132,3 +134,96 @@ class DecoderLayer(nn.Module):
             x = torch.cat([cache, x], dim=1)
 
         return x, tgt_mask, memory, memory_mask
+
+    def init_incremental_state(self, memory, maxlen):
+        """Initialize the state for incremental decoding.
+
+        The keys and values of the source attention are computed once here,
+        and the buffers of the keys and values of the self-attention are
+        preallocated for maxlen frames.
+
+        Args:
+            memory (torch.Tensor): Encoded memory, float32 (#batch, maxlen_in, size).
+            maxlen (int): The maximum number of frames to be decoded.
+
+        Returns:
+            Dict[str, Any]: The state of this layer.
+
+        """
+        n_batch = memory.size(0)
+        h, d_k = self.src_attn.h, self.src_attn.d_k
+        src_k = self.src_attn.linear_k(memory).view(n_batch, -1, h, d_k)
+        src_v = self.src_attn.linear_v(memory).view(n_batch, -1, h, d_k)
+        h, d_k = self.self_attn.h, self.self_attn.d_k
+        return dict(
+            src_k=src_k.transpose(1, 2),  # (batch, head, maxlen_in, d_k)
+            src_v=src_v.transpose(1, 2),  # (batch, head, maxlen_in, d_k)
+            self_k=memory.new_zeros(n_batch, h, maxlen, d_k),
+            self_v=memory.new_zeros(n_batch, h, maxlen, d_k),
+            length=0,
+        )
+
+    def forward_incremental(self, tgt, memory_mask, state):
+        """Compute decoded features of the next frame with the cached keys and values.
+
+        This gives the same outputs as forward() with the subsequent mask
+        for the last frame, while the keys and values of the past frames are
+        not computed again. Only MultiHeadedAttention is supported as self_attn.
+
+        Args:
+            tgt (torch.Tensor): Input tensor of the next frame (#batch, 1, size).
+            memory_mask (torch.Tensor): Encoded memory mask (#batch, 1, maxlen_in).
+            state (Dict[str, Any]): The state given by init_incremental_state(),
+                which is updated in place.
+
+        Returns:
+            torch.Tensor: Output tensor (#batch, 1, size).
+
+        """
+        residual = tgt
+        if self.normalize_before:
+            tgt = self.norm1(tgt)
+
+        # append the key and value of the next frame to the buffers
+        q, k, v = self.self_attn.forward_qkv(tgt, tgt, tgt)
+        length = state["length"] + 1
+        state["self_k"][:, :, length - 1 : length] = k
+        state["self_v"][:, :, length - 1 : length] = v
+        state["length"] = length
+        k, v = state["self_k"][:, :, :length], state["self_v"][:, :, :length]
+        scores = torch.matmul(q, k.transpose(-2, -1)) / math.sqrt(self.self_attn.d_k)
+        x = self.self_attn.forward_attention(v, scores, None)
+        if self.concat_after:
+            x = residual + self.concat_linear1(torch.cat((tgt, x), dim=-1))
+        else:
+            x = residual + self.dropout(x)
+        if not self.normalize_before:
+            x = self.norm1(x)
+
+        residual = x
+        if self.normalize_before:
+            x = self.norm2(x)
+        n_batch = x.size(0)
+        q = self.src_attn.linear_q(x).view(
+            n_batch, -1, self.src_attn.h, self.src_attn.d_k
+        )
+        q = q.transpose(1, 2)  # (batch, head, 1, d_k)
+        scores = torch.matmul(q, state["src_k"].transpose(-2, -1)) / math.sqrt(
+            self.src_attn.d_k
+        )
+        src = self.src_attn.forward_attention(state["src_v"], scores, memory_mask)
+        if self.concat_after:
+            x = residual + self.concat_linear2(torch.cat((x, src), dim=-1))
+        else:
+            x = residual + self.dropout(src)
+        if not self.normalize_before:
+            x = self.norm2(x)
+
+        residual = x
+        if self.normalize_before:
+            x = self.norm3(x)
+        x = residual + self.dropout(self.feed_forward(x))
+        if not self.normalize_before:
+            x = self.norm3(x)
+
+        return x
@@ -79,18 +79,20 @@ class PositionalEncoding(torch.nn.Module):
         pe = pe.unsqueeze(0)
         self.pe = pe.to(device=x.device, dtype=x.dtype)
 
-    def forward(self, x: torch.Tensor):
+    def forward(self, x: torch.Tensor, offset: int = 0):
         """Add positional encoding.
 
         Args:
             x (torch.Tensor): Input tensor (batch, time, `*`).
+            offset (int): The position of the first frame of x,
+                e.g. the current step in incremental decoding.
 
         Returns:
             torch.Tensor: Encoded tensor (batch, time, `*`).
 
         """
-        self.extend_pe(x)
-        x = x * self.xscale + self.pe[:, : x.size(1)]
+        self.extend_pe(x if offset == 0 else x.new_zeros(1, offset + x.size(1)))
+        x = x * self.xscale + self.pe[:, offset : offset + x.size(1)]
         return self.dropout(x)
 
 
@@ -115,18 +117,19 @@ class ScaledPositionalEncoding(PositionalEncoding):
         """Reset parameters."""
         self.alpha.data = torch.tensor(1.0)
 
-    def forward(self, x):
+    def forward(self, x, offset: int = 0):
         """Add positional encoding.
 
         Args:
             x (torch.Tensor): Input tensor (batch, time, `*`).
+            offset (int): The position of the first frame of x.
 
         Returns:
             torch.Tensor: Encoded tensor (batch, time, `*`).
 
         """
-        self.extend_pe(x)
-        x = x + self.alpha * self.pe[:, : x.size(1)]
+        self.extend_pe(x if offset == 0 else x.new_zeros(1, offset + x.size(1)))
+        x = x + self.alpha * self.pe[:, offset : offset + x.size(1)]
         return self.dropout(x)
 
 
@@ -6,28 +6,110 @@
 
 """Repeat the same layer definition."""
 
+from distutils.version import LooseVersion
+
 import torch
+from torch.utils.checkpoint import checkpoint
+
+if LooseVersion(torch.__version__) >= LooseVersion("1.11.0"):
+    # NOTE: The non-reentrant variant also works if no input requires grad
+    checkpoint_kwargs = dict(use_reentrant=False)
+else:
+    checkpoint_kwargs = dict()
+
+
+def _flatten(args):
+    """Flatten the tuples in args, e.g. ((x, pos_emb), mask) -> [x, pos_emb, mask]."""
+    flat, spec = [], []
+    for arg in args:
+        if isinstance(arg, tuple):
+            spec.append(len(arg))
+            flat.extend(arg)
+        else:
+            spec.append(None)
+            flat.append(arg)
+    return flat, spec
+
+
+def _unflatten(flat, spec):
+    args, i = [], 0
+    for n in spec:
+        if n is None:
+            args.append(flat[i])
+            i += 1
+        else:
+            args.append(tuple(flat[i : i + n]))
+            i += n
+    return tuple(args)
 
 
 class MultiSequential(torch.nn.Sequential):
-    """Multi-input multi-output torch.nn.Sequential."""
+    """Multi-input multi-output torch.nn.Sequential.
+
+    Args:
+        layer_drop_rate (float): Probability to skip each layer in training.
+        checkpoint_every (int): Recompute the activations of every this number of
+            layers in backward instead of keeping them. 0 disables checkpointing.
+
+    """
+
+    def __init__(self, *args, layer_drop_rate=0.0, checkpoint_every=0):
+        """Initialize MultiSequential."""
+        super().__init__(*args)
+        self.layer_drop_rate = layer_drop_rate
+        self.checkpoint_every = checkpoint_every
 
     def forward(self, *args):
         """Repeat."""
-        for m in self:
-            args = m(*args)
+        layers = list(self)
+        if self.training and self.layer_drop_rate > 0.0:
+            # NOTE: The skipped layers are decided here, outside of the checkpointed
+            #   segments, so that the recomputation skips the same layers
+            probs = torch.empty(len(layers)).uniform_()
+            layers = [m for m, p in zip(layers, probs) if p >= self.layer_drop_rate]
+
+        if (
+            not self.training
+            or self.checkpoint_every <= 0
+            or not torch.is_grad_enabled()
+        ):
+            for m in layers:
+                args = m(*args)
+            return args
+
+        for i in range(0, len(layers), self.checkpoint_every):
+            segment = layers[i : i + self.checkpoint_every]
+            flat, spec = _flatten(args)
+
+            def run_segment(*flat, segment=segment, spec=spec):
+                args = _unflatten(flat, spec)
+                for m in segment:
+                    args = m(*args)
+                flat, run_segment.out_spec = _flatten(args)
+                return tuple(flat)
+
+            # NOTE: The RNG state, e.g. for dropout, is restored in the recomputation
+            flat = checkpoint(run_segment, *flat, **checkpoint_kwargs)
+            args = _unflatten(flat, run_segment.out_spec)
         return args
 
 
-def repeat(N, fn):
+def repeat(N, fn, layer_drop_rate=0.0, checkpoint_every=0):
     """Repeat module N times.
 
     Args:
         N (int): Number of repeat time.
         fn (Callable): Function to generate module.
+        layer_drop_rate (float): Probability to skip each layer in training.
+        checkpoint_every (int): Checkpoint the activations every this number of
+            layers in training. 0 disables checkpointing.
 
     Returns:
         MultiSequential: Repeated model instance.
 
     """
-    return MultiSequential(*[fn(n) for n in range(N)])
+    return MultiSequential(
+        *[fn(n) for n in range(N)],
+        layer_drop_rate=layer_drop_rate,
+        checkpoint_every=checkpoint_every,
+    )
@@ -293,8 +293,45 @@ class WaveNet(nn.Module):
         # reshape inputs
         assert len(x.shape) == 1
         assert len(h.shape) == 2 and h.shape[1] == self.n_aux
-        x = x.unsqueeze(0)
-        h = h.transpose(0, 1).unsqueeze(0)
+
+        return self.batch_generate(
+            x.unsqueeze(0), h.unsqueeze(0), n_samples, interval=interval, mode=mode
+        )[0]
+
+    def batch_generate(self, x, h, n_samples, interval=None, mode="sampling"):
+        """Generate a batch of waveforms in lockstep with fast generation algorithm.
+
+        Each dilated convolution keeps a ring buffer of its past inputs, so every
+        step only computes the newest time index (`Fast WaveNet Generation
+        Algorithm`_). The auxiliary feature projections of all layers are computed
+        with a single matrix product per block of samples instead of per step.
+
+        Utterances of different lengths can be generated together by padding ``h``
+        and trimming each output to its own length afterwards, since the model is
+        causal and padded frames do not affect earlier samples.
+
+        Args:
+            x (LongTensor): Initial waveform tensor with the shape  (B, T).
+            h (Tensor): Auxiliary feature tensor with the shape
+                (B, n_samples + T, n_aux).
+            n_samples (int): Number of samples to be generated.
+            interval (int, optional): Log interval.
+            mode (str, optional): "sampling" or "argmax".
+
+        Return:
+            ndarray: Generated quantized waveforms (B, n_samples).
+
+        .. _`Fast WaveNet Generation Algorithm`: https://arxiv.org/abs/1611.09482
+
+        """
+        # check inputs
+        assert len(x.shape) == 2
+        assert len(h.shape) == 3 and h.shape[2] == self.n_aux
+        assert self.kernel_size > 1
+        if mode not in ["sampling", "argmax"]:
+            logging.error("mode should be sampling or argmax")
+            sys.exit(1)
+        h = h.transpose(1, 2)
 
         # perform upsampling
         if self.upsampling_factor > 0:
@@ -310,12 +347,31 @@ class WaveNet(nn.Module):
             x = F.pad(x, (n_pad, 0), "constant", self.n_quantize // 2)
             h = F.pad(h, (n_pad, 0), "replicate")
 
-        # prepare buffer
-        output = self._preprocess(x)
-        h_ = h[:, :, : x.size(1)]
-        output_buffer = []
-        buffer_size = []
-        for i, d in enumerate(self.dilations):
+        # the last generation step uses the auxiliary feature at T + n_samples - 2
+        n_init = x.size(1)
+        if h.shape[2] < n_init + n_samples - 1:
+            h = F.pad(h, (0, n_init + n_samples - 1 - h.shape[2]), "replicate")
+
+        batch_size = x.size(0)
+        n_layers = len(self.dilations)
+        n_taps = self.kernel_size
+
+        # preallocate the whole output instead of growing it at every step
+        samples = x.new_zeros(batch_size, n_init + n_samples)
+        samples[:, :n_init] = x
+
+        # fill per-layer ring buffers with the inputs of the initial waveform
+        buffers = []
+        buffer_size = [(n_taps - 1) * d for d in self.dilations]
+        output = self._preprocess(x[:, :-1])
+        h_ = h[:, :, : n_init - 1]
+        for i in range(n_layers):
+            buffer = output.new_zeros(batch_size, self.n_resch, buffer_size[i])
+            idx = torch.arange(
+                n_init - 1 - buffer_size[i], n_init - 1, device=output.device
+            )
+            buffer[:, :, idx % buffer_size[i]] = output[:, :, -buffer_size[i] :]
+            buffers.append(buffer)
             output, _ = self._residual_forward(
                 output,
                 h_,
@@ -326,52 +382,91 @@ class WaveNet(nn.Module):
                 self.skip_1x1[i],
                 self.res_1x1[i],
             )
-            if d == 2 ** (self.dilation_depth - 1):
-                buffer_size.append(self.kernel_size - 1)
-            else:
-                buffer_size.append(d * 2 * (self.kernel_size - 1))
-            output_buffer.append(output[:, :, -buffer_size[i] - 1 : -1])
+
+        # flatten convolution weights into matrices for single-step products
+        causal_weight = self.causal.conv.weight.permute(2, 1, 0)  # K x Q x R
+        causal_bias = self.causal.conv.bias
+        dil_weights = []
+        res_weights = []
+        for i in range(n_layers):
+            weight = torch.cat(
+                [self.dil_sigmoid[i].conv.weight, self.dil_tanh[i].conv.weight], dim=0
+            )  # 2R x R x K
+            dil_weights.append(weight.permute(2, 1, 0).reshape(-1, 2 * self.n_resch))
+            res_weights.append(self.res_1x1[i].weight[:, :, 0].t())
+        aux_weight = torch.cat(
+            [
+                torch.cat([s.weight[:, :, 0], t.weight[:, :, 0]], dim=0)
+                for s, t in zip(self.aux_1x1_sigmoid, self.aux_1x1_tanh)
+            ],
+            dim=0,
+        )  # (L x 2R) x n_aux
+        # dilated convolution biases are folded into the auxiliary projections
+        aux_bias = torch.cat(
+            [
+                torch.cat([s.bias + ds.conv.bias, t.bias + dt.conv.bias])
+                for s, t, ds, dt in zip(
+                    self.aux_1x1_sigmoid,
+                    self.aux_1x1_tanh,
+                    self.dil_sigmoid,
+                    self.dil_tanh,
+                )
+            ]
+        )
+        skip_weight = torch.cat(
+            [skip_1x1.weight[:, :, 0].t() for skip_1x1 in self.skip_1x1], dim=0
+        )  # (L x R) x S
+        skip_bias = sum(skip_1x1.bias for skip_1x1 in self.skip_1x1)
 
         # generate
-        samples = x[0]
+        block_size = 256
         start_time = time.time()
         for i in range(n_samples):
-            output = samples[-self.kernel_size * 2 + 1 :].unsqueeze(0)
-            output = self._preprocess(output)
-            h_ = h[:, :, samples.size(0) - 1].contiguous().view(1, self.n_aux, 1)
-            output_buffer_next = []
-            skip_connections = []
-            for j, d in enumerate(self.dilations):
-                output, skip = self._generate_residual_forward(
-                    output,
-                    h_,
-                    self.dil_sigmoid[j],
-                    self.dil_tanh[j],
-                    self.aux_1x1_sigmoid[j],
-                    self.aux_1x1_tanh[j],
-                    self.skip_1x1[j],
-                    self.res_1x1[j],
+            t = n_init - 1 + i
+
+            # project auxiliary features of all layers for the next block at once
+            if i % block_size == 0:
+                h_block = h[:, :, t : t + block_size].transpose(1, 2)
+                aux_block = torch.matmul(h_block, aux_weight.t()) + aux_bias
+                aux_block = aux_block.view(batch_size, -1, n_layers, 2 * self.n_resch)
+            aux = aux_block[:, i % block_size]
+
+            # causal convolution over one-hot inputs is a sum of embedding lookups
+            output = causal_bias
+            for k in range(n_taps):
+                output = (
+                    output
+                    + causal_weight[k][samples[:, t - n_taps + 1 + k] % self.n_quantize]
                 )
-                output = torch.cat([output_buffer[j], output], dim=2)
-                output_buffer_next.append(output[:, :, -buffer_size[j] :])
-                skip_connections.append(skip)
 
-            # update buffer
-            output_buffer = output_buffer_next
+            gated_outputs = []
+            for j in range(n_layers):
+                d = self.dilations[j]
+                taps = [
+                    buffers[j][:, :, (t - (n_taps - 1 - k) * d) % buffer_size[j]]
+                    for k in range(n_taps - 1)
+                ]
+                inputs = torch.cat(taps + [output], dim=1)
+                buffers[j][:, :, t % buffer_size[j]] = output
+
+                gated = torch.matmul(inputs, dil_weights[j]) + aux[:, j]
+                gated = torch.sigmoid(gated[:, : self.n_resch]) * torch.tanh(
+                    gated[:, self.n_resch :]
+                )
+                gated_outputs.append(gated)
+                output = (
+                    torch.matmul(gated, res_weights[j]) + self.res_1x1[j].bias + output
+                )
 
             # get predicted sample
-            output = sum(skip_connections)
-            output = self._postprocess(output)[0]
+            output = torch.matmul(torch.cat(gated_outputs, dim=1), skip_weight)
+            output = self._postprocess((output + skip_bias).unsqueeze(2))[:, -1]
             if mode == "sampling":
-                posterior = F.softmax(output[-1], dim=0)
-                dist = torch.distributions.Categorical(posterior)
-                sample = dist.sample().unsqueeze(0)
-            elif mode == "argmax":
-                sample = output.argmax(-1)
+                posterior = F.softmax(output, dim=-1)
+                sample = torch.multinomial(posterior, 1)[:, 0]
             else:
-                logging.error("mode should be sampling or argmax")
-                sys.exit(1)
-            samples = torch.cat([samples, sample], dim=0)
+                sample = output.argmax(-1)
+            samples[:, t + 1] = sample
 
             # show progress
             if interval is not None and (i + 1) % interval == 0:
@@ -387,7 +482,7 @@ class WaveNet(nn.Module):
                 )
                 start_time = time.time()
 
-        return samples[-n_samples:].cpu().numpy()
+        return samples[:, -n_samples:].cpu().numpy()
 
     def _preprocess(self, x):
         x = self.onehot(x).transpose(1, 2)
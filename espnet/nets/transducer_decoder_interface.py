@@ -21,6 +21,8 @@ class Hypothesis:
         Tuple[torch.Tensor, Optional[torch.Tensor]], List[torch.Tensor], torch.Tensor
     ]
     lm_state: Union[Dict[str, Any], List[Any]] = None
+    # (length, id) of a prefix of yseq given by DecoderStateCache.key()
+    yseq_key: Optional[Tuple[int, int]] = None
 
 
 @dataclass
@@ -56,7 +58,7 @@ class TransducerDecoderInterface:
     def score(
         self,
         hyp: Union[Hypothesis, NSCHypothesis],
-        cache: Dict[str, Any],
+        cache: Dict[Tuple[int, ...], Any],
     ) -> Union[
         Tuple[torch.Tensor, Optional[torch.Tensor]],
         torch.Tensor,
@@ -82,7 +84,7 @@ class TransducerDecoderInterface:
         batch_states: Union[
             Tuple[torch.Tensor, Optional[torch.Tensor]], List[Optional[torch.Tensor]]
         ],
-        cache: Dict[str, Any],
+        cache: Dict[Tuple[int, ...], Any],
     ) -> Union[
         Tuple[torch.Tensor, Optional[torch.Tensor]],
         torch.Tensor,
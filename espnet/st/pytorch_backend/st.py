@@ -20,6 +20,7 @@ from espnet.asr.asr_utils import add_results_to_json
 from espnet.asr.asr_utils import CompareValueTrigger
 from espnet.asr.asr_utils import restore_snapshot
 from espnet.asr.asr_utils import snapshot_object
+from espnet.asr.asr_utils import StreamingResultsWriter
 from espnet.asr.asr_utils import torch_load
 from espnet.asr.asr_utils import torch_resume
 from espnet.asr.asr_utils import torch_snapshot
@@ -617,7 +618,8 @@ def trans(args):
     # read json data
     with open(args.trans_json, "rb") as f:
         js = json.load(f)["utts"]
-    new_js = {}
+    # write results per utterance to resume decoding after a crash
+    new_js = StreamingResultsWriter(args.result_label)
 
     load_inputs_and_targets = LoadInputsAndTargets(
         mode="asr",
@@ -632,6 +634,8 @@ def trans(args):
     if args.batchsize == 0:
         with torch.no_grad():
             for idx, name in enumerate(js.keys(), 1):
+                if name in new_js:
+                    continue
                 logging.info("(%d/%d) decoding " + name, idx, len(js.keys()))
                 batch = [(name, js[name])]
                 feat = load_inputs_and_targets(batch)[0][0]
@@ -657,6 +661,8 @@ def trans(args):
             sorted_index = sorted(range(len(feat_lens)), key=lambda i: -feat_lens[i])
             keys = [keys[i] for i in sorted_index]
 
+        keys = [key for key in keys if key not in new_js]
+
         with torch.no_grad():
             for names in grouper(args.batchsize, keys, None):
                 names = [name for name in names if name]
@@ -674,9 +680,4 @@ def trans(args):
                         js[name], nbest_hyp, train_args.char_list
                     )
 
-    with open(args.result_label, "wb") as f:
-        f.write(
-            json.dumps(
-                {"utts": new_js}, indent=4, ensure_ascii=False, sort_keys=True
-            ).encode("utf_8")
-        )
+    new_js.merge()
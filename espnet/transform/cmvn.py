@@ -94,6 +94,41 @@ class CMVN(object):
             )
         )
 
+    def batch_call(self, xs_pad, ilens, uttid_list=None):
+        """Apply CMVN to a padded batch (B, Tmax, ...)."""
+        if uttid_list is None:
+            spks = [None] * len(xs_pad)
+        elif self.utt2spk is not None:
+            spks = [self.utt2spk[u] for u in uttid_list]
+        else:
+            spks = list(uttid_list)
+
+        if len(set(spks)) == 1:
+            bias = self.bias[spks[0]]
+            scale = self.scale[spks[0]]
+        else:
+            # Per-sample statistics: (B, 1, ..., Dim)
+            bias = np.stack([self.bias[spk] for spk in spks])
+            scale = np.stack([self.scale[spk] for spk in spks])
+            shape = (len(xs_pad),) + (1,) * (xs_pad.ndim - bias.ndim) + bias.shape[1:]
+            bias = bias.reshape(shape)
+            scale = scale.reshape(shape)
+
+        x = xs_pad
+        if not self.reverse:
+            if self.norm_means:
+                x = np.add(x, bias)
+            if self.norm_vars:
+                x = np.multiply(x, scale)
+
+        else:
+            if self.norm_vars:
+                x = np.divide(x, scale)
+            if self.norm_means:
+                x = np.subtract(x, bias)
+
+        return x
+
     def __call__(self, x, uttid=None):
         if self.utt2spk is not None:
             spk = self.utt2spk[uttid]
@@ -128,6 +163,27 @@ class UtteranceCMVN(object):
             norm_vars=self.norm_vars,
         )
 
+    def batch_call(self, xs_pad, ilens, uttid_list=None):
+        """Apply utterance CMVN to a padded batch (B, Tmax, Dim)."""
+        # mask: (B, Tmax, 1)
+        mask = np.arange(xs_pad.shape[1])[None, :] < ilens[:, None]
+        mask = mask.reshape(mask.shape + (1,) * (xs_pad.ndim - 2))
+        counts = ilens.reshape((-1,) + (1,) * (xs_pad.ndim - 2))
+
+        square_sums = (xs_pad ** 2 * mask).sum(axis=1)
+        mean = (xs_pad * mask).sum(axis=1) / counts
+
+        x = xs_pad
+        if self.norm_means:
+            x = np.subtract(x, mean[:, None])
+
+        if self.norm_vars:
+            var = square_sums / counts - mean ** 2
+            std = np.maximum(np.sqrt(var), self.std_floor)
+            x = np.divide(x, std[:, None])
+
+        return x
+
     def __call__(self, x, uttid=None):
         # x: [Time, Dim]
         square_sums = (x ** 2).sum(axis=0)
@@ -6,6 +6,11 @@ import soundfile
 from espnet.utils.io_utils import SoundHDF5File
 
 
+def _batch_shape(xs_pad, ndim=1):
+    # Shape to broadcast per-sample values of ndim dims to the padded batch
+    return (len(xs_pad),) + (1,) * (xs_pad.ndim - ndim)
+
+
 class SpeedPerturbation(object):
     """SpeedPerturbation
 
@@ -165,6 +170,7 @@ class VolumePerturbation(object):
         else:
             # The ratio is given on runtime randomly
             self.utt2ratio = None
+            self.accept_uttid = False
 
     def __repr__(self):
         if self.utt2ratio is None:
@@ -176,6 +182,21 @@ class VolumePerturbation(object):
                 self.__class__.__name__, self.utt2ratio_file, self.dbunit
             )
 
+    def batch_call(self, xs_pad, ilens, uttid_list=None, train=True):
+        """Apply the perturbation to a padded batch (B, Tmax, ...)."""
+        if not train:
+            return xs_pad
+
+        xs_pad = xs_pad.astype(numpy.float32)
+
+        if self.accept_uttid:
+            ratio = numpy.array([self.utt2ratio[u] for u in uttid_list])
+        else:
+            ratio = self.state.uniform(self.lower, self.upper, size=len(xs_pad))
+        if self.dbunit:
+            ratio = 10 ** (ratio / 20)
+        return xs_pad * ratio.astype(numpy.float32).reshape(_batch_shape(xs_pad))
+
     def __call__(self, x, uttid=None, train=True):
         if not train:
             return x
@@ -257,6 +278,44 @@ class NoiseInjection(object):
                 self.__class__.__name__, self.utt2ratio_file, self.dbunit
             )
 
+    def batch_call(self, xs_pad, ilens, uttid_list=None, train=True):
+        """Apply the noise injection to a padded batch (B, Tmax, ...)."""
+        if not train:
+            return xs_pad
+
+        if self.utt2noise is not None:
+            # Noise sources have their own lengths: Process each sample
+            ys = [
+                self(x[:ilen], None if uttid_list is None else uttid_list[i])
+                for i, (x, ilen) in enumerate(zip(xs_pad, ilens))
+            ]
+            ys_pad = numpy.zeros((len(ys), xs_pad.shape[1]) + ys[0].shape[1:])
+            for i, y in enumerate(ys):
+                ys_pad[i, : len(y)] = y
+            return ys_pad
+
+        xs_pad = xs_pad.astype(numpy.float32)
+
+        # 1. Get ratio of noise to signal in sound pressure level
+        if uttid_list is not None and self.utt2ratio is not None:
+            ratio = numpy.array([self.utt2ratio[u] for u in uttid_list])
+        else:
+            ratio = self.state.uniform(self.lower, self.upper, size=len(xs_pad))
+
+        if self.dbunit:
+            ratio = 10 ** (ratio / 20)
+        mask = numpy.arange(xs_pad.shape[1])[None, :] < ilens[:, None]
+        mask = mask.reshape(mask.shape + (1,) * (xs_pad.ndim - 2))
+        n_elements = ilens * numpy.prod(xs_pad.shape[2:], dtype=numpy.int64)
+        power = (xs_pad ** 2 * mask).reshape(len(xs_pad), -1).sum(1) / n_elements
+        scale = ratio * numpy.sqrt(power)
+
+        # 2. Generate white noise
+        noise = self.state.normal(0, 1, xs_pad.shape)
+
+        # 3. Add noise to signal
+        return xs_pad + noise * scale.reshape(_batch_shape(xs_pad))
+
     def __call__(self, x, uttid=None, train=True):
         if not train:
             return x
@@ -1,7 +1,30 @@
+from distutils.version import LooseVersion
+from functools import lru_cache
+
 import librosa
 import numpy as np
 
 
+@lru_cache(maxsize=32)
+def _mel_basis(fs, n_fft, n_mels, fmin, fmax):
+    # mel_basis: (Mel_freq, Freq)
+    mel_basis = librosa.filters.mel(
+        sr=fs, n_fft=n_fft, n_mels=n_mels, fmin=fmin, fmax=fmax
+    )
+    mel_basis.flags.writeable = False
+    return mel_basis
+
+
+@lru_cache(maxsize=32)
+def _stft_window(window, win_length, n_fft):
+    # Same window as librosa.stft, padded to n_fft: (n_fft,)
+    win_length = n_fft if win_length is None else win_length
+    fft_window = librosa.filters.get_window(window, win_length, fftbins=True)
+    fft_window = librosa.util.pad_center(fft_window, size=n_fft).astype(np.float32)
+    fft_window.flags.writeable = False
+    return fft_window
+
+
 def stft(
     x, n_fft, n_shift, win_length=None, window="hann", center=True, pad_mode="reflect"
 ):
@@ -76,7 +99,7 @@ def stft2logmelspectrogram(x_stft, fs, n_mels, n_fft, fmin=None, fmax=None, eps=
     # spc: (Time, Channel, Freq) or (Time, Freq)
     spc = np.abs(x_stft)
     # mel_basis: (Mel_freq, Freq)
-    mel_basis = librosa.filters.mel(fs, n_fft, n_mels, fmin, fmax)
+    mel_basis = _mel_basis(fs, n_fft, n_mels, fmin, fmax)
     # lmspc: (Time, Channel, Mel_freq) or (Time, Mel_freq)
     lmspc = np.log10(np.maximum(eps, np.dot(spc, mel_basis.T)))
 
@@ -117,6 +140,124 @@ def logmelspectrogram(
     )
 
 
+def _batch_torch_stft(xs, n_fft, n_shift, win_length, window, pad_mode, device):
+    import torch
+
+    # Flatten all channels of all signals: [(Time,), ...]
+    signals = []
+    n_channels = []
+    for x in xs:
+        x = x[:, None] if x.ndim == 1 else x
+        x = x.astype(np.float32)
+        n_channels.append(x.shape[1])
+        # NOTE: Center padding is applied per signal, as librosa.stft does
+        for ch in range(x.shape[1]):
+            signals.append(np.pad(x[:, ch], n_fft // 2, mode=pad_mode))
+
+    max_len = max(len(s) for s in signals)
+    batch = np.zeros((len(signals), max_len), dtype=np.float32)
+    for i, s in enumerate(signals):
+        batch[i, : len(s)] = s
+    olens = [1 + (len(s) - n_fft) // n_shift for s in signals]
+
+    stft_kwargs = dict(
+        n_fft=n_fft,
+        hop_length=n_shift,
+        win_length=n_fft,
+        window=torch.from_numpy(_stft_window(window, win_length, n_fft).copy()).to(
+            device
+        ),
+        center=False,
+    )
+    # spec: (Batch * Channel, Freq, Frames, 2=real_imag)
+    if LooseVersion(torch.__version__) >= LooseVersion("1.7.0"):
+        # NOTE: The real tensor output is removed from torch>=2.0
+        spec = torch.view_as_real(
+            torch.stft(
+                torch.from_numpy(batch).to(device), return_complex=True, **stft_kwargs
+            )
+        )
+    else:
+        spec = torch.stft(torch.from_numpy(batch).to(device), **stft_kwargs)
+    # spec: (Batch * Channel, Frames, Freq, 2=real_imag)
+    return spec.transpose(1, 2), olens, n_channels
+
+
+def _split_channels(xs_in, x_stack, olens, n_channels):
+    # Gather the channels of each signal back: [(Time, Channel, ...) or (Time, ...)]
+    outs = []
+    offset = 0
+    for x_in, n_ch in zip(xs_in, n_channels):
+        olen = olens[offset]
+        x = np.stack([x_stack[offset + ch][:olen] for ch in range(n_ch)], axis=1)
+        if x_in.ndim == 1:
+            x = x[:, 0]
+        outs.append(x)
+        offset += n_ch
+    return outs
+
+
+def batch_stft(
+    xs, n_fft, n_shift, win_length=None, window="hann", pad_mode="reflect", device="cpu"
+):
+    """Compute STFT of a batch of signals at once with torch.
+
+    Equivalent to applying stft(center=True) to each signal.
+
+    :param List[np.ndarray] xs: Signals, each (Time,) or (Time, Channel)
+    :return: Complex spectrograms, each (Frames, Freq) or (Frames, Channel, Freq)
+    :rtype: List[np.ndarray]
+    """
+    spec, olens, n_channels = _batch_torch_stft(
+        xs, n_fft, n_shift, win_length, window, pad_mode, device
+    )
+    spec = spec.cpu().numpy()
+    spec = spec[..., 0] + 1j * spec[..., 1]
+    return _split_channels(xs, spec.astype(np.complex64), olens, n_channels)
+
+
+def batch_logmelspectrogram(
+    xs,
+    fs,
+    n_mels,
+    n_fft,
+    n_shift,
+    win_length=None,
+    window="hann",
+    fmin=None,
+    fmax=None,
+    eps=1e-10,
+    pad_mode="reflect",
+    device="cpu",
+):
+    """Compute log-mel spectrograms of a batch of signals at once with torch.
+
+    Equivalent to applying logmelspectrogram to each signal. Signals of similar
+    length should be batched together to limit the computation wasted on padding.
+
+    :param List[np.ndarray] xs: Signals, each (Time,) or (Time, Channel)
+    :return: Log-mel spectrograms, each (Frames, Mel_freq)
+        or (Frames, Channel, Mel_freq)
+    :rtype: List[np.ndarray]
+    """
+    import torch
+
+    fmin = 0 if fmin is None else fmin
+    fmax = fs / 2 if fmax is None else fmax
+
+    spec, olens, n_channels = _batch_torch_stft(
+        xs, n_fft, n_shift, win_length, window, pad_mode, device
+    )
+    # spc: (Batch * Channel, Frames, Freq)
+    spc = spec.pow(2).sum(-1).sqrt()
+    mel_basis = torch.from_numpy(_mel_basis(fs, n_fft, n_mels, fmin, fmax).copy())
+    # lmspc: (Batch * Channel, Frames, Mel_freq)
+    lmspc = torch.matmul(spc, mel_basis.to(spc.device, spc.dtype).t())
+    lmspc = torch.log10(torch.clamp(lmspc, min=eps))
+
+    return _split_channels(xs, lmspc.cpu().numpy(), olens, n_channels)
+
+
 class Spectrogram(object):
     def __init__(self, n_fft, n_shift, win_length=None, window="hann"):
         self.n_fft = n_fft
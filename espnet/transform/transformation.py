@@ -6,6 +6,7 @@ from inspect import signature
 import io
 import logging
 
+import numpy as np
 import yaml
 
 from espnet.utils.dynamic_import import dynamic_import
@@ -37,9 +38,35 @@ import_alias = dict(
 )
 
 
+def _pad_batch(xs):
+    """Pad a list of arrays along the first axis.
+
+    :param Sequence[np.ndarray] xs:
+    :return: padded array (B, Tmax, ...) and lengths (B,), or None if the arrays
+        can't be stacked, e.g. they have different trailing dimensions
+    :rtype: Optional[Tuple[np.ndarray, np.ndarray]]
+    """
+    if len(xs) == 0 or not all(isinstance(x, np.ndarray) and x.ndim > 0 for x in xs):
+        return None
+    if len(set(x.shape[1:] for x in xs)) != 1:
+        return None
+
+    ilens = np.array([len(x) for x in xs])
+    xs_pad = np.zeros(
+        (len(xs), ilens.max()) + xs[0].shape[1:], dtype=np.result_type(*xs)
+    )
+    for i, x in enumerate(xs):
+        xs_pad[i, : len(x)] = x
+    return xs_pad, ilens
+
+
 class Transformation(object):
     """Apply some functions to the mini-batch
 
+    Functions which implement ``batch_call(xs_pad, ilens, uttid_list, **kwargs)``
+    are applied to the padded mini-batch at once. Adjacent functions of this kind
+    are fused, i.e. the mini-batch is padded and split only once for all of them.
+
     Examples:
         >>> kwargs = {"process": [{"type": "fbank",
         ...                        "n_mels": 80,
@@ -94,6 +121,24 @@ class Transformation(object):
                 "Not supporting mode={}".format(self.conf["mode"])
             )
 
+        # Derive the args which each func has once, instead of at every call
+        self.params = OrderedDict()
+        for idx, func in self.functions.items():
+            try:
+                self.params[idx] = set(signature(func).parameters)
+            except ValueError:
+                # Some function, e.g. built-in function, are failed
+                self.params[idx] = set()
+
+        # Group adjacent functions which can process the padded mini-batch
+        self.stages = []
+        for idx, func in self.functions.items():
+            batch_native = hasattr(func, "batch_call")
+            if len(self.stages) > 0 and self.stages[-1][0] and batch_native:
+                self.stages[-1][1].append(idx)
+            else:
+                self.stages.append((batch_native, [idx]))
+
     def __repr__(self):
         rep = "\n" + "\n".join(
             "    {}: {}".format(k, v) for k, v in self.functions.items()
@@ -118,26 +163,18 @@ class Transformation(object):
             uttid_list = [uttid_list for _ in range(len(xs))]
 
         if self.conf.get("mode", "sequential") == "sequential":
-            for idx in range(len(self.conf["process"])):
-                func = self.functions[idx]
-                # TODO(karita): use TrainingTrans and UttTrans to check __call__ args
-                # Derive only the args which the func has
-                try:
-                    param = signature(func).parameters
-                except ValueError:
-                    # Some function, e.g. built-in function, are failed
-                    param = {}
-                _kwargs = {k: v for k, v in kwargs.items() if k in param}
-                try:
-                    if uttid_list is not None and "uttid" in param:
-                        xs = [func(x, u, **_kwargs) for x, u in zip(xs, uttid_list)]
-                    else:
-                        xs = [func(x, **_kwargs) for x in xs]
-                except Exception:
-                    logging.fatal(
-                        "Catch a exception from {}th func: {}".format(idx, func)
-                    )
-                    raise
+            for batch_native, indices in self.stages:
+                padded = _pad_batch(xs) if batch_native else None
+                if padded is None:
+                    for idx in indices:
+                        xs = self._apply(idx, xs, uttid_list, kwargs)
+                else:
+                    xs_pad, ilens = padded
+                    for idx in indices:
+                        xs_pad = self._apply_batch(
+                            idx, xs_pad, ilens, uttid_list, kwargs
+                        )
+                    xs = [x[:ilen] for x, ilen in zip(xs_pad, ilens)]
         else:
             raise NotImplementedError(
                 "Not supporting mode={}".format(self.conf["mode"])
@@ -147,3 +184,29 @@ class Transformation(object):
             return xs
         else:
             return xs[0]
+
+    def _apply(self, idx, xs, uttid_list, kwargs):
+        func = self.functions[idx]
+        param = self.params[idx]
+        # TODO(karita): use TrainingTrans and UttTrans to check __call__ args
+        _kwargs = {k: v for k, v in kwargs.items() if k in param}
+        try:
+            if uttid_list is not None and "uttid" in param:
+                return [func(x, u, **_kwargs) for x, u in zip(xs, uttid_list)]
+            else:
+                return [func(x, **_kwargs) for x in xs]
+        except Exception:
+            logging.fatal("Catch a exception from {}th func: {}".format(idx, func))
+            raise
+
+    def _apply_batch(self, idx, xs_pad, ilens, uttid_list, kwargs):
+        func = self.functions[idx]
+        param = self.params[idx]
+        _kwargs = {k: v for k, v in kwargs.items() if k in param}
+        if "uttid" not in param:
+            uttid_list = None
+        try:
+            return func.batch_call(xs_pad, ilens, uttid_list, **_kwargs)
+        except Exception:
+            logging.fatal("Catch a exception from {}th func: {}".format(idx, func))
+            raise
@@ -0,0 +1,270 @@
+"""Named timing spans and the profiler window to find the hot paths.
+
+The spans are placed in the hot paths, e.g. the encoder and the scorers of
+the beam search, and cost only a function call unless SpanTimer
+or StepProfiler is active in the process.
+
+Examples:
+    >>> from espnet.utils.profiling import span, SpanTimer
+    >>> with SpanTimer() as timer:
+    ...     with span("encoder"):
+    ...         model.encode(speech, speech_lengths)
+    >>> logging.info(timer.log_message())
+
+"""
+
+from collections import defaultdict
+from distutils.version import LooseVersion
+import logging
+from pathlib import Path
+import time
+from typing import Dict
+from typing import Optional
+from typing import Union
+
+import torch
+
+# The active SpanTimer and whether StepProfiler is capturing in this process
+_timer = None
+_profiling = False
+
+
+class _NullSpan:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    def __init__(self, name: str):
+        self.name = name
+
+    def __enter__(self):
+        self.timer = _timer
+        if _profiling:
+            # Shown as a range in the trace of StepProfiler
+            self.record = torch.autograd.profiler.record_function(self.name)
+            self.record.__enter__()
+        else:
+            self.record = None
+        if self.timer is not None:
+            self.timer.synchronize_if_needed()
+            self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if self.timer is not None:
+            self.timer.synchronize_if_needed()
+            self.timer.add(self.name, time.perf_counter() - self.start)
+        if self.record is not None:
+            self.record.__exit__(exc_type, exc_val, exc_tb)
+
+
+def span(name: str):
+    """Measure the block as the span of the name.
+
+    Returns a shared no-op context manager if neither SpanTimer nor
+    StepProfiler is active.
+    """
+    if _timer is None and not _profiling:
+        return _NULL_SPAN
+    return _Span(name)
+
+
+class SpanTimer:
+    """Accumulate the elapsed time of the spans while it is entered.
+
+    The nested spans are measured separately, i.e. the time of the inner span
+    is also included in the outer one.
+
+    Args:
+        synchronize: Synchronize CUDA at the beginning and the end of each span
+            to measure the time of the kernels instead of their launches
+        enabled: Do nothing if False
+
+    """
+
+    def __init__(self, synchronize: bool = False, enabled: bool = True):
+        self.synchronize = synchronize and torch.cuda.is_available()
+        self.enabled = enabled
+        self.totals: Dict[str, float] = defaultdict(float)
+        self.counts: Dict[str, int] = defaultdict(int)
+        self._pending: Dict[str, float] = defaultdict(float)
+        self._prev = None
+
+    def __enter__(self):
+        global _timer
+        if self.enabled:
+            self._prev = _timer
+            _timer = self
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        global _timer
+        if self.enabled:
+            _timer = self._prev
+            self._prev = None
+
+    def iterate(self, iterable):
+        """Activate the timer while iterating, including the body of the loop."""
+        with self:
+            yield from iterable
+
+    def synchronize_if_needed(self):
+        if self.synchronize and torch.cuda.is_initialized():
+            torch.cuda.synchronize()
+
+    def add(self, name: str, elapsed: float):
+        self.totals[name] += elapsed
+        self.counts[name] += 1
+        self._pending[name] += elapsed
+
+    def pop(self) -> Dict[str, float]:
+        """Return the elapsed time of each span since the last call."""
+        retval = dict(self._pending)
+        self._pending.clear()
+        return retval
+
+    def log_message(self) -> str:
+        if len(self.totals) == 0:
+            return "No spans are measured"
+        message = "Time of the spans (total, count, mean):"
+        for name, total in sorted(self.totals.items(), key=lambda x: -x[1]):
+            count = self.counts[name]
+            message += (
+                f"\n  {name}: {total:.3f} sec, {count}, {total / count * 1000:.3f} ms"
+            )
+        return message
+
+
+class StepProfiler:
+    """Capture the profile of the steps in [start, start + num_steps).
+
+    The trace is written in the Chrome trace format, which can be seen
+    with chrome://tracing or Perfetto, and the spans are shown as the ranges.
+    step() must be called at the end of every step.
+
+    Args:
+        output_file: The json file of the Chrome trace
+        start: The index of the first step to be captured
+        num_steps: The number of the steps to be captured
+        use_cuda: Capture the CUDA kernels too
+
+    Examples:
+        >>> profiler = StepProfiler("exp/profile/trace.json", start=10, num_steps=5)
+        >>> for batch in iterator:
+        ...     train_step(batch)
+        ...     profiler.step()
+        >>> profiler.close()
+
+    """
+
+    def __init__(
+        self,
+        output_file: Union[Path, str],
+        start: int = 0,
+        num_steps: int = 1,
+        use_cuda: bool = False,
+    ):
+        assert start >= 0 and num_steps > 0, (start, num_steps)
+        self.output_file = Path(output_file)
+        self.start = start
+        self.num_steps = num_steps
+        self.use_cuda = use_cuda
+        self.num_done = 0
+        self._prof = None
+        if start == 0:
+            self._begin()
+
+    def _begin(self):
+        global _profiling
+        if LooseVersion(torch.__version__) >= LooseVersion("1.8.1"):
+            activities = [torch.profiler.ProfilerActivity.CPU]
+            if self.use_cuda:
+                activities.append(torch.profiler.ProfilerActivity.CUDA)
+            self._prof = torch.profiler.profile(activities=activities)
+        else:
+            self._prof = torch.autograd.profiler.profile(use_cuda=self.use_cuda)
+        self._prof.__enter__()
+        _profiling = True
+
+    def step(self):
+        self.num_done += 1
+        if self.num_done == self.start + self.num_steps:
+            self.close()
+        elif self.num_done == self.start:
+            self._begin()
+
+    def close(self) -> Optional[Path]:
+        """Stop capturing and write the trace if the window has begun."""
+        global _profiling
+        if self._prof is None:
+            return None
+        prof, self._prof = self._prof, None
+        prof.__exit__(None, None, None)
+        _profiling = False
+
+        self.output_file.parent.mkdir(parents=True, exist_ok=True)
+        prof.export_chrome_trace(str(self.output_file))
+        logging.info(
+            "The hot spots in the profiled steps:\n"
+            + prof.key_averages().table(sort_by="self_cpu_time_total", row_limit=20)
+        )
+        logging.info(f"Wrote the trace to {self.output_file}")
+        return self.output_file
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+class ThroughputMeter:
+    """Summarize the real time factor and the throughput of the inference.
+
+    Examples:
+        >>> meter = ThroughputMeter()
+        >>> for keys, batch in loader:
+        ...     outputs = model(**batch)
+        ...     meter.add(len(keys), batch["speech_lengths"].sum().item() / fs)
+        >>> logging.info(meter.log_message())
+
+    """
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.num_utts = 0
+        self.duration = 0.0
+
+    def add(self, num_utts: int, duration: Optional[float] = None):
+        """Count the utterances and the duration of the audio in seconds."""
+        self.num_utts += num_utts
+        if duration is not None:
+            self.duration += duration
+
+    def summary(self) -> Dict[str, float]:
+        elapsed = time.perf_counter() - self.start
+        retval = dict(
+            num_utts=self.num_utts,
+            elapsed=elapsed,
+            utts_per_sec=self.num_utts / max(elapsed, 1e-9),
+        )
+        if self.duration > 0:
+            retval.update(duration=self.duration, rtf=elapsed / self.duration)
+        return retval
+
+    def log_message(self) -> str:
+        s = self.summary()
+        message = (
+            f"Processed {s['num_utts']} utterances in {s['elapsed']:.2f} sec "
+            f"({s['utts_per_sec']:.2f} utterances / sec)"
+        )
+        if "rtf" in s:
+            message += f", audio: {s['duration']:.2f} sec, RTF: {s['rtf']:.4f}"
+        return message
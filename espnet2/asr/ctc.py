@@ -1,9 +1,12 @@
 import logging
+from typing import Tuple
 
 import torch
 import torch.nn.functional as F
 from typeguard import check_argument_types
 
+from espnet.nets.pytorch_backend.ctc import ctc_forced_align
+
 
 class CTC(torch.nn.Module):
     """CTC module.
@@ -161,3 +164,28 @@ class CTC(torch.nn.Module):
             torch.Tensor: argmax applied 2d tensor (B, Tmax)
         """
         return torch.argmax(self.ctc_lo(hs_pad), dim=2)
+
+    def forced_align(
+        self,
+        hs_pad: torch.Tensor,
+        hlens: torch.Tensor,
+        ys_pad: torch.Tensor,
+        ys_lens: torch.Tensor,
+        blank_id: int = 0,
+    ) -> Tuple[torch.Tensor, torch.Tensor]:
+        """Find the best CTC alignments of a batch by the Viterbi algorithm
+
+        Args:
+            hs_pad: 3d tensor (B, Tmax, eprojs)
+            hlens: (B,)
+            ys_pad: (B, Lmax)
+            ys_lens: (B,)
+            blank_id: The index of blank
+        Returns:
+            alignment: (B, Tmax) The token id of each frame, padded with -1
+            states: (B, Tmax) The index of the label sequence extended with blanks
+                of each frame, i.e. 2 * l + 1 for the l-th token, padded with -1
+        """
+        return ctc_forced_align(
+            self.log_softmax(hs_pad), hlens, ys_pad, ys_lens, blank_id=blank_id
+        )
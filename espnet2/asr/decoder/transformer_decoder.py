@@ -48,6 +48,9 @@ class BaseTransformerDecoder(AbsDecoder, BatchScorerInterface):
             i.e. x -> x + linear(concat(x, att(x)))
             if False, no additional linear will be applied.
             i.e. x -> x + att(x)
+        layer_drop_rate: probability to skip each decoder block in training
+        checkpoint_every: recompute the activations of every this number of
+            decoder blocks in backward to save memory, 0 to disable
     """
 
     def __init__(
@@ -241,6 +244,8 @@ class TransformerDecoder(BaseTransformerDecoder):
         pos_enc_class=PositionalEncoding,
         normalize_before: bool = True,
         concat_after: bool = False,
+        layer_drop_rate: float = 0.0,
+        checkpoint_every: int = 0,
     ):
         assert check_argument_types()
         super().__init__(
@@ -270,6 +275,8 @@ class TransformerDecoder(BaseTransformerDecoder):
                 normalize_before,
                 concat_after,
             ),
+            layer_drop_rate=layer_drop_rate,
+            checkpoint_every=checkpoint_every,
         )
 
 
@@ -293,6 +300,8 @@ class LightweightConvolutionTransformerDecoder(BaseTransformerDecoder):
         conv_wshare: int = 4,
         conv_kernel_length: Sequence[int] = (11, 11, 11, 11, 11, 11),
         conv_usebias: int = False,
+        layer_drop_rate: float = 0.0,
+        checkpoint_every: int = 0,
     ):
         assert check_argument_types()
         if len(conv_kernel_length) != num_blocks:
@@ -332,6 +341,8 @@ class LightweightConvolutionTransformerDecoder(BaseTransformerDecoder):
                 normalize_before,
                 concat_after,
             ),
+            layer_drop_rate=layer_drop_rate,
+            checkpoint_every=checkpoint_every,
         )
 
 
@@ -355,6 +366,8 @@ class LightweightConvolution2DTransformerDecoder(BaseTransformerDecoder):
         conv_wshare: int = 4,
         conv_kernel_length: Sequence[int] = (11, 11, 11, 11, 11, 11),
         conv_usebias: int = False,
+        layer_drop_rate: float = 0.0,
+        checkpoint_every: int = 0,
     ):
         assert check_argument_types()
         if len(conv_kernel_length) != num_blocks:
@@ -394,6 +407,8 @@ class LightweightConvolution2DTransformerDecoder(BaseTransformerDecoder):
                 normalize_before,
                 concat_after,
             ),
+            layer_drop_rate=layer_drop_rate,
+            checkpoint_every=checkpoint_every,
         )
 
 
@@ -417,6 +432,8 @@ class DynamicConvolutionTransformerDecoder(BaseTransformerDecoder):
         conv_wshare: int = 4,
         conv_kernel_length: Sequence[int] = (11, 11, 11, 11, 11, 11),
         conv_usebias: int = False,
+        layer_drop_rate: float = 0.0,
+        checkpoint_every: int = 0,
     ):
         assert check_argument_types()
         if len(conv_kernel_length) != num_blocks:
@@ -456,6 +473,8 @@ class DynamicConvolutionTransformerDecoder(BaseTransformerDecoder):
                 normalize_before,
                 concat_after,
             ),
+            layer_drop_rate=layer_drop_rate,
+            checkpoint_every=checkpoint_every,
         )
 
 
@@ -479,6 +498,8 @@ class DynamicConvolution2DTransformerDecoder(BaseTransformerDecoder):
         conv_wshare: int = 4,
         conv_kernel_length: Sequence[int] = (11, 11, 11, 11, 11, 11),
         conv_usebias: int = False,
+        layer_drop_rate: float = 0.0,
+        checkpoint_every: int = 0,
     ):
         assert check_argument_types()
         if len(conv_kernel_length) != num_blocks:
@@ -518,4 +539,6 @@ class DynamicConvolution2DTransformerDecoder(BaseTransformerDecoder):
                 normalize_before,
                 concat_after,
             ),
+            layer_drop_rate=layer_drop_rate,
+            checkpoint_every=checkpoint_every,
         )
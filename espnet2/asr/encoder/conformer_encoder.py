@@ -73,6 +73,10 @@ class ConformerEncoder(AbsEncoder):
         zero_triu (bool): Whether to zero the upper triangular part of attention matrix.
         cnn_module_kernel (int): Kernerl size of convolution module.
         padding_idx (int): Padding idx for input_layer=embed.
+        layer_drop_rate (float): Probability to skip each encoder block in
+            training.
+        checkpoint_every (int): Recompute the activations of every this number
+            of encoder blocks in backward to save memory. 0 disables it.
 
     """
 
@@ -100,6 +104,8 @@ class ConformerEncoder(AbsEncoder):
         zero_triu: bool = False,
         cnn_module_kernel: int = 31,
         padding_idx: int = -1,
+        layer_drop_rate: float = 0.0,
+        checkpoint_every: int = 0,
     ):
         assert check_argument_types()
         super().__init__()
@@ -250,6 +256,8 @@ class ConformerEncoder(AbsEncoder):
                 normalize_before,
                 concat_after,
             ),
+            layer_drop_rate=layer_drop_rate,
+            checkpoint_every=checkpoint_every,
         )
         if self.normalize_before:
             self.after_norm = LayerNorm(output_size)
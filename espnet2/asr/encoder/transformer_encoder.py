@@ -50,6 +50,9 @@ class TransformerEncoder(AbsEncoder):
         positionwise_layer_type: linear of conv1d
         positionwise_conv_kernel_size: kernel size of positionwise conv1d layer
         padding_idx: padding_idx for input_layer=embed
+        layer_drop_rate: probability to skip each encoder block in training
+        checkpoint_every: recompute the activations of every this number of
+            encoder blocks in backward to save memory, 0 to disable
     """
 
     def __init__(
@@ -69,6 +72,8 @@ class TransformerEncoder(AbsEncoder):
         positionwise_layer_type: str = "linear",
         positionwise_conv_kernel_size: int = 1,
         padding_idx: int = -1,
+        layer_drop_rate: float = 0.0,
+        checkpoint_every: int = 0,
     ):
         assert check_argument_types()
         super().__init__()
@@ -137,6 +142,8 @@ class TransformerEncoder(AbsEncoder):
                 normalize_before,
                 concat_after,
             ),
+            layer_drop_rate=layer_drop_rate,
+            checkpoint_every=checkpoint_every,
         )
         if self.normalize_before:
             self.after_norm = LayerNorm(output_size)
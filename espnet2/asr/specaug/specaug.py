@@ -3,6 +3,7 @@ from typing import Sequence
 from typing import Union
 
 from espnet2.asr.specaug.abs_specaug import AbsSpecAug
+from espnet2.layers.mask_along_axis import make_axis_mask
 from espnet2.layers.mask_along_axis import MaskAlongAxis
 from espnet2.layers.time_warp import TimeWarp
 
@@ -19,6 +20,11 @@ class SpecAug(AbsSpecAug):
         When using cuda mode, time_warp doesn't have reproducibility
         due to `torch.nn.functional.interpolate`.
 
+    If batched is true, the time warping is done by one grid_sample call with
+    the warp center of each sample, and the time and frequency masks are
+    applied as one boolean mask over the padded batch.
+    The time masks are put within the length of each sample in this mode.
+
     """
 
     def __init__(
@@ -32,6 +38,7 @@ class SpecAug(AbsSpecAug):
         apply_time_mask: bool = True,
         time_mask_width_range: Union[int, Sequence[int]] = (0, 100),
         num_time_mask: int = 2,
+        batched: bool = False,
     ):
         if not apply_time_warp and not apply_time_mask and not apply_freq_mask:
             raise ValueError(
@@ -41,9 +48,12 @@ class SpecAug(AbsSpecAug):
         self.apply_time_warp = apply_time_warp
         self.apply_freq_mask = apply_freq_mask
         self.apply_time_mask = apply_time_mask
+        self.batched = batched
 
         if apply_time_warp:
-            self.time_warp = TimeWarp(window=time_warp_window, mode=time_warp_mode)
+            self.time_warp = TimeWarp(
+                window=time_warp_window, mode=time_warp_mode, batched=batched
+            )
         else:
             self.time_warp = None
 
@@ -66,6 +76,8 @@ class SpecAug(AbsSpecAug):
             self.time_mask = None
 
     def forward(self, x, x_lengths=None):
+        if self.batched:
+            return self._batched_forward(x, x_lengths)
         if self.time_warp is not None:
             x, x_lengths = self.time_warp(x, x_lengths)
         if self.freq_mask is not None:
@@ -73,3 +85,37 @@ class SpecAug(AbsSpecAug):
         if self.time_mask is not None:
             x, x_lengths = self.time_mask(x, x_lengths)
         return x, x_lengths
+
+    def _batched_forward(self, x, x_lengths=None):
+        if self.time_warp is not None:
+            x, x_lengths = self.time_warp(x, x_lengths)
+
+        # x: (Batch, Length, Freq) or (Batch, Channel, Length, Freq)
+        B, T, F = x.size(0), x.size(-2), x.size(-1)
+        mask = None
+        if self.freq_mask is not None:
+            # mask: (Batch, 1, Freq)
+            mask = make_axis_mask(
+                B,
+                F,
+                mask_width_range=self.freq_mask.mask_width_range,
+                num_mask=self.freq_mask.num_mask,
+                device=x.device,
+            )[:, None, :]
+        if self.time_mask is not None:
+            # time_mask: (Batch, Length, 1)
+            time_mask = make_axis_mask(
+                B,
+                T,
+                mask_width_range=self.time_mask.mask_width_range,
+                num_mask=self.time_mask.num_mask,
+                lengths=x_lengths,
+                device=x.device,
+            )[:, :, None]
+            mask = time_mask if mask is None else mask | time_mask
+        if mask is None:
+            return x, x_lengths
+
+        if x.dim() == 4:
+            mask = mask[:, None]
+        return x.masked_fill(mask, 0.0), x_lengths
@@ -0,0 +1,277 @@
+"""The benchmarks of the hot paths with the synthetic inputs.
+
+The sizes are chosen to finish each benchmark within a second on a CPU core.
+The names must not be changed once the results are stored as the baseline.
+"""
+
+from pathlib import Path
+import tempfile
+
+import numpy as np
+import soundfile
+import torch
+
+from espnet.nets.batch_beam_search import BatchBeamSearch
+from espnet.nets.beam_search import BeamSearch
+from espnet.nets.ctc_prefix_score import CTCPrefixScoreTH
+from espnet.nets.pytorch_backend.fastspeech.length_regulator import LengthRegulator
+from espnet.nets.pytorch_backend.transformer.attention import MultiHeadedAttention
+from espnet.nets.pytorch_backend.transformer.attention import (
+    RelPositionMultiHeadedAttention,  # noqa: H301
+)
+from espnet.nets.pytorch_backend.transformer.embedding import RelPositionalEncoding
+from espnet.nets.scorers.ctc import CTCPrefixScorer
+from espnet.nets.scorers.length_bonus import LengthBonus
+from espnet2.asr.ctc import CTC
+from espnet2.asr.decoder.transformer_decoder import TransformerDecoder
+from espnet2.asr.encoder.conformer_encoder import ConformerEncoder
+from espnet2.benchmark.runner import register_benchmark
+from espnet2.lm.seq_rnn_lm import SequentialRNNLM
+from espnet2.samplers.build_batch_sampler import build_batch_sampler
+from espnet2.train.collate_fn import common_collate_fn
+from espnet2.train.dataset import ESPnetDataset
+from espnet2.train.preprocessor import CommonPreprocessor
+from espnet2.utils.griffin_lim import Spectrogram2Waveform
+
+
+def _register_beam_search(batch: bool, ctc_weight: float, use_lm: bool):
+    name = "beam_search/{}/ctc{}{}".format(
+        "batch" if batch else "default", ctc_weight, "/lm" if use_lm else ""
+    )
+
+    @register_benchmark(name)
+    def _():
+        vocab_size, adim = 100, 128
+        decoder = TransformerDecoder(
+            vocab_size, adim, linear_units=256, num_blocks=2, dropout_rate=0.0
+        )
+        scorers = dict(
+            decoder=decoder,
+            ctc=CTCPrefixScorer(ctc=CTC(vocab_size, adim), eos=vocab_size - 1),
+            length_bonus=LengthBonus(vocab_size),
+        )
+        weights = dict(decoder=1.0 - ctc_weight, ctc=ctc_weight, length_bonus=0.0)
+        if use_lm:
+            scorers["lm"] = SequentialRNNLM(vocab_size, unit=128, nlayers=1)
+            weights["lm"] = 0.3
+        for v in scorers.values():
+            if isinstance(v, torch.nn.Module):
+                v.eval()
+
+        beam_search = (BatchBeamSearch if batch else BeamSearch)(
+            scorers=scorers,
+            weights=weights,
+            beam_size=5,
+            vocab_size=vocab_size,
+            sos=vocab_size - 1,
+            eos=vocab_size - 1,
+            pre_beam_score_key="full",
+        )
+        x = torch.randn(100, adim)
+
+        def fn():
+            with torch.no_grad():
+                # NOTE: maxlenratio > 0 to search the same number of the steps
+                beam_search(x, maxlenratio=0.2)
+
+        return fn
+
+
+for _batch in [False, True]:
+    for _ctc_weight in [0.0, 0.3]:
+        for _use_lm in [False, True]:
+            _register_beam_search(_batch, _ctc_weight, _use_lm)
+
+
+@register_benchmark("ctc_prefix_score_th")
+def _():
+    batch, beam, odim, steps = 2, 5, 100, 10
+    logp = torch.randn(batch, 200, odim).log_softmax(-1)
+    xlens = torch.tensor([200, 150])
+    pre_beam = torch.randn(batch * beam, odim).topk(30, dim=1)[1]
+
+    def fn():
+        scorer = CTCPrefixScoreTH(logp.clone(), xlens, 0, odim - 1)
+        ys = [[odim - 1] for _ in range(batch * beam)]
+        state = None
+        for _ in range(steps):
+            scores, state = scorer(ys, state, pre_beam)
+            best_ids = scores.view(batch, beam * odim).topk(beam, dim=1)[1]
+            state = scorer.index_select_state(state, best_ids)
+            ys = [
+                ys[b * beam + int(i) // odim] + [int(i) % odim]
+                for b in range(batch)
+                for i in best_ids[b]
+            ]
+
+    return fn
+
+
+@register_benchmark("attention/mha")
+def _():
+    att = MultiHeadedAttention(4, 256, 0.0).eval()
+    x = torch.randn(8, 200, 256)
+    mask = torch.ones(8, 1, 200, dtype=torch.bool)
+
+    def fn():
+        with torch.no_grad():
+            att(x, x, x, mask)
+
+    return fn
+
+
+@register_benchmark("attention/rel_pos_mha")
+def _():
+    att = RelPositionMultiHeadedAttention(4, 256, 0.0).eval()
+    x, pos_emb = RelPositionalEncoding(256, 0.0)(torch.randn(8, 200, 256))
+    mask = torch.ones(8, 1, 200, dtype=torch.bool)
+
+    def fn():
+        with torch.no_grad():
+            att(x, x, x, pos_emb, mask)
+
+    return fn
+
+
+def _conformer_inputs():
+    encoder = ConformerEncoder(
+        80,
+        output_size=144,
+        attention_heads=4,
+        linear_units=576,
+        num_blocks=4,
+        dropout_rate=0.0,
+        positional_dropout_rate=0.0,
+        macaron_style=True,
+        rel_pos_type="latest",
+        pos_enc_layer_type="rel_pos",
+        selfattention_layer_type="rel_selfattn",
+        cnn_module_kernel=15,
+    )
+    xs = torch.randn(4, 400, 80)
+    ilens = torch.tensor([400, 380, 300, 250])
+    return encoder, xs, ilens
+
+
+@register_benchmark("conformer_encoder/forward")
+def _():
+    encoder, xs, ilens = _conformer_inputs()
+    encoder.eval()
+
+    def fn():
+        with torch.no_grad():
+            encoder(xs, ilens)
+
+    return fn
+
+
+@register_benchmark("conformer_encoder/backward")
+def _():
+    encoder, xs, ilens = _conformer_inputs()
+    encoder.train()
+
+    def fn():
+        encoder.zero_grad()
+        encoder(xs, ilens)[0].sum().backward()
+
+    return fn
+
+
+def _write_wav(path: Path, nsamples: int, fs: int = 16000):
+    soundfile.write(str(path), np.random.uniform(-0.5, 0.5, nsamples), fs)
+
+
+@register_benchmark("dataset/getitem_collate")
+def _():
+    # NOTE: Referred from fn to remove the directory after the benchmark
+    tmpdir = tempfile.TemporaryDirectory()
+    d = Path(tmpdir.name)
+    with (d / "wav.scp").open("w") as f, (d / "text").open("w") as f2:
+        for i in range(32):
+            _write_wav(d / f"utt{i}.wav", np.random.randint(8000, 32000))
+            f.write(f"utt{i} {d / f'utt{i}.wav'}\n")
+            tokens = np.random.randint(0, 100, np.random.randint(10, 50))
+            f2.write(f"utt{i} {' '.join(map(str, tokens))}\n")
+    dataset = ESPnetDataset(
+        [(str(d / "wav.scp"), "speech", "sound"), (str(d / "text"), "text", "text_int")]
+    )
+    keys = [f"utt{i}" for i in range(32)]
+
+    def fn():
+        assert tmpdir is not None
+        for i in range(0, len(keys), 8):
+            common_collate_fn([dataset[k] for k in keys[i : i + 8]])
+
+    return fn
+
+
+def _register_sampler(type: str):
+    @register_benchmark(f"sampler/{type}")
+    def _():
+        tmpdir = tempfile.TemporaryDirectory()
+        shape_file = Path(tmpdir.name) / "speech_shape"
+        with shape_file.open("w") as f:
+            for i, length in enumerate(np.random.randint(1000, 300000, 10000)):
+                f.write(f"utt{i} {length}\n")
+
+        def fn():
+            assert tmpdir is not None
+            sampler = build_batch_sampler(
+                type=type,
+                batch_size=32,
+                batch_bins=4000000,
+                shape_files=[str(shape_file)],
+                fold_lengths=[160000],
+            )
+            list(sampler)
+
+        return fn
+
+
+for _type in ["sorted", "folded", "numel", "length"]:
+    _register_sampler(_type)
+
+
+@register_benchmark("preprocessor/rir_noise")
+def _():
+    tmpdir = tempfile.TemporaryDirectory()
+    d = Path(tmpdir.name)
+    for name, nsamples in [("rir", 4000), ("noise", 48000)]:
+        with (d / f"{name}.scp").open("w") as f:
+            for i in range(4):
+                _write_wav(d / f"{name}{i}.wav", nsamples)
+                f.write(f"{name}{i} {d / f'{name}{i}.wav'}\n")
+    preprocessor = CommonPreprocessor(
+        train=True, rir_scp=str(d / "rir.scp"), noise_scp=str(d / "noise.scp")
+    )
+    speech = np.random.uniform(-0.5, 0.5, 32000).astype(np.float32)
+
+    def fn():
+        assert tmpdir is not None
+        for _ in range(8):
+            preprocessor("utt", {"speech": speech})
+
+    return fn
+
+
+@register_benchmark("length_regulator")
+def _():
+    length_regulator = LengthRegulator()
+    xs = torch.randn(8, 100, 384)
+    ds = torch.randint(1, 10, (8, 100))
+
+    def fn():
+        with torch.no_grad():
+            length_regulator(xs, ds)
+
+    return fn
+
+
+@register_benchmark("spectrogram2waveform")
+def _():
+    spc2wav = Spectrogram2Waveform(
+        n_fft=1024, n_shift=256, fs=22050, n_mels=80, griffin_lim_iters=8
+    )
+    spc = np.random.randn(200, 80)
+
+    return lambda: spc2wav(spc)
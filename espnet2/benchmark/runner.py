@@ -0,0 +1,206 @@
+"""Measure the benchmarks and compare the results with a baseline."""
+
+from collections import OrderedDict
+import json
+import logging
+from pathlib import Path
+import platform
+import re
+import statistics
+import time
+from typing import Callable
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Union
+
+import numpy as np
+import torch
+from typeguard import check_argument_types
+
+from espnet2.torch_utils.set_all_random_seed import set_all_random_seed
+
+# name -> setup function returning the callable to be measured
+_benchmarks: Dict[str, Callable[[], Callable[[], None]]] = OrderedDict()
+
+
+def register_benchmark(name: str):
+    """Register the setup function of a benchmark.
+
+    The setup function builds the synthetic inputs and the modules,
+    which are not measured, and returns the callable to be measured.
+
+    Examples:
+        >>> @register_benchmark("attention/mha")
+        ... def _():
+        ...     att = MultiHeadedAttention(4, 256, 0.0).eval()
+        ...     x = torch.randn(4, 200, 256)
+        ...     return lambda: att(x, x, x, None)
+
+    """
+
+    def register(setup: Callable[[], Callable[[], None]]):
+        if name in _benchmarks:
+            raise RuntimeError(f"{name} is already registered")
+        _benchmarks[name] = setup
+        return setup
+
+    return register
+
+
+def get_benchmarks(pattern: Optional[str] = None) -> List[str]:
+    """Return the names of the registered benchmarks matching the regex."""
+    # NOTE: The benchmarks are registered on importing the module
+    import espnet2.benchmark.cases  # noqa
+
+    return [k for k in _benchmarks if pattern is None or re.search(pattern, k)]
+
+
+def measure(fn: Callable[[], None], warmup: int = 1, repeat: int = 5) -> dict:
+    """Measure the elapsed time of fn in seconds.
+
+    The median is used for the comparison because it's robust to the outliers,
+    e.g. the interruptions by the other processes.
+    """
+    assert check_argument_types()
+    for _ in range(warmup):
+        fn()
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return dict(
+        median=statistics.median(times),
+        mean=statistics.mean(times),
+        min=min(times),
+        max=max(times),
+        stdev=statistics.stdev(times) if len(times) > 1 else 0.0,
+        repeat=repeat,
+    )
+
+
+def environment() -> dict:
+    """The conditions affecting the results, which should match the baseline."""
+    return dict(
+        python=platform.python_version(),
+        torch=torch.__version__,
+        numpy=np.__version__,
+        machine=platform.machine(),
+        processor=platform.processor(),
+        num_threads=torch.get_num_threads(),
+    )
+
+
+def run_benchmarks(
+    names: List[str],
+    warmup: int = 1,
+    repeat: int = 5,
+    num_threads: int = 1,
+    seed: int = 0,
+) -> dict:
+    """Run the benchmarks on CPU.
+
+    The failed benchmarks, e.g. due to the missing optional dependencies,
+    are recorded as the errors instead of stopping the others.
+    """
+    assert check_argument_types()
+    torch.set_num_threads(num_threads)
+    results = OrderedDict()
+    get_benchmarks()
+    for name in names:
+        # The same inputs in every run
+        set_all_random_seed(seed)
+        # NOTE: Suppress the logs of the measured code, e.g. BeamSearch
+        logging.disable(logging.INFO)
+        try:
+            fn = _benchmarks[name]()
+            results[name] = measure(fn, warmup=warmup, repeat=repeat)
+        except Exception as e:
+            results[name] = dict(error=f"{type(e).__name__}: {e}")
+        finally:
+            logging.disable(logging.NOTSET)
+        if "error" in results[name]:
+            logging.warning(f"{name} failed: {results[name]['error']}")
+            continue
+        logging.info(
+            f"{name}: median={results[name]['median'] * 1000:.3f} ms, "
+            f"stdev={results[name]['stdev'] * 1000:.3f} ms"
+        )
+    return dict(environment=environment(), results=results)
+
+
+def compare(current: dict, baseline: dict, threshold: float = 0.1) -> List[dict]:
+    """Compare the medians of the benchmarks with the baseline.
+
+    Args:
+        current: The output of run_benchmarks()
+        baseline: The output of run_benchmarks() stored in advance.
+            The threshold of each benchmark can be overwritten
+            by "thresholds": {name: float} in it.
+        threshold: The ratio of the slowdown regarded as the regression,
+            e.g. 0.1 means the median becomes 10% slower than the baseline
+
+    Returns:
+        List[dict]: name, current, baseline, ratio, and status for each benchmark.
+            status is "regression", "improvement", "same", "new", "missing",
+            or "error".
+
+    """
+    assert check_argument_types()
+    if current.get("environment") != baseline.get("environment"):
+        logging.warning(
+            "The environment is different from the baseline: "
+            f"{current.get('environment')} != {baseline.get('environment')}"
+        )
+    thresholds = baseline.get("thresholds", {})
+    cur, base = current["results"], baseline["results"]
+
+    rows = []
+    for name in list(cur) + [k for k in base if k not in cur]:
+        row = dict(name=name, current=None, baseline=None, ratio=None)
+        if name not in cur:
+            row["status"] = "missing"
+        elif "error" in cur[name]:
+            row["status"] = "error"
+        elif name not in base or "error" in base[name]:
+            row["current"] = cur[name]["median"]
+            row["status"] = "new"
+        else:
+            row.update(current=cur[name]["median"], baseline=base[name]["median"])
+            row["ratio"] = row["current"] / max(row["baseline"], 1e-12)
+            th = thresholds.get(name, threshold)
+            if row["ratio"] > 1 + th:
+                row["status"] = "regression"
+            elif row["ratio"] < 1 / (1 + th):
+                row["status"] = "improvement"
+            else:
+                row["status"] = "same"
+        rows.append(row)
+    return rows
+
+
+def format_comparison(rows: List[dict]) -> str:
+    def ms(v):
+        return "-" if v is None else f"{v * 1000:.3f}"
+
+    width = max([len(r["name"]) for r in rows] + [4])
+    lines = [f"{'name':<{width}}  {'current[ms]':>12}  {'baseline[ms]':>12}  ratio"]
+    for r in rows:
+        ratio = "-" if r["ratio"] is None else f"{r['ratio']:.3f}"
+        lines.append(
+            f"{r['name']:<{width}}  {ms(r['current']):>12}  {ms(r['baseline']):>12}  "
+            f"{ratio} {r['status']}"
+        )
+    return "\n".join(lines)
+
+
+def load_results(path: Union[Path, str]) -> dict:
+    with Path(path).open("r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_results(results: dict, path: Union[Path, str]):
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    with Path(path).open("w", encoding="utf-8") as f:
+        json.dump(results, f, indent=4)
@@ -9,6 +9,12 @@ from typing import Union
 import numpy as np
 
 from espnet.utils.cli_utils import get_commandline_args
+from espnet2.fileio.packed_array import PackedArrayReader
+from espnet2.fileio.packed_array import PackedArrayWriter
+from espnet2.fileio.text_index import write_text_index
+from espnet2.main_funcs.collect_stats import load_stats
+from espnet2.main_funcs.collect_stats import merge_stats
+from espnet2.main_funcs.collect_stats import save_stats
 
 
 def aggregate_stats_dirs(
@@ -46,21 +52,31 @@ def aggregate_stats_dirs(
                         lines = sorted(lines, key=lambda x: x.split()[0])
                         for line in lines:
                             fout.write(line)
+            write_text_index(output_dir / mode / f"{key}_shape")
 
         for key in stats_keys:
             if not skip_sum_stats:
-                sum_stats = None
+                # Merge the float64 mean and M2 of the jobs one by one
+                # and add up the sum and the square sum as they are
+                sum_stats = (0, np.float64(0), np.float64(0))
+                sums = (0, 0)
                 for idir in input_dirs:
-                    stats = np.load(idir / mode / f"{key}_stats.npz")
-                    if sum_stats is None:
-                        sum_stats = dict(**stats)
-                    else:
-                        for k in stats:
-                            sum_stats[k] += stats[k]
+                    with np.load(idir / mode / f"{key}_stats.npz") as stats:
+                        sum_stats = merge_stats(sum_stats, load_stats(stats))
+                        sums = (sums[0] + stats["sum"], sums[1] + stats["sum_square"])
 
-                np.savez(output_dir / mode / f"{key}_stats.npz", **sum_stats)
+                save_stats(output_dir / mode / f"{key}_stats.npz", sum_stats, sums)
 
             # if --write_collected_feats=true
+            p = Path(mode) / "collect_feats" / key
+            if (input_dirs[0] / p / "meta.json").exists():
+                with PackedArrayWriter(output_dir / p) as writer:
+                    for idir in input_dirs:
+                        reader = PackedArrayReader(idir / p)
+                        for k in reader:
+                            writer[k] = reader[k]
+
+            # if --write_collected_feats=true --collected_feats_format=npy
             p = Path(mode) / "collect_feats" / f"{key}.scp"
             scp = input_dirs[0] / p
             if scp.exists():
@@ -8,6 +8,7 @@ from typing import Sequence
 from typing import Tuple
 from typing import Union
 
+import humanfriendly
 import numpy as np
 import torch
 from typeguard import check_argument_types
@@ -23,12 +24,19 @@ from espnet.nets.scorer_interface import BatchScorerInterface
 from espnet.nets.scorers.ctc import CTCPrefixScorer
 from espnet.nets.scorers.length_bonus import LengthBonus
 from espnet.utils.cli_utils import get_commandline_args
+from espnet.utils.profiling import span
+from espnet.utils.profiling import SpanTimer
+from espnet.utils.profiling import StepProfiler
+from espnet.utils.profiling import ThroughputMeter
 from espnet2.fileio.datadir_writer import DatadirWriter
+from espnet2.samplers.inference_batch_sampler import InferenceBatchSampler
 from espnet2.tasks.asr import ASRTask
 from espnet2.tasks.lm import LMTask
 from espnet2.text.build_tokenizer import build_tokenizer
 from espnet2.text.token_id_converter import TokenIDConverter
 from espnet2.torch_utils.device_funcs import to_device
+from espnet2.torch_utils.forked_inference import forked_inference
+from espnet2.torch_utils.freeze_for_inference import freeze_for_inference
 from espnet2.torch_utils.set_all_random_seed import set_all_random_seed
 from espnet2.utils import config_argparse
 from espnet2.utils.types import str2bool
@@ -76,6 +84,8 @@ class Speech2Text:
             asr_train_config, asr_model_file, device
         )
         asr_model.to(dtype=getattr(torch, dtype)).eval()
+        # e.g. Fold GlobalMVN into the frontend and precompute the sinc filters
+        freeze_for_inference(asr_model)
 
         decoder = asr_model.decoder
         ctc = CTCPrefixScorer(ctc=asr_model.ctc, eos=asr_model.eos)
@@ -191,16 +201,56 @@ class Speech2Text:
         batch = {"speech": speech, "speech_lengths": lengths}
 
         # a. To device
-        batch = to_device(batch, device=self.device)
+        with span("h2d"):
+            batch = to_device(batch, device=self.device)
 
         # b. Forward Encoder
         enc, _ = self.asr_model.encode(**batch)
         assert len(enc) == 1, len(enc)
 
         # c. Passed the encoder result and the beam search
-        nbest_hyps = self.beam_search(
-            x=enc[0], maxlenratio=self.maxlenratio, minlenratio=self.minlenratio
-        )
+        return self._decode(enc[0])
+
+    @torch.no_grad()
+    def batch_inference(
+        self,
+        speech: Union[torch.Tensor, np.ndarray],
+        speech_lengths: Union[torch.Tensor, np.ndarray],
+    ) -> List[List[Tuple[Optional[str], List[str], List[int], Hypothesis]]]:
+        """Inference for the padded utterances of different lengths
+
+        The encoder is forwarded for the mini-batch at once,
+        while the beam search is performed for each utterance.
+
+        Args:
+            speech: Input speech data (Batch, Nsamples)
+            speech_lengths: The lengths of the utterances (Batch,)
+        Returns:
+            [[(text, token, token_int, hyp), ...], ...] for each utterance
+
+        """
+        assert check_argument_types()
+        speech = torch.as_tensor(speech).to(getattr(torch, self.dtype))
+        lengths = torch.as_tensor(speech_lengths).long()
+        batch = {"speech": speech, "speech_lengths": lengths}
+
+        # a. To device
+        with span("h2d"):
+            batch = to_device(batch, device=self.device)
+
+        # b. Forward Encoder
+        enc, enc_lens = self.asr_model.encode(**batch)
+
+        # c. Passed the encoder result without the padded frames and the beam search
+        return [self._decode(e[:length]) for e, length in zip(enc, enc_lens.tolist())]
+
+    def _decode(
+        self, enc: torch.Tensor
+    ) -> List[Tuple[Optional[str], List[str], List[int], Hypothesis]]:
+        with span("beam_search"):
+            nbest_hyps = self.beam_search(
+                x=enc, maxlenratio=self.maxlenratio, minlenratio=self.minlenratio
+            )
         nbest_hyps = nbest_hyps[: self.nbest]
 
         results = []
@@ -253,14 +303,20 @@ def inference(
     bpemodel: Optional[str],
     allow_variable_data_keys: bool,
     streaming: bool,
+    shape_file: Sequence[str],
+    batch_bins: int,
+    nj: int,
+    num_threads: int,
+    profile_spans: bool,
+    profile_window: Optional[Sequence[int]],
 ):
     assert check_argument_types()
-    if batch_size > 1:
-        raise NotImplementedError("batch decoding is not implemented")
     if word_lm_train_config is not None:
         raise NotImplementedError("Word LM is not implemented")
     if ngpu > 1:
         raise NotImplementedError("only single GPU decoding is supported")
+    if ngpu >= 1 and nj > 1:
+        raise NotImplementedError("--nj > 1 is supported only for CPU decoding")
 
     logging.basicConfig(
         level=log_level,
@@ -274,6 +330,9 @@ def inference(
 
     # 1. Set random-seed
     set_all_random_seed(seed)
+    if nj > 1:
+        # NOTE: Only the forked processes use multiple threads
+        torch.set_num_threads(1)
 
     # 2. Build speech2text
     speech2text = Speech2Text(
@@ -306,39 +365,105 @@ def inference(
         collate_fn=ASRTask.build_collate_fn(speech2text.asr_train_args, False),
         allow_variable_data_keys=allow_variable_data_keys,
         inference=True,
+        shape_files=shape_file,
+        batch_bins=batch_bins,
     )
+    if isinstance(loader.batch_sampler, InferenceBatchSampler):
+        logging.info(f"Padding efficiency: {loader.batch_sampler.padding_efficiency}")
+        # Restore the order of the inputs in the outputs
+        key_order = loader.batch_sampler.keys
+    else:
+        key_order = None
 
-    # 7 .Start for-loop
-    # FIXME(kamo): The output format should be discussed about
-    with DatadirWriter(output_dir) as writer:
-        for keys, batch in loader:
-            assert isinstance(batch, dict), type(batch)
-            assert all(isinstance(s, str) for s in keys), keys
-            _bs = len(next(iter(batch.values())))
-            assert len(keys) == _bs, f"{len(keys)} != {_bs}"
-            batch = {k: v[0] for k, v in batch.items() if not k.endswith("_lengths")}
-
-            # N-best list of (text, token, token_int, hyp_object)
-            try:
-                results = speech2text(**batch)
-            except TooShortUttError as e:
-                logging.warning(f"Utterance {keys} {e}")
-                hyp = Hypothesis(score=0.0, scores={}, states={}, yseq=[])
-                results = [[" ", ["<space>"], [2], hyp]] * nbest
+    # The sampling rate of the raw speech to derive the real time factor
+    fs = None
+    if speech2text.asr_model.frontend is not None:
+        fs = speech2text.asr_train_args.frontend_conf.get("fs", 16000)
+        if isinstance(fs, str):
+            fs = humanfriendly.parse_size(fs)
 
-            # Only supporting batch_size==1
-            key = keys[0]
-            for n, (text, token, token_int, hyp) in zip(range(1, nbest + 1), results):
-                # Create a directory: outdir/{n}best_recog
-                ibest_writer = writer[f"{n}best_recog"]
+    def decode(keys: List[str], batch: dict) -> Tuple[Optional[float], List[list]]:
+        """Return the duration in seconds and the N-best list for each utterance
 
-                # Write the result to each file
-                ibest_writer["token"][key] = " ".join(token)
-                ibest_writer["token_int"][key] = " ".join(map(str, token_int))
-                ibest_writer["score"][key] = str(hyp.score)
+        The N-best list consists of (text, token, token_int, score).
+        """
+        assert isinstance(batch, dict), type(batch)
+        assert all(isinstance(s, str) for s in keys), keys
+        _bs = len(next(iter(batch.values())))
+        assert len(keys) == _bs, f"{len(keys)} != {_bs}"
+
+        try:
+            batch_results = speech2text.batch_inference(
+                batch["speech"], batch["speech_lengths"]
+            )
+        except TooShortUttError as e:
+            if len(keys) > 1:
+                # Decode one by one to find the too short utterances
+                batch_results = []
+                for key, speech, length in zip(
+                    keys, batch["speech"], batch["speech_lengths"]
+                ):
+                    try:
+                        batch_results.append(speech2text(speech[:length]))
+                    except TooShortUttError as e:
+                        logging.warning(f"Utterance {key} {e}")
+                        hyp = Hypothesis(score=0.0, scores={}, states={}, yseq=[])
+                        batch_results.append([[" ", ["<space>"], [2], hyp]] * nbest)
+            else:
+                logging.warning(f"Utterance {keys} {e}")
+                hyp = Hypothesis(score=0.0, scores={}, states={}, yseq=[])
+                batch_results = [[[" ", ["<space>"], [2], hyp]] * nbest]
+
+        duration = None
+        if fs is not None:
+            duration = batch["speech_lengths"].sum().item() / fs
+        # NOTE: The hypothesis objects are not returned to the parent process
+        return duration, [
+            [
+                (text, token, token_int, str(hyp.score))
+                for text, token, token_int, hyp in results
+            ]
+            for results in batch_results
+        ]
 
-                if text is not None:
-                    ibest_writer["text"][key] = text
+    # 7 .Start for-loop
+    # FIXME(kamo): The output format should be discussed about
+    timer = SpanTimer(synchronize=device == "cuda", enabled=profile_spans)
+    profiler = None
+    if profile_window is not None:
+        profiler = StepProfiler(
+            Path(output_dir) / "profile/trace.json",
+            *profile_window,
+            use_cuda=device == "cuda",
+        )
+    meter = ThroughputMeter()
+    with DatadirWriter(output_dir, key_order=key_order) as writer:
+        for keys, (duration, batch_results) in timer.iterate(
+            forked_inference(loader, decode, nj=nj, num_threads=num_threads)
+        ):
+            meter.add(len(keys), duration)
+            if profiler is not None:
+                profiler.step()
+            for key, results in zip(keys, batch_results):
+                for n, (text, token, token_int, score) in zip(
+                    range(1, nbest + 1), results
+                ):
+                    # Create a directory: outdir/{n}best_recog
+                    ibest_writer = writer[f"{n}best_recog"]
+
+                    # Write the result to each file
+                    ibest_writer["token"][key] = " ".join(token)
+                    ibest_writer["token_int"][key] = " ".join(map(str, token_int))
+                    ibest_writer["score"][key] = score
+
+                    if text is not None:
+                        ibest_writer["text"][key] = text
+
+    if profiler is not None:
+        profiler.close()
+    if profile_spans:
+        logging.info(timer.log_message())
+    logging.info(meter.log_message())
 
 
 def get_parser():
@@ -377,6 +502,36 @@ def get_parser():
         default=1,
         help="The number of workers used for DataLoader",
     )
+    parser.add_argument(
+        "--nj",
+        type=int,
+        default=1,
+        help="The number of the processes forked after loading the model. "
+        "The utterances are given to the idle ones from the longest, "
+        "which requires --shape_file. Only for CPU decoding",
+    )
+    parser.add_argument(
+        "--num_threads",
+        type=int,
+        default=1,
+        help="The number of the intra-op threads of each process if nj > 1",
+    )
+    parser.add_argument(
+        "--profile_spans",
+        type=str2bool,
+        default=False,
+        help="Log the time of the named spans in the hot paths, e.g. encoder. "
+        "Only measured in this process, i.e. nj = 1",
+    )
+    parser.add_argument(
+        "--profile_window",
+        type=int,
+        nargs=2,
+        default=None,
+        help="Capture the profile of torch.profiler for the mini-batches "
+        "[START, START + NUM) and write it as Chrome trace to "
+        '"{output_dir}/profile/trace.json". Only for nj = 1',
+    )
 
     group = parser.add_argument_group("Input data related")
     group.add_argument(
@@ -387,6 +542,15 @@ def get_parser():
     )
     group.add_argument("--key_file", type=str_or_none)
     group.add_argument("--allow_variable_data_keys", type=str2bool, default=False)
+    group.add_argument(
+        "--shape_file",
+        type=str,
+        action="append",
+        default=[],
+        help="The shape files of the inputs, e.g. speech_shape. If given, "
+        "the utterances of similar lengths are batched together "
+        "and the outputs are written in the original order",
+    )
 
     group = parser.add_argument_group("The model configuration related")
     group.add_argument("--asr_train_config", type=str, required=True)
@@ -401,7 +565,16 @@ def get_parser():
         "--batch_size",
         type=int,
         default=1,
-        help="The batch size for inference",
+        help="The batch size for inference. The encoder is forwarded "
+        "for the mini-batch at once, while the beam search is performed "
+        "for each utterance",
+    )
+    group.add_argument(
+        "--batch_bins",
+        type=int,
+        default=0,
+        help="The maximum of batch_size x max_length in a mini-batch instead of "
+        "--batch_size. This requires --shape_file",
     )
     group.add_argument("--nbest", type=int, default=1, help="Output N-best hypotheses")
     group.add_argument("--beam_size", type=int, default=20, help="Beam size")
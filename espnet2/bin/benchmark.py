@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+import argparse
+import logging
+import sys
+from typing import Optional
+from typing import Union
+
+from typeguard import check_argument_types
+
+from espnet.utils.cli_utils import get_commandline_args
+from espnet2.benchmark.runner import compare
+from espnet2.benchmark.runner import format_comparison
+from espnet2.benchmark.runner import get_benchmarks
+from espnet2.benchmark.runner import load_results
+from espnet2.benchmark.runner import run_benchmarks
+from espnet2.benchmark.runner import save_results
+from espnet2.utils.types import str_or_none
+
+
+def benchmark(
+    filter: Optional[str],
+    list_only: bool,
+    warmup: int,
+    repeat: int,
+    num_threads: int,
+    seed: int,
+    output_file: Optional[str],
+    baseline: Optional[str],
+    threshold: float,
+    log_level: Union[int, str],
+):
+    """Run the CPU benchmarks of the hot paths with the synthetic inputs.
+
+    The baseline is the output_file of the previous run on the same machine,
+    e.g. before the change to be verified.
+    """
+    assert check_argument_types()
+    logging.basicConfig(
+        level=log_level,
+        format="%(asctime)s (%(module)s:%(lineno)d) %(levelname)s: %(message)s",
+    )
+    names = get_benchmarks(filter)
+    if list_only:
+        for name in names:
+            print(name)
+        return None
+    if len(names) == 0:
+        raise RuntimeError(f"No benchmarks match {filter}")
+
+    results = run_benchmarks(
+        names, warmup=warmup, repeat=repeat, num_threads=num_threads, seed=seed
+    )
+    if output_file is not None:
+        save_results(results, output_file)
+        logging.info(f"Wrote the results to {output_file}")
+
+    if baseline is None:
+        return results
+    rows = compare(results, load_results(baseline), threshold=threshold)
+    print(format_comparison(rows))
+    regressions = [r["name"] for r in rows if r["status"] == "regression"]
+    if len(regressions) > 0:
+        raise RuntimeError(f"The benchmarks regressed: {regressions}")
+    return results
+
+
+def get_parser():
+    parser = argparse.ArgumentParser(
+        description="Run the CPU benchmarks and compare them with the baseline",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+    parser.add_argument(
+        "--log_level",
+        type=lambda x: x.upper(),
+        default="INFO",
+        choices=("CRITICAL", "ERROR", "WARNING", "INFO", "DEBUG", "NOTSET"),
+        help="The verbose level of logging",
+    )
+    parser.add_argument(
+        "--filter",
+        type=str_or_none,
+        default=None,
+        help="Run the benchmarks whose names match this regular expression",
+    )
+    parser.add_argument(
+        "--list",
+        dest="list_only",
+        action="store_true",
+        help="Print the names of the benchmarks without running them",
+    )
+    parser.add_argument(
+        "--warmup", type=int, default=1, help="The number of the warm-up runs"
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=5, help="The number of the measured runs"
+    )
+    parser.add_argument(
+        "--num_threads",
+        type=int,
+        default=1,
+        help="The number of the intra-op threads of torch",
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    parser.add_argument(
+        "--output_file",
+        type=str_or_none,
+        default=None,
+        help="Write the results as json, which can be used as the baseline",
+    )
+    parser.add_argument(
+        "--baseline",
+        type=str_or_none,
+        default=None,
+        help="The json of the previous results to be compared with",
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.1,
+        help="Raise an error if the median of a benchmark becomes slower "
+        "than the baseline by this ratio. It can be overwritten for each "
+        'benchmark by "thresholds": {name: ratio} in the baseline json',
+    )
+    return parser
+
+
+def main(cmd=None):
+    print(get_commandline_args(), file=sys.stderr)
+    parser = get_parser()
+    args = parser.parse_args(cmd)
+    kwargs = vars(args)
+    benchmark(**kwargs)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+import argparse
+import logging
+import sys
+from typing import List
+
+from espnet.utils.cli_utils import get_commandline_args
+from espnet2.fileio.text_index import write_text_index
+
+
+def build_text_index(input: List[str], log_level: str):
+    logging.basicConfig(
+        level=log_level,
+        format="%(asctime)s (%(module)s:%(lineno)d) %(levelname)s: %(message)s",
+    )
+    for path in input:
+        index_dir = write_text_index(path)
+        logging.info(f"Wrote {index_dir}")
+
+
+def get_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description='Write the binary index of 2 column text files as "{input}.idx", '
+        "e.g. wav.scp, text, or shape files, "
+        "which is memory-mapped instead of parsing the text files",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+    parser.add_argument(
+        "--log_level",
+        type=lambda x: x.upper(),
+        default="INFO",
+        choices=("CRITICAL", "ERROR", "WARNING", "INFO", "DEBUG", "NOTSET"),
+        help="The verbose level of logging",
+    )
+    parser.add_argument(
+        "--input", action="append", required=True, help="Input text files"
+    )
+    return parser
+
+
+def main(cmd=None):
+    print(get_commandline_args(), file=sys.stderr)
+    parser = get_parser()
+    args = parser.parse_args(cmd)
+    kwargs = vars(args)
+    build_text_index(**kwargs)
+
+
+if __name__ == "__main__":
+    main()
@@ -16,7 +16,9 @@ from tqdm import trange
 from typeguard import check_argument_types
 
 from espnet.utils.cli_utils import get_commandline_args
+from espnet2.fileio.datadir_writer import sort_lines_by_keys
 from espnet2.fileio.npy_scp import NpyScpWriter
+from espnet2.samplers.inference_batch_sampler import InferenceBatchSampler
 from espnet2.tasks.diar import DiarizationTask
 from espnet2.torch_utils.device_funcs import to_device
 from espnet2.torch_utils.set_all_random_seed import set_all_random_seed
@@ -159,6 +161,50 @@ class DiarizeSpeech:
 
         return spk_prediction
 
+    @torch.no_grad()
+    def batch_inference(
+        self,
+        speech: Union[torch.Tensor, np.ndarray],
+        speech_lengths: Union[torch.Tensor, np.ndarray],
+        fs: int = 8000,
+    ) -> List[np.ndarray]:
+        """Inference for the padded utterances of different lengths
+
+        Args:
+            speech: Input speech data (Batch, Nsamples [, Channels])
+            speech_lengths: The lengths of the utterances (Batch,)
+            fs: sample rate
+        Returns:
+            [speaker_info1, speaker_info2, ...] (NFrames, num_spk) for each utterance
+
+        """
+        assert check_argument_types()
+        speech = torch.as_tensor(speech)
+        lengths = torch.as_tensor(speech_lengths).long()
+
+        if self.segmenting:
+            # NOTE: The segment-wise processing assumes the same length in a batch
+            return [
+                self(speech[b : b + 1, :length], fs=fs)[0]
+                for b, length in enumerate(lengths.tolist())
+            ]
+
+        speech = to_device(speech.to(getattr(torch, self.dtype)), device=self.device)
+        lengths = to_device(lengths, device=self.device)
+        encoder_out, encoder_out_lens = self.diar_model.encode(speech, lengths)
+        spk_prediction = self.diar_model.decoder(encoder_out, encoder_out_lens)
+        assert spk_prediction.size(2) == self.num_spk, (
+            spk_prediction.size(2),
+            self.num_spk,
+        )
+        spk_prediction = spk_prediction.cpu().numpy()
+        spk_prediction = 1 / (1 + np.exp(-spk_prediction))
+
+        # Remove the padded frames
+        return [
+            p[:length] for p, length in zip(spk_prediction, encoder_out_lens.tolist())
+        ]
+
 
 def inference(
     output_dir: str,
@@ -176,10 +222,10 @@ def inference(
     allow_variable_data_keys: bool,
     segment_size: Optional[float],
     show_progressbar: bool,
+    shape_file: Sequence[str],
+    batch_bins: int,
 ):
     assert check_argument_types()
-    if batch_size > 1:
-        raise NotImplementedError("batch decoding is not implemented")
     if ngpu > 1:
         raise NotImplementedError("only single GPU decoding is supported")
 
@@ -221,6 +267,8 @@ def inference(
         ),
         allow_variable_data_keys=allow_variable_data_keys,
         inference=True,
+        shape_files=shape_file,
+        batch_bins=batch_bins,
     )
 
     # 4. Start for-loop
@@ -231,14 +279,21 @@ def inference(
         assert all(isinstance(s, str) for s in keys), keys
         _bs = len(next(iter(batch.values())))
         assert len(keys) == _bs, f"{len(keys)} != {_bs}"
-        batch = {k: v for k, v in batch.items() if not k.endswith("_lengths")}
 
-        spk_predictions = diarize_speech(**batch)
-        for b in range(batch_size):
-            writer[keys[b]] = spk_predictions[b]
+        # The utterances are padded to the longest one in the mini-batch
+        spk_predictions = diarize_speech.batch_inference(
+            batch["speech"], batch["speech_lengths"]
+        )
+        for key, spk_prediction in zip(keys, spk_predictions):
+            writer[key] = spk_prediction
 
     writer.close()
 
+    if isinstance(loader.batch_sampler, InferenceBatchSampler):
+        logging.info(f"Padding efficiency: {loader.batch_sampler.padding_efficiency}")
+        # Restore the order of the inputs
+        sort_lines_by_keys(f"{output_dir}/diarize.scp", loader.batch_sampler.keys)
+
 
 def get_parser():
     parser = config_argparse.ArgumentParser(
@@ -292,6 +347,15 @@ def get_parser():
     )
     group.add_argument("--key_file", type=str_or_none)
     group.add_argument("--allow_variable_data_keys", type=str2bool, default=False)
+    group.add_argument(
+        "--shape_file",
+        type=str,
+        action="append",
+        default=[],
+        help="The shape files of the inputs, e.g. speech_shape. If given, "
+        "the utterances of similar lengths are batched together "
+        "and the outputs are written in the original order",
+    )
 
     group = parser.add_argument_group("The model configuration related")
     group.add_argument("--diar_train_config", type=str, required=True)
@@ -304,6 +368,13 @@ def get_parser():
         default=1,
         help="The batch size for inference",
     )
+    group.add_argument(
+        "--batch_bins",
+        type=int,
+        default=0,
+        help="The maximum of batch_size x max_length in a mini-batch instead of "
+        "--batch_size. This requires --shape_file",
+    )
     group = parser.add_argument_group("Diarize speech related")
     group.add_argument(
         "--segment_size",
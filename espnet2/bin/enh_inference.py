@@ -16,9 +16,16 @@ from tqdm import trange
 from typeguard import check_argument_types
 
 from espnet.utils.cli_utils import get_commandline_args
+from espnet.utils.profiling import span
+from espnet.utils.profiling import SpanTimer
+from espnet.utils.profiling import StepProfiler
+from espnet.utils.profiling import ThroughputMeter
+from espnet2.fileio.datadir_writer import sort_lines_by_keys
 from espnet2.fileio.sound_scp import SoundScpWriter
+from espnet2.samplers.inference_batch_sampler import InferenceBatchSampler
 from espnet2.tasks.enh import EnhancementTask
 from espnet2.torch_utils.device_funcs import to_device
+from espnet2.torch_utils.forked_inference import forked_inference
 from espnet2.torch_utils.set_all_random_seed import set_all_random_seed
 from espnet2.utils import config_argparse
 from espnet2.utils.types import str2bool
@@ -223,6 +230,55 @@ class SeparateSpeech:
 
         return waves
 
+    @torch.no_grad()
+    def batch_inference(
+        self,
+        speech_mix: Union[torch.Tensor, np.ndarray],
+        speech_mix_lengths: Union[torch.Tensor, np.ndarray],
+        fs: int = 8000,
+    ) -> List[List[np.ndarray]]:
+        """Inference for the padded utterances of different lengths
+
+        Args:
+            speech_mix: Input speech data (Batch, Nsamples [, Channels])
+            speech_mix_lengths: The lengths of the utterances (Batch,)
+            fs: sample rate
+        Returns:
+            [[separated_audio1, separated_audio2, ...], ...] for each utterance
+
+        """
+        assert check_argument_types()
+        speech_mix = torch.as_tensor(speech_mix)
+        lengths = torch.as_tensor(speech_mix_lengths).long()
+
+        if self.segmenting:
+            # NOTE: The segment-wise processing assumes the same length in a batch
+            return [
+                [w[0] for w in self(speech_mix[b : b + 1, :length], fs=fs)]
+                for b, length in enumerate(lengths.tolist())
+            ]
+
+        speech_mix = speech_mix.to(getattr(torch, self.dtype))
+        with span("h2d"):
+            speech_mix = to_device(speech_mix, device=self.device)
+            lengths = to_device(lengths, device=self.device)
+        with span("encoder"):
+            feats, f_lens = self.enh_model.encoder(speech_mix, lengths)
+        with span("separator"):
+            feats, _, _ = self.enh_model.separator(feats, f_lens)
+        with span("decoder"):
+            waves = [self.enh_model.decoder(f, lengths)[0] for f in feats]
+        assert len(waves) == self.num_spk, len(waves) == self.num_spk
+
+        results = []
+        for b, length in enumerate(lengths.tolist()):
+            # Remove the padded part: (Nsamples,)
+            wavs = [w[b, :length] for w in waves]
+            if self.normalize_output_wav:
+                wavs = [w / abs(w).max() * 0.9 for w in wavs]
+            results.append([w.cpu().numpy() for w in wavs])
+        return results
+
     @staticmethod
     @torch.no_grad()
     def normalize_scale(enh_wav, ref_ch_wav):
@@ -288,12 +344,18 @@ def inference(
     show_progressbar: bool,
     ref_channel: Optional[int],
     normalize_output_wav: bool,
+    shape_file: Sequence[str],
+    batch_bins: int,
+    nj: int,
+    num_threads: int,
+    profile_spans: bool,
+    profile_window: Optional[Sequence[int]],
 ):
     assert check_argument_types()
-    if batch_size > 1:
-        raise NotImplementedError("batch decoding is not implemented")
     if ngpu > 1:
         raise NotImplementedError("only single GPU decoding is supported")
+    if ngpu >= 1 and nj > 1:
+        raise NotImplementedError("--nj > 1 is supported only for CPU decoding")
 
     logging.basicConfig(
         level=log_level,
@@ -307,6 +369,9 @@ def inference(
 
     # 1. Set random-seed
     set_all_random_seed(seed)
+    if nj > 1:
+        # NOTE: Only the forked processes use multiple threads
+        torch.set_num_threads(1)
 
     # 2. Build separate_speech
     separate_speech = SeparateSpeech(
@@ -337,6 +402,8 @@ def inference(
         ),
         allow_variable_data_keys=allow_variable_data_keys,
         inference=True,
+        shape_files=shape_file,
+        batch_bins=batch_bins,
     )
 
     # 4. Start for-loop
@@ -346,21 +413,53 @@ def inference(
             SoundScpWriter(f"{output_dir}/wavs/{i + 1}", f"{output_dir}/spk{i + 1}.scp")
         )
 
-    for keys, batch in loader:
+    def separate(keys: List[str], batch: dict) -> List[List[np.ndarray]]:
         assert isinstance(batch, dict), type(batch)
         assert all(isinstance(s, str) for s in keys), keys
         _bs = len(next(iter(batch.values())))
         assert len(keys) == _bs, f"{len(keys)} != {_bs}"
-        batch = {k: v for k, v in batch.items() if not k.endswith("_lengths")}
 
-        waves = separate_speech(**batch)
-        for (spk, w) in enumerate(waves):
-            for b in range(batch_size):
-                writers[spk][keys[b]] = fs, w[b]
+        # The utterances are padded to the longest one in the mini-batch
+        return separate_speech.batch_inference(
+            batch["speech_mix"], batch["speech_mix_lengths"]
+        )
+
+    timer = SpanTimer(synchronize=device == "cuda", enabled=profile_spans)
+    profiler = None
+    if profile_window is not None:
+        profiler = StepProfiler(
+            Path(output_dir) / "profile/trace.json",
+            *profile_window,
+            use_cuda=device == "cuda",
+        )
+    meter = ThroughputMeter()
+    for keys, results in timer.iterate(
+        forked_inference(loader, separate, nj=nj, num_threads=num_threads)
+    ):
+        for key, waves in zip(keys, results):
+            for (spk, w) in enumerate(waves):
+                writers[spk][key] = fs, w
+            meter.add(1, len(waves[0]) / fs)
+        if profiler is not None:
+            profiler.step()
+
+    if profiler is not None:
+        profiler.close()
+    if profile_spans:
+        logging.info(timer.log_message())
+    logging.info(meter.log_message())
 
     for writer in writers:
         writer.close()
 
+    if isinstance(loader.batch_sampler, InferenceBatchSampler):
+        logging.info(f"Padding efficiency: {loader.batch_sampler.padding_efficiency}")
+        # Restore the order of the inputs
+        for i in range(separate_speech.num_spk):
+            sort_lines_by_keys(
+                f"{output_dir}/spk{i + 1}.scp", loader.batch_sampler.keys
+            )
+
 
 def get_parser():
     parser = config_argparse.ArgumentParser(
@@ -401,6 +500,36 @@ def get_parser():
         default=1,
         help="The number of workers used for DataLoader",
     )
+    parser.add_argument(
+        "--nj",
+        type=int,
+        default=1,
+        help="The number of the processes forked after loading the model. "
+        "The utterances are given to the idle ones from the longest, "
+        "which requires --shape_file. Only for CPU decoding",
+    )
+    parser.add_argument(
+        "--num_threads",
+        type=int,
+        default=1,
+        help="The number of the intra-op threads of each process if nj > 1",
+    )
+    parser.add_argument(
+        "--profile_spans",
+        type=str2bool,
+        default=False,
+        help="Log the time of the named spans in the hot paths, e.g. encoder. "
+        "Only measured in this process, i.e. nj = 1",
+    )
+    parser.add_argument(
+        "--profile_window",
+        type=int,
+        nargs=2,
+        default=None,
+        help="Capture the profile of torch.profiler for the mini-batches "
+        "[START, START + NUM) and write it as Chrome trace to "
+        '"{output_dir}/profile/trace.json". Only for nj = 1',
+    )
 
     group = parser.add_argument_group("Input data related")
     group.add_argument(
@@ -411,6 +540,15 @@ def get_parser():
     )
     group.add_argument("--key_file", type=str_or_none)
     group.add_argument("--allow_variable_data_keys", type=str2bool, default=False)
+    group.add_argument(
+        "--shape_file",
+        type=str,
+        action="append",
+        default=[],
+        help="The shape files of the inputs, e.g. speech_mix_shape. If given, "
+        "the utterances of similar lengths are batched together "
+        "and the outputs are written in the original order",
+    )
 
     group = parser.add_argument_group("Output data related")
     group.add_argument(
@@ -431,6 +569,13 @@ def get_parser():
         default=1,
         help="The batch size for inference",
     )
+    group.add_argument(
+        "--batch_bins",
+        type=int,
+        default=0,
+        help="The maximum of batch_size x max_length in a mini-batch instead of "
+        "--batch_size. This requires --shape_file",
+    )
     group = parser.add_argument_group("SeparateSpeech related")
     group.add_argument(
         "--segment_size",
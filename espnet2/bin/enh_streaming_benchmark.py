@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+import argparse
+import json
+import logging
+from pathlib import Path
+import sys
+import time
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Union
+
+import numpy as np
+import torch
+from typeguard import check_argument_types
+
+from espnet.utils.cli_utils import get_commandline_args
+from espnet2.enh.espnet_model import ESPnetEnhancementModel
+from espnet2.tasks.enh import EnhancementTask
+from espnet2.torch_utils.set_all_random_seed import set_all_random_seed
+from espnet2.utils.types import str_or_none
+
+
+def _synchronize(device: str):
+    if device.startswith("cuda"):
+        torch.cuda.synchronize()
+
+
+@torch.no_grad()
+def benchmark_streaming(
+    model: ESPnetEnhancementModel,
+    speech_mix: torch.Tensor,
+    fs: int,
+    chunk_size: int,
+) -> Dict[str, float]:
+    """Compare the streaming mode with the offline mode on the same mixture.
+
+    Args:
+        model: The enhancement model supporting forward_streaming()
+        speech_mix: The mixture (Batch, samples) on the device of the model
+        fs: The sampling rate to derive the real time factors
+        chunk_size: The number of the samples given at once in the streaming mode
+
+    Returns:
+        Dict[str, float]: The max absolute difference of the outputs,
+            the real time factors, and the processing time of each chunk
+
+    """
+    assert check_argument_types()
+    device = str(speech_mix.device)
+    batch_size, num_samples = speech_mix.shape
+    lengths = speech_mix.new_full((batch_size,), num_samples, dtype=torch.long)
+
+    # 1. Offline mode
+    _synchronize(device)
+    start = time.perf_counter()
+    feature_mix, flens = model.encoder(speech_mix, lengths)
+    feature_pre, flens, _ = model.separator(feature_mix, flens)
+    offline = [model.decoder(fp, lengths)[0] for fp in feature_pre]
+    _synchronize(device)
+    offline_time = time.perf_counter() - start
+
+    # 2. Streaming mode
+    states = None
+    outputs: List[List[torch.Tensor]] = [[] for _ in range(model.num_spk)]
+    chunk_times = []
+    for pos in range(0, num_samples, chunk_size):
+        start = time.perf_counter()
+        speech_pre, states = model.forward_streaming(
+            speech_mix[:, pos : pos + chunk_size],
+            states,
+            last=pos + chunk_size >= num_samples,
+        )
+        _synchronize(device)
+        chunk_times.append(time.perf_counter() - start)
+        for out, wav in zip(outputs, speech_pre):
+            out.append(wav)
+    streaming = [torch.cat(out, dim=1) for out in outputs]
+
+    # NOTE: The samples after the last frame are not emitted in the streaming mode
+    length = min(streaming[0].size(1), offline[0].size(1))
+    max_abs_diff = max(
+        float((off[:, :length] - st[:, :length]).abs().max())
+        for off, st in zip(offline, streaming)
+    )
+    duration = num_samples / fs
+    chunk_times = np.array(chunk_times)
+    return dict(
+        max_abs_diff=max_abs_diff,
+        offline_rtf=offline_time / duration,
+        streaming_rtf=chunk_times.sum() / duration,
+        chunk_duration_ms=chunk_size / fs * 1000,
+        chunk_latency_mean_ms=chunk_times.mean() * 1000,
+        chunk_latency_max_ms=chunk_times.max() * 1000,
+        num_chunks=len(chunk_times),
+    )
+
+
+def enh_streaming_benchmark(
+    enh_train_config: str,
+    enh_model_file: Optional[str],
+    fs: int,
+    duration: float,
+    chunk_size: int,
+    batch_size: int,
+    ngpu: int,
+    seed: int,
+    dtype: str,
+    tolerance: Optional[float],
+    output_file: Optional[str],
+    log_level: Union[int, str],
+):
+    """Measure the latency and the real time factor of the streaming mode.
+
+    The model is fed with a random mixture chunk by chunk and the outputs
+    are compared with the ones of the offline mode, which must be identical
+    for the causal models, e.g. TCNSeparator(causal=True, norm_type="cLN").
+    """
+    assert check_argument_types()
+    logging.basicConfig(
+        level=log_level,
+        format="%(asctime)s (%(module)s:%(lineno)d) %(levelname)s: %(message)s",
+    )
+    if ngpu > 1:
+        raise NotImplementedError("only single GPU benchmark is supported")
+    device = "cuda" if ngpu >= 1 else "cpu"
+    set_all_random_seed(seed)
+
+    model, _ = EnhancementTask.build_model_from_file(
+        enh_train_config, enh_model_file, device
+    )
+    model.to(dtype=getattr(torch, dtype)).eval()
+
+    speech_mix = torch.randn(
+        batch_size, int(fs * duration), dtype=getattr(torch, dtype), device=device
+    )
+    # Warming up, e.g. for the initialization of cuDNN
+    benchmark_streaming(model, speech_mix[:, :fs], fs, chunk_size)
+    results = benchmark_streaming(model, speech_mix, fs, chunk_size)
+    for k, v in results.items():
+        logging.info(f"{k}: {v}")
+
+    if output_file is not None:
+        Path(output_file).parent.mkdir(parents=True, exist_ok=True)
+        with Path(output_file).open("w", encoding="utf-8") as f:
+            json.dump(results, f, indent=4)
+    if tolerance is not None and results["max_abs_diff"] > tolerance:
+        raise RuntimeError(
+            "The streaming outputs are different from the offline ones: "
+            f"{results['max_abs_diff']} > {tolerance}"
+        )
+    return results
+
+
+def get_parser():
+    parser = argparse.ArgumentParser(
+        description="Benchmark the streaming mode of Speech Enhancement",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+    parser.add_argument(
+        "--log_level",
+        type=lambda x: x.upper(),
+        default="INFO",
+        choices=("CRITICAL", "ERROR", "WARNING", "INFO", "DEBUG", "NOTSET"),
+        help="The verbose level of logging",
+    )
+    parser.add_argument(
+        "--ngpu",
+        type=int,
+        default=0,
+        help="The number of gpus. 0 indicates CPU mode",
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    parser.add_argument(
+        "--dtype",
+        default="float32",
+        choices=["float16", "float32", "float64"],
+        help="Data type",
+    )
+
+    group = parser.add_argument_group("The model configuration related")
+    group.add_argument("--enh_train_config", type=str, required=True)
+    group.add_argument("--enh_model_file", type=str_or_none, default=None)
+
+    group = parser.add_argument_group("Benchmark related")
+    group.add_argument("--fs", type=int, default=8000, help="Sampling rate")
+    group.add_argument(
+        "--duration",
+        type=float,
+        default=10.0,
+        help="The duration of the random mixture in seconds",
+    )
+    group.add_argument(
+        "--chunk_size",
+        type=int,
+        default=160,
+        help="The number of the samples given at once in the streaming mode",
+    )
+    group.add_argument("--batch_size", type=int, default=1, help="The batch size")
+    group.add_argument(
+        "--tolerance",
+        type=float,
+        default=None,
+        help="Raise an error if the max absolute difference between "
+        "the streaming and the offline outputs exceeds this value",
+    )
+    group.add_argument(
+        "--output_file",
+        type=str_or_none,
+        default=None,
+        help="Write the results as json",
+    )
+    return parser
+
+
+def main(cmd=None):
+    print(get_commandline_args(), file=sys.stderr)
+    parser = get_parser()
+    args = parser.parse_args(cmd)
+    kwargs = vars(args)
+    enh_streaming_benchmark(**kwargs)
+
+
+if __name__ == "__main__":
+    main()
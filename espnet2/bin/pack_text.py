@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+import argparse
+import logging
+from pathlib import Path
+import sys
+from typing import List
+from typing import Optional
+
+import numpy as np
+from typeguard import check_argument_types
+
+from espnet.utils.cli_utils import get_commandline_args
+from espnet2.fileio.packed_text import PackedTextBlockReader
+from espnet2.fileio.packed_text import PackedTextWriter
+from espnet2.text.build_tokenizer import build_tokenizer
+from espnet2.text.cleaner import TextCleaner
+from espnet2.text.token_id_converter import TokenIDConverter
+from espnet2.utils.types import str2bool
+from espnet2.utils.types import str_or_none
+
+
+def pack_text(
+    input: str,
+    output_dir: str,
+    token_type: str,
+    token_list: str,
+    bpemodel: Optional[str],
+    non_linguistic_symbols: Optional[str],
+    cleaner: Optional[str],
+    g2p: Optional[str],
+    add_eos: bool,
+    block_size: List[int],
+    log_level: str,
+):
+    """Tokenize a text file and write it as a packed token corpus.
+
+    The output directory can be given to the dataset with the "packed_text" type
+    or the "packed_text_{block_size}" type, instead of the text file
+    with the "text" type.
+    """
+    assert check_argument_types()
+    logging.basicConfig(
+        level=log_level,
+        format="%(asctime)s (%(module)s:%(lineno)d) %(levelname)s: %(message)s",
+    )
+
+    text_cleaner = TextCleaner(cleaner)
+    tokenizer = build_tokenizer(
+        token_type=token_type,
+        bpemodel=bpemodel,
+        non_linguistic_symbols=non_linguistic_symbols,
+        g2p_type=g2p,
+    )
+    converter = TokenIDConverter(token_list=token_list)
+    # NOTE: The last token is <sos/eos> as ESPnetLanguageModel assumes
+    eos = converter.get_num_vocabulary_size() - 1 if add_eos else None
+
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    if input == "-":
+        fin = sys.stdin
+    else:
+        fin = Path(input).open("r", encoding="utf-8")
+
+    fshape = (output_dir / "text_shape").open("w", encoding="utf-8")
+    with PackedTextWriter(output_dir, eos=eos) as writer, fshape:
+        for line in fin:
+            sps = line.rstrip().split(maxsplit=1)
+            if len(sps) == 0:
+                continue
+            key = sps[0]
+            text = sps[1] if len(sps) == 2 else ""
+            tokens = tokenizer.text2tokens(text_cleaner(text))
+            text_ints = np.array(converter.tokens2ids(tokens), dtype=np.int32)
+            writer[key] = text_ints
+            fshape.write(f"{key} {len(text_ints)}\n")
+
+    # Write the shape files for the batch sampler in the block mode
+    for size in block_size:
+        reader = PackedTextBlockReader(output_dir, size)
+        with (output_dir / f"text_shape.block{size}").open(
+            "w", encoding="utf-8"
+        ) as fshape:
+            for key in reader:
+                fshape.write(f"{key} {reader.shape(key)}\n")
+    logging.info(f"Wrote {output_dir}")
+
+
+def get_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Tokenize texts and write them as a packed token corpus",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+    parser.add_argument(
+        "--log_level",
+        type=lambda x: x.upper(),
+        default="INFO",
+        choices=("CRITICAL", "ERROR", "WARNING", "INFO", "DEBUG", "NOTSET"),
+        help="The verbose level of logging",
+    )
+    parser.add_argument(
+        "--input",
+        "-i",
+        required=True,
+        help="Input text with the sentence ids. - indicates sys.stdin",
+    )
+    parser.add_argument("--output_dir", "-o", required=True, help="Output directory")
+    parser.add_argument(
+        "--token_type",
+        "-t",
+        default="char",
+        choices=["char", "bpe", "word", "phn"],
+        help="Token type",
+    )
+    parser.add_argument(
+        "--token_list", required=True, help="A text mapping int-id to token"
+    )
+    parser.add_argument("--bpemodel", default=None, help="The bpemodel file path")
+    parser.add_argument(
+        "--non_linguistic_symbols",
+        type=str_or_none,
+        help="non_linguistic_symbols file path",
+    )
+    parser.add_argument(
+        "--cleaner",
+        type=str_or_none,
+        choices=[None, "tacotron", "jaconv", "vietnamese"],
+        default=None,
+        help="Apply text cleaning",
+    )
+    parser.add_argument(
+        "--g2p",
+        type=str_or_none,
+        default=None,
+        help="Specify g2p method if --token_type=phn",
+    )
+    parser.add_argument(
+        "--add_eos",
+        type=str2bool,
+        default=True,
+        help="Write <sos/eos> after each sentence to mark the sentence boundaries",
+    )
+    parser.add_argument(
+        "--block_size",
+        type=int,
+        default=[],
+        action="append",
+        help="Write the shape file for the packed_text_{block_size} type",
+    )
+    return parser
+
+
+def main(cmd=None):
+    print(get_commandline_args(), file=sys.stderr)
+    parser = get_parser()
+    args = parser.parse_args(cmd)
+    kwargs = vars(args)
+    pack_text(**kwargs)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,22 +1,83 @@
 #!/usr/bin/env python3
 import argparse
 from collections import Counter
+from collections import OrderedDict
+import heapq
 from itertools import zip_longest
 import logging
 from pathlib import Path
 import sys
+from typing import Dict
 from typing import List
 from typing import Optional
 
 from espnet.utils.cli_utils import get_commandline_args
 
 
+class _WriterPool:
+    """Keep at most "max_open_files" files opened to append lines."""
+
+    def __init__(self, max_open_files: int):
+        if max_open_files < 1:
+            raise ValueError(f"max_open_files must be 1 or more: {max_open_files}")
+        self.max_open_files = max_open_files
+        self.files = OrderedDict()
+
+    def write(self, path: Path, line: str):
+        f = self.files.pop(path, None)
+        if f is None:
+            if len(self.files) >= self.max_open_files:
+                _, oldest = self.files.popitem(last=False)
+                oldest.close()
+            f = path.open("a", encoding="utf-8")
+        self.files[path] = f
+        f.write(line)
+
+    def close(self):
+        for f in self.files.values():
+            f.close()
+        self.files.clear()
+
+
+def read_lengths(shape_file: str) -> Dict[str, int]:
+    """Read the first dimension of each shape, e.g. "uttidA 1000,80" -> 1000."""
+    lengths = {}
+    with open(shape_file, "r", encoding="utf-8") as f:
+        for line in f:
+            key, shape = line.rstrip().split(maxsplit=1)
+            lengths[key] = int(shape.split(",")[0])
+    return lengths
+
+
+def balance_splits(lengths: Dict[str, int], num_splits: int) -> Dict[str, int]:
+    """Assign the utterances to the splits to balance the total lengths.
+
+    The longest utterance is assigned first to the split having
+    the least total length so far, i.e. greedy bin packing.
+
+    Args:
+        lengths: The dict mapping the utterance id to its length.
+        num_splits: The number of splits.
+    Returns:
+        The dict mapping the utterance id to the split index.
+    """
+    heap = [(0, n) for n in range(num_splits)]
+    key2split = {}
+    for key in sorted(lengths, key=lambda k: -lengths[k]):
+        total, n = heapq.heappop(heap)
+        key2split[key] = n
+        heapq.heappush(heap, (total + lengths[key], n))
+    return key2split
+
+
 def split_scps(
     scps: List[str],
     num_splits: int,
     names: Optional[List[str]],
     output_dir: str,
     log_level: str,
+    shape_file: Optional[str] = None,
+    max_open_files: int = 256,
 ):
     logging.basicConfig(
         level=log_level,
@@ -33,6 +94,13 @@ def split_scps(
     for name in names:
         (Path(output_dir) / name).mkdir(parents=True, exist_ok=True)
 
+    if shape_file is not None:
+        key2length = read_lengths(shape_file)
+        key2split = balance_splits(key2length, num_splits)
+    else:
+        key2length = None
+        key2split = None
+
     scp_files = [open(s, "r", encoding="utf-8") for s in scps]
     # Remove existing files
     for n in range(num_splits):
@@ -41,27 +109,38 @@ def split_scps(
                 (Path(output_dir) / name / f"split.{n}").unlink()
 
     counter = Counter()
+    split_lengths = Counter()
     linenum = -1
-    for linenum, lines in enumerate(zip_longest(*scp_files)):
-        if any(line is None for line in lines):
-            raise RuntimeError("Number of lines are mismatched")
-
-        prev_key = None
-        for line in lines:
-            key = line.rstrip().split(maxsplit=1)[0]
-            if prev_key is not None and prev_key != key:
-                raise RuntimeError("Not sorted or not having same keys")
-
-        # Select a piece from split texts alternatively
-        num = linenum % num_splits
-        counter[num] += 1
-        # Write lines respectively
-        for line, name in zip(lines, names):
-            # To reduce the number of opened file descriptors, open now
-            with (Path(output_dir) / name / f"split.{num}").open(
-                "a", encoding="utf-8"
-            ) as f:
-                f.write(line)
+    writers = _WriterPool(max_open_files)
+    try:
+        for linenum, lines in enumerate(zip_longest(*scp_files)):
+            if any(line is None for line in lines):
+                raise RuntimeError("Number of lines are mismatched")
+
+            prev_key = None
+            for line in lines:
+                key = line.rstrip().split(maxsplit=1)[0]
+                if prev_key is not None and prev_key != key:
+                    raise RuntimeError("Not sorted or not having same keys")
+                prev_key = key
+
+            if key2split is None:
+                # Select a piece from split texts alternatively
+                num = linenum % num_splits
+            elif key in key2split:
+                num = key2split[key]
+            else:
+                raise RuntimeError(f"{key} is not found in {shape_file}")
+            counter[num] += 1
+            if key2length is not None:
+                split_lengths[num] += key2length[key]
+            # Write lines respectively
+            for line, name in zip(lines, names):
+                writers.write(Path(output_dir) / name / f"split.{num}", line)
+    finally:
+        writers.close()
+        for f in scp_files:
+            f.close()
 
     if linenum + 1 < num_splits:
         raise RuntimeError(
@@ -71,6 +150,17 @@ def split_scps(
     for name in names:
         with (Path(output_dir) / name / "num_splits").open("w", encoding="utf-8") as f:
             f.write(str(num_splits))
+        # e.g. "split.0 <num_lines> <total_length>"
+        # The total length is written only if the shape file is given.
+        # AbsTask.build_multiple_iter_factory uses it to share the cache size.
+        with (Path(output_dir) / name / "split_manifest").open(
+            "w", encoding="utf-8"
+        ) as f:
+            for n in range(num_splits):
+                if key2length is None:
+                    f.write(f"split.{n} {counter[n]}\n")
+                else:
+                    f.write(f"split.{n} {counter[n]} {split_lengths[n]}\n")
     logging.info(f"N lines of split text: {set(counter.values())}")
 
 
@@ -91,6 +181,17 @@ def get_parser() -> argparse.ArgumentParser:
     parser.add_argument("--names", help="Output names for each files", nargs="+")
     parser.add_argument("--num_splits", help="Split number", type=int)
     parser.add_argument("--output_dir", required=True, help="Output directory")
+    parser.add_argument(
+        "--shape_file",
+        help="Balance the total lengths of the splits using the shape file "
+        "instead of assigning the lines alternatively",
+    )
+    parser.add_argument(
+        "--max_open_files",
+        type=int,
+        default=256,
+        help="The maximum number of output files opened at once",
+    )
     return parser
 
 
@@ -1,11 +1,15 @@
 #!/usr/bin/env python3
 import argparse
 from collections import Counter
+import functools
+import itertools
 import logging
+import multiprocessing
 from pathlib import Path
 import sys
 from typing import List
 from typing import Optional
+from typing import Tuple
 
 from typeguard import check_argument_types
 
@@ -62,6 +66,82 @@ def field2slice(field: Optional[str]) -> slice:
     return slic
 
 
+class _LineTokenizer:
+    """Convert a line of the input text to the tokens."""
+
+    def __init__(
+        self,
+        field: Optional[str],
+        delimiter: Optional[str],
+        token_type: str,
+        space_symbol: str,
+        non_linguistic_symbols: Optional[str],
+        bpemodel: Optional[str],
+        remove_non_linguistic_symbols: bool,
+        cleaner: Optional[str],
+        g2p: Optional[str],
+    ):
+        self.field = None if field is None else field2slice(field)
+        self.delimiter = delimiter
+        self.cleaner = TextCleaner(cleaner)
+        self.tokenizer = build_tokenizer(
+            token_type=token_type,
+            bpemodel=bpemodel,
+            delimiter=delimiter,
+            space_symbol=space_symbol,
+            non_linguistic_symbols=non_linguistic_symbols,
+            remove_non_linguistic_symbols=remove_non_linguistic_symbols,
+            g2p_type=g2p,
+        )
+
+    def __call__(self, line: str) -> List[str]:
+        line = line.rstrip()
+        if self.field is not None:
+            # e.g. field="2-"
+            # uttidA hello world!! -> hello world!!
+            tokens = line.split(self.delimiter)
+            tokens = tokens[self.field]
+            if self.delimiter is None:
+                line = " ".join(tokens)
+            else:
+                line = self.delimiter.join(tokens)
+
+        line = self.cleaner(line)
+        return self.tokenizer.text2tokens(line)
+
+
+_line_tokenizer = None
+
+
+def _init_worker(kwargs: dict):
+    # NOTE: The tokenizer is built in each worker since g2p objects
+    #   are not always picklable
+    global _line_tokenizer
+    _line_tokenizer = _LineTokenizer(**kwargs)
+
+
+def _tokenize_chunk(
+    lines: List[str], write_vocabulary: bool
+) -> Tuple[Optional[List[str]], Counter]:
+    counter = Counter()
+    outputs = None if write_vocabulary else []
+    for line in lines:
+        tokens = _line_tokenizer(line)
+        if write_vocabulary:
+            counter.update(tokens)
+        else:
+            outputs.append(" ".join(tokens) + "\n")
+    return outputs, counter
+
+
+def _chunks(fin, chunk_size: int):
+    while True:
+        chunk = list(itertools.islice(fin, chunk_size))
+        if len(chunk) == 0:
+            break
+        yield chunk
+
+
 def tokenize(
     input: str,
     output: str,
@@ -79,6 +159,8 @@ def tokenize(
     add_symbol: List[str],
     cleaner: Optional[str],
     g2p: Optional[str],
+    nj: int = 1,
+    chunk_size: int = 10000,
 ):
     assert check_argument_types()
 
@@ -97,40 +179,45 @@ def tokenize(
         p.parent.mkdir(parents=True, exist_ok=True)
         fout = p.open("w", encoding="utf-8")
 
-    cleaner = TextCleaner(cleaner)
-    tokenizer = build_tokenizer(
-        token_type=token_type,
-        bpemodel=bpemodel,
+    tokenizer_kwargs = dict(
+        field=field,
         delimiter=delimiter,
+        token_type=token_type,
         space_symbol=space_symbol,
         non_linguistic_symbols=non_linguistic_symbols,
+        bpemodel=bpemodel,
         remove_non_linguistic_symbols=remove_non_linguistic_symbols,
-        g2p_type=g2p,
+        cleaner=cleaner,
+        g2p=g2p,
     )
 
+    # The input is split into chunks of lines, which are tokenized by nj processes.
+    # imap() keeps the order of the chunks, so the output order is the input order.
     counter = Counter()
-    if field is not None:
-        field = field2slice(field)
+    if nj > 1:
+        pool = multiprocessing.Pool(
+            nj, initializer=_init_worker, initargs=(tokenizer_kwargs,)
+        )
+        map_fn = pool.imap
+    else:
+        pool = None
+        _init_worker(tokenizer_kwargs)
+        map_fn = map
 
-    for line in fin:
-        line = line.rstrip()
-        if field is not None:
-            # e.g. field="2-"
-            # uttidA hello world!! -> hello world!!
-            tokens = line.split(delimiter)
-            tokens = tokens[field]
-            if delimiter is None:
-                line = " ".join(tokens)
+    try:
+        results = map_fn(
+            functools.partial(_tokenize_chunk, write_vocabulary=write_vocabulary),
+            _chunks(fin, chunk_size),
+        )
+        for outputs, chunk_counter in results:
+            if not write_vocabulary:
+                fout.writelines(outputs)
             else:
-                line = delimiter.join(tokens)
-
-        line = cleaner(line)
-        tokens = tokenizer.text2tokens(line)
-        if not write_vocabulary:
-            fout.write(" ".join(tokens) + "\n")
-        else:
-            for t in tokens:
-                counter[t] += 1
+                counter.update(chunk_counter)
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
 
     if not write_vocabulary:
         return
@@ -244,6 +331,19 @@ def get_parser() -> argparse.ArgumentParser:
         help="Specify g2p method if --token_type=phn",
     )
 
+    parser.add_argument(
+        "--nj",
+        type=int,
+        default=1,
+        help="The number of processes to tokenize the text",
+    )
+    parser.add_argument(
+        "--chunk_size",
+        type=int,
+        default=10000,
+        help="The number of lines given to a process at a time",
+    )
+
     group = parser.add_argument_group("write_vocabulary mode related")
     group.add_argument(
         "--write_vocabulary",
@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+import argparse
+import json
+import logging
+import multiprocessing
+from pathlib import Path
+import sys
+from typing import Dict
+from typing import Sequence
+from typing import Tuple
+
+import numpy as np
+import torch
+from typeguard import check_argument_types
+import yaml
+
+from espnet.utils.cli_utils import get_commandline_args
+from espnet2.fileio.packed_array import PackedArrayReader
+from espnet2.fileio.packed_array import PackedArrayWriter
+from espnet2.tasks.tts import energy_extractor_choices
+from espnet2.tasks.tts import pitch_extractor_choices
+from espnet2.train.dataset import ESPnetDataset
+from espnet2.tts.feats_extract.abs_feats_extract import AbsFeatsExtract
+from espnet2.utils.types import str2triple_str
+
+# The objects shared by the worker processes
+_worker_state = {}
+
+
+def build_extractors(config: dict) -> Dict[str, AbsFeatsExtract]:
+    """Build the pitch and energy extractors from the config of TTSTask.
+
+    The reduction factor is taken from "tts_conf" as TTSTask.build_model() does.
+    """
+    reduction_factor = (config.get("tts_conf") or {}).get("reduction_factor", 1)
+    extractors = {}
+    for name, class_choices in [
+        ("pitch", pitch_extractor_choices),
+        ("energy", energy_extractor_choices),
+    ]:
+        if config.get(f"{name}_extract") is None:
+            continue
+        conf = dict(config.get(f"{name}_extract_conf") or {})
+        conf.setdefault("reduction_factor", reduction_factor)
+        extract_class = class_choices.get_class(config[f"{name}_extract"])
+        extractor = extract_class(**conf)
+        if not any(
+            v for k, v in extractor.get_parameters().items() if "token_averaged" in k
+        ):
+            raise ValueError(
+                f"Only the token-averaged {name} can be extracted in advance: "
+                f"{extractor.get_parameters()}"
+            )
+        extractors[name] = extractor
+    return extractors
+
+
+def _init_worker(dataset: ESPnetDataset, extractors: Dict[str, AbsFeatsExtract]):
+    _worker_state.update(dataset=dataset, extractors=extractors)
+
+
+@torch.no_grad()
+def _extract(key: str) -> Tuple[str, Dict[str, np.ndarray]]:
+    dataset = _worker_state["dataset"]
+    extractors = _worker_state["extractors"]
+    _, data = dataset[key]
+    # speech: (1, NSample), durations: (1, NToken)
+    speech = torch.from_numpy(data["speech"])[None]
+    durations = torch.from_numpy(data["durations"]).long()[None]
+
+    retval = {}
+    for name, extractor in extractors.items():
+        # NOTE: Only the frames covered by the durations are averaged,
+        #   so the number of frames is adjusted to them
+        feats, _ = extractor(
+            speech,
+            torch.LongTensor([speech.size(1)]),
+            feats_lengths=durations.sum(dim=1) * extractor.reduction_factor,
+            durations=durations,
+            durations_lengths=torch.LongTensor([durations.size(1)]),
+        )
+        # (1, NToken, 1) -> (NToken, 1)
+        retval[name] = feats[0].numpy()
+    return key, retval
+
+
+def tts_extract_feats(
+    output_dir: str,
+    config: str,
+    data_path_and_name_and_type: Sequence[Tuple[str, str, str]],
+    nj: int,
+    log_level: str,
+):
+    """Extract the token-averaged pitch and energy once for FastSpeech2 training.
+
+    The features are written as "packed_array" directories,
+    "{output_dir}/pitch" and "{output_dir}/energy",
+    which can be given to the training instead of extracting them in every epoch.
+    The extraction is skipped if the existing ones were derived from
+    the same extractor parameters and the same input files.
+    """
+    assert check_argument_types()
+    logging.basicConfig(
+        level=log_level,
+        format="%(asctime)s (%(module)s:%(lineno)d) %(levelname)s: %(message)s",
+    )
+
+    with Path(config).open("r", encoding="utf-8") as f:
+        extractors = build_extractors(yaml.safe_load(f))
+    if len(extractors) == 0:
+        raise RuntimeError(f"Neither pitch_extract nor energy_extract is set: {config}")
+    names = [name for _, name, _ in data_path_and_name_and_type]
+    if sorted(names) != ["durations", "speech"]:
+        raise RuntimeError(f'"speech" and "durations" are required: {names}')
+
+    # The cache is invalidated if the parameters or the input files are changed
+    sources = {}
+    for path, _, _ in data_path_and_name_and_type:
+        stat = Path(path).stat()
+        sources[path] = [stat.st_size, stat.st_mtime_ns]
+
+    output_dir = Path(output_dir)
+    todo = {}
+    for name, extractor in extractors.items():
+        params = dict(
+            class_name=type(extractor).__name__,
+            conf=extractor.get_parameters(),
+            sources=sources,
+        )
+        # e.g. tuple -> list to compare with the loaded one
+        params = json.loads(json.dumps(params))
+        if (output_dir / name / "meta.json").exists():
+            if PackedArrayReader(output_dir / name).params == params:
+                logging.info(f"{output_dir / name} is up to date. Skipping")
+                continue
+        todo[name] = extractor, params
+    if len(todo) == 0:
+        return
+
+    dataset = ESPnetDataset(data_path_and_name_and_type)
+    keys = list(dataset)
+    worker_args = (dataset, {name: ext for name, (ext, _) in todo.items()})
+    writers = {
+        name: PackedArrayWriter(output_dir / name, params)
+        for name, (_, params) in todo.items()
+    }
+
+    if nj > 1:
+        # NOTE: pyworld runs on CPU, so the utterances are processed in parallel
+        pool = multiprocessing.Pool(nj, initializer=_init_worker, initargs=worker_args)
+        results = pool.imap(_extract, keys, chunksize=16)
+    else:
+        pool = None
+        _init_worker(*worker_args)
+        results = map(_extract, keys)
+
+    try:
+        for i, (key, feats) in enumerate(results, 1):
+            for name, value in feats.items():
+                writers[name][key] = value
+            if i % 1000 == 0:
+                logging.info(f"Processed {i}/{len(keys)} utterances")
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+    for name, writer in writers.items():
+        writer.close()
+        logging.info(f"Wrote {output_dir / name}")
+
+
+def get_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Extract the token-averaged pitch and energy in advance",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+    parser.add_argument(
+        "--log_level",
+        type=lambda x: x.upper(),
+        default="INFO",
+        choices=("CRITICAL", "ERROR", "WARNING", "INFO", "DEBUG", "NOTSET"),
+        help="The verbose level of logging",
+    )
+    parser.add_argument("--output_dir", type=str, required=True)
+    parser.add_argument(
+        "--config",
+        type=str,
+        required=True,
+        help="The config file of the TTS task having pitch_extract_conf "
+        "and energy_extract_conf, e.g. the one written by collect_stats",
+    )
+    parser.add_argument(
+        "--data_path_and_name_and_type",
+        type=str2triple_str,
+        required=True,
+        action="append",
+        help='"speech" and "durations", '
+        'e.g. "dump/raw/tr_no_dev/wav.scp,speech,sound"',
+    )
+    parser.add_argument(
+        "--nj", type=int, default=1, help="The number of the worker processes"
+    )
+    return parser
+
+
+def main(cmd=None):
+    print(get_commandline_args(), file=sys.stderr)
+    parser = get_parser()
+    args = parser.parse_args(cmd)
+    kwargs = vars(args)
+    tts_extract_feats(**kwargs)
+
+
+if __name__ == "__main__":
+    main()
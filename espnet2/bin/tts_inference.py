@@ -8,6 +8,7 @@ from pathlib import Path
 import shutil
 import sys
 import time
+from typing import List
 from typing import Optional
 from typing import Sequence
 from typing import Tuple
@@ -20,9 +21,16 @@ import torch
 from typeguard import check_argument_types
 
 from espnet.utils.cli_utils import get_commandline_args
+from espnet.utils.profiling import span
+from espnet.utils.profiling import SpanTimer
+from espnet.utils.profiling import StepProfiler
+from espnet.utils.profiling import ThroughputMeter
+from espnet2.fileio.datadir_writer import sort_lines_by_keys
 from espnet2.fileio.npy_scp import NpyScpWriter
+from espnet2.samplers.inference_batch_sampler import InferenceBatchSampler
 from espnet2.tasks.tts import TTSTask
 from espnet2.torch_utils.device_funcs import to_device
+from espnet2.torch_utils.forked_inference import forked_inference
 from espnet2.torch_utils.set_all_random_seed import set_all_random_seed
 from espnet2.tts.duration_calculator import DurationCalculator
 from espnet2.tts.fastspeech import FastSpeech
@@ -155,8 +163,10 @@ class Text2Speech:
             cfg = self.decode_config.copy()
             cfg.update({"alpha": speed_control_alpha})
 
-        batch = to_device(batch, self.device)
-        outs, outs_denorm, probs, att_ws = self.model.inference(**batch, **cfg)
+        with span("h2d"):
+            batch = to_device(batch, self.device)
+        with span("tts_model"):
+            outs, outs_denorm, probs, att_ws = self.model.inference(**batch, **cfg)
 
         if att_ws is not None:
             duration, focus_rate = self.duration_calculator(att_ws)
@@ -164,12 +174,90 @@ class Text2Speech:
             duration, focus_rate = None, None
 
         if self.spc2wav is not None:
-            wav = torch.tensor(self.spc2wav(outs_denorm.cpu().numpy()))
+            with span("vocoder"):
+                wav = torch.tensor(self.spc2wav(outs_denorm.cpu().numpy()))
         else:
             wav = None
 
         return wav, outs, outs_denorm, probs, att_ws, duration, focus_rate
 
+    @torch.no_grad()
+    def batch_inference(
+        self,
+        text: torch.Tensor,
+        text_lengths: torch.Tensor,
+        speech: torch.Tensor = None,
+        speech_lengths: torch.Tensor = None,
+        spembs: torch.Tensor = None,
+    ) -> List[Tuple]:
+        """Synthesize the mini-batch of the padded texts at once.
+
+        Returns:
+            List[Tuple]: The outputs of __call__() for each sample,
+                which are cropped to the lengths of each sample.
+
+        """
+        assert check_argument_types()
+        if not self.support_batch_inference:
+            raise NotImplementedError(
+                "batch decoding is only implemented for Tacotron2 and Transformer "
+                "without teacher forcing"
+            )
+        if self.use_speech and speech is None:
+            raise RuntimeError("missing required argument: 'speech'")
+
+        batch = {"text": text, "text_lengths": text_lengths}
+        if speech is not None:
+            batch["speech"] = speech
+            if speech_lengths is not None:
+                batch["speech_lengths"] = speech_lengths
+        if spembs is not None:
+            batch["spembs"] = spembs
+        with span("h2d"):
+            batch = to_device(batch, self.device)
+        with span("tts_model"):
+            outs, outs_denorm, probs, att_ws, olens = self.model.batch_inference(
+                **batch, **self.decode_config
+            )
+
+        retval = []
+        r = self.tts.reduction_factor
+        for i, (olen, ilen) in enumerate(zip(olens.tolist(), text_lengths.tolist())):
+            # (L, T) for Tacotron2 or (#layers, #heads, L, T) for Transformer
+            att_w = att_ws[i][..., : olen // r, : ilen + 1]
+            duration, focus_rate = self.duration_calculator(att_w)
+            out_denorm = outs_denorm[i, :olen]
+            if self.spc2wav is not None:
+                with span("vocoder"):
+                    wav = torch.tensor(self.spc2wav(out_denorm.cpu().numpy()))
+            else:
+                wav = None
+            retval.append(
+                (
+                    wav,
+                    outs[i, :olen],
+                    out_denorm,
+                    probs[i, :olen],
+                    att_w,
+                    duration,
+                    focus_rate,
+                )
+            )
+        return retval
+
+    @property
+    def support_batch_inference(self) -> bool:
+        """Check whether batch_inference() is available.
+
+        Returns:
+            bool: True if the auto-regressive decoding can be batched else False.
+
+        """
+        return (
+            isinstance(self.tts, (Tacotron2, Transformer))
+            and not self.use_teacher_forcing
+        )
+
     @property
     def fs(self) -> Optional[int]:
         if self.spc2wav is not None:
@@ -210,13 +298,19 @@ def inference(
     speed_control_alpha: float,
     allow_variable_data_keys: bool,
     vocoder_conf: dict,
+    shape_file: Sequence[str],
+    batch_bins: int,
+    nj: int,
+    num_threads: int,
+    profile_spans: bool,
+    profile_window: Optional[Sequence[int]],
 ):
     """Perform TTS model decoding."""
     assert check_argument_types()
-    if batch_size > 1:
-        raise NotImplementedError("batch decoding is not implemented")
     if ngpu > 1:
         raise NotImplementedError("only single GPU decoding is supported")
+    if ngpu >= 1 and nj > 1:
+        raise NotImplementedError("--nj > 1 is supported only for CPU decoding")
     logging.basicConfig(
         level=log_level,
         format="%(asctime)s (%(module)s:%(lineno)d) %(levelname)s: %(message)s",
@@ -229,6 +323,9 @@ def inference(
 
     # 1. Set random-seed
     set_all_random_seed(seed)
+    if nj > 1:
+        # NOTE: Only the forked processes use multiple threads
+        torch.set_num_threads(1)
 
     # 2. Build model
     text2speech = Text2Speech(
@@ -246,6 +343,11 @@ def inference(
         dtype=dtype,
         device=device,
     )
+    if (batch_size > 1 or batch_bins > 0) and not text2speech.support_batch_inference:
+        raise NotImplementedError(
+            "batch decoding is only implemented for Tacotron2 and Transformer "
+            "without teacher forcing"
+        )
 
     # 3. Build data-iterator
     if not text2speech.use_speech:
@@ -262,8 +364,36 @@ def inference(
         collate_fn=TTSTask.build_collate_fn(text2speech.train_args, False),
         allow_variable_data_keys=allow_variable_data_keys,
         inference=True,
+        shape_files=shape_file,
+        batch_bins=batch_bins,
     )
 
+    def synthesize(keys: List[str], batch: dict):
+        assert isinstance(batch, dict), type(batch)
+        assert all(isinstance(s, str) for s in keys), keys
+        _bs = len(next(iter(batch.values())))
+        assert len(keys) == _bs, f"{len(keys)} != {_bs}"
+
+        start_time = time.perf_counter()
+        if _bs == 1:
+            # Change to single sequence and remove *_length
+            # because inference() requires 1-seq, not mini-batch.
+            batch = {k: v[0] for k, v in batch.items() if not k.endswith("_lengths")}
+            results = [text2speech(**batch)]
+            insizes = [next(iter(batch.values())).size(0) + 1]
+        else:
+            names = ("text", "text_lengths", "speech", "speech_lengths", "spembs")
+            batch = {k: v for k, v in batch.items() if k in names}
+            results = text2speech.batch_inference(**batch)
+            insizes = (batch["text_lengths"] + 1).tolist()
+        elapsed = time.perf_counter() - start_time
+        logging.info(
+            "inference speed = {:.1f} frames / sec.".format(
+                sum(int(r[1].size(0)) for r in results) / elapsed
+            )
+        )
+        return insizes, results
+
     # 6. Start for-loop
     output_dir = Path(output_dir)
     (output_dir / "norm").mkdir(parents=True, exist_ok=True)
@@ -275,6 +405,16 @@ def inference(
     (output_dir / "durations").mkdir(parents=True, exist_ok=True)
     (output_dir / "focus_rates").mkdir(parents=True, exist_ok=True)
 
+    timer = SpanTimer(synchronize=device == "cuda", enabled=profile_spans)
+    profiler = None
+    if profile_window is not None:
+        profiler = StepProfiler(
+            Path(output_dir) / "profile/trace.json",
+            *profile_window,
+            use_cuda=device == "cuda",
+        )
+    meter = ThroughputMeter()
+
     # Lazy load to avoid the backend error
     matplotlib.use("Agg")
     import matplotlib.pyplot as plt
@@ -292,97 +432,115 @@ def inference(
     ) as duration_writer, open(
         output_dir / "focus_rates/focus_rates", "w"
     ) as focus_rate_writer:
-        for idx, (keys, batch) in enumerate(loader, 1):
-            assert isinstance(batch, dict), type(batch)
-            assert all(isinstance(s, str) for s in keys), keys
-            _bs = len(next(iter(batch.values())))
-            assert _bs == 1, _bs
-
-            # Change to single sequence and remove *_length
-            # because inference() requires 1-seq, not mini-batch.
-            batch = {k: v[0] for k, v in batch.items() if not k.endswith("_lengths")}
-
-            start_time = time.perf_counter()
-            wav, outs, outs_denorm, probs, att_ws, duration, focus_rate = text2speech(
-                **batch
-            )
-
-            key = keys[0]
-            insize = next(iter(batch.values())).size(0) + 1
-            logging.info(
-                "inference speed = {:.1f} frames / sec.".format(
-                    int(outs.size(0)) / (time.perf_counter() - start_time)
-                )
-            )
-            logging.info(f"{key} (size:{insize}->{outs.size(0)})")
-            if outs.size(0) == insize * maxlenratio:
-                logging.warning(f"output length reaches maximum length ({key}).")
-
-            norm_writer[key] = outs.cpu().numpy()
-            shape_writer.write(f"{key} " + ",".join(map(str, outs.shape)) + "\n")
-
-            denorm_writer[key] = outs_denorm.cpu().numpy()
-
-            if duration is not None:
-                # Save duration and fucus rates
-                duration_writer.write(
-                    f"{key} " + " ".join(map(str, duration.cpu().numpy())) + "\n"
-                )
-                focus_rate_writer.write(f"{key} {float(focus_rate):.5f}\n")
-
-                # Plot attention weight
-                att_ws = att_ws.cpu().numpy()
-
-                if att_ws.ndim == 2:
-                    att_ws = att_ws[None][None]
-                elif att_ws.ndim != 4:
-                    raise RuntimeError(f"Must be 2 or 4 dimension: {att_ws.ndim}")
-
-                w, h = plt.figaspect(att_ws.shape[0] / att_ws.shape[1])
-                fig = plt.Figure(
-                    figsize=(
-                        w * 1.3 * min(att_ws.shape[0], 2.5),
-                        h * 1.3 * min(att_ws.shape[1], 2.5),
+        for keys, (insizes, results) in timer.iterate(
+            forked_inference(loader, synthesize, nj=nj, num_threads=num_threads)
+        ):
+            if profiler is not None:
+                profiler.step()
+            for (
+                key,
+                insize,
+                (
+                    wav,
+                    outs,
+                    outs_denorm,
+                    probs,
+                    att_ws,
+                    duration,
+                    focus_rate,
+                ),
+            ) in zip(keys, insizes, results):
+                logging.info(f"{key} (size:{insize}->{outs.size(0)})")
+                meter.add(1, None if wav is None else len(wav) / text2speech.fs)
+                if outs.size(0) == insize * maxlenratio:
+                    logging.warning(f"output length reaches maximum length ({key}).")
+
+                norm_writer[key] = outs.cpu().numpy()
+                shape_writer.write(f"{key} " + ",".join(map(str, outs.shape)) + "\n")
+
+                denorm_writer[key] = outs_denorm.cpu().numpy()
+
+                if duration is not None:
+                    # Save duration and fucus rates
+                    duration_writer.write(
+                        f"{key} " + " ".join(map(str, duration.cpu().numpy())) + "\n"
                     )
-                )
-                fig.suptitle(f"{key}")
-                axes = fig.subplots(att_ws.shape[0], att_ws.shape[1])
-                if len(att_ws) == 1:
-                    axes = [[axes]]
-                for ax, att_w in zip(axes, att_ws):
-                    for ax_, att_w_ in zip(ax, att_w):
-                        ax_.imshow(att_w_.astype(np.float32), aspect="auto")
-                        ax_.set_xlabel("Input")
-                        ax_.set_ylabel("Output")
-                        ax_.xaxis.set_major_locator(MaxNLocator(integer=True))
-                        ax_.yaxis.set_major_locator(MaxNLocator(integer=True))
-
-                fig.set_tight_layout({"rect": [0, 0.03, 1, 0.95]})
-                fig.savefig(output_dir / f"att_ws/{key}.png")
-                fig.clf()
-
-            if probs is not None:
-                # Plot stop token prediction
-                probs = probs.cpu().numpy()
-
-                fig = plt.Figure()
-                ax = fig.add_subplot(1, 1, 1)
-                ax.plot(probs)
-                ax.set_title(f"{key}")
-                ax.set_xlabel("Output")
-                ax.set_ylabel("Stop probability")
-                ax.set_ylim(0, 1)
-                ax.grid(which="both")
-
-                fig.set_tight_layout(True)
-                fig.savefig(output_dir / f"probs/{key}.png")
-                fig.clf()
-
-            # TODO(kamo): Write scp
-            if wav is not None:
-                sf.write(
-                    f"{output_dir}/wav/{key}.wav", wav.numpy(), text2speech.fs, "PCM_16"
-                )
+                    focus_rate_writer.write(f"{key} {float(focus_rate):.5f}\n")
+
+                    # Plot attention weight
+                    att_ws = att_ws.cpu().numpy()
+
+                    if att_ws.ndim == 2:
+                        att_ws = att_ws[None][None]
+                    elif att_ws.ndim != 4:
+                        raise RuntimeError(f"Must be 2 or 4 dimension: {att_ws.ndim}")
+
+                    w, h = plt.figaspect(att_ws.shape[0] / att_ws.shape[1])
+                    fig = plt.Figure(
+                        figsize=(
+                            w * 1.3 * min(att_ws.shape[0], 2.5),
+                            h * 1.3 * min(att_ws.shape[1], 2.5),
+                        )
+                    )
+                    fig.suptitle(f"{key}")
+                    axes = fig.subplots(att_ws.shape[0], att_ws.shape[1])
+                    if len(att_ws) == 1:
+                        axes = [[axes]]
+                    for ax, att_w in zip(axes, att_ws):
+                        for ax_, att_w_ in zip(ax, att_w):
+                            ax_.imshow(att_w_.astype(np.float32), aspect="auto")
+                            ax_.set_xlabel("Input")
+                            ax_.set_ylabel("Output")
+                            ax_.xaxis.set_major_locator(MaxNLocator(integer=True))
+                            ax_.yaxis.set_major_locator(MaxNLocator(integer=True))
+
+                    fig.set_tight_layout({"rect": [0, 0.03, 1, 0.95]})
+                    fig.savefig(output_dir / f"att_ws/{key}.png")
+                    fig.clf()
+
+                if probs is not None:
+                    # Plot stop token prediction
+                    probs = probs.cpu().numpy()
+
+                    fig = plt.Figure()
+                    ax = fig.add_subplot(1, 1, 1)
+                    ax.plot(probs)
+                    ax.set_title(f"{key}")
+                    ax.set_xlabel("Output")
+                    ax.set_ylabel("Stop probability")
+                    ax.set_ylim(0, 1)
+                    ax.grid(which="both")
+
+                    fig.set_tight_layout(True)
+                    fig.savefig(output_dir / f"probs/{key}.png")
+                    fig.clf()
+
+                # TODO(kamo): Write scp
+                if wav is not None:
+                    sf.write(
+                        f"{output_dir}/wav/{key}.wav",
+                        wav.numpy(),
+                        text2speech.fs,
+                        "PCM_16",
+                    )
+
+    if profiler is not None:
+        profiler.close()
+    if profile_spans:
+        logging.info(timer.log_message())
+    logging.info(meter.log_message())
+
+    if isinstance(loader.batch_sampler, InferenceBatchSampler):
+        logging.info(f"Padding efficiency: {loader.batch_sampler.padding_efficiency}")
+        # Restore the order of the inputs
+        for path in [
+            output_dir / "norm/feats.scp",
+            output_dir / "denorm/feats.scp",
+            output_dir / "speech_shape/speech_shape",
+            output_dir / "durations/durations",
+            output_dir / "focus_rates/focus_rates",
+        ]:
+            sort_lines_by_keys(path, loader.batch_sampler.keys)
 
     # remove duration related files if attention is not provided
     if att_ws is None:
@@ -440,12 +598,49 @@ def get_parser():
         default=1,
         help="The number of workers used for DataLoader",
     )
+    parser.add_argument(
+        "--nj",
+        type=int,
+        default=1,
+        help="The number of the processes forked after loading the model. "
+        "The utterances are given to the idle ones from the longest, "
+        "which requires --shape_file. Only for CPU decoding",
+    )
+    parser.add_argument(
+        "--num_threads",
+        type=int,
+        default=1,
+        help="The number of the intra-op threads of each process if nj > 1",
+    )
+    parser.add_argument(
+        "--profile_spans",
+        type=str2bool,
+        default=False,
+        help="Log the time of the named spans in the hot paths, e.g. encoder. "
+        "Only measured in this process, i.e. nj = 1",
+    )
+    parser.add_argument(
+        "--profile_window",
+        type=int,
+        nargs=2,
+        default=None,
+        help="Capture the profile of torch.profiler for the mini-batches "
+        "[START, START + NUM) and write it as Chrome trace to "
+        '"{output_dir}/profile/trace.json". Only for nj = 1',
+    )
     parser.add_argument(
         "--batch_size",
         type=int,
         default=1,
         help="The batch size for inference",
     )
+    parser.add_argument(
+        "--batch_bins",
+        type=int,
+        default=0,
+        help="The maximum of batch_size x max_length in a mini-batch instead of "
+        "--batch_size. This requires --shape_file",
+    )
 
     group = parser.add_argument_group("Input data related")
     group.add_argument(
@@ -463,6 +658,15 @@ def get_parser():
         type=str2bool,
         default=False,
     )
+    group.add_argument(
+        "--shape_file",
+        type=str,
+        action="append",
+        default=[],
+        help="The shape files of the inputs, e.g. text_shape. If given, "
+        "the utterances of similar lengths are batched together "
+        "and the outputs are written in the original order",
+    )
 
     group = parser.add_argument_group("The model configuration related")
     group.add_argument(
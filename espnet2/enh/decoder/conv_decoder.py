@@ -30,3 +30,38 @@ class ConvDecoder(AbsDecoder):
         wav = wav.squeeze(1)
 
         return wav, ilens
+
+    def forward_streaming(
+        self, input: torch.Tensor, state: torch.Tensor = None, last: bool = False
+    ):
+        """Decode the next chunk of frames by overlap-add.
+
+        Args:
+            input (torch.Tensor): the next frames [Batch, frames, F]
+            state (torch.Tensor): the overlapping tail of the previous chunks
+                [Batch, kernel_size - stride], None for the first chunk
+            last (bool): Whether to output the tail as well for the last chunk
+        Returns:
+            wav (torch.Tensor): [Batch, frames * stride] samples which
+                the following frames don't overlap, or all the rest if last
+            state (torch.Tensor): the overlapping tail
+        """
+        stride = self.convtrans1d.stride[0]
+        kernel_size = self.convtrans1d.kernel_size[0]
+        batch_size, num_frames, _ = input.shape
+        tail = max(kernel_size - stride, 0)
+        if state is None:
+            state = input.new_zeros(batch_size, tail)
+
+        # [Batch, (frames - 1) * stride + kernel_size]
+        if num_frames > 0:
+            wav = self.convtrans1d(input.transpose(1, 2)).squeeze(1)
+        else:
+            wav = input.new_zeros(batch_size, 0)
+        wav = torch.nn.functional.pad(
+            wav, (0, num_frames * stride + tail - wav.size(1))
+        )
+        wav[:, :tail] += state
+        if last:
+            return wav, wav[:, :0]
+        return wav[:, : num_frames * stride], wav[:, num_frames * stride :]
@@ -45,3 +45,32 @@ class ConvEncoder(AbsEncoder):
         flens = (ilens - self.kernel_size) // self.stride + 1
 
         return feature, flens
+
+    def forward_streaming(self, input: torch.Tensor, state: torch.Tensor = None):
+        """Encode the next chunk of samples incrementally.
+
+        The samples which don't fill a frame yet are kept in the state and
+        prepended to the next chunk, so that the frames are the same as
+        those of forward() for the whole signal.
+
+        Args:
+            input (torch.Tensor): next chunk of mixed speech [Batch, sample]
+            state (torch.Tensor): the rest samples of the previous chunks
+                [Batch, sample'], None for the first chunk
+        Returns:
+            feature (torch.Tensor): the new frames [Batch, frames, channel]
+            state (torch.Tensor): the samples not encoded yet
+        """
+        assert input.dim() == 2, "Currently only support single channle input"
+
+        if state is not None:
+            input = torch.cat([state, input], dim=1)
+        num_frames = max((input.size(1) - self.kernel_size) // self.stride + 1, 0)
+        state = input[:, num_frames * self.stride :]
+        if num_frames == 0:
+            return input.new_zeros(input.size(0), 0, self.output_dim), state
+
+        input = input[:, None, : (num_frames - 1) * self.stride + self.kernel_size]
+        feature = self.conv1d(input)
+        feature = torch.nn.functional.relu(feature)
+        return feature.transpose(1, 2), state
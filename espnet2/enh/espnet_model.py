@@ -1,7 +1,9 @@
 """Enhancement model module."""
 from functools import reduce
 from itertools import permutations
+from typing import Any
 from typing import Dict
+from typing import List
 from typing import Optional
 from typing import Tuple
 
@@ -675,3 +677,57 @@ class ESPnetEnhancementModel(AbsESPnetModel):
 
         feats, feats_lengths = speech_mix, speech_mix_lengths
         return {"feats": feats, "feats_lengths": feats_lengths}
+
+    def forward_streaming(
+        self,
+        speech_chunk: torch.Tensor,
+        states: Optional[Dict[str, Any]] = None,
+        last: bool = False,
+    ) -> Tuple[List[torch.Tensor], Dict[str, Any]]:
+        """Enhance or separate the next chunk of the mixture in the streaming mode.
+
+        The encoder, the separator, and the decoder process only the new
+        samples, keeping what they need from the previous chunks in the states.
+        This requires the encoder and the decoder supporting the incremental
+        processing, e.g. ConvEncoder and ConvDecoder, and a causal separator,
+        e.g. TCNSeparator(causal=True, norm_type="cLN").
+
+        Args:
+            speech_chunk: The next chunk of the mixture (Batch, samples)
+            states: The states of the previous chunks, None for the first chunk
+            last: Whether speech_chunk is the last one. The rest of the outputs
+                are flushed.
+
+        Returns:
+            List[torch.Tensor]: The new samples of each speaker [(Batch, samples'), ...]
+            Dict[str, Any]: Updated states
+
+        """
+        for module in (self.encoder, self.decoder):
+            if not hasattr(module, "forward_streaming"):
+                raise NotImplementedError(
+                    f"{type(module).__name__} doesn't support streaming"
+                )
+        if states is None:
+            states = dict(encoder=None, separator=None, decoder=[None] * self.num_spk)
+
+        feature, enc_state = self.encoder.forward_streaming(
+            speech_chunk, states["encoder"]
+        )
+        if feature.size(1) > 0:
+            feature_pre, sep_state = self.separator.forward_streaming(
+                feature, states["separator"]
+            )
+        else:
+            # Not enough samples to make a frame yet
+            feature_pre, sep_state = [feature] * self.num_spk, states["separator"]
+
+        speech_pre, dec_states = [], []
+        for fp, dec_state in zip(feature_pre, states["decoder"]):
+            wav, dec_state = self.decoder.forward_streaming(fp, dec_state, last=last)
+            speech_pre.append(wav)
+            dec_states.append(dec_state)
+
+        return speech_pre, dict(
+            encoder=enc_state, separator=sep_state, decoder=dec_states
+        )
@@ -81,6 +81,39 @@ class TemporalConvNet(nn.Module):
         M, N, K = mixture_w.size()
         score = self.network(mixture_w)  # [M, N, K] -> [M, C*N, K]
         score = score.view(M, self.C, N, K)  # [M, C*N, K] -> [M, C, N, K]
+        return self._mask_nonlinear(score)
+
+    def forward_streaming(self, mixture_w, states=None):
+        """Forward the next chunk of frames with the history of the causal convolutions.
+
+        The outputs of the chunks are the same as those of forward() for the
+        whole utterance, if the network is causal and normalized frame by frame,
+        i.e. norm_type is "cLN" or "BN" (in evaluation).
+
+        Args:
+            mixture_w: [M, N, K], the next K frames
+            states: List of the histories of each TemporalBlock,
+                None for the first chunk
+
+        Returns:
+            est_mask: [M, C, N, K]
+            states: Updated states
+        """
+        layer_norm, bottleneck_conv1x1, temporal_conv_net, mask_conv1x1 = self.network
+        blocks = [block for repeat in temporal_conv_net for block in repeat]
+        if states is None:
+            states = [None] * len(blocks)
+
+        M, N, K = mixture_w.size()
+        output = bottleneck_conv1x1(layer_norm(mixture_w))
+        new_states = []
+        for block, state in zip(blocks, states):
+            output, state = block.forward_streaming(output, state)
+            new_states.append(state)
+        score = mask_conv1x1(output).view(M, self.C, N, K)
+        return self._mask_nonlinear(score), new_states
+
+    def _mask_nonlinear(self, score):
         if self.mask_nonlinear == "softmax":
             est_mask = F.softmax(score, dim=1)
         elif self.mask_nonlinear == "relu":
@@ -140,6 +173,22 @@ class TemporalBlock(nn.Module):
         return out + residual  # look like w/o F.relu is better than w/ F.relu
         # return F.relu(out + residual)
 
+    def forward_streaming(self, x, state=None):
+        """Forward the next chunk with the history of the depthwise convolution.
+
+        Args:
+            x: [M, B, K]
+            state: [M, H, (P - 1) * dilation], the last inputs of
+                the depthwise convolution, None for the first chunk
+
+        Returns:
+            [M, B, K]
+            state: Updated state
+        """
+        conv1x1, prelu, norm, dsconv = self.net
+        out, state = dsconv.forward_streaming(norm(prelu(conv1x1(x))), state)
+        return out + x, state
+
 
 class DepthwiseSeparableConv(nn.Module):
     def __init__(
@@ -154,6 +203,7 @@ class DepthwiseSeparableConv(nn.Module):
         causal=False,
     ):
         super().__init__()
+        self.causal = causal
         # Use `groups` option to implement depthwise convolution
         # [M, H, K] -> [M, H, K]
         depthwise_conv = nn.Conv1d(
@@ -189,6 +239,37 @@ class DepthwiseSeparableConv(nn.Module):
         """
         return self.net(x)
 
+    def forward_streaming(self, x, state=None):
+        """Forward the next chunk by prepending the history instead of zero-padding.
+
+        Args:
+            x: [M, H, K]
+            state: [M, H, (P - 1) * dilation], None for the first chunk
+
+        Returns:
+            result: [M, B, K]
+            state: The last (P - 1) * dilation frames of the history and x
+        """
+        if not self.causal:
+            raise NotImplementedError("Only the causal convolution can be streamed")
+        depthwise_conv = self.net[0]
+        history = depthwise_conv.padding[0]
+        if state is None:
+            state = x.new_zeros(x.size(0), x.size(1), history)
+        x = torch.cat([state, x], dim=2)
+        state = x[:, :, x.size(2) - history :]
+        # The zero-padding of the first chunk is given by the initial state
+        x = F.conv1d(
+            x,
+            depthwise_conv.weight,
+            depthwise_conv.bias,
+            stride=depthwise_conv.stride,
+            dilation=depthwise_conv.dilation,
+            groups=depthwise_conv.groups,
+        )
+        # self.net[1] is Chomp1d
+        return self.net[2:](x), state
+
 
 class Chomp1d(nn.Module):
     """To ensure the output length is the same as the input."""
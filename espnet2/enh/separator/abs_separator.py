@@ -1,6 +1,7 @@
 from abc import ABC
 from abc import abstractmethod
 from collections import OrderedDict
+from typing import Any
 from typing import Tuple
 
 import torch
@@ -16,6 +17,17 @@ class AbsSeparator(torch.nn.Module, ABC):
 
         raise NotImplementedError
 
+    def forward_streaming(
+        self, input_frame: torch.Tensor, states=None
+    ) -> Tuple[Tuple[torch.Tensor], Any]:
+        """Separate the next chunk of frames given the states of the previous ones.
+
+        Only the causal separators can implement this.
+        """
+        raise NotImplementedError(
+            f"{type(self).__name__} doesn't support streaming separation"
+        )
+
     @property
     @abstractmethod
     def num_spk(self):
@@ -103,6 +103,32 @@ class RNNSeparator(AbsSeparator):
 
         return masked, ilens, others
 
+    def forward_streaming(
+        self, input_frame: torch.Tensor, states=None
+    ) -> Tuple[List[torch.Tensor], Union[torch.Tensor, Tuple[torch.Tensor]]]:
+        """Separate the next chunk of frames carrying the RNN states over.
+
+        Only the uni-directional RNNs, e.g. rnn_type="lstm", are supported.
+
+        Args:
+            input_frame (torch.Tensor): Encoded feature of the next chunk [B, T, N]
+            states: The RNN states of the previous chunks, None for the first chunk
+
+        Returns:
+            masked (List[torch.Tensor]): [(B, T, N), ...]
+            states: Updated RNN states
+        """
+        if self.rnn.nbrnn.bidirectional:
+            raise NotImplementedError(
+                f"Streaming requires a uni-directional RNN: {self.rnn.typ}"
+            )
+        B, T, N = input_frame.shape
+        ilens = torch.full([B], T, dtype=torch.long)
+        x, _, states = self.rnn(input_frame, ilens, prev_state=states)
+
+        masked = [input_frame * self.nonlinear(linear(x)) for linear in self.linear]
+        return masked, states
+
     @property
     def num_spk(self):
         return self._num_spk
@@ -1,5 +1,6 @@
 from collections import OrderedDict
 from typing import List
+from typing import Optional
 from typing import Tuple
 from typing import Union
 
@@ -42,6 +43,8 @@ class TCNSeparator(AbsSeparator):
         super().__init__()
 
         self._num_spk = num_spk
+        self.causal = causal
+        self.norm_type = norm_type
 
         if nonlinear not in ("sigmoid", "relu", "tanh"):
             raise ValueError("Not supporting nonlinear={}".format(nonlinear))
@@ -99,6 +102,33 @@ class TCNSeparator(AbsSeparator):
 
         return masked, ilens, others
 
+    def forward_streaming(
+        self, input_frame: torch.Tensor, states: Optional[List[torch.Tensor]] = None
+    ) -> Tuple[List[torch.Tensor], List[torch.Tensor]]:
+        """Separate the next chunk of frames with the causal TCN.
+
+        The dilated convolutions keep their last inputs in the states,
+        so that the outputs are the same as forward() for the whole input.
+
+        Args:
+            input_frame (torch.Tensor): Encoded feature of the next chunk [B, T, N]
+            states (List[torch.Tensor]): The states of the previous chunks,
+                None for the first chunk
+
+        Returns:
+            masked (List[torch.Tensor]): [(B, T, N), ...]
+            states (List[torch.Tensor]): Updated states
+        """
+        if not self.causal or self.norm_type == "gLN":
+            raise NotImplementedError(
+                "Streaming requires causal=True and the frame-wise normalization "
+                f"(cLN or BN): causal={self.causal}, norm_type={self.norm_type}"
+            )
+        masks, states = self.tcn.forward_streaming(input_frame.transpose(1, 2), states)
+        masks = masks.transpose(2, 3).unbind(dim=1)  # List[B, T, N]
+        masked = [input_frame * m for m in masks]
+        return masked, states
+
     @property
     def num_spk(self):
         return self._num_spk
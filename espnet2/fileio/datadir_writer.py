@@ -1,4 +1,6 @@
 from pathlib import Path
+from typing import Optional
+from typing import Sequence
 from typing import Union
 import warnings
 
@@ -17,11 +19,16 @@ class DatadirWriter:
         ...     subwriter["uttidA"] = "some/where/a.wav"
         ...     subwriter["uttidB"] = "some/where/b.wav"
 
+    If key_order is given, the lines of each file are sorted in the order
+    when closing, e.g. to restore the order of the inputs
+    after the inference of the length-sorted mini-batches.
+
     """
 
-    def __init__(self, p: Union[Path, str]):
+    def __init__(self, p: Union[Path, str], key_order: Optional[Sequence[str]] = None):
         assert check_argument_types()
         self.path = Path(p)
+        self.key_order = key_order
         self.chilidren = {}
         self.fd = None
         self.has_children = False
@@ -36,7 +43,7 @@ class DatadirWriter:
             raise RuntimeError("This writer points out a file")
 
         if key not in self.chilidren:
-            w = DatadirWriter((self.path / key))
+            w = DatadirWriter((self.path / key), key_order=self.key_order)
             self.chilidren[key] = w
             self.has_children = True
 
@@ -73,5 +80,23 @@ class DatadirWriter:
                     )
                 prev_child = child
 
-        elif self.fd is not None:
+        elif self.fd is not None and not self.fd.closed:
             self.fd.close()
+            if self.key_order is not None:
+                sort_lines_by_keys(self.path, self.key_order)
+
+
+def sort_lines_by_keys(path: Union[Path, str], keys: Sequence[str]):
+    """Sort the lines of a text file starting with keys, e.g. "wav.scp".
+
+    The lines are sorted in the order of "keys", and the lines of the other keys
+    follow in their original order.
+    """
+    assert check_argument_types()
+    path = Path(path)
+    with path.open("r", encoding="utf-8") as f:
+        lines = f.readlines()
+    key2idx = {k: i for i, k in enumerate(keys)}
+    lines.sort(key=lambda line: key2idx.get(line.split(maxsplit=1)[0], len(key2idx)))
+    with path.open("w", encoding="utf-8") as f:
+        f.writelines(lines)
@@ -0,0 +1,140 @@
+import collections.abc
+import json
+from pathlib import Path
+from typing import Optional
+from typing import Union
+
+import numpy as np
+from typeguard import check_argument_types
+
+
+class PackedArrayWriter:
+    """Writer class for packed arrays, e.g. token-averaged pitch of each utterance.
+
+    The arrays, (Length, Dim, ...), are concatenated along the first axis
+    into a flat binary file and indexed by their offsets in it.
+    All arrays must have the same dtype and the same shape except for the first axis.
+    "params" is written to meta.json to tell how the arrays were derived,
+    so that the readers can check whether they are up to date.
+
+    Examples:
+        dump/feats_cache/train/pitch/values.bin  # The arrays of all utterances
+        dump/feats_cache/train/pitch/offsets.npy  # int64 (NUtt + 1,)
+        dump/feats_cache/train/pitch/keys  # The utterance ids in the order of offsets
+        dump/feats_cache/train/pitch/meta.json  # The dtype, the shape, and params
+
+        >>> writer = PackedArrayWriter('dump/feats_cache/train/pitch')
+        >>> writer['aa'] = numpy_array
+        >>> writer['bb'] = numpy_array
+        >>> writer.close()
+
+    """
+
+    def __init__(self, outdir: Union[Path, str], params: Optional[dict] = None):
+        assert check_argument_types()
+        self.dir = Path(outdir)
+        self.dir.mkdir(parents=True, exist_ok=True)
+        # NOTE: meta.json is written at last to indicate the completion
+        if (self.dir / "meta.json").exists():
+            (self.dir / "meta.json").unlink()
+        self.params = params
+        self.fvalues = (self.dir / "values.bin").open("wb")
+        self.fkeys = (self.dir / "keys").open("w", encoding="utf-8")
+        self.offsets = [0]
+        self.dtype = None
+        self.shape = None
+
+    def __setitem__(self, key: str, value: np.ndarray):
+        assert isinstance(value, np.ndarray), type(value)
+        assert value.ndim >= 1, value.shape
+        if self.dtype is None:
+            self.dtype = value.dtype
+            self.shape = value.shape[1:]
+        elif value.dtype != self.dtype or value.shape[1:] != self.shape:
+            raise RuntimeError(
+                f"Mismatched array: {key}: {value.dtype}{value.shape} "
+                f"while the others are {self.dtype}(*, {self.shape})"
+            )
+        self.fvalues.write(np.ascontiguousarray(value).tobytes())
+        self.fkeys.write(f"{key}\n")
+        self.offsets.append(self.offsets[-1] + len(value))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self):
+        self.fvalues.close()
+        self.fkeys.close()
+        np.save(str(self.dir / "offsets.npy"), np.array(self.offsets, dtype=np.int64))
+        with (self.dir / "meta.json").open("w", encoding="utf-8") as f:
+            json.dump(
+                dict(
+                    dtype=np.dtype(self.dtype or np.float32).str,
+                    shape=list(self.shape or ()),
+                    params=self.params,
+                ),
+                f,
+                indent=4,
+            )
+
+
+class PackedArrayReader(collections.abc.Mapping):
+    """Reader class for packed arrays written by PackedArrayWriter.
+
+    The values are read by memory map, so the memory used by this object
+    doesn't depend on the data size except for the utterance ids.
+
+    Examples:
+        >>> reader = PackedArrayReader('dump/feats_cache/train/pitch')
+        >>> array = reader['key1']
+
+    """
+
+    def __init__(self, path: Union[Path, str]):
+        assert check_argument_types()
+        self.dir = Path(path)
+        with (self.dir / "meta.json").open("r", encoding="utf-8") as f:
+            meta = json.load(f)
+        self.dtype = np.dtype(meta["dtype"])
+        self.shape = tuple(meta["shape"])
+        self.params = meta["params"]
+        self.offsets = np.load(str(self.dir / "offsets.npy"), mmap_mode="r")
+        with (self.dir / "keys").open("r", encoding="utf-8") as f:
+            self.key2idx = {line.rstrip(): i for i, line in enumerate(f)}
+        self._values = None
+
+    @property
+    def values(self) -> np.ndarray:
+        # NOTE: Opened lazily in each process, e.g. DataLoader workers
+        if self._values is None:
+            if self.offsets[-1] == 0:
+                self._values = np.zeros((0,) + self.shape, dtype=self.dtype)
+            else:
+                self._values = np.memmap(
+                    self.dir / "values.bin", dtype=self.dtype, mode="r"
+                ).reshape((-1,) + self.shape)
+        return self._values
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["_values"] = None
+        return state
+
+    def __getitem__(self, key) -> np.ndarray:
+        idx = self.key2idx[key]
+        return np.array(self.values[self.offsets[idx] : self.offsets[idx + 1]])
+
+    def __contains__(self, item):
+        return item in self.key2idx
+
+    def __len__(self):
+        return len(self.key2idx)
+
+    def __iter__(self):
+        return iter(self.key2idx)
+
+    def keys(self):
+        return self.key2idx.keys()
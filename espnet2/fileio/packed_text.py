@@ -0,0 +1,200 @@
+import collections.abc
+from pathlib import Path
+from typing import Optional
+from typing import Union
+
+import numpy as np
+from typeguard import check_argument_types
+
+from espnet2.fileio.text_index import load_text_index
+from espnet2.fileio.text_index import write_text_index
+
+
+class PackedTextWriter:
+    """Writer class for a packed token corpus.
+
+    All token ids are concatenated into a flat int32 array and the sentences
+    are indexed by their offsets in it. If "eos" is given, it is written after
+    each sentence to mark the sentence boundaries in the flat array.
+
+    Examples:
+        dump/packed/train/tokens.bin  # int32 token ids of all sentences
+        dump/packed/train/offsets.npy  # int64 (NSentence + 1,)
+        dump/packed/train/lengths.npy  # int64 (NSentence,) without eos
+        dump/packed/train/keys  # The sentence ids in the order of offsets
+        dump/packed/train/keys.idx  # The index of keys by write_text_index()
+
+        >>> writer = PackedTextWriter('dump/packed/train')
+        >>> writer['aa'] = numpy_array
+        >>> writer['bb'] = numpy_array
+        >>> writer.close()
+
+    """
+
+    def __init__(self, outdir: Union[Path, str], eos: Optional[int] = None):
+        assert check_argument_types()
+        self.dir = Path(outdir)
+        self.dir.mkdir(parents=True, exist_ok=True)
+        self.eos = None if eos is None else np.array([eos], dtype=np.int32)
+        self.ftokens = (self.dir / "tokens.bin").open("wb")
+        self.fkeys = (self.dir / "keys").open("w", encoding="utf-8")
+        self.offsets = [0]
+        self.lengths = []
+
+    def __setitem__(self, key: str, value: np.ndarray):
+        assert isinstance(value, np.ndarray), type(value)
+        assert value.ndim == 1, value.shape
+        if self.eos is not None:
+            value = np.concatenate([value.astype(np.int32), self.eos])
+            self.lengths.append(len(value) - 1)
+        else:
+            self.lengths.append(len(value))
+        self.ftokens.write(value.astype(np.int32).tobytes())
+        self.fkeys.write(f"{key}\n")
+        self.offsets.append(self.offsets[-1] + len(value))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self):
+        self.ftokens.close()
+        self.fkeys.close()
+        np.save(str(self.dir / "offsets.npy"), np.array(self.offsets, dtype=np.int64))
+        np.save(str(self.dir / "lengths.npy"), np.array(self.lengths, dtype=np.int64))
+        write_text_index(self.dir / "keys")
+
+
+class PackedTextReader(collections.abc.Mapping):
+    """Reader class for a packed token corpus written by PackedTextWriter.
+
+    The token ids and the index of the sentence ids are read by memory map,
+    so neither the memory used by this object nor the startup time depends on
+    the corpus size. The token ids are returned as int64 like "text_int".
+
+    Examples:
+        >>> reader = PackedTextReader('dump/packed/train')
+        >>> array = reader['key1']
+
+    """
+
+    def __init__(self, path: Union[Path, str]):
+        assert check_argument_types()
+        self.dir = Path(path)
+        self.offsets = np.load(str(self.dir / "offsets.npy"), mmap_mode="r")
+        self.lengths = np.load(str(self.dir / "lengths.npy"), mmap_mode="r")
+        self.index = load_text_index(self.dir / "keys")
+        if self.index is None:
+            raise RuntimeError(
+                f"The index of {self.dir / 'keys'} is missing or outdated: "
+                f"python -m espnet2.bin.build_text_index --input {self.dir / 'keys'}"
+            )
+        self._tokens = None
+
+    @property
+    def tokens(self) -> np.ndarray:
+        # NOTE: Opened lazily in each process, e.g. DataLoader workers
+        if self._tokens is None:
+            if self.offsets[-1] == 0:
+                self._tokens = np.zeros(0, dtype=np.int32)
+            else:
+                self._tokens = np.memmap(
+                    self.dir / "tokens.bin", dtype=np.int32, mode="r"
+                )
+        return self._tokens
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["_tokens"] = None
+        return state
+
+    def __getitem__(self, key) -> np.ndarray:
+        idx = self.index.line_number(key)
+        start = self.offsets[idx]
+        return self.tokens[start : start + self.lengths[idx]].astype(np.int64)
+
+    def __contains__(self, item):
+        return item in self.index
+
+    def __len__(self):
+        return len(self.lengths)
+
+    def __iter__(self):
+        return iter(self.index)
+
+
+class PackedTextBlockReader(collections.abc.Mapping):
+    """Reader class to serve a packed token corpus as fixed-length blocks.
+
+    The sentences are concatenated as written by PackedTextWriter, i.e. with
+    eos between them if it was given, and are cut into blocks of "block_size"
+    tokens regardless of the sentence boundaries.
+    Only the last block can be shorter, so a mini-batch has almost no padding.
+    The i-th block has the key "block{i}". The keys are not kept in memory.
+
+    Examples:
+        >>> reader = PackedTextBlockReader('dump/packed/train', 512)
+        >>> array = reader['block0']  # (512,)
+
+    """
+
+    def __init__(self, path: Union[Path, str], block_size: int):
+        assert check_argument_types()
+        if block_size <= 0:
+            raise ValueError(f"block_size must be positive: {block_size}")
+        self.dir = Path(path)
+        self.block_size = block_size
+        offsets = np.load(str(self.dir / "offsets.npy"), mmap_mode="r")
+        self.num_tokens = int(offsets[-1])
+        self._tokens = None
+
+    @property
+    def tokens(self) -> np.ndarray:
+        if self._tokens is None:
+            if self.num_tokens == 0:
+                self._tokens = np.zeros(0, dtype=np.int32)
+            else:
+                self._tokens = np.memmap(
+                    self.dir / "tokens.bin", dtype=np.int32, mode="r"
+                )
+        return self._tokens
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["_tokens"] = None
+        return state
+
+    def _key2idx(self, key) -> int:
+        if not isinstance(key, str) or not key.startswith("block"):
+            raise KeyError(key)
+        try:
+            idx = int(key[len("block") :])
+        except ValueError:
+            raise KeyError(key)
+        if not 0 <= idx < len(self):
+            raise KeyError(key)
+        return idx
+
+    def __getitem__(self, key) -> np.ndarray:
+        idx = self._key2idx(key)
+        start = idx * self.block_size
+        return self.tokens[start : start + self.block_size].astype(np.int64)
+
+    def __contains__(self, item):
+        try:
+            self._key2idx(item)
+        except KeyError:
+            return False
+        return True
+
+    def __len__(self):
+        return (self.num_tokens + self.block_size - 1) // self.block_size
+
+    def __iter__(self):
+        return (f"block{i}" for i in range(len(self)))
+
+    def shape(self, key) -> int:
+        idx = self._key2idx(key)
+        return min(self.block_size, self.num_tokens - idx * self.block_size)
@@ -2,10 +2,13 @@ import logging
 from pathlib import Path
 from typing import Dict
 from typing import List
+from typing import Mapping
 from typing import Union
 
 from typeguard import check_argument_types
 
+from espnet2.fileio.text_index import load_text_index
+
 
 def read_2column_text(path: Union[Path, str]) -> Dict[str, str]:
     """Read a text file having 2 column as dict object.
@@ -35,6 +38,21 @@ def read_2column_text(path: Union[Path, str]) -> Dict[str, str]:
     return data
 
 
+def load_2column_text(path: Union[Path, str]) -> Mapping[str, str]:
+    """Read a text file having 2 column using its binary index if available.
+
+    If "{path}.idx" written by write_text_index() is up to date,
+    the text file is not parsed and the memory-mapped index is returned instead.
+    Otherwise, this is the same as read_2column_text().
+
+    """
+    assert check_argument_types()
+    index = load_text_index(path)
+    if index is not None:
+        return index
+    return read_2column_text(path)
+
+
 def load_num_sequence_text(
     path: Union[Path, str], loader_type: str = "csv_int"
 ) -> Dict[str, List[Union[float, int]]]:
@@ -0,0 +1,248 @@
+import collections.abc
+import json
+import os
+from pathlib import Path
+import shutil
+from typing import Iterator
+from typing import List
+from typing import Optional
+from typing import Tuple
+from typing import Union
+
+import numpy as np
+from typeguard import check_argument_types
+
+
+def index_path(path: Union[Path, str]) -> Path:
+    """Return the directory of the index for the text file: "{path}.idx"."""
+    path = Path(path)
+    return path.with_name(path.name + ".idx")
+
+
+def _source_stat(path: Path) -> dict:
+    stat = path.stat()
+    return dict(source_size=stat.st_size, source_mtime_ns=stat.st_mtime_ns)
+
+
+def write_text_index(
+    path: Union[Path, str], index_dir: Union[Path, str] = None
+) -> Path:
+    """Write a binary index of a 2 column text file, e.g. wav.scp or shape file.
+
+    The index is a directory of the following files, which are memory-mapped
+    by TextIndexReader:
+
+        keys.bin  # The keys sorted by bytes and joined with "\\n"
+        key_offsets.npy  # int64 (NKey + 1,): The start of each key in keys.bin
+        value_offsets.npy  # int64 (NKey, 2): The byte range of the values
+        order.npy  # int64 (NKey,): The sorted position of each line
+        lines.npy  # int64 (NKey,): The line number of each sorted key
+        shapes.npy  # int32 (NKey, NDim): Only if all values are "int,int,..."
+        meta.json  # The size and mtime of the text file to detect the change
+
+    Examples:
+        >>> write_text_index('dump/raw/train/speech_shape')
+        PosixPath('dump/raw/train/speech_shape.idx')
+
+    """
+    assert check_argument_types()
+    path = Path(path)
+    index_dir = index_path(path) if index_dir is None else Path(index_dir)
+
+    keys = []
+    value_offsets = []
+    values = []
+    offset = 0
+    with path.open("rb") as f:
+        for line in f:
+            # NOTE: Split as str like read_2column_text(), which also splits
+            #   on non-ASCII whitespace, e.g. "\u3000", unlike bytes.split()
+            stripped = line.decode("utf-8").rstrip()
+            sps = stripped.split(maxsplit=1)
+            if len(sps) != 0:
+                keys.append(sps[0].encode("utf-8"))
+                end = offset + len(stripped.encode("utf-8"))
+                if len(sps) == 1:
+                    value_offsets.append((end, end))
+                    values.append("")
+                else:
+                    value_offsets.append((end - len(sps[1].encode("utf-8")), end))
+                    values.append(sps[1])
+            offset += len(line)
+
+    # order: The sorted position of each line
+    argsort = sorted(range(len(keys)), key=keys.__getitem__)
+    order = np.empty(len(keys), dtype=np.int64)
+    order[argsort] = np.arange(len(keys))
+    sorted_keys = [keys[i] for i in argsort]
+    for prev, cur in zip(sorted_keys, sorted_keys[1:]):
+        if prev == cur:
+            raise RuntimeError(f"{cur.decode('utf-8')} is duplicated ({path})")
+
+    if index_dir.exists():
+        shutil.rmtree(index_dir)
+    index_dir.mkdir(parents=True)
+    with (index_dir / "keys.bin").open("wb") as f:
+        f.write(b"\n".join(sorted_keys))
+    key_offsets = np.zeros(len(keys) + 1, dtype=np.int64)
+    np.cumsum([len(k) + 1 for k in sorted_keys], out=key_offsets[1:])
+    np.save(index_dir / "key_offsets.npy", key_offsets)
+    np.save(
+        index_dir / "value_offsets.npy",
+        np.array(value_offsets, dtype=np.int64).reshape(-1, 2)[argsort],
+    )
+    np.save(index_dir / "order.npy", order)
+    np.save(index_dir / "lines.npy", np.array(argsort, dtype=np.int64))
+
+    shapes = _parse_shapes(values)
+    if shapes is not None:
+        np.save(index_dir / "shapes.npy", shapes[argsort])
+
+    # NOTE: meta.json is written at last to indicate the completion
+    with (index_dir / "meta.json").open("w", encoding="utf-8") as f:
+        json.dump(
+            dict(num_keys=len(keys), **_source_stat(path)),
+            f,
+        )
+    return index_dir
+
+
+def _parse_shapes(values: List[str]) -> Optional[np.ndarray]:
+    if len(values) == 0:
+        return None
+    ndim = values[0].count(",") + 1
+    if any(v.count(",") + 1 != ndim for v in values):
+        return None
+    try:
+        shapes = np.array(",".join(values).split(","), dtype=np.int64).reshape(
+            len(values), ndim
+        )
+    except ValueError:
+        return None
+    if (shapes < 0).any() or (shapes > np.iinfo(np.int32).max).any():
+        return None
+    return shapes.astype(np.int32)
+
+
+def load_text_index(path: Union[Path, str]) -> Optional["TextIndexReader"]:
+    """Return TextIndexReader if the index of the text file is up to date."""
+    path = Path(path)
+    meta = index_path(path) / "meta.json"
+    if not meta.exists() or not path.exists():
+        return None
+    with meta.open("r", encoding="utf-8") as f:
+        info = json.load(f)
+    if any(info.get(k) != v for k, v in _source_stat(path).items()):
+        return None
+    return TextIndexReader(path)
+
+
+class TextIndexReader(collections.abc.Mapping):
+    """Reader class of a 2 column text file by its index.
+
+    The index is memory-mapped, so it is shared among the processes,
+    e.g. DataLoader workers and DDP ranks, without copying and
+    it is not necessary to parse the text file at startup.
+    A key is looked up by the binary search on the sorted keys,
+    and the value is read from the text file with the byte offsets.
+
+    Examples:
+        >>> write_text_index('wav.scp')
+        >>> reader = TextIndexReader('wav.scp')
+        >>> reader['key1']
+        '/some/path/a.wav'
+
+    """
+
+    def __init__(self, path: Union[Path, str]):
+        assert check_argument_types()
+        self.path = Path(path)
+        self.dir = index_path(path)
+        if not (self.dir / "meta.json").exists():
+            raise FileNotFoundError(f"The index is not found: {self.dir}")
+        self.has_shapes = (self.dir / "shapes.npy").exists()
+        self._arrays = None
+        self._file = None
+
+    @property
+    def arrays(self) -> dict:
+        # NOTE: Opened lazily in each process
+        if self._arrays is None:
+            arrays = {
+                name: np.load(self.dir / f"{name}.npy", mmap_mode="r")
+                for name in ["key_offsets", "value_offsets", "order", "lines"]
+            }
+            if os.path.getsize(self.dir / "keys.bin") == 0:
+                arrays["keys"] = np.zeros(0, dtype=np.uint8)
+            else:
+                arrays["keys"] = np.memmap(self.dir / "keys.bin", mode="r")
+            if self.has_shapes:
+                arrays["shapes"] = np.load(self.dir / "shapes.npy", mmap_mode="r")
+            self._arrays = arrays
+        return self._arrays
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["_arrays"] = None
+        state["_file"] = None
+        return state
+
+    def _sorted_key(self, idx: int) -> bytes:
+        offsets = self.arrays["key_offsets"]
+        return self.arrays["keys"][offsets[idx] : offsets[idx + 1] - 1].tobytes()
+
+    def _find(self, key) -> int:
+        if not isinstance(key, str):
+            raise KeyError(key)
+        target = key.encode("utf-8")
+        lo, hi = 0, len(self)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._sorted_key(mid) < target:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo == len(self) or self._sorted_key(lo) != target:
+            raise KeyError(key)
+        return lo
+
+    def __getitem__(self, key) -> str:
+        idx = self._find(key)
+        start, end = self.arrays["value_offsets"][idx]
+        if self._file is None:
+            self._file = self.path.open("rb")
+        # NOTE: pread() doesn't move the file offset, which is shared with
+        # the forked processes, e.g. DataLoader workers, unlike seek() + read()
+        value = os.pread(self._file.fileno(), int(end - start), int(start))
+        return value.decode("utf-8")
+
+    def line_number(self, key) -> int:
+        """Return the 0-based line number of the key in the text file."""
+        return int(self.arrays["lines"][self._find(key)])
+
+    def shape(self, key) -> Tuple[int, ...]:
+        return tuple(int(x) for x in self.arrays["shapes"][self._find(key)])
+
+    def __contains__(self, item):
+        try:
+            self._find(item)
+        except KeyError:
+            return False
+        return True
+
+    def __len__(self):
+        return len(self.arrays["order"])
+
+    def keys_in_order(self) -> List[str]:
+        """Return the keys in the order of the lines of the text file."""
+        sorted_keys = self.arrays["keys"].tobytes().decode("utf-8").split("\n")
+        if len(self) == 0:
+            return []
+        return [sorted_keys[i] for i in self.arrays["order"]]
+
+    def shapes_in_order(self) -> np.ndarray:
+        """Return (NKey, NDim) shapes in the order of the lines of the text file."""
+        return np.asarray(self.arrays["shapes"])[self.arrays["order"]]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.keys_in_order())
@@ -75,26 +75,41 @@ class GlobalMVN(AbsNormalize, InversibleInterface):
             ilens = x.new_full([x.size(0)], x.size(1))
         norm_means = self.norm_means
         norm_vars = self.norm_vars
-        self.mean = self.mean.to(x.device, x.dtype)
-        self.std = self.std.to(x.device, x.dtype)
+        # NOTE: The buffers are converted without re-assigning them,
+        #   which is a no-op if the device and the dtype are already the same
+        mean = self.mean.to(x.device, x.dtype)
+        std = self.std.to(x.device, x.dtype)
         mask = make_pad_mask(ilens, x, 1)
 
         # feat: (B, T, D)
         if norm_means:
             if x.requires_grad:
-                x = x - self.mean
+                x = x - mean
             else:
-                x -= self.mean
+                x -= mean
         if x.requires_grad:
             x = x.masked_fill(mask, 0.0)
         else:
             x.masked_fill_(mask, 0.0)
 
         if norm_vars:
-            x /= self.std
+            x /= std
 
         return x, ilens
 
+    def scale_and_bias(self) -> Tuple[torch.Tensor, torch.Tensor]:
+        """Return (scale, bias) such that forward() is "x * scale + bias".
+
+        This is used to fold the normalization into the preceding layer,
+        e.g. LogMel.fold_normalization(), except for the zero padding.
+        """
+        scale = 1.0 / self.std if self.norm_vars else torch.ones_like(self.std)
+        if self.norm_means:
+            bias = -self.mean * scale
+        else:
+            bias = torch.zeros_like(self.mean)
+        return scale, bias
+
     def inverse(
         self, x: torch.Tensor, ilens: torch.Tensor = None
     ) -> Tuple[torch.Tensor, torch.Tensor]:
@@ -102,8 +117,8 @@ class GlobalMVN(AbsNormalize, InversibleInterface):
             ilens = x.new_full([x.size(0)], x.size(1))
         norm_means = self.norm_means
         norm_vars = self.norm_vars
-        self.mean = self.mean.to(x.device, x.dtype)
-        self.std = self.std.to(x.device, x.dtype)
+        mean = self.mean.to(x.device, x.dtype)
+        std = self.std.to(x.device, x.dtype)
         mask = make_pad_mask(ilens, x, 1)
 
         if x.requires_grad:
@@ -112,10 +127,10 @@ class GlobalMVN(AbsNormalize, InversibleInterface):
             x.masked_fill_(mask, 0.0)
 
         if norm_vars:
-            x *= self.std
+            x *= std
 
         # feat: (B, T, D)
         if norm_means:
-            x += self.mean
+            x += mean
             x.masked_fill_(make_pad_mask(ilens, x, 1), 0.0)
         return x, ilens
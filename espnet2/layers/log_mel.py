@@ -49,10 +49,26 @@ class LogMel(torch.nn.Module):
         melmat = librosa.filters.mel(**_mel_options)
         # melmat: (D2, D1) -> (D1, D2)
         self.register_buffer("melmat", torch.from_numpy(melmat.T).float())
+        # The affine transform folded by fold_normalization()
+        self.register_buffer("norm_scale", None)
+        self.register_buffer("norm_bias", None)
 
     def extra_repr(self):
         return ", ".join(f"{k}={v}" for k, v in self.mel_options.items())
 
+    def fold_normalization(self, scale: torch.Tensor, bias: torch.Tensor):
+        """Apply "logmel_feat * scale + bias" in forward() for the inference.
+
+        This replaces the following GlobalMVN, e.g. by freeze_for_inference(),
+        to compute the normalized features at once.
+
+        Args:
+            scale: (D2,)
+            bias: (D2,)
+        """
+        self.norm_scale = scale.to(self.melmat.device, self.melmat.dtype)
+        self.norm_bias = bias.to(self.melmat.device, self.melmat.dtype)
+
     def forward(
         self,
         feat: torch.Tensor,
@@ -71,6 +87,9 @@ class LogMel(torch.nn.Module):
         else:
             logmel_feat = mel_feat.log() / torch.log(self.log_base)
 
+        if self.norm_scale is not None:
+            logmel_feat = torch.addcmul(self.norm_bias, logmel_feat, self.norm_scale)
+
         # Zero padding
         if ilens is not None:
             logmel_feat = logmel_feat.masked_fill(
@@ -4,6 +4,50 @@ from typing import Sequence
 from typing import Union
 
 
+def make_axis_mask(
+    batch: int,
+    size: int,
+    mask_width_range: Sequence[int] = (0, 30),
+    num_mask: int = 2,
+    lengths: torch.Tensor = None,
+    device=None,
+) -> torch.Tensor:
+    """Make the boolean mask of random bands along an axis.
+
+    Args:
+        batch: Batch size
+        size: The size of the axis, i.e. Length or Freq
+        mask_width_range: Select the width randomly between this range
+        num_mask: The number of bands for each sample
+        lengths: (Batch,): If given, the bands are put within each length
+    Returns:
+        mask: (Batch, size)
+    """
+    # mask_length: (B, num_mask, 1)
+    mask_length = torch.randint(
+        mask_width_range[0],
+        mask_width_range[1],
+        (batch, num_mask),
+        device=device,
+    ).unsqueeze(2)
+
+    # mask_pos: (B, num_mask, 1)
+    if lengths is None:
+        mask_pos = torch.randint(
+            0, max(1, size - mask_length.max()), (batch, num_mask), device=device
+        ).unsqueeze(2)
+    else:
+        high = (lengths.to(device)[:, None, None] - mask_length).clamp(min=1)
+        mask_pos = (torch.rand(high.shape, device=device) * high).long()
+
+    # aran: (1, 1, D)
+    aran = torch.arange(size, device=device)[None, None, :]
+    # mask: (Batch, num_mask, D)
+    mask = (mask_pos <= aran) * (aran < (mask_pos + mask_length))
+    # Multiply masks: (Batch, num_mask, D) -> (Batch, D)
+    return mask.any(dim=1)
+
+
 def mask_along_axis(
     spec: torch.Tensor,
     spec_lengths: torch.Tensor,
@@ -25,28 +69,14 @@ def mask_along_axis(
         # spec: (Batch, Channel, Length, Freq) -> (Batch * Channel, Length, Freq)
         spec = spec.view(-1, spec.size(2), spec.size(3))
 
-    B = spec.shape[0]
-    # D = Length or Freq
-    D = spec.shape[dim]
-    # mask_length: (B, num_mask, 1)
-    mask_length = torch.randint(
-        mask_width_range[0],
-        mask_width_range[1],
-        (B, num_mask),
+    # mask: (Batch, D), D = Length or Freq
+    mask = make_axis_mask(
+        spec.shape[0],
+        spec.shape[dim],
+        mask_width_range=mask_width_range,
+        num_mask=num_mask,
         device=spec.device,
-    ).unsqueeze(2)
-
-    # mask_pos: (B, num_mask, 1)
-    mask_pos = torch.randint(
-        0, max(1, D - mask_length.max()), (B, num_mask), device=spec.device
-    ).unsqueeze(2)
-
-    # aran: (1, 1, D)
-    aran = torch.arange(D, device=spec.device)[None, None, :]
-    # mask: (Batch, num_mask, D)
-    mask = (mask_pos <= aran) * (aran < (mask_pos + mask_length))
-    # Multiply masks: (Batch, num_mask, D) -> (Batch, D)
-    mask = mask.any(dim=1)
+    )
     if dim == 1:
         # mask: (Batch, Length, 1)
         mask = mask.unsqueeze(2)
@@ -101,6 +101,7 @@ class SincConv(torch.nn.Module):
         if self.kernel_size % 2 == 0:
             raise ValueError("SincConv: Kernel size must be odd.")
         self.f = None
+        self.frozen = False
         N = self.kernel_size // 2
         self._x = 2 * math.pi * torch.linspace(1, N, N)
         self._window = self.window_func(torch.linspace(1, N, N))
@@ -156,6 +157,19 @@ class SincConv(torch.nn.Module):
         filters = filters.view(filters.size(0), 1, filters.size(1))
         self.sinc_filters = filters
 
+    def freeze_for_inference(self):
+        """Precompute the filters to skip the calculation in every forward.
+
+        The filters are kept as a buffer, which follows the device and the dtype
+        of the module, so that the band parameters must not be updated later.
+        """
+        with torch.no_grad():
+            self._create_filters(self.f.device)
+        filters = self.sinc_filters
+        del self.sinc_filters
+        self.register_buffer("sinc_filters", filters)
+        self.frozen = True
+
     def forward(self, xs: torch.Tensor) -> torch.Tensor:
         """Sinc convolution forward function.
 
@@ -165,7 +179,8 @@ class SincConv(torch.nn.Module):
         Returns:
             xs: Batch in form of torch.Tensor (B, C_out, D_out).
         """
-        self._create_filters(xs.device)
+        if not self.frozen:
+            self._create_filters(xs.device)
         xs = torch.nn.functional.conv1d(
             xs,
             self.sinc_filters,
@@ -1,4 +1,6 @@
 """Time warp module."""
+from distutils.version import LooseVersion
+
 import torch
 
 from espnet.nets.pytorch_backend.nets_utils import pad_list
@@ -46,21 +48,95 @@ def time_warp(x: torch.Tensor, window: int = 80, mode: str = DEFAULT_TIME_WARP_M
     return x.view(*org_size)
 
 
+def batch_time_warp(
+    x: torch.Tensor,
+    x_lengths: torch.Tensor = None,
+    window: int = 80,
+    mode: str = "bilinear",
+):
+    """Time warping with a warp center per sample using grid_sample.
+
+    Each sample is warped within its own length by one grid_sample call for
+    the whole batch, instead of interpolating each sample separately.
+
+    Args:
+        x: (Batch, Time, Freq) or (Batch, Channel, Time, Freq)
+        x_lengths: (Batch,)
+        window: time warp parameter
+        mode: Interpolate mode of grid_sample: "bilinear", "nearest" or "bicubic"
+    """
+    if mode == "bicubic" and LooseVersion(torch.__version__) < LooseVersion("1.8.0"):
+        # grid_sample supports bicubic from torch 1.8
+        mode = "bilinear"
+
+    org_size = x.size()
+    if x.dim() == 3:
+        # x: (Batch, Time, Freq) -> (Batch, 1, Time, Freq)
+        x = x[:, None]
+    B, _, T, F = x.shape
+    if x_lengths is None:
+        x_lengths = torch.full((B,), T, dtype=torch.long)
+    lengths = x_lengths.to(x.device, torch.float)
+
+    # Draw the center and the warped position in the range of each length.
+    # The samples shorter than 2 * window + 1 are left as they are.
+    valid = lengths - window > window
+    center = window + torch.floor(
+        torch.rand(B, device=x.device) * (lengths - 2 * window).clamp(min=1)
+    )
+    warped = center - window + torch.floor(torch.rand(B, device=x.device) * 2 * window)
+    warped = torch.where(valid, warped + 1, center)
+    center, warped, lengths = center[:, None], warped[:, None], lengths[:, None]
+
+    # The source position of each output frame,
+    # following the coordinates of interpolate(align_corners=False)
+    # t, src: (Batch, Time)
+    t = torch.arange(T, device=x.device, dtype=torch.float)[None] + 0.5
+    # NOTE: clamp() only takes effect for the samples that are not warped
+    left = t * center / warped.clamp(min=1) - 0.5
+    scale = (lengths - center) / (lengths - warped).clamp(min=1)
+    right = center + (t - warped) * scale - 0.5
+    src = torch.where(t < warped, left, right)
+    src = torch.min(src.clamp(min=0.0), lengths - 1)
+
+    # grid: (Batch, Time, Freq, 2) in [-1, 1], the last dim is (freq, time)
+    grid_t = (2 * src + 1) / T - 1
+    grid_f = (2 * torch.arange(F, device=x.device, dtype=torch.float) + 1) / F - 1
+    grid = torch.stack(
+        [grid_f[None, None].expand(B, T, F), grid_t[:, :, None].expand(B, T, F)],
+        dim=-1,
+    )
+    y = torch.nn.functional.grid_sample(
+        x, grid.to(x.dtype), mode=mode, padding_mode="border", align_corners=False
+    )
+    # Keep the padding region zero
+    y = y.masked_fill((t >= lengths)[:, None, :, None], 0.0)
+    return y.view(*org_size)
+
+
 class TimeWarp(torch.nn.Module):
     """Time warping using torch.interpolate.
 
     Args:
         window: time warp parameter
         mode: Interpolate mode
+        batched: Warp each sample at its own center by one grid_sample call
+            instead of using interpolate for each sample
     """
 
-    def __init__(self, window: int = 80, mode: str = DEFAULT_TIME_WARP_MODE):
+    def __init__(
+        self,
+        window: int = 80,
+        mode: str = DEFAULT_TIME_WARP_MODE,
+        batched: bool = False,
+    ):
         super().__init__()
         self.window = window
         self.mode = mode
+        self.batched = batched
 
     def extra_repr(self):
-        return f"window={self.window}, mode={self.mode}"
+        return f"window={self.window}, mode={self.mode}, batched={self.batched}"
 
     def forward(self, x: torch.Tensor, x_lengths: torch.Tensor = None):
         """Forward function.
@@ -70,7 +146,9 @@ class TimeWarp(torch.nn.Module):
             x_lengths: (Batch,)
         """
 
-        if x_lengths is None or all(le == x_lengths[0] for le in x_lengths):
+        if self.batched:
+            y = batch_time_warp(x, x_lengths, window=self.window, mode=self.mode)
+        elif x_lengths is None or all(le == x_lengths[0] for le in x_lengths):
             # Note that applying same warping for each sample
             y = time_warp(x, window=self.window, mode=self.mode)
         else:
@@ -18,6 +18,7 @@ from espnet.nets.pytorch_backend.rnn.attentions import AttMultiHeadDot
 from espnet.nets.pytorch_backend.rnn.attentions import AttMultiHeadLoc
 from espnet.nets.pytorch_backend.rnn.attentions import AttMultiHeadMultiResLoc
 from espnet.nets.pytorch_backend.rnn.attentions import NoAtt
+from espnet.nets.pytorch_backend.transformer.attention import capture_attention
 from espnet.nets.pytorch_backend.transformer.attention import MultiHeadedAttention
 
 
@@ -128,7 +129,8 @@ def calculate_all_attentions(
                 if k + "_lengths" in batch
             }
         )
-        model(**_sample)
+        with capture_attention():
+            model(**_sample)
 
         # Derive the attention results
         for name, output in outputs.items():
@@ -1,9 +1,9 @@
-from collections import defaultdict
 import logging
 from pathlib import Path
 from typing import Dict
 from typing import Iterable
 from typing import List
+from typing import Mapping
 from typing import Optional
 from typing import Tuple
 
@@ -15,11 +15,110 @@ from typeguard import check_argument_types
 
 from espnet2.fileio.datadir_writer import DatadirWriter
 from espnet2.fileio.npy_scp import NpyScpWriter
+from espnet2.fileio.packed_array import PackedArrayWriter
+from espnet2.fileio.text_index import write_text_index
 from espnet2.torch_utils.device_funcs import to_device
 from espnet2.torch_utils.forward_adaptor import ForwardAdaptor
 from espnet2.train.abs_espnet_model import AbsESPnetModel
 
 
+def _valid_frames(
+    v: torch.Tensor, lengths: Optional[torch.Tensor] = None
+) -> torch.Tensor:
+    if lengths is not None:
+        mask = torch.arange(v.size(1), device=v.device)[None] < lengths.to(
+            v.device
+        ).view(-1, 1)
+        # (Batch, Length, Dim, ...) -> (NFrame, Dim, ...)
+        v = v[mask]
+    return v
+
+
+def batch_stats(
+    v: torch.Tensor, lengths: Optional[torch.Tensor] = None
+) -> Tuple[int, torch.Tensor, torch.Tensor]:
+    """Derive the count, the mean, and the M2 of a padded batch in float64.
+
+    Args:
+        v: (Batch, Length, Dim, ...) if lengths is given, else (Batch, Dim, ...)
+        lengths: (Batch,)
+    Returns:
+        count: The number of frames, or the number of utterances if no lengths
+        mean: (Dim, ...)
+        m2: (Dim, ...) The sum of the squared differences from the mean
+
+    """
+    v = _valid_frames(v, lengths).double()
+    count = v.size(0)
+    if count == 0:
+        return 0, v.new_zeros(v.shape[1:]), v.new_zeros(v.shape[1:])
+    mean = v.mean(0)
+    m2 = ((v - mean) ** 2).sum(0)
+    return count, mean, m2
+
+
+def batch_sums(
+    v: torch.Tensor, lengths: Optional[torch.Tensor] = None
+) -> Tuple[torch.Tensor, torch.Tensor]:
+    """Derive the sum and the square sum of a padded batch without casting.
+
+    They are accumulated in the dtype of v if it's float, or in int64.
+
+    Returns:
+        sum: (Dim, ...)
+        sum_square: (Dim, ...)
+
+    """
+    v = _valid_frames(v, lengths)
+    return v.sum(0), (v ** 2).sum(0)
+
+
+def merge_stats(a: Tuple, b: Tuple) -> Tuple:
+    """Merge two (count, mean, m2) by the parallel algorithm of Chan et al.
+
+    This works with both of torch.Tensor and np.ndarray.
+    """
+    count_a, mean_a, m2_a = a
+    count_b, mean_b, m2_b = b
+    if count_a == 0:
+        return b
+    if count_b == 0:
+        return a
+    count = count_a + count_b
+    delta = mean_b - mean_a
+    mean = mean_a + delta * (count_b / count)
+    m2 = m2_a + m2_b + delta ** 2 * (count_a * count_b / count)
+    return count, mean, m2
+
+
+def load_stats(stats: Mapping[str, np.ndarray]) -> Tuple[int, np.ndarray, np.ndarray]:
+    """Return (count, mean, m2) from the content of "{key}_stats.npz"."""
+    count = int(stats["count"])
+    if "mean" in stats and "m2" in stats:
+        return count, stats["mean"], stats["m2"]
+    # Written by the older version
+    sum_v = stats["sum"].astype(np.float64)
+    mean = sum_v / max(count, 1)
+    m2 = stats["sum_square"].astype(np.float64) - mean * sum_v
+    return count, mean, m2
+
+
+def save_stats(
+    path: Path,
+    stats: Tuple[int, np.ndarray, np.ndarray],
+    sums: Tuple[np.ndarray, np.ndarray],
+):
+    """Save (count, mean, m2) and (sum, sum_square) as "{key}_stats.npz".
+
+    "sum" and "sum_square" are accumulated in the dtype of the features for
+    GlobalMVN, while "mean" and "m2" are kept in float64 to merge the stats
+    precisely.
+    """
+    count, mean, m2 = stats
+    sum_v, sum_square = sums
+    np.savez(path, count=count, sum=sum_v, sum_square=sum_square, mean=mean, m2=m2)
+
+
 @torch.no_grad()
 def collect_stats(
     model: AbsESPnetModel,
@@ -29,6 +128,7 @@ def collect_stats(
     ngpu: Optional[int],
     log_interval: Optional[int],
     write_collected_feats: bool,
+    collected_feats_format: str = "packed_array",
 ) -> None:
     """Perform on collect_stats mode.
 
@@ -36,10 +136,14 @@ def collect_stats(
     and gathering statistics.
     This method is used before executing train().
 
+    The statistics are computed for the whole padded batch on the device
+    and are merged in float64.
+    The collected feats are written as a PackedArrayWriter directory per key,
+    or as a npy file per utterance if collected_feats_format="npy".
+
     """
     assert check_argument_types()
 
-    npy_scp_writers = {}
     for itr, mode in zip([train_iter, valid_iter], ["train", "valid"]):
         if log_interval is None:
             try:
@@ -47,25 +151,28 @@ def collect_stats(
             except TypeError:
                 log_interval = 100
 
-        sum_dict = defaultdict(lambda: 0)
-        sq_dict = defaultdict(lambda: 0)
-        count_dict = defaultdict(lambda: 0)
+        stats_dict = {}
+        sums_dict = {}
+        feats_writers = {}
+        batch_keys = []
 
         with DatadirWriter(output_dir / mode) as datadir_writer:
             for iiter, (keys, batch) in enumerate(itr, 1):
-                batch = to_device(batch, "cuda" if ngpu > 0 else "cpu")
-
                 # 1. Write shape file
-                for name in batch:
-                    if name.endswith("_lengths"):
-                        continue
-                    for i, (key, data) in enumerate(zip(keys, batch[name])):
-                        if f"{name}_lengths" in batch:
-                            lg = int(batch[f"{name}_lengths"][i])
-                            data = data[:lg]
-                        datadir_writer[f"{name}_shape"][key] = ",".join(
-                            map(str, data.shape)
-                        )
+                batch_keys = [k for k in batch if not k.endswith("_lengths")]
+                for name in batch_keys:
+                    writer = datadir_writer[f"{name}_shape"]
+                    shape = list(batch[name].shape[1:])
+                    if f"{name}_lengths" in batch:
+                        lengths = batch[f"{name}_lengths"].tolist()
+                    else:
+                        lengths = [None] * len(keys)
+                    for key, lg in zip(keys, lengths):
+                        if lg is not None:
+                            shape[0] = lg
+                        writer[key] = ",".join(map(str, shape))
+
+                batch = to_device(batch, "cuda" if ngpu > 0 else "cpu")
 
                 # 2. Extract feats
                 if ngpu <= 1:
@@ -79,48 +186,63 @@ def collect_stats(
                         module_kwargs=batch,
                     )
 
-                # 3. Calculate sum and square sum
+                # 3. Calculate the statistics
                 for key, v in data.items():
-                    for i, (uttid, seq) in enumerate(zip(keys, v.cpu().numpy())):
-                        # Truncate zero-padding region
-                        if f"{key}_lengths" in data:
-                            length = data[f"{key}_lengths"][i]
-                            # seq: (Length, Dim, ...)
-                            seq = seq[:length]
-                        else:
-                            # seq: (Dim, ...) -> (1, Dim, ...)
-                            seq = seq[None]
-                        # Accumulate value, its square, and count
-                        sum_dict[key] += seq.sum(0)
-                        sq_dict[key] += (seq ** 2).sum(0)
-                        count_dict[key] += len(seq)
-
-                        # 4. [Option] Write derived features as npy format file.
-                        if write_collected_feats:
-                            # Instantiate NpyScpWriter for the first iteration
-                            if (key, mode) not in npy_scp_writers:
-                                p = output_dir / mode / "collect_feats"
-                                npy_scp_writers[(key, mode)] = NpyScpWriter(
+                    lengths = data.get(f"{key}_lengths")
+                    stats = batch_stats(v, lengths)
+                    sums = batch_sums(v, lengths)
+                    if key in stats_dict:
+                        stats_dict[key] = merge_stats(stats_dict[key], stats)
+                        sums_dict[key] = tuple(
+                            a + b for a, b in zip(sums_dict[key], sums)
+                        )
+                    else:
+                        stats_dict[key] = stats
+                        sums_dict[key] = sums
+
+                    # 4. [Option] Write derived features
+                    # NOTE: Not Kaldi ark, which can't store e.g. int64 or 3-dim arrays
+                    if write_collected_feats and not key.endswith("_lengths"):
+                        if key not in feats_writers:
+                            p = output_dir / mode / "collect_feats"
+                            if collected_feats_format == "npy":
+                                feats_writers[key] = NpyScpWriter(
                                     p / f"data_{key}", p / f"{key}.scp"
                                 )
-                            # Save array as npy file
-                            npy_scp_writers[(key, mode)][uttid] = seq
+                            elif collected_feats_format == "packed_array":
+                                feats_writers[key] = PackedArrayWriter(p / key)
+                            else:
+                                raise RuntimeError(
+                                    f"Not supported: {collected_feats_format}"
+                                )
+                        v = v.cpu().numpy()
+                        if lengths is not None:
+                            lengths = lengths.tolist()
+                        for i, uttid in enumerate(keys):
+                            # Truncate zero-padding region
+                            # seq: (Length, Dim, ...) or (Dim, ...) -> (1, Dim, ...)
+                            seq = v[i][None] if lengths is None else v[i, : lengths[i]]
+                            feats_writers[key][uttid] = seq
 
                 if iiter % log_interval == 0:
                     logging.info(f"Niter: {iiter}")
 
-        for key in sum_dict:
-            np.savez(
+        for writer in feats_writers.values():
+            writer.close()
+
+        # Write the binary index to load the shape files without parsing
+        for name in batch_keys:
+            write_text_index(output_dir / mode / f"{name}_shape")
+
+        for key, (count, mean, m2) in stats_dict.items():
+            save_stats(
                 output_dir / mode / f"{key}_stats.npz",
-                count=count_dict[key],
-                sum=sum_dict[key],
-                sum_square=sq_dict[key],
+                (count, mean.cpu().numpy(), m2.cpu().numpy()),
+                tuple(v.cpu().numpy() for v in sums_dict[key]),
             )
 
         # batch_keys and stats_keys are used by aggregate_stats_dirs.py
         with (output_dir / mode / "batch_keys").open("w", encoding="utf-8") as f:
-            f.write(
-                "\n".join(filter(lambda x: not x.endswith("_lengths"), batch)) + "\n"
-            )
+            f.write("\n".join(batch_keys) + "\n")
         with (output_dir / mode / "stats_keys").open("w", encoding="utf-8") as f:
-            f.write("\n".join(sum_dict) + "\n")
+            f.write("\n".join(stats_dict) + "\n")
@@ -86,6 +86,7 @@ def build_batch_sampler(
     fold_lengths: Sequence[int] = (),
     padding: bool = True,
     utt2category_file: str = None,
+    cache_dir: str = None,
 ) -> AbsSampler:
     """Helper function to instantiate BatchSampler.
 
@@ -102,6 +103,8 @@ def build_batch_sampler(
         fold_lengths: Used for "folded" mode
         padding: Whether sequences are input as a padded tensor or not.
             used for "numel" mode
+        cache_dir: The directory to cache the mini-batches keyed by the hash of
+            the shape files. Used for "folded", "numel", or "length" mode
     """
     assert check_argument_types()
     if len(shape_files) == 0:
@@ -137,6 +140,7 @@ def build_batch_sampler(
             drop_last=drop_last,
             min_batch_size=min_batch_size,
             utt2category_file=utt2category_file,
+            cache_dir=cache_dir,
         )
 
     elif type == "numel":
@@ -148,6 +152,7 @@ def build_batch_sampler(
             drop_last=drop_last,
             padding=padding,
             min_batch_size=min_batch_size,
+            cache_dir=cache_dir,
         )
 
     elif type == "length":
@@ -159,6 +164,7 @@ def build_batch_sampler(
             drop_last=drop_last,
             padding=padding,
             min_batch_size=min_batch_size,
+            cache_dir=cache_dir,
         )
 
     else:
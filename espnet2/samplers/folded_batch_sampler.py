@@ -1,14 +1,18 @@
 from typing import Iterator
 from typing import List
+from typing import Optional
 from typing import Sequence
 from typing import Tuple
 from typing import Union
 
+import numpy as np
 from typeguard import check_argument_types
 
-from espnet2.fileio.read_text import load_num_sequence_text
 from espnet2.fileio.read_text import read_2column_text
 from espnet2.samplers.abs_sampler import AbsSampler
+from espnet2.samplers.shape_arrays import BatchList
+from espnet2.samplers.shape_arrays import load_or_make_batch_list
+from espnet2.samplers.shape_arrays import load_shape_arrays
 
 
 class FoldedBatchSampler(AbsSampler):
@@ -22,6 +26,7 @@ class FoldedBatchSampler(AbsSampler):
         sort_batch: str = "ascending",
         drop_last: bool = False,
         utt2category_file: str = None,
+        cache_dir: str = None,
     ):
         assert check_argument_types()
         assert batch_size > 0
@@ -40,52 +45,77 @@ class FoldedBatchSampler(AbsSampler):
         self.sort_batch = sort_batch
         self.drop_last = drop_last
 
-        # utt2shape: (Length, ...)
+        files = list(shape_files)
+        if utt2category_file is not None:
+            files.append(utt2category_file)
+        self.batch_list = load_or_make_batch_list(
+            cache_dir,
+            files,
+            dict(
+                sampler=self.__class__.__name__,
+                batch_size=batch_size,
+                fold_lengths=list(fold_lengths),
+                min_batch_size=min_batch_size,
+                sort_in_batch=sort_in_batch,
+                sort_batch=sort_batch,
+                drop_last=drop_last,
+                utt2category=utt2category_file is not None,
+            ),
+            lambda: self._make_batch_list(
+                fold_lengths, min_batch_size, utt2category_file
+            ),
+        )
+
+    def _make_batch_list(
+        self,
+        fold_lengths: Sequence[int],
+        min_batch_size: int,
+        utt2category_file: Optional[str],
+    ) -> BatchList:
+        # shapes: (NSample, NDim) for each shape file, e.g.
         #    uttA 100,...
         #    uttB 201,...
-        utt2shapes = [
-            load_num_sequence_text(s, loader_type="csv_int") for s in shape_files
-        ]
-
-        first_utt2shape = utt2shapes[0]
-        for s, d in zip(shape_files, utt2shapes):
-            if set(d) != set(first_utt2shape):
-                raise RuntimeError(
-                    f"keys are mismatched between {s} != {shape_files[0]}"
-                )
+        keys, shapes = load_shape_arrays(self.shape_files)
+        if len(keys) == 0:
+            raise RuntimeError(f"0 lines found: {self.shape_files[0]}")
 
         # Sort samples in ascending order
         # (shape order should be like (Length, Dim))
-        keys = sorted(first_utt2shape, key=lambda k: first_utt2shape[k][0])
-        if len(keys) == 0:
-            raise RuntimeError(f"0 lines found: {shape_files[0]}")
+        order = np.argsort(shapes[0][:, 0], kind="stable")
+        keys = [keys[i] for i in order]
+        # factors: (NSample,)
+        factors = np.max(
+            [sh[order, 0] // m for sh, m in zip(shapes, fold_lengths)], axis=0
+        )
 
-        category2utt = {}
+        category2indices = {}
         if utt2category_file is not None:
             utt2category = read_2column_text(utt2category_file)
-            if set(utt2category) != set(first_utt2shape):
+            if set(utt2category) != set(keys):
                 raise RuntimeError(
                     "keys are mismatched between "
-                    f"{utt2category_file} != {shape_files[0]}"
+                    f"{utt2category_file} != {self.shape_files[0]}"
                 )
-            for k in keys:
-                category2utt.setdefault(utt2category[k], []).append(k)
+            for i, k in enumerate(keys):
+                category2indices.setdefault(utt2category[k], []).append(i)
         else:
-            category2utt["default_category"] = keys
-
-        self.batch_list = []
-        for d, v in category2utt.items():
-            category_keys = v
+            category2indices["default_category"] = list(range(len(keys)))
+
+        sorted_keys = []
+        starts = []
+        ends = []
+        for indices in category2indices.values():
+            category_keys = [keys[i] for i in indices]
+            category_factors = factors[indices]
             # Decide batch-sizes
             start = 0
             batch_sizes = []
             while True:
-                k = category_keys[start]
-                factor = max(int(d[k][0] / m) for d, m in zip(utt2shapes, fold_lengths))
-                bs = max(min_batch_size, int(batch_size / (1 + factor)))
+                factor = int(category_factors[start])
+                bs = max(min_batch_size, int(self.batch_size / (1 + factor)))
                 if self.drop_last and start + bs > len(category_keys):
                     # This if-block avoids 0-batches
-                    if len(self.batch_list) > 0:
+                    if len(starts) > 0:
                         break
 
                 bs = min(len(category_keys) - start, bs)
@@ -111,33 +141,18 @@ class FoldedBatchSampler(AbsSampler):
                 ), f"{sum(batch_sizes)} != {len(category_keys)}"
 
             # Set mini-batch
-            cur_batch_list = []
-            start = 0
-            for bs in batch_sizes:
-                assert len(category_keys) >= start + bs, "Bug"
-                minibatch_keys = category_keys[start : start + bs]
-                start += bs
-                if sort_in_batch == "descending":
-                    minibatch_keys.reverse()
-                elif sort_in_batch == "ascending":
-                    # Key are already sorted in ascending
-                    pass
-                else:
-                    raise ValueError(
-                        "sort_in_batch must be ascending or "
-                        f"descending: {sort_in_batch}"
-                    )
-                cur_batch_list.append(tuple(minibatch_keys))
-
-            if sort_batch == "ascending":
-                pass
-            elif sort_batch == "descending":
-                cur_batch_list.reverse()
-            else:
-                raise ValueError(
-                    f"sort_batch must be ascending or descending: {sort_batch}"
-                )
-            self.batch_list.extend(cur_batch_list)
+            cur_ends = len(sorted_keys) + np.cumsum(batch_sizes)
+            cur_starts = cur_ends - np.array(batch_sizes)
+            if self.sort_batch == "descending":
+                cur_starts, cur_ends = cur_starts[::-1], cur_ends[::-1]
+            starts.extend(cur_starts)
+            ends.extend(cur_ends)
+            sorted_keys.extend(category_keys)
+
+        # Keys are sorted in ascending in each mini-batch
+        return BatchList(
+            sorted_keys, starts, ends, reverse=self.sort_in_batch == "descending"
+        )
 
     def __repr__(self):
         return (
@@ -0,0 +1,105 @@
+from typing import Iterator
+from typing import List
+from typing import Optional
+from typing import Sequence
+from typing import Tuple
+from typing import Union
+
+import numpy as np
+from typeguard import check_argument_types
+
+from espnet2.samplers.abs_sampler import AbsSampler
+from espnet2.samplers.shape_arrays import BatchList
+from espnet2.samplers.shape_arrays import load_shape_arrays
+from espnet2.samplers.shape_arrays import make_sorted_batch_list
+
+
+class InferenceBatchSampler(AbsSampler):
+    """Mini-batches of the utterances bucketed by their lengths for inference.
+
+    The utterances are sorted by the lengths in the shape files and split into
+    mini-batches whose padded size, i.e. batch_size x max_length, doesn't exceed
+    batch_bins. If batch_bins is 0, each mini-batch has batch_size utterances.
+    Unlike the samplers for training, every utterance is used exactly once
+    and the original order is kept in "keys" to restore it in the outputs.
+
+    Args:
+        shape_files: The shape files, e.g. "speech_shape", whose first dimension
+            is the length. The lengths are summed over the files.
+        batch_bins: The maximum of batch_size x max_length in a mini-batch
+        batch_size: The batch size used if batch_bins is 0
+        keys: The utterances to be processed in the original order,
+            e.g. the keys of "--key_file". All keys in the first shape file
+            are used by default.
+
+    """
+
+    def __init__(
+        self,
+        shape_files: Union[Tuple[str, ...], List[str]],
+        batch_bins: int = 0,
+        batch_size: int = 1,
+        keys: Optional[Sequence[str]] = None,
+    ):
+        assert check_argument_types()
+        assert batch_bins >= 0 and batch_size > 0, (batch_bins, batch_size)
+        self.shape_files = shape_files
+        self.batch_bins = batch_bins
+        self.batch_size = batch_size
+
+        all_keys, shapes = load_shape_arrays(shape_files)
+        costs = sum(sh[:, 0] for sh in shapes)
+        if keys is None:
+            keys = all_keys
+        else:
+            key2idx = {k: i for i, k in enumerate(all_keys)}
+            missing = [k for k in keys if k not in key2idx]
+            if len(missing) > 0:
+                raise RuntimeError(
+                    f"{len(missing)} keys are not found in {shape_files[0]}, "
+                    f"e.g. {missing[0]}"
+                )
+            costs = costs[[key2idx[k] for k in keys]]
+        if len(keys) == 0:
+            raise RuntimeError(f"0 lines found: {shape_files[0]}")
+        self.keys = list(keys)
+
+        # NOTE: The longest mini-batch comes first to notice OOM at the beginning
+        order = np.argsort(costs, kind="stable")
+        sorted_keys = [self.keys[i] for i in order]
+        self.costs = costs[order]
+        if batch_bins > 0:
+            self.batch_list = make_sorted_batch_list(
+                sorted_keys,
+                self.costs,
+                batch_bins=batch_bins,
+                sort_in_batch="descending",
+                sort_batch="descending",
+            )
+        else:
+            # Split from the longest one, so the last mini-batch can be smaller
+            ends = np.arange(len(sorted_keys), 0, -batch_size)
+            starts = np.maximum(ends - batch_size, 0)
+            self.batch_list = BatchList(sorted_keys, starts, ends, reverse=True)
+
+    @property
+    def padding_efficiency(self) -> float:
+        """The ratio of the actual lengths to the padded lengths of all batches."""
+        starts, ends = self.batch_list.starts, self.batch_list.ends
+        # The costs are sorted in ascending order, so the last one is the max
+        padded = ((ends - starts) * self.costs[ends - 1]).sum()
+        return float(self.costs.sum() / max(padded, 1))
+
+    def __repr__(self):
+        return (
+            f"{self.__class__.__name__}("
+            f"N-batch={len(self)}, "
+            f"batch_bins={self.batch_bins}, "
+            f"batch_size={self.batch_size})"
+        )
+
+    def __len__(self):
+        return len(self.batch_list)
+
+    def __iter__(self) -> Iterator[Tuple[str, ...]]:
+        return iter(self.batch_list)
@@ -0,0 +1,320 @@
+"""Array-backed utilities for the batch samplers.
+
+The shape files are loaded as integer arrays instead of dicts of lists,
+and mini-batches are kept as the slices of a sorted key list.
+"""
+import collections.abc
+import hashlib
+import logging
+from pathlib import Path
+from typing import Callable
+from typing import List
+from typing import Optional
+from typing import Sequence
+from typing import Tuple
+from typing import Union
+
+import numpy as np
+
+from espnet2.fileio.text_index import load_text_index
+from espnet2.fileio.text_index import TextIndexReader
+
+
+class BatchList(collections.abc.Sequence):
+    """Mini-batches as the slices of a key list.
+
+    The i-th mini-batch is keys[starts[i]:ends[i]], reversed if "reverse".
+    The key tuples are created only when accessed.
+
+    Examples:
+        >>> batches = BatchList(["a", "b", "c"], [0, 2], [2, 3])
+        >>> list(batches)
+        [('a', 'b'), ('c',)]
+
+    """
+
+    def __init__(
+        self,
+        keys: List[str],
+        starts: Union[np.ndarray, Sequence[int]],
+        ends: Union[np.ndarray, Sequence[int]],
+        reverse: bool = False,
+    ):
+        self.keys = keys
+        self.starts = np.asarray(starts, dtype=np.int64)
+        self.ends = np.asarray(ends, dtype=np.int64)
+        self.reverse = reverse
+        assert len(self.starts) == len(self.ends), (len(starts), len(ends))
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def __getitem__(self, idx):
+        if isinstance(idx, slice):
+            return [self[i] for i in range(*idx.indices(len(self)))]
+        batch = self.keys[self.starts[idx] : self.ends[idx]]
+        if self.reverse:
+            batch.reverse()
+        return tuple(batch)
+
+    def batch_sizes(self) -> np.ndarray:
+        return self.ends - self.starts
+
+
+def _load_shape_file(path: Union[Path, str]) -> Tuple[List[str], np.ndarray]:
+    index = load_text_index(path)
+    if index is not None and index.has_shapes:
+        # Use the binary index written by write_text_index()
+        return index.keys_in_order(), index.shapes_in_order().astype(np.int64)
+
+    keys = []
+    values = []
+    with Path(path).open("r", encoding="utf-8") as f:
+        for linenum, line in enumerate(f, 1):
+            sps = line.rstrip().split(maxsplit=1)
+            if len(sps) != 2:
+                raise RuntimeError(
+                    f"The shape file must have 2 columns: {line} ({path}:{linenum})"
+                )
+            keys.append(sps[0])
+            values.append(sps[1])
+    if len(values) == 0:
+        return keys, np.zeros((0, 1), dtype=np.int64)
+
+    ndim = values[0].count(",") + 1
+    if all(v.count(",") + 1 == ndim for v in values):
+        # Parse all values at once
+        shapes = np.fromstring(",".join(values), dtype=np.int64, sep=",")
+        if len(shapes) != len(values) * ndim:
+            raise RuntimeError(f"Failed to parse {path} as integers")
+        return keys, shapes.reshape(len(values), ndim)
+
+    # The number of dimensions varies: Pad with 1 which doesn't change the size
+    ndim = max(v.count(",") + 1 for v in values)
+    shapes = np.ones((len(values), ndim), dtype=np.int64)
+    for i, v in enumerate(values):
+        shape = [int(x) for x in v.split(",")]
+        shapes[i, : len(shape)] = shape
+    return keys, shapes
+
+
+def _same_keys(a: TextIndexReader, b: TextIndexReader) -> bool:
+    return (
+        len(a) == len(b)
+        and np.array_equal(a.arrays["key_offsets"], b.arrays["key_offsets"])
+        and np.array_equal(a.arrays["keys"], b.arrays["keys"])
+    )
+
+
+def load_shape_arrays(
+    shape_files: Sequence[Union[Path, str]],
+) -> Tuple[List[str], List[np.ndarray]]:
+    """Load the shape files as arrays aligned to the keys of the first file.
+
+    Examples:
+        shape1: (Length, Dim)
+            uttA 100,80
+            uttB 201,80
+        shape2: (Length,)
+            uttB 12
+            uttA 10
+
+        >>> keys, (shape1, shape2) = load_shape_arrays(['shape1', 'shape2'])
+        >>> keys
+        ['uttA', 'uttB']
+        >>> shape2
+        array([[10], [12]])
+
+    Returns:
+        keys: The keys in the order of the first shape file
+        shapes: (NSample, NDim) int64 array for each shape file
+
+    """
+    indices = [load_text_index(path) for path in shape_files]
+    if all(
+        index is not None and index.has_shapes and _same_keys(index, indices[0])
+        for index in indices
+    ):
+        # Align the shapes with the sorted positions without hashing the keys
+        order = indices[0].arrays["order"]
+        return indices[0].keys_in_order(), [
+            np.asarray(index.arrays["shapes"])[order].astype(np.int64)
+            for index in indices
+        ]
+
+    keys = None
+    key2idx = None
+    shapes = []
+    for path in shape_files:
+        _keys, shape = _load_shape_file(path)
+        if keys is None:
+            keys = _keys
+            key2idx = {k: i for i, k in enumerate(keys)}
+            if len(key2idx) != len(keys):
+                raise RuntimeError(f"The keys are duplicated in {path}")
+        else:
+            idx = np.fromiter(
+                (key2idx.get(k, -1) for k in _keys), dtype=np.int64, count=len(_keys)
+            )
+            if (
+                len(_keys) != len(keys)
+                or (idx < 0).any()
+                or len(np.unique(idx)) != len(keys)
+            ):
+                raise RuntimeError(
+                    f"keys are mismatched between {path} != {shape_files[0]}"
+                )
+            aligned = np.empty_like(shape)
+            aligned[idx] = shape
+            shape = aligned
+        shapes.append(shape)
+    return keys, shapes
+
+
+def greedy_batch_sizes(
+    costs: np.ndarray,
+    batch_bins: int,
+    min_batch_size: int = 1,
+    padding: bool = True,
+) -> Tuple[List[int], int]:
+    """Split the samples into mini-batches from the head greedily.
+
+    A mini-batch is closed when its bins exceed batch_bins and it has
+    min_batch_size samples at least.
+
+    Args:
+        costs: (NSample,) If padding, the bins of a mini-batch is
+            (batch_size x the cost of the last sample), else the sum of the costs.
+        batch_bins: The maximum bins of a mini-batch
+        min_batch_size: The minimum batch size
+        padding: Whether sequences are input as a padded tensor or not.
+    Returns:
+        batch_sizes: The sizes of the closed mini-batches
+        remainder: The number of the rest samples
+
+    """
+    batch_sizes = []
+    num_samples = len(costs)
+    start = 0
+    if not padding:
+        # The bins of [start, end) is cumsum[end] - cumsum[start]
+        cumsum = np.concatenate([[0], np.cumsum(costs)])
+        while start < num_samples:
+            end = int(np.searchsorted(cumsum, cumsum[start] + batch_bins, side="right"))
+            bs = max(end - start, min_batch_size)
+            if start + bs > num_samples:
+                break
+            batch_sizes.append(bs)
+            start += bs
+        return batch_sizes, num_samples - start
+
+    window = 16
+    while start < num_samples:
+        # Search the first position exceeding batch_bins in a growing window
+        while True:
+            end = min(num_samples, start + window)
+            bs = np.arange(1, end - start + 1)
+            over = (bs * costs[start:end] > batch_bins) & (bs >= min_batch_size)
+            if over.any() or end == num_samples:
+                break
+            window *= 2
+        if not over.any():
+            break
+        bs = int(np.argmax(over)) + 1
+        batch_sizes.append(bs)
+        start += bs
+        window = max(16, 2 * bs)
+    return batch_sizes, num_samples - start
+
+
+def make_sorted_batch_list(
+    keys: List[str],
+    costs: np.ndarray,
+    batch_bins: int,
+    min_batch_size: int = 1,
+    sort_in_batch: str = "descending",
+    sort_batch: str = "ascending",
+    drop_last: bool = False,
+    padding: bool = True,
+) -> BatchList:
+    """Make mini-batches of the keys sorted in ascending order of the length.
+
+    See greedy_batch_sizes() for costs.
+    """
+    batch_sizes, remainder = greedy_batch_sizes(
+        costs, batch_bins, min_batch_size=min_batch_size, padding=padding
+    )
+    if remainder != 0 and (not drop_last or len(batch_sizes) == 0):
+        batch_sizes.append(remainder)
+
+    if len(batch_sizes) == 0:
+        # Maybe we can't reach here
+        raise RuntimeError("0 batches")
+
+    # If the last batch-size is smaller than minimum batch_size,
+    # the samples are redistributed to the other mini-batches
+    if len(batch_sizes) > 1 and batch_sizes[-1] < min_batch_size:
+        for i in range(batch_sizes.pop(-1)):
+            batch_sizes[-(i % len(batch_sizes)) - 1] += 1
+
+    if not drop_last:
+        # Bug check
+        assert sum(batch_sizes) == len(keys), f"{sum(batch_sizes)} != {len(keys)}"
+
+    ends = np.cumsum(batch_sizes)
+    starts = ends - np.array(batch_sizes)
+    if sort_batch == "descending":
+        starts, ends = starts[::-1], ends[::-1]
+    # Keys are sorted in ascending in each mini-batch
+    return BatchList(keys, starts, ends, reverse=sort_in_batch == "descending")
+
+
+def _hash_files(paths: Sequence[Union[Path, str]]) -> str:
+    h = hashlib.sha1()
+    for p in paths:
+        with Path(p).open("rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                h.update(chunk)
+    return h.hexdigest()
+
+
+def load_or_make_batch_list(
+    cache_dir: Optional[Union[Path, str]],
+    files: Sequence[Union[Path, str]],
+    params: dict,
+    make_batch_list: Callable[[], BatchList],
+) -> BatchList:
+    """Load the mini-batches from the cache or make and cache them.
+
+    The cache file is keyed by the hash of the contents of the given files
+    and the parameters of the sampler, so it is invalidated if either changes.
+    """
+    if cache_dir is None:
+        return make_batch_list()
+
+    cache_key = _hash_files(files) + repr(sorted(params.items()))
+    cache = Path(cache_dir) / (hashlib.sha1(cache_key.encode()).hexdigest() + ".npz")
+    if cache.exists():
+        logging.info(f"Loading the mini-batches from {cache}")
+        with np.load(cache) as d:
+            keys = d["keys"].tobytes().decode("utf-8").split("\n")
+            return BatchList(keys, d["starts"], d["ends"], reverse=bool(d["reverse"]))
+
+    batch_list = make_batch_list()
+    try:
+        cache.parent.mkdir(parents=True, exist_ok=True)
+        # NOTE: Write to a temporary file and rename it for the other processes
+        tmp = cache.with_suffix(f".{np.random.randint(1 << 30)}.tmp.npz")
+        np.savez(
+            tmp,
+            keys=np.frombuffer(
+                "\n".join(batch_list.keys).encode("utf-8"), dtype=np.uint8
+            ),
+            starts=batch_list.starts,
+            ends=batch_list.ends,
+            reverse=batch_list.reverse,
+        )
+        tmp.rename(cache)
+    except OSError as e:
+        logging.warning(f"Failed to write the mini-batch cache: {e}")
+    return batch_list
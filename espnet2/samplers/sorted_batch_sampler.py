@@ -2,10 +2,11 @@ import logging
 from typing import Iterator
 from typing import Tuple
 
+import numpy as np
 from typeguard import check_argument_types
 
-from espnet2.fileio.read_text import load_num_sequence_text
 from espnet2.samplers.abs_sampler import AbsSampler
+from espnet2.samplers.shape_arrays import load_shape_arrays
 
 
 class SortedBatchSampler(AbsSampler):
@@ -37,18 +38,19 @@ class SortedBatchSampler(AbsSampler):
         # utt2shape: (Length, ...)
         #    uttA 100,...
         #    uttB 201,...
-        utt2shape = load_num_sequence_text(shape_file, loader_type="csv_int")
+        keys, (shapes,) = load_shape_arrays([shape_file])
         if sort_in_batch == "descending":
             # Sort samples in descending order (required by RNN)
-            keys = sorted(utt2shape, key=lambda k: -utt2shape[k][0])
+            order = np.argsort(-shapes[:, 0], kind="stable")
         elif sort_in_batch == "ascending":
             # Sort samples in ascending order
-            keys = sorted(utt2shape, key=lambda k: utt2shape[k][0])
+            order = np.argsort(shapes[:, 0], kind="stable")
         else:
             raise ValueError(
                 f"sort_in_batch must be either one of "
                 f"ascending, descending, or None: {sort_in_batch}"
             )
+        keys = [keys[i] for i in order]
         if len(keys) == 0:
             raise RuntimeError(f"0 lines found: {shape_file}")
 
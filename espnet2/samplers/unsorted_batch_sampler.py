@@ -4,6 +4,7 @@ from typing import Tuple
 
 from typeguard import check_argument_types
 
+from espnet2.fileio.read_text import load_2column_text
 from espnet2.fileio.read_text import read_2column_text
 from espnet2.samplers.abs_sampler import AbsSampler
 
@@ -37,7 +38,7 @@ class UnsortedBatchSampler(AbsSampler):
         # utt2shape:
         #    uttA <anything is o.k>
         #    uttB <anything is o.k>
-        utt2any = read_2column_text(key_file)
+        utt2any = load_2column_text(key_file)
         if len(utt2any) == 0:
             logging.warning(f"{key_file} is empty")
         # In this case the, the first column in only used
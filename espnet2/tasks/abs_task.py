@@ -17,6 +17,7 @@ from typing import Optional
 from typing import Sequence
 from typing import Tuple
 from typing import Union
+import zipfile
 
 import humanfriendly
 import numpy as np
@@ -32,6 +33,7 @@ import yaml
 
 from espnet import __version__
 from espnet.utils.cli_utils import get_commandline_args
+from espnet2.fileio.read_text import read_2column_text
 from espnet2.iterators.abs_iter_factory import AbsIterFactory
 from espnet2.iterators.chunk_iter_factory import ChunkIterFactory
 from espnet2.iterators.multiple_iter_factory import MultipleIterFactory
@@ -40,15 +42,19 @@ from espnet2.main_funcs.collect_stats import collect_stats
 from espnet2.optimizers.sgd import SGD
 from espnet2.samplers.build_batch_sampler import BATCH_TYPES
 from espnet2.samplers.build_batch_sampler import build_batch_sampler
+from espnet2.samplers.inference_batch_sampler import InferenceBatchSampler
 from espnet2.samplers.unsorted_batch_sampler import UnsortedBatchSampler
 from espnet2.schedulers.noam_lr import NoamLR
 from espnet2.schedulers.warmup_lr import WarmupLR
+from espnet2.torch_utils.initialize import skip_initialization
 from espnet2.torch_utils.load_pretrained_model import load_pretrained_model
 from espnet2.torch_utils.model_summary import model_summary
 from espnet2.torch_utils.pytorch_version import pytorch_cudnn_version
 from espnet2.torch_utils.set_all_random_seed import set_all_random_seed
 from espnet2.train.abs_espnet_model import AbsESPnetModel
 from espnet2.train.class_choices import ClassChoices
+from espnet2.train.collate_fn import CollateBufferPool
+from espnet2.train.collate_fn import CommonCollateFn
 from espnet2.train.dataset import AbsDataset
 from espnet2.train.dataset import DATA_TYPES
 from espnet2.train.dataset import ESPnetDataset
@@ -433,6 +439,14 @@ class AbsTask(ABC):
             default=False,
             help='Write the output features from the model when "collect stats" mode',
         )
+        group.add_argument(
+            "--collected_feats_format",
+            type=str,
+            default="packed_array",
+            choices=["packed_array", "npy"],
+            help="The format of --write_collected_feats: A packed_array directory "
+            "per feature, or a npy file per utterance",
+        )
 
         group = parser.add_argument_group("Trainer related")
         group.add_argument(
@@ -588,6 +602,22 @@ class AbsTask(ABC):
             default=-1,
             help="Set the model log period",
         )
+        group.add_argument(
+            "--profile_spans",
+            type=str2bool,
+            default=False,
+            help="Report the time of the named spans in the hot paths, "
+            'e.g. "frontend", "encoder", and "decoder", as "{name}_time"',
+        )
+        group.add_argument(
+            "--profile_window",
+            type=int,
+            nargs=2,
+            default=None,
+            help="Capture the profile of torch.profiler for the training "
+            "iterations [START, START + NUM) counted over all epochs "
+            'and write it as Chrome trace to "{output_dir}/profile"',
+        )
         group.add_argument(
             "--detect_anomaly",
             type=str2bool,
@@ -701,6 +731,14 @@ class AbsTask(ABC):
             choices=["descending", "ascending"],
             help="Sort mini-batches by the sample lengths",
         )
+        group.add_argument(
+            "--batch_cache_dir",
+            type=str_or_none,
+            default=None,
+            help="Cache the mini-batches in this directory. "
+            "The cache is keyed by the hash of the shape files and "
+            "the batch options, and is reused across runs and DDP ranks",
+        )
         group.add_argument(
             "--multiple_iterator",
             type=str2bool,
@@ -783,6 +821,14 @@ class AbsTask(ABC):
             "as opened for ark files. "
             "This feature is only valid when data type is 'kaldi_ark'.",
         )
+        group.add_argument(
+            "--collate_buffer_pool_size",
+            type=int,
+            default=0,
+            help="The number of the buffers of the padded mini-batches "
+            "reused by CommonCollateFn in each DataLoader worker. "
+            "0 indicates allocating new ones for every mini-batch",
+        )
         group.add_argument(
             "--valid_max_cache_size",
             type=humanfriendly_parse_size_or_none,
@@ -1210,6 +1256,7 @@ class AbsTask(ABC):
                 ngpu=args.ngpu,
                 log_interval=args.log_interval,
                 write_collected_feats=args.write_collected_feats,
+                collected_feats_format=args.collected_feats_format,
             )
         else:
 
@@ -1365,6 +1412,15 @@ class AbsTask(ABC):
         else:
             raise NotImplementedError(f"mode={mode}")
 
+        if isinstance(collate_fn, CommonCollateFn):
+            # NOTE: Collated into the page-locked memory for DataLoader(pin_memory)
+            #   if num_workers=0
+            collate_fn.pin_memory = args.ngpu > 0
+            if args.collate_buffer_pool_size > 0:
+                collate_fn.buffer_pool = CollateBufferPool(
+                    args.collate_buffer_pool_size
+                )
+
         return IteratorOptions(
             preprocess_fn=preprocess_fn,
             collate_fn=collate_fn,
@@ -1483,6 +1539,7 @@ class AbsTask(ABC):
             if iter_options.distributed
             else 1,
             utt2category_file=utt2category_file,
+            cache_dir=args.batch_cache_dir,
         )
 
         batches = list(batch_sampler)
@@ -1680,7 +1737,11 @@ class AbsTask(ABC):
             else None
             for i in range(num_splits)
         ]
-        max_cache_size = iter_options.max_cache_size / num_splits
+        max_cache_size_list = cls._split_max_cache_size(
+            iter_options.max_cache_size,
+            num_splits,
+            [path for path, _, _ in iter_options.data_path_and_name_and_type],
+        )
 
         # Note that iter-factories are built for each epoch at runtime lazily.
         build_funcs = [
@@ -1693,17 +1754,19 @@ class AbsTask(ABC):
                     data_path_and_name_and_type=_data_path_and_name_and_type,
                     shape_files=_shape_files,
                     num_iters_per_epoch=_num_iters_per_epoch,
-                    max_cache_size=max_cache_size,
+                    max_cache_size=_max_cache_size,
                 ),
             )
             for (
                 _data_path_and_name_and_type,
                 _shape_files,
                 _num_iters_per_epoch,
+                _max_cache_size,
             ) in zip(
                 data_path_and_name_and_type_list,
                 shape_files_list,
                 num_iters_per_epoch_list,
+                max_cache_size_list,
             )
         ]
 
@@ -1712,6 +1775,25 @@ class AbsTask(ABC):
             build_funcs=build_funcs, shuffle=iter_options.train, seed=args.seed
         )
 
+    @staticmethod
+    def _split_max_cache_size(
+        max_cache_size: float, num_splits: int, paths: Sequence[str]
+    ) -> List[float]:
+        """Share max_cache_size by the splits in proportion to their sizes.
+
+        The sizes are read from "split_manifest" written by split_scps,
+        and the cache size is divided equally if it is not found.
+        """
+        for path in paths:
+            p = Path(path) / "split_manifest"
+            if p.exists():
+                with p.open("r", encoding="utf-8") as f:
+                    # e.g. "split.0 <num_lines> [<total_length>]"
+                    sizes = [float(line.split()[-1]) for line in f]
+                if len(sizes) == num_splits and sum(sizes) > 0:
+                    return [max_cache_size * s / sum(sizes) for s in sizes]
+        return [max_cache_size / num_splits] * num_splits
+
     @classmethod
     def build_streaming_iterator(
         cls,
@@ -1725,8 +1807,17 @@ class AbsTask(ABC):
         allow_variable_data_keys: bool = False,
         ngpu: int = 0,
         inference: bool = False,
+        shape_files: Sequence[str] = None,
+        batch_bins: int = 0,
     ) -> DataLoader:
-        """Build DataLoader using iterable dataset"""
+        """Build DataLoader using iterable dataset
+
+        If shape_files are given, the utterances are bucketed by their lengths
+        using InferenceBatchSampler instead of iterating them in the order
+        of key_file, so that batch_size or batch_bins can be increased with
+        less padding. The sampler is available as "DataLoader.batch_sampler"
+        to restore the original order of the outputs.
+        """
         assert check_argument_types()
         # For backward compatibility for pytorch DataLoader
         if collate_fn is not None:
@@ -1734,6 +1825,38 @@ class AbsTask(ABC):
         else:
             kwargs = {}
 
+        if shape_files is not None and len(shape_files) > 0:
+            dataset = ESPnetDataset(
+                data_path_and_name_and_type,
+                float_dtype=dtype,
+                preprocess=preprocess_fn,
+            )
+            cls.check_task_requirements(
+                dataset, allow_variable_data_keys, train=False, inference=inference
+            )
+            if Path(
+                Path(data_path_and_name_and_type[0][0]).parent, "utt2category"
+            ).exists():
+                # NOTE: The utterances of different categories can't be mixed
+                logging.warning("utt2category is found. batch_size is set to 1")
+                batch_size, batch_bins = 1, 0
+            batch_sampler = InferenceBatchSampler(
+                shape_files,
+                batch_bins=batch_bins,
+                batch_size=batch_size,
+                keys=None if key_file is None else list(read_2column_text(key_file)),
+            )
+            logging.info(f"Inference batch sampler: {batch_sampler}")
+            return DataLoader(
+                dataset=dataset,
+                batch_sampler=batch_sampler,
+                pin_memory=ngpu > 0,
+                num_workers=num_workers,
+                **kwargs,
+            )
+        elif batch_bins > 0:
+            raise RuntimeError("batch_bins requires the shape files")
+
         dataset = IterableESPnetDataset(
             data_path_and_name_and_type,
             float_dtype=dtype,
@@ -1778,17 +1901,38 @@ class AbsTask(ABC):
         with config_file.open("r", encoding="utf-8") as f:
             args = yaml.safe_load(f)
         args = argparse.Namespace(**args)
-        model = cls.build_model(args)
+        if model_file is None:
+            model = cls.build_model(args)
+        else:
+            # NOTE: All parameters are overwritten by the checkpoint,
+            #   so the random initialization is skipped
+            init = getattr(args, "init", None)
+            args.init = None
+            try:
+                with skip_initialization():
+                    model = cls.build_model(args)
+            finally:
+                args.init = init
         if not isinstance(model, AbsESPnetModel):
             raise RuntimeError(
                 f"model must inherit {AbsESPnetModel.__name__}, but got {type(model)}"
             )
-        model.to(device)
         if model_file is not None:
-            if device == "cuda":
-                # NOTE(kamo): "cuda" for torch.load always indicates cuda:0
-                #   in PyTorch<=1.4
-                device = f"cuda:{torch.cuda.current_device()}"
-            model.load_state_dict(torch.load(model_file, map_location=device))
+            # Load on cpu, by memory map if possible, and copy into the model
+            # before moving it, to avoid holding two copies of the weights on device
+            load_kwargs = {}
+            # NOTE: The legacy format, i.e. _use_new_zipfile_serialization=False,
+            #   can't be memory-mapped
+            mmap = LooseVersion(torch.__version__) >= LooseVersion("2.1.0")
+            if mmap and zipfile.is_zipfile(model_file):
+                load_kwargs["mmap"] = True
+            state_dict = torch.load(model_file, map_location="cpu", **load_kwargs)
+            model.load_state_dict(state_dict)
+            del state_dict
+        if device == "cuda":
+            # NOTE(kamo): "cuda" for torch.load always indicates cuda:0
+            #   in PyTorch<=1.4
+            device = f"cuda:{torch.cuda.current_device()}"
+        model.to(device)
 
         return model, args
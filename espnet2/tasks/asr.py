@@ -14,38 +14,12 @@ from typeguard import check_return_type
 
 from espnet2.asr.ctc import CTC
 from espnet2.asr.decoder.abs_decoder import AbsDecoder
-from espnet2.asr.decoder.rnn_decoder import RNNDecoder
-from espnet2.asr.decoder.transformer_decoder import (
-    DynamicConvolution2DTransformerDecoder,  # noqa: H301
-)
-from espnet2.asr.decoder.transformer_decoder import DynamicConvolutionTransformerDecoder
-from espnet2.asr.decoder.transformer_decoder import (
-    LightweightConvolution2DTransformerDecoder,  # noqa: H301
-)
-from espnet2.asr.decoder.transformer_decoder import (
-    LightweightConvolutionTransformerDecoder,  # noqa: H301
-)
-from espnet2.asr.decoder.transformer_decoder import TransformerDecoder
 from espnet2.asr.encoder.abs_encoder import AbsEncoder
-from espnet2.asr.encoder.conformer_encoder import ConformerEncoder
-from espnet2.asr.encoder.rnn_encoder import RNNEncoder
-from espnet2.asr.encoder.transformer_encoder import TransformerEncoder
-from espnet2.asr.encoder.contextual_block_transformer_encoder import (
-    ContextualBlockTransformerEncoder,  # noqa: H301
-)
-from espnet2.asr.encoder.vgg_rnn_encoder import VGGRNNEncoder
-from espnet2.asr.encoder.wav2vec2_encoder import FairSeqWav2Vec2Encoder
 from espnet2.asr.espnet_model import ESPnetASRModel
 from espnet2.asr.frontend.abs_frontend import AbsFrontend
-from espnet2.asr.frontend.default import DefaultFrontend
-from espnet2.asr.frontend.windowing import SlidingWindow
 from espnet2.asr.preencoder.abs_preencoder import AbsPreEncoder
-from espnet2.asr.preencoder.sinc import LightweightSincConvs
 from espnet2.asr.specaug.abs_specaug import AbsSpecAug
-from espnet2.asr.specaug.specaug import SpecAug
 from espnet2.layers.abs_normalize import AbsNormalize
-from espnet2.layers.global_mvn import GlobalMVN
-from espnet2.layers.utterance_mvn import UtteranceMVN
 from espnet2.tasks.abs_task import AbsTask
 from espnet2.torch_utils.initialize import initialize
 from espnet2.train.class_choices import ClassChoices
@@ -61,13 +35,16 @@ from espnet2.utils.types import str_or_none
 
 frontend_choices = ClassChoices(
     name="frontend",
-    classes=dict(default=DefaultFrontend, sliding_window=SlidingWindow),
+    classes=dict(
+        default="espnet2.asr.frontend.default.DefaultFrontend",
+        sliding_window="espnet2.asr.frontend.windowing.SlidingWindow",
+    ),
     type_check=AbsFrontend,
     default="default",
 )
 specaug_choices = ClassChoices(
     name="specaug",
-    classes=dict(specaug=SpecAug),
+    classes=dict(specaug="espnet2.asr.specaug.specaug.SpecAug"),
     type_check=AbsSpecAug,
     default=None,
     optional=True,
@@ -75,8 +52,8 @@ specaug_choices = ClassChoices(
 normalize_choices = ClassChoices(
     "normalize",
     classes=dict(
-        global_mvn=GlobalMVN,
-        utterance_mvn=UtteranceMVN,
+        global_mvn="espnet2.layers.global_mvn.GlobalMVN",
+        utterance_mvn="espnet2.layers.utterance_mvn.UtteranceMVN",
     ),
     type_check=AbsNormalize,
     default="utterance_mvn",
@@ -85,7 +62,7 @@ normalize_choices = ClassChoices(
 preencoder_choices = ClassChoices(
     name="preencoder",
     classes=dict(
-        sinc=LightweightSincConvs,
+        sinc="espnet2.asr.preencoder.sinc.LightweightSincConvs",
     ),
     type_check=AbsPreEncoder,
     default=None,
@@ -94,12 +71,15 @@ preencoder_choices = ClassChoices(
 encoder_choices = ClassChoices(
     "encoder",
     classes=dict(
-        conformer=ConformerEncoder,
-        transformer=TransformerEncoder,
-        contextual_block_transformer=ContextualBlockTransformerEncoder,
-        vgg_rnn=VGGRNNEncoder,
-        rnn=RNNEncoder,
-        wav2vec2=FairSeqWav2Vec2Encoder,
+        conformer="espnet2.asr.encoder.conformer_encoder.ConformerEncoder",
+        transformer="espnet2.asr.encoder.transformer_encoder.TransformerEncoder",
+        contextual_block_transformer=(
+            "espnet2.asr.encoder.contextual_block_transformer_encoder."
+            "ContextualBlockTransformerEncoder"
+        ),
+        vgg_rnn="espnet2.asr.encoder.vgg_rnn_encoder.VGGRNNEncoder",
+        rnn="espnet2.asr.encoder.rnn_encoder.RNNEncoder",
+        wav2vec2="espnet2.asr.encoder.wav2vec2_encoder.FairSeqWav2Vec2Encoder",
     ),
     type_check=AbsEncoder,
     default="rnn",
@@ -107,12 +87,24 @@ encoder_choices = ClassChoices(
 decoder_choices = ClassChoices(
     "decoder",
     classes=dict(
-        transformer=TransformerDecoder,
-        lightweight_conv=LightweightConvolutionTransformerDecoder,
-        lightweight_conv2d=LightweightConvolution2DTransformerDecoder,
-        dynamic_conv=DynamicConvolutionTransformerDecoder,
-        dynamic_conv2d=DynamicConvolution2DTransformerDecoder,
-        rnn=RNNDecoder,
+        transformer="espnet2.asr.decoder.transformer_decoder.TransformerDecoder",
+        lightweight_conv=(
+            "espnet2.asr.decoder.transformer_decoder."
+            "LightweightConvolutionTransformerDecoder"
+        ),
+        lightweight_conv2d=(
+            "espnet2.asr.decoder.transformer_decoder."
+            "LightweightConvolution2DTransformerDecoder"
+        ),
+        dynamic_conv=(
+            "espnet2.asr.decoder.transformer_decoder."
+            "DynamicConvolutionTransformerDecoder"
+        ),
+        dynamic_conv2d=(
+            "espnet2.asr.decoder.transformer_decoder."
+            "DynamicConvolution2DTransformerDecoder"
+        ),
+        rnn="espnet2.asr.decoder.rnn_decoder.RNNDecoder",
     ),
     type_check=AbsDecoder,
     default="rnn",
@@ -32,6 +32,13 @@ class CharTokenizer(AbsTokenizer):
             self.non_linguistic_symbols = set(non_linguistic_symbols)
         self.remove_non_linguistic_symbols = remove_non_linguistic_symbols
 
+        # Index the symbols by their first character, longest first,
+        # so that each position of a line is matched against a few candidates only
+        self._symbols_by_head = {}
+        for w in sorted(self.non_linguistic_symbols, key=len, reverse=True):
+            if len(w) > 0:
+                self._symbols_by_head.setdefault(w[0], []).append(w)
+
     def __repr__(self):
         return (
             f"{self.__class__.__name__}("
@@ -41,20 +48,24 @@ class CharTokenizer(AbsTokenizer):
         )
 
     def text2tokens(self, line: str) -> List[str]:
+        if len(self._symbols_by_head) == 0:
+            return ["<space>" if t == " " else t for t in line]
+
         tokens = []
-        while len(line) != 0:
-            for w in self.non_linguistic_symbols:
-                if line.startswith(w):
+        i = 0
+        while i < len(line):
+            t = line[i]
+            for w in self._symbols_by_head.get(t, ()):
+                if line.startswith(w, i):
                     if not self.remove_non_linguistic_symbols:
-                        tokens.append(line[: len(w)])
-                    line = line[len(w) :]
+                        tokens.append(w)
+                    i += len(w)
                     break
             else:
-                t = line[0]
                 if t == " ":
                     t = "<space>"
                 tokens.append(t)
-                line = line[1:]
+                i += 1
         return tokens
 
     def tokens2text(self, tokens: Iterable[str]) -> str:
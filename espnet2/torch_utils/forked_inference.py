@@ -0,0 +1,122 @@
+"""Run the inference of a mini-batch iterator in forked worker processes."""
+
+from concurrent.futures import as_completed
+from concurrent.futures import ProcessPoolExecutor
+import logging
+import multiprocessing
+import pickle
+import sys
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import Iterator
+from typing import List
+from typing import Tuple
+
+import torch
+from torch.utils.data import DataLoader
+from torch.utils.data import IterableDataset
+from typeguard import check_argument_types
+
+# The objects shared by the worker processes
+_worker_state = {}
+
+
+def _run(keys: Tuple[str, ...]) -> Tuple[List[str], bytes]:
+    # NOTE: The intra-op threads of the workers shouldn't exceed the cores in total
+    torch.set_num_threads(_worker_state["num_threads"])
+    loader = _worker_state["loader"]
+    keys, batch = loader.collate_fn([loader.dataset[k] for k in keys])
+    with torch.no_grad():
+        results = _worker_state["inference_fn"](keys, batch)
+    # NOTE: Pickled in advance to copy the tensors instead of sharing them
+    #   via the file descriptors, which can exceed the limit of the system
+    return keys, pickle.dumps(results)
+
+
+def forked_inference(
+    loader: DataLoader,
+    inference_fn: Callable[[List[str], Dict[str, torch.Tensor]], Any],
+    nj: int = 1,
+    num_threads: int = 1,
+) -> Iterator[Tuple[List[str], Any]]:
+    """Apply inference_fn to the mini-batches of the loader in parallel.
+
+    The worker processes are forked after the model is loaded,
+    so the model captured by inference_fn is shared with copy-on-write
+    instead of being loaded in each process.
+    The mini-batches are given to the idle workers one by one from a shared queue
+    in the order of batch_sampler, which is longest-first for
+    InferenceBatchSampler, so the long utterances don't remain at the end.
+    The results are yielded in the order of completion and should be
+    written in the order of the keys, e.g. by sort_lines_by_keys().
+    If a worker is killed, e.g. by the OOM killer, BrokenProcessPool is raised
+    instead of waiting for its result forever.
+
+    If nj is 1, the mini-batches of the loader are processed in this process.
+
+    Note that this process should use a single intra-op thread,
+    i.e. torch.set_num_threads(1) before loading the model, because
+    the workers using multiple threads can hang if the OpenMP thread pool
+    of GNU libgomp was used before forking.
+
+    Args:
+        loader: The DataLoader built with a map-style dataset and a batch sampler,
+            e.g. AbsTask.build_streaming_iterator(shape_files=...)
+        inference_fn: The function taking the keys and the mini-batch.
+            The results must be picklable.
+        nj: The number of the worker processes
+        num_threads: The number of the intra-op threads of each worker
+
+    Examples:
+        >>> for keys, results in forked_inference(loader, fn, nj=4):
+        ...     for key, result in zip(keys, results):
+        ...         writer[key] = result
+
+    """
+    assert check_argument_types()
+    if nj <= 1:
+        for keys, batch in loader:
+            with torch.no_grad():
+                yield keys, inference_fn(keys, batch)
+        return
+
+    if isinstance(loader.dataset, IterableDataset) or loader.batch_sampler is None:
+        raise RuntimeError(
+            "A map-style dataset with a batch sampler is required to run "
+            "the inference in the worker processes, e.g. give the shape files"
+        )
+    if torch.cuda.is_available() and torch.cuda.is_initialized():
+        raise RuntimeError("CUDA can't be used in the forked processes")
+
+    if torch.get_num_threads() > 1 and num_threads > 1:
+        logging.warning(
+            f"This process uses {torch.get_num_threads()} threads, "
+            "so the workers can hang. Call torch.set_num_threads(1) in advance"
+        )
+
+    batches = list(loader.batch_sampler)
+    logging.info(
+        f"Forking {nj} workers with {num_threads} threads for {len(batches)} batches"
+    )
+    _worker_state.update(
+        loader=loader, inference_fn=inference_fn, num_threads=num_threads
+    )
+    # NOTE: "fork" is required to share the model without pickling it.
+    #   It's the default on Linux for python<3.7, which has no mp_context
+    if sys.version_info >= (3, 7):
+        kwargs = dict(mp_context=multiprocessing.get_context("fork"))
+    else:
+        kwargs = dict()
+    executor = ProcessPoolExecutor(nj, **kwargs)
+    futures = []
+    try:
+        futures = [executor.submit(_run, keys) for keys in batches]
+        for future in as_completed(futures):
+            keys, results = future.result()
+            yield keys, pickle.loads(results)
+    finally:
+        for future in futures:
+            future.cancel()
+        executor.shutdown()
+        _worker_state.clear()
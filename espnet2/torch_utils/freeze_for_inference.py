@@ -0,0 +1,44 @@
+"""Freeze espnet2 models for the inference."""
+
+import logging
+
+import torch
+
+from espnet2.layers.global_mvn import GlobalMVN
+from espnet2.layers.log_mel import LogMel
+
+
+def freeze_for_inference(model: torch.nn.Module) -> torch.nn.Module:
+    """Precompute what doesn't depend on the input for the inference.
+
+    1. The modules having freeze_for_inference(), e.g. SincConv, are frozen.
+    2. GlobalMVN following the LogMel of the frontend, e.g. DefaultFrontend,
+       is folded into it as a single affine transform and removed.
+    3. The parameters don't require gradients.
+
+    The model is switched to the eval mode and must not be trained after this,
+    e.g. SpecAug can't be applied between the frontend and the normalization.
+    Note that the state_dict of the frozen model is not compatible
+    with the original one.
+
+    Examples:
+        >>> model, _ = ASRTask.build_model_from_file(config, model_file, device)
+        >>> model = freeze_for_inference(model.eval())
+
+    """
+    model.eval()
+    for module in model.modules():
+        if hasattr(module, "freeze_for_inference"):
+            module.freeze_for_inference()
+
+    for module in model.modules():
+        normalize = getattr(module, "normalize", None)
+        logmel = getattr(getattr(module, "frontend", None), "logmel", None)
+        if isinstance(normalize, GlobalMVN) and isinstance(logmel, LogMel):
+            logging.info(f"Folding {normalize} into {logmel}")
+            logmel.fold_normalization(*normalize.scale_and_bias())
+            module.normalize = None
+
+    for p in model.parameters():
+        p.requires_grad_(False)
+    return model
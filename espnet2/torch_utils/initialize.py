@@ -2,11 +2,44 @@
 
 """Initialize modules for espnet2 neural networks."""
 
+from contextlib import contextmanager
 import math
 import torch
 from typeguard import check_argument_types
 
 
+@contextmanager
+def skip_initialization():
+    """Skip the random initialization of the modules built in this context.
+
+    The in-place functions of ``torch.nn.init`` do nothing within this context,
+    so that the parameters are only allocated. This is meant for the models
+    whose parameters are overwritten by a checkpoint right after building.
+
+    Examples:
+        >>> with skip_initialization():
+        ...     model = Model()
+        >>> model.load_state_dict(torch.load("model.pth"))
+
+    """
+    originals = {
+        name: func
+        for name, func in vars(torch.nn.init).items()
+        if name.endswith("_") and not name.startswith("_") and callable(func)
+    }
+
+    def _skip(tensor, *args, **kwargs):
+        return tensor
+
+    try:
+        for name in originals:
+            setattr(torch.nn.init, name, _skip)
+        yield
+    finally:
+        for name, func in originals.items():
+            setattr(torch.nn.init, name, func)
+
+
 def initialize(model: torch.nn.Module, init: str):
     """Initialize weights of a neural network module.
 
@@ -1,6 +1,8 @@
+import importlib
 from typing import Mapping
 from typing import Optional
 from typing import Tuple
+from typing import Union
 
 from typeguard import check_argument_types
 from typeguard import check_return_type
@@ -30,12 +32,17 @@ class ClassChoices:
     >>> class_obj = choices.get_class(args.var)
     >>> a_object = class_obj(**args.var_conf)
 
+    A class can also be given as the dotted path to it, e.g.
+    "espnet2.asr.encoder.rnn_encoder.RNNEncoder". Such a class is imported
+    when it is selected at first, so that the modules of the other choices
+    are never imported.
+
     """
 
     def __init__(
         self,
         name: str,
-        classes: Mapping[str, type],
+        classes: Mapping[str, Union[type, str]],
         type_check: type = None,
         default: str = None,
         optional: bool = False,
@@ -48,7 +55,7 @@ class ClassChoices:
             raise ValueError('"none", "nil", and "null" are reserved.')
         if type_check is not None:
             for v in self.classes.values():
-                if not issubclass(v, type_check):
+                if not isinstance(v, str) and not issubclass(v, type_check):
                     raise ValueError(f"must be {type_check.__name__}, but got {v}")
 
         self.optional = optional
@@ -68,7 +75,10 @@ class ClassChoices:
         if name is None or (self.optional and name.lower() == ("none", "null", "nil")):
             retval = None
         elif name.lower() in self.classes:
-            class_obj = self.classes[name]
+            class_obj = self.classes[name.lower()]
+            if isinstance(class_obj, str):
+                class_obj = self._import_class(class_obj)
+                self.classes[name.lower()] = class_obj
             assert check_return_type(class_obj)
             retval = class_obj
         else:
@@ -79,6 +89,13 @@ class ClassChoices:
 
         return retval
 
+    def _import_class(self, path: str) -> type:
+        module_name, _, class_name = path.rpartition(".")
+        class_obj = getattr(importlib.import_module(module_name), class_name)
+        if self.base_type is not None and not issubclass(class_obj, self.base_type):
+            raise ValueError(f"must be {self.base_type.__name__}, but got {class_obj}")
+        return class_obj
+
     def add_arguments(self, parser):
         parser.add_argument(
             f"--{self.name}",
@@ -24,10 +24,13 @@ from typeguard import check_argument_types
 from typeguard import check_return_type
 
 from espnet2.fileio.npy_scp import NpyScpReader
+from espnet2.fileio.packed_array import PackedArrayReader
+from espnet2.fileio.packed_text import PackedTextBlockReader
+from espnet2.fileio.packed_text import PackedTextReader
 from espnet2.fileio.rand_gen_dataset import FloatRandomGenerateDataset
 from espnet2.fileio.rand_gen_dataset import IntRandomGenerateDataset
+from espnet2.fileio.read_text import load_2column_text
 from espnet2.fileio.read_text import load_num_sequence_text
-from espnet2.fileio.read_text import read_2column_text
 from espnet2.fileio.rttm import RttmReader
 from espnet2.fileio.sound_scp import SoundScpReader
 from espnet2.utils.sized_dict import SizedDict
@@ -125,6 +128,15 @@ def kaldi_loader(path, float_dtype=None, max_cache_fd: int = 0):
     return AdapterForSoundScpReader(loader, float_dtype)
 
 
+def packed_text_block_loader(path, loader_type):
+    # e.g. packed_text_512
+    try:
+        block_size = int(loader_type[len("packed_text_") :])
+    except ValueError:
+        raise RuntimeError(f"e.g packed_text_512: but got {loader_type}")
+    return PackedTextBlockReader(path, block_size)
+
+
 def rand_int_loader(filepath, loader_type):
     # e.g. rand_int_3_10
     try:
@@ -203,7 +215,7 @@ DATA_TYPES = {
         "   ...",
     ),
     "text": dict(
-        func=read_2column_text,
+        func=load_2column_text,
         kwargs=[],
         help="Return text as is. The text must be converted to ndarray "
         "by 'preprocess'."
@@ -212,6 +224,38 @@ DATA_TYPES = {
         "   utterance_id_B foo bar\n"
         "   ...",
     ),
+    "packed_text_\\d+": dict(
+        func=packed_text_block_loader,
+        kwargs=["loader_type"],
+        help="e.g. 'packed_text_512'. A directory written by "
+        "espnet2.bin.pack_text. All token ids are concatenated and served as "
+        "blocks of the given number of tokens, whose keys are block0, block1, ..."
+        "\n\n"
+        "   dump/packed/train/tokens.bin\n"
+        "   dump/packed/train/offsets.npy\n"
+        "   dump/packed/train/keys",
+    ),
+    "packed_text": dict(
+        func=PackedTextReader,
+        kwargs=[],
+        help="A directory written by espnet2.bin.pack_text. "
+        "Return the token ids of each sentence."
+        "\n\n"
+        "   dump/packed/train/tokens.bin\n"
+        "   dump/packed/train/offsets.npy\n"
+        "   dump/packed/train/keys",
+    ),
+    "packed_array": dict(
+        func=PackedArrayReader,
+        kwargs=[],
+        help="A directory written by espnet2.fileio.packed_array.PackedArrayWriter, "
+        "e.g. the token-averaged pitch and energy extracted by "
+        "espnet2.bin.tts_extract_feats. Return the array of each utterance."
+        "\n\n"
+        "   dump/feats_cache/train/pitch/values.bin\n"
+        "   dump/feats_cache/train/pitch/offsets.npy\n"
+        "   dump/feats_cache/train/pitch/keys",
+    ),
     "hdf5": dict(
         func=H5FileWrapper,
         kwargs=[],
@@ -300,7 +300,12 @@ class CommonPreprocessor(AbsPreprocessor):
                 ma = np.max(np.abs(speech))
                 data[self.speech_name] = speech * self.speech_volume_normalize / ma
 
-        if self.text_name in data and self.tokenizer is not None:
+        # NOTE: The text can be already converted to token ids, e.g. packed_text
+        if (
+            self.text_name in data
+            and self.tokenizer is not None
+            and isinstance(data[self.text_name], str)
+        ):
             text = data[self.text_name]
             text = self.text_cleaner(text)
             tokens = self.tokenizer.text2tokens(text)
@@ -24,6 +24,9 @@ from torch.utils.tensorboard import SummaryWriter
 from typeguard import check_argument_types
 import wandb
 
+from espnet.utils.profiling import span
+from espnet.utils.profiling import SpanTimer
+from espnet.utils.profiling import StepProfiler
 from espnet2.iterators.abs_iter_factory import AbsIterFactory
 from espnet2.main_funcs.average_nbest_models import average_nbest_models
 from espnet2.main_funcs.calculate_all_attentions import calculate_all_attentions
@@ -86,6 +89,8 @@ class TrainerOptions:
     val_scheduler_criterion: Sequence[str]
     unused_parameters: bool
     wandb_model_log_interval: int
+    profile_spans: bool
+    profile_window: Optional[Sequence[int]]
 
 
 class Trainer:
@@ -464,6 +469,8 @@ class Trainer:
         no_forward_run = options.no_forward_run
         ngpu = options.ngpu
         use_wandb = options.use_wandb
+        profile_spans = options.profile_spans
+        profile_window = options.profile_window
         distributed = distributed_option.distributed
 
         if log_interval is None:
@@ -478,18 +485,33 @@ class Trainer:
         # processes, send stop-flag to the other processes if iterator is finished
         iterator_stop = torch.tensor(0).to("cuda" if ngpu > 0 else "cpu")
 
+        timer = SpanTimer(synchronize=ngpu > 0, enabled=profile_spans)
+        profiler = None
         start_time = time.perf_counter()
         for iiter, (_, batch) in enumerate(
-            reporter.measure_iter_time(iterator, "iter_time"), 1
+            timer.iterate(reporter.measure_iter_time(iterator, "iter_time")), 1
         ):
             assert isinstance(batch, dict), type(batch)
+            # NOTE: The count includes this iteration after registering iter_time
+            if (
+                profile_window is not None
+                and reporter.get_total_count() - 1 == profile_window[0]
+            ):
+                profiler = StepProfiler(
+                    Path(options.output_dir)
+                    / "profile"
+                    / f"trace.{profile_window[0]}.json",
+                    num_steps=profile_window[1],
+                    use_cuda=ngpu > 0,
+                )
 
             if distributed:
                 torch.distributed.all_reduce(iterator_stop, ReduceOp.SUM)
                 if iterator_stop > 0:
                     break
 
-            batch = to_device(batch, "cuda" if ngpu > 0 else "cpu")
+            with span("h2d"):
+                batch = to_device(batch, "cuda" if ngpu > 0 else "cpu")
             if no_forward_run:
                 all_steps_are_invalid = False
                 continue
@@ -645,8 +667,28 @@ class Trainer:
                         train_time=time.perf_counter() - start_time,
                     ),
                 )
+                if ngpu > 0:
+                    # The peak memory shows the effect of e.g. checkpoint_every
+                    reporter.register(
+                        dict(
+                            gpu_max_allocated_mem_GB=torch.cuda.max_memory_allocated()
+                            / 2 ** 30
+                        ),
+                    )
+                    # Reset the peak to report the peak of each step.
+                    # NOTE: The reserved memory is kept by the caching allocator,
+                    #   so the peak reserved memory reported by Reporter stays
+                    if LooseVersion(torch.__version__) >= LooseVersion("1.4.0"):
+                        torch.cuda.reset_peak_memory_stats()
+                    else:
+                        torch.cuda.reset_max_memory_allocated()
                 start_time = time.perf_counter()
 
+            if profile_spans:
+                reporter.register({f"{k}_time": v for k, v in timer.pop().items()})
+            if profiler is not None:
+                profiler.step()
+
             # NOTE(kamo): Call log_message() after next()
             reporter.next()
             if iiter % log_interval == 0:
@@ -661,6 +703,9 @@ class Trainer:
                 iterator_stop.fill_(1)
                 torch.distributed.all_reduce(iterator_stop, ReduceOp.SUM)
 
+        if profiler is not None:
+            # The window may exceed the epoch
+            profiler.close()
         return all_steps_are_invalid
 
     @classmethod
@@ -211,3 +211,61 @@ class ESPnetTTSModel(AbsESPnetModel):
         else:
             outs_denorm = outs
         return outs, outs_denorm, probs, att_ws
+
+    def batch_inference(
+        self,
+        text: torch.Tensor,
+        text_lengths: torch.Tensor,
+        speech: torch.Tensor = None,
+        speech_lengths: torch.Tensor = None,
+        spembs: torch.Tensor = None,
+        **decode_config,
+    ) -> Tuple[torch.Tensor, torch.Tensor, torch.Tensor, torch.Tensor, torch.Tensor]:
+        """Generate the batch of features with the auto-regressive models.
+
+        Only the models having batch_inference(), i.e. Tacotron2 and Transformer,
+        are supported and teacher forcing is not supported.
+
+        Returns:
+            Tensor: Batch of padded output features (B, Lmax, odim).
+            Tensor: Batch of padded denormalized output features (B, Lmax, odim).
+            Tensor: Batch of padded stop probabilities (B, Lmax).
+            Tensor: Batch of padded attention weights.
+            LongTensor: Batch of the lengths of the outputs (B,).
+
+        """
+        if not hasattr(self.tts, "batch_inference"):
+            raise NotImplementedError(
+                f"{type(self.tts).__name__} doesn't support batch inference"
+            )
+        if decode_config.pop("use_teacher_forcing", False):
+            raise NotImplementedError("batch inference with teacher forcing")
+
+        kwargs = {}
+        if getattr(self.tts, "use_gst", False):
+            if speech is None:
+                raise RuntimeError("missing required argument: 'speech'")
+            if speech_lengths is None:
+                speech_lengths = speech.new_full(
+                    [speech.size(0)], speech.size(1), dtype=torch.long
+                )
+            if self.feats_extract is not None:
+                feats, feats_lengths = self.feats_extract(speech, speech_lengths)
+            else:
+                feats, feats_lengths = speech, speech_lengths
+            if self.normalize is not None:
+                feats, feats_lengths = self.normalize(feats, feats_lengths)
+            kwargs.update(speech=feats, speech_lengths=feats_lengths)
+        if spembs is not None:
+            kwargs["spembs"] = spembs
+
+        outs, probs, att_ws, olens = self.tts.batch_inference(
+            text=text, text_lengths=text_lengths, **kwargs, **decode_config
+        )
+
+        if self.normalize is not None:
+            # NOTE: normalize.inverse is in-place operation
+            outs_denorm = self.normalize.inverse(outs.clone(), olens)[0]
+        else:
+            outs_denorm = outs
+        return outs, outs_denorm, probs, att_ws, olens
@@ -0,0 +1,50 @@
+"""Token-wise averaging of frame-level features."""
+
+import torch
+
+
+def average_by_duration(
+    x: torch.Tensor, durations: torch.Tensor, positive_only: bool = False
+) -> torch.Tensor:
+    """Average the frames of each token given by the durations.
+
+    The frames are summed into the tokens by scatter_add at once
+    instead of looping over the tokens.
+
+    Args:
+        x: Frame-level features (B, Tmax).
+        durations: Durations of the tokens in frames (B, Nmax), padded with 0.
+            The frames after the sum of the durations are ignored.
+        positive_only: Average only the positive values, e.g. the voiced frames
+            of f0. The tokens having no positive values are 0.
+
+    Returns:
+        Tensor: Token-wise averaged features (B, Nmax).
+
+    Examples:
+        >>> x = torch.tensor([[1.0, 3.0, 0.0, 4.0, 9.0]])
+        >>> average_by_duration(x, torch.tensor([[2, 2, 0]]))
+        tensor([[2., 2., 0.]])
+        >>> average_by_duration(x, torch.tensor([[2, 2, 0]]), positive_only=True)
+        tensor([[2., 4., 0.]])
+
+    """
+    batch, tmax = x.size()
+    num_tokens = durations.size(1)
+    durations = durations.to(x.device)
+
+    # The token index of each frame: The number of token ends before the frame
+    # e.g. durations=[2, 1, 0] -> token_idx=[0, 0, 1, 3, 3, ...]
+    ends = durations.cumsum(dim=1).clamp(max=tmax)
+    boundaries = durations.new_zeros(batch, tmax + 1)
+    boundaries.scatter_add_(1, ends, torch.ones_like(ends))
+    # The frames after the last token go to the extra slot, Nmax
+    token_idx = boundaries[:, :tmax].cumsum(dim=1)
+
+    mask = x > 0.0 if positive_only else torch.ones_like(x, dtype=torch.bool)
+    sums = x.new_zeros(batch, num_tokens + 1)
+    sums.scatter_add_(1, token_idx, x.masked_fill(~mask, 0.0))
+    counts = x.new_zeros(batch, num_tokens + 1)
+    counts.scatter_add_(1, token_idx, mask.to(x.dtype))
+    sums, counts = sums[:, :num_tokens], counts[:, :num_tokens]
+    return torch.where(counts > 0, sums / counts.clamp(min=1), sums.new_zeros(()))
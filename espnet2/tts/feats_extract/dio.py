@@ -21,6 +21,7 @@ from typeguard import check_argument_types
 
 from espnet.nets.pytorch_backend.nets_utils import pad_list
 from espnet2.tts.feats_extract.abs_feats_extract import AbsFeatsExtract
+from espnet2.tts.feats_extract.average_by_duration import average_by_duration
 
 
 class Dio(AbsFeatsExtract):
@@ -110,19 +111,16 @@ class Dio(AbsFeatsExtract):
                 for p, fl in zip(pitch, feats_lengths)
             ]
 
+        pitch_lengths = input.new_tensor([len(p) for p in pitch], dtype=torch.long)
+        # Padding
+        pitch = pad_list(pitch, 0.0)
+
         # (Optional): Average by duration to calculate token-wise f0
         if self.use_token_averaged_f0:
             durations = durations * self.reduction_factor
-            pitch = [
-                self._average_by_duration(p, d).view(-1)
-                for p, d in zip(pitch, durations)
-            ]
+            self._check_durations(pitch_lengths, durations)
+            pitch = average_by_duration(pitch, durations, positive_only=True)
             pitch_lengths = durations_lengths
-        else:
-            pitch_lengths = input.new_tensor([len(p) for p in pitch], dtype=torch.long)
-
-        # Padding
-        pitch = pad_list(pitch, 0.0)
 
         # Return with the shape (B, T, 1)
         return pitch.unsqueeze(-1), pitch_lengths
@@ -175,13 +173,6 @@ class Dio(AbsFeatsExtract):
 
         return f0
 
-    def _average_by_duration(self, x: torch.Tensor, d: torch.Tensor) -> torch.Tensor:
-        assert 0 <= len(x) - d.sum() < self.reduction_factor
-        d_cumsum = F.pad(d.cumsum(dim=0), (1, 0))
-        x_avg = [
-            x[start:end].masked_select(x[start:end].gt(0.0)).mean(dim=0)
-            if len(x[start:end].masked_select(x[start:end].gt(0.0))) != 0
-            else x.new_tensor(0.0)
-            for start, end in zip(d_cumsum[:-1], d_cumsum[1:])
-        ]
-        return torch.stack(x_avg)
+    def _check_durations(self, lengths: torch.Tensor, durations: torch.Tensor):
+        diff = lengths - durations.sum(dim=1).to(lengths.device)
+        assert ((0 <= diff) & (diff < self.reduction_factor)).all(), diff
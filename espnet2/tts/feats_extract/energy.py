@@ -17,6 +17,7 @@ from typeguard import check_argument_types
 from espnet.nets.pytorch_backend.nets_utils import pad_list
 from espnet2.layers.stft import Stft
 from espnet2.tts.feats_extract.abs_feats_extract import AbsFeatsExtract
+from espnet2.tts.feats_extract.average_by_duration import average_by_duration
 
 
 class Energy(AbsFeatsExtract):
@@ -109,30 +110,23 @@ class Energy(AbsFeatsExtract):
             ]
             energy_lengths = feats_lengths
 
+        # Padding
+        if isinstance(energy, list):
+            energy = pad_list(energy, 0.0)
+
         # (Optional): Average by duration to calculate token-wise energy
         if self.use_token_averaged_energy:
             durations = durations * self.reduction_factor
-            energy = [
-                self._average_by_duration(e[:el].view(-1), d)
-                for e, el, d in zip(energy, energy_lengths, durations)
-            ]
+            self._check_durations(energy_lengths, durations)
+            energy = average_by_duration(energy, durations)
             energy_lengths = durations_lengths
 
-        # Padding
-        if isinstance(energy, list):
-            energy = pad_list(energy, 0.0)
-
         # Return with the shape (B, T, 1)
         return energy.unsqueeze(-1), energy_lengths
 
-    def _average_by_duration(self, x: torch.Tensor, d: torch.Tensor) -> torch.Tensor:
-        assert 0 <= len(x) - d.sum() < self.reduction_factor
-        d_cumsum = F.pad(d.cumsum(dim=0), (1, 0))
-        x_avg = [
-            x[start:end].mean() if len(x[start:end]) != 0 else x.new_tensor(0.0)
-            for start, end in zip(d_cumsum[:-1], d_cumsum[1:])
-        ]
-        return torch.stack(x_avg)
+    def _check_durations(self, lengths: torch.Tensor, durations: torch.Tensor):
+        diff = lengths - durations.sum(dim=1).to(lengths.device)
+        assert ((0 <= diff) & (diff < self.reduction_factor)).all(), diff
 
     @staticmethod
     def _adjust_num_frames(x: torch.Tensor, num_frames: torch.Tensor) -> torch.Tensor:
@@ -269,4 +269,5 @@ class MultiHeadedAttention(BaseMultiHeadedAttention):
         self.linear_v = torch.nn.Linear(v_dim, n_feat)
         self.linear_out = torch.nn.Linear(n_feat, n_feat)
         self.attn = None
+        self.store_attn = False
         self.dropout = torch.nn.Dropout(p=dropout_rate)
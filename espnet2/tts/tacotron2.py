@@ -15,6 +15,7 @@ from typeguard import check_argument_types
 from espnet.nets.pytorch_backend.e2e_tts_tacotron2 import GuidedAttentionLoss
 from espnet.nets.pytorch_backend.e2e_tts_tacotron2 import Tacotron2Loss
 from espnet.nets.pytorch_backend.nets_utils import make_pad_mask
+from espnet.nets.pytorch_backend.nets_utils import pad_list
 from espnet.nets.pytorch_backend.rnn.attentions import AttForward
 from espnet.nets.pytorch_backend.rnn.attentions import AttForwardTA
 from espnet.nets.pytorch_backend.rnn.attentions import AttLoc
@@ -435,6 +436,79 @@ class Tacotron2(AbsTTS):
 
         return outs, probs, att_ws
 
+    def batch_inference(
+        self,
+        text: torch.Tensor,
+        text_lengths: torch.Tensor,
+        speech: torch.Tensor = None,
+        speech_lengths: torch.Tensor = None,
+        spembs: torch.Tensor = None,
+        threshold: float = 0.5,
+        minlenratio: float = 0.0,
+        maxlenratio: float = 10.0,
+        use_att_constraint: bool = False,
+        backward_window: int = 1,
+        forward_window: int = 3,
+    ) -> Tuple[torch.Tensor, torch.Tensor, torch.Tensor, torch.Tensor]:
+        """Generate the batch of feature sequences given the batch of characters.
+
+        The encoder is applied to each sample to give the same hidden states
+        as inference(), and then the auto-regressive decoding is performed
+        for the whole batch at once.
+
+        Args:
+            text (LongTensor): Batch of padded character ids (B, Tmax).
+            text_lengths (LongTensor): Batch of lengths of each input batch (B,).
+            speech (Tensor, optional): Batch of padded features to extract style
+                (B, Lmax, idim).
+            speech_lengths (LongTensor, optional): Batch of the lengths of speech (B,).
+            spembs (Tensor, optional): Batch of speaker embeddings (B, spk_embed_dim).
+            threshold (float, optional): Threshold in inference.
+            minlenratio (float, optional): Minimum length ratio in inference.
+            maxlenratio (float, optional): Maximum length ratio in inference.
+            use_att_constraint (bool, optional): Whether to apply attention constraint.
+            backward_window (int, optional): Backward window in attention constraint.
+            forward_window (int, optional): Forward window in attention constraint.
+
+        Returns:
+            Tensor: Batch of padded output features (B, Lmax, odim).
+            Tensor: Batch of padded stop probabilities (B, Lmax).
+            Tensor: Batch of padded attention weights (B, Lmax // r, Tmax + 1).
+            LongTensor: Batch of the lengths of the outputs (B,).
+
+        """
+        assert check_argument_types()
+        if self.use_gst:
+            assert speech is not None, "speech must be provided with GST."
+
+        hs = []
+        for i, l in enumerate(text_lengths.tolist()):
+            # add eos at the last of sequence
+            x = F.pad(text[i, :l], [0, 1], "constant", self.eos)
+            h = self.enc.inference(x)
+            if self.use_gst:
+                y = (
+                    speech[i]
+                    if speech_lengths is None
+                    else speech[i, : speech_lengths[i]]
+                )
+                h = h + self.gst(y.unsqueeze(0))
+            hs.append(h)
+        hlens = text_lengths + 1
+        hs = pad_list(hs, 0.0)
+        if self.spk_embed_dim is not None:
+            hs = self._integrate_with_spk_embed(hs, spembs)
+        return self.dec.batch_inference(
+            hs,
+            hlens,
+            threshold=threshold,
+            minlenratio=minlenratio,
+            maxlenratio=maxlenratio,
+            use_att_constraint=use_att_constraint,
+            backward_window=backward_window,
+            forward_window=forward_window,
+        )
+
     def _integrate_with_spk_embed(
         self, hs: torch.Tensor, spembs: torch.Tensor
     ) -> torch.Tensor:
@@ -15,10 +15,11 @@ from espnet.nets.pytorch_backend.e2e_tts_transformer import GuidedMultiHeadAtten
 from espnet.nets.pytorch_backend.e2e_tts_transformer import TransformerLoss
 from espnet.nets.pytorch_backend.nets_utils import make_non_pad_mask
 from espnet.nets.pytorch_backend.nets_utils import make_pad_mask
+from espnet.nets.pytorch_backend.nets_utils import pad_list
 from espnet.nets.pytorch_backend.tacotron2.decoder import Postnet
 from espnet.nets.pytorch_backend.tacotron2.decoder import Prenet as DecoderPrenet
 from espnet.nets.pytorch_backend.tacotron2.encoder import Encoder as EncoderPrenet
-from espnet.nets.pytorch_backend.transformer.attention import MultiHeadedAttention
+from espnet.nets.pytorch_backend.transformer.attention import capture_attention
 from espnet.nets.pytorch_backend.transformer.decoder import Decoder
 from espnet.nets.pytorch_backend.transformer.embedding import PositionalEncoding
 from espnet.nets.pytorch_backend.transformer.embedding import ScaledPositionalEncoding
@@ -356,6 +357,17 @@ class Transformer(AbsTTS):
                 sigma=guided_attn_loss_sigma,
                 alpha=guided_attn_loss_lambda,
             )
+            # keep attention weights of the layers used in the guided attention loss
+            num_layers = self.num_layers_applied_guided_attn
+            if "encoder" in self.modules_applied_guided_attn:
+                for layer in list(self.encoder.encoders)[-num_layers:]:
+                    layer.self_attn.store_attn = True
+            if "decoder" in self.modules_applied_guided_attn:
+                for layer in list(self.decoder.decoders)[-num_layers:]:
+                    layer.self_attn.store_attn = True
+            if "encoder-decoder" in self.modules_applied_guided_attn:
+                for layer in list(self.decoder.decoders)[-num_layers:]:
+                    layer.src_attn.store_attn = True
 
         # initialize parameters
         self._reset_parameters(
@@ -604,7 +616,8 @@ class Transformer(AbsTTS):
             spembs = None if spemb is None else spemb.unsqueeze(0)
             ilens = x.new_tensor([xs.size(1)]).long()
             olens = y.new_tensor([ys.size(1)]).long()
-            outs, *_ = self._forward(xs, ilens, ys, olens, spembs)
+            with capture_attention():
+                outs, *_ = self._forward(xs, ilens, ys, olens, spembs)
 
             # get attention weights
             att_ws = []
@@ -614,82 +627,151 @@ class Transformer(AbsTTS):
 
             return outs[0], None, att_ws[0]
 
-        # forward encoder
-        xs = x.unsqueeze(0)
-        hs, _ = self.encoder(xs, None)
+        outs, probs, att_ws, _ = self.batch_inference(
+            text.unsqueeze(0),
+            text.new_tensor([text.size(0)]).long(),
+            speech=None if speech is None else speech.unsqueeze(0),
+            spembs=None if spembs is None else spembs.unsqueeze(0),
+            threshold=threshold,
+            minlenratio=minlenratio,
+            maxlenratio=maxlenratio,
+        )
+
+        return outs[0], probs[0], att_ws[0]
+
+    def batch_inference(
+        self,
+        text: torch.Tensor,
+        text_lengths: torch.Tensor,
+        speech: torch.Tensor = None,
+        speech_lengths: torch.Tensor = None,
+        spembs: torch.Tensor = None,
+        threshold: float = 0.5,
+        minlenratio: float = 0.0,
+        maxlenratio: float = 10.0,
+    ) -> Tuple[torch.Tensor, torch.Tensor, torch.Tensor, torch.Tensor]:
+        """Generate the batch of feature sequences given the batch of characters.
+
+        The decoder runs incrementally for the whole batch at once: Only the
+        new frame is fed at each step, and the keys and values of the past
+        frames are cached in each decoder layer. Each sample stops independently:
+        The frames are still written for every sample until the whole batch has
+        finished, and the outputs of each sample are cropped to its own length
+        afterwards.
+
+        Args:
+            text (LongTensor): Batch of padded character ids (B, Tmax).
+            text_lengths (LongTensor): Batch of lengths of each input batch (B,).
+            speech (Tensor, optional): Batch of padded features to extract style
+                (B, Lmax, idim).
+            speech_lengths (LongTensor, optional): Batch of the lengths of speech (B,).
+            spembs (Tensor, optional): Batch of speaker embeddings (B, spk_embed_dim).
+            threshold (float, optional): Threshold in inference.
+            minlenratio (float, optional): Minimum length ratio in inference.
+            maxlenratio (float, optional): Maximum length ratio in inference.
+
+        Returns:
+            Tensor: Batch of padded output features (B, Lmax, odim).
+            Tensor: Batch of padded stop probabilities (B, Lmax).
+            Tensor: Batch of padded encoder-decoder (source) attention weights
+                (B, #layers, #heads, Lmax // r, Tmax + 1).
+            LongTensor: Batch of the lengths of the outputs (B,).
 
-        # integrate GST
+        """
+        assert check_argument_types()
         if self.use_gst:
-            style_embs = self.gst(y.unsqueeze(0))
-            hs = hs + style_embs.unsqueeze(1)
+            assert speech is not None, "speech must be provided with GST."
+        batch = text.size(0)
+        r = self.reduction_factor
+
+        # forward encoder for each sample not to be affected by the padded inputs
+        hs = []
+        for i, l in enumerate(text_lengths.tolist()):
+            # add eos at the last of sequence
+            x = F.pad(text[i, :l], [0, 1], "constant", self.eos)
+            h, _ = self.encoder(x.unsqueeze(0), None)
+            if self.use_gst:
+                y = (
+                    speech[i]
+                    if speech_lengths is None
+                    else speech[i, : speech_lengths[i]]
+                )
+                h = h + self.gst(y.unsqueeze(0)).unsqueeze(1)
+            hs.append(h[0])
+        hlens = text_lengths + 1
+        hs = pad_list(hs, 0.0)
+        h_masks = self._source_mask(hlens)
 
         # integrate speaker embedding
         if self.spk_embed_dim is not None:
-            spembs = spemb.unsqueeze(0)
             hs = self._integrate_with_spk_embed(hs, spembs)
 
         # set limits of length
-        maxlen = int(hs.size(1) * maxlenratio / self.reduction_factor)
-        minlen = int(hs.size(1) * minlenratio / self.reduction_factor)
+        maxlens = torch.tensor([int(hl * maxlenratio / r) for hl in hlens.tolist()])
+        minlens = torch.tensor([int(hl * minlenratio / r) for hl in hlens.tolist()])
+        max_steps = max(1, int(torch.max(maxlens.max(), minlens.max())))
 
-        # initialize
-        idx = 0
-        ys = hs.new_zeros(1, 1, self.odim)
-        outs, probs = [], []
+        # preallocate the outputs
+        outs = hs.new_zeros(batch, max_steps * r, self.odim)
+        probs = hs.new_zeros(batch, max_steps * r)
+        olens = torch.zeros(batch, dtype=torch.long)
+        finished = torch.zeros(batch, dtype=torch.bool)
+        att_ws = []
 
         # forward decoder step-by-step
-        z_cache = self.decoder.init_state(x)
-        while True:
+        ys = hs.new_zeros(batch, 1, self.odim)
+        state = self.decoder.init_incremental_state(hs, max_steps)
+        for step in range(max_steps):
             # update index
-            idx += 1
+            idx = step + 1
 
             # calculate output and stop prob at idx-th step
-            y_masks = subsequent_mask(idx).unsqueeze(0).to(x.device)
-            z, z_cache = self.decoder.forward_one_step(
-                ys, y_masks, hs, cache=z_cache
-            )  # (B, adim)
-            outs += [
-                self.feat_out(z).view(self.reduction_factor, self.odim)
-            ]  # [(r, odim), ...]
-            probs += [torch.sigmoid(self.prob_out(z))[0]]  # [(r), ...]
+            with capture_attention():
+                z = self.decoder.forward_incremental(
+                    ys, h_masks, state, offset=step
+                )  # (B, adim)
+            out = self.feat_out(z).view(batch, r, self.odim)  # (B, r, odim)
+            prob = torch.sigmoid(self.prob_out(z))  # (B, r)
+            outs[:, step * r : idx * r] = out
+            probs[:, step * r : idx * r] = prob
 
             # update next inputs
-            ys = torch.cat(
-                (ys, outs[-1][-1].view(1, 1, self.odim)), dim=1
-            )  # (1, idx + 1, odim)
-
-            # get attention weights
-            att_ws_ = []
-            for name, m in self.named_modules():
-                if isinstance(m, MultiHeadedAttention) and "src" in name:
-                    att_ws_ += [m.attn[0, :, -1].unsqueeze(1)]  # [(#heads, 1, T),...]
-            if idx == 1:
-                att_ws = att_ws_
-            else:
-                # [(#heads, l, T), ...]
-                att_ws = [
-                    torch.cat([att_w, att_w_], dim=1)
-                    for att_w, att_w_ in zip(att_ws, att_ws_)
-                ]
-
-            # check whether to finish generation
-            if int(sum(probs[-1] >= threshold)) > 0 or idx >= maxlen:
-                # check mininum length
-                if idx < minlen:
-                    continue
-                outs = (
-                    torch.cat(outs, dim=0).unsqueeze(0).transpose(1, 2)
-                )  # (L, odim) -> (1, L, odim) -> (1, odim, L)
-                if self.postnet is not None:
-                    outs = outs + self.postnet(outs)  # (1, odim, L)
-                outs = outs.transpose(2, 1).squeeze(0)  # (L, odim)
-                probs = torch.cat(probs, dim=0)
+            ys = out[:, -1:]  # (B, 1, odim)
+
+            # get attention weights -> [(B, #layers, #heads, T), ...]
+            att_ws += [
+                torch.stack(
+                    [m.src_attn.attn[:, :, -1] for m in self.decoder.decoders], 1
+                )
+            ]
+
+            # check whether to finish generation of each sample
+            stop = ((prob >= threshold).any(dim=1).cpu() | (idx >= maxlens)) & (
+                idx >= minlens
+            )
+            olens[stop & ~finished] = idx * r
+            finished |= stop
+            if bool(finished.all()):
                 break
 
-        # concatenate attention weights -> (#layers, #heads, L, T)
-        att_ws = torch.stack(att_ws, dim=0)
+        # concatenate attention weights -> (B, #layers, #heads, L, T)
+        att_ws = torch.stack(att_ws, dim=3)
+
+        # apply postnet to each sample not to be affected by the padded frames
+        lmax = int(olens.max())
+        after_outs = hs.new_zeros(batch, lmax, self.odim)
+        for i, olen in enumerate(olens.tolist()):
+            out = outs[i : i + 1, :olen].transpose(1, 2)  # (1, odim, L)
+            if self.postnet is not None:
+                out = out + self.postnet(out)  # (1, odim, L)
+            after_outs[i, :olen] = out.transpose(2, 1)[0]
+        mask = torch.arange(lmax)[None] < olens[:, None]
+        probs = probs[:, :lmax].masked_fill(~mask.to(hs.device), 0.0)
+        att_ws = att_ws[:, :, :, : lmax // r].masked_fill(
+            ~mask[:, None, None, r - 1 :: r, None].to(hs.device), 0.0
+        )
 
-        return outs, probs, att_ws
+        return after_outs, probs, att_ws, olens
 
     def _add_first_frame_and_remove_last_frame(self, ys: torch.Tensor) -> torch.Tensor:
         ys_in = torch.cat(
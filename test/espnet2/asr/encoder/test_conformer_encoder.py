@@ -49,6 +49,28 @@ def test_encoder_forward_backward(
     y.sum().backward()
 
 
+@pytest.mark.parametrize("layer_drop_rate, checkpoint_every", [(0.5, 0), (0.0, 1)])
+def test_encoder_layer_drop_checkpoint(layer_drop_rate, checkpoint_every):
+    encoder = ConformerEncoder(
+        20,
+        output_size=2,
+        attention_heads=2,
+        linear_units=4,
+        num_blocks=2,
+        rel_pos_type="latest",
+        pos_enc_layer_type="rel_pos",
+        selfattention_layer_type="rel_selfattn",
+        use_cnn_module=True,
+        cnn_module_kernel=3,
+        layer_drop_rate=layer_drop_rate,
+        checkpoint_every=checkpoint_every,
+    )
+    x = torch.randn(2, 32, 20, requires_grad=True)
+    x_lens = torch.LongTensor([32, 28])
+    y, _, _ = encoder(x, x_lens)
+    y.sum().backward()
+
+
 def test_encoder_invalid_layer_type():
     with pytest.raises(ValueError):
         ConformerEncoder(20, rel_pos_type="dummy")
@@ -32,3 +32,18 @@ def test_Encoder_output_size():
 def test_Encoder_invalid_type():
     with pytest.raises(ValueError):
         TransformerEncoder(20, input_layer="fff")
+
+
+@pytest.mark.parametrize("layer_drop_rate, checkpoint_every", [(0.5, 0), (0.0, 2)])
+def test_Encoder_layer_drop_checkpoint(layer_drop_rate, checkpoint_every):
+    encoder = TransformerEncoder(
+        20,
+        output_size=40,
+        num_blocks=4,
+        layer_drop_rate=layer_drop_rate,
+        checkpoint_every=checkpoint_every,
+    )
+    x = torch.randn(2, 10, 20, requires_grad=True)
+    x_lens = torch.LongTensor([10, 8])
+    y, _, _ = encoder(x, x_lens)
+    y.sum().backward()
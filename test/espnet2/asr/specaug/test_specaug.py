@@ -37,3 +37,23 @@ def test_SpecAuc_repr(apply_time_warp, apply_freq_mask, apply_time_mask):
         apply_time_mask=apply_time_mask,
     )
     print(specaug)
+
+
+@pytest.mark.parametrize("apply_time_warp", [False, True])
+@pytest.mark.parametrize("apply_freq_mask", [False, True])
+@pytest.mark.parametrize("apply_time_mask", [False, True])
+def test_SpecAuc_batched(apply_time_warp, apply_freq_mask, apply_time_mask):
+    if not apply_time_warp and not apply_time_mask and not apply_freq_mask:
+        return
+    specaug = SpecAug(
+        apply_time_warp=apply_time_warp,
+        time_warp_mode="bilinear",
+        apply_freq_mask=apply_freq_mask,
+        apply_time_mask=apply_time_mask,
+        batched=True,
+    )
+    x = torch.randn(2, 1000, 80, requires_grad=True)
+    x_lens = torch.tensor([1000, 600])
+    y, y_lens = specaug(x, x_lens)
+    assert y.shape == x.shape
+    y.sum().backward()
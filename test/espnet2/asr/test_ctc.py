@@ -36,3 +36,24 @@ def test_ctc_argmax(ctc_type, ctc_args):
         pytest.importorskip("warpctc_pytorch")
     ctc = CTC(encoder_output_sizse=10, odim=5, ctc_type=ctc_type)
     ctc.argmax(ctc_args[0])
+
+
+def test_ctc_forced_align():
+    ctc = CTC(encoder_output_sizse=10, odim=5)
+    h = torch.randn(2, 10, 10)
+    h_lens = torch.LongTensor([10, 8])
+    y = torch.LongTensor([[1, 2, 2, 3, 4], [4, 3, 0, 0, 0]])
+    y_lens = torch.LongTensor([5, 2])
+    alignment, states = ctc.forced_align(h, h_lens, y, y_lens)
+    assert alignment.shape == states.shape == (2, 10)
+    assert (alignment[1, 8:] == -1).all() and (states[1, 8:] == -1).all()
+    for i in range(2):
+        # The states are monotonic and the collapsed path is the label sequence
+        seq = states[i, : h_lens[i]]
+        assert (seq[1:] >= seq[:-1]).all()
+        tokens = [
+            int(alignment[i, t])
+            for t in range(h_lens[i])
+            if seq[t] % 2 == 1 and (t == 0 or seq[t] != seq[t - 1])
+        ]
+        assert tokens == y[i, : y_lens[i]].tolist()
@@ -0,0 +1,85 @@
+import pytest
+
+from espnet2.benchmark import runner
+from espnet2.benchmark.runner import compare
+from espnet2.benchmark.runner import format_comparison
+from espnet2.benchmark.runner import get_benchmarks
+from espnet2.benchmark.runner import load_results
+from espnet2.benchmark.runner import measure
+from espnet2.benchmark.runner import register_benchmark
+from espnet2.benchmark.runner import run_benchmarks
+from espnet2.benchmark.runner import save_results
+
+
+@pytest.fixture()
+def benchmarks():
+    saved = runner._benchmarks.copy()
+    yield
+    runner._benchmarks.clear()
+    runner._benchmarks.update(saved)
+
+
+def test_measure():
+    count = []
+    result = measure(lambda: count.append(1), warmup=2, repeat=3)
+    assert len(count) == 5
+    assert result["repeat"] == 3
+    assert result["min"] <= result["median"] <= result["max"]
+
+
+def test_get_benchmarks():
+    names = get_benchmarks()
+    assert "attention/mha" in names
+    assert get_benchmarks("^sampler/") == [n for n in names if n.startswith("sampler/")]
+
+
+def test_register_benchmark_twice(benchmarks):
+    register_benchmark("test/dummy")(lambda: lambda: None)
+    with pytest.raises(RuntimeError):
+        register_benchmark("test/dummy")(lambda: lambda: None)
+
+
+def test_run_benchmarks_records_errors(benchmarks):
+    def _raise():
+        raise ValueError("dummy")
+
+    register_benchmark("test/ok")(lambda: lambda: None)
+    register_benchmark("test/error")(lambda: _raise)
+    results = run_benchmarks(["test/ok", "test/error"], warmup=0, repeat=2)
+    assert results["results"]["test/ok"]["repeat"] == 2
+    assert "ValueError" in results["results"]["test/error"]["error"]
+    assert "torch" in results["environment"]
+
+
+def _results(**medians):
+    return dict(
+        environment={},
+        results={
+            k: dict(error="") if v is None else dict(median=v)
+            for k, v in medians.items()
+        },
+    )
+
+
+def test_compare():
+    current = _results(a=1.2, b=1.05, c=0.5, d=1.0, e=None, f=2.0)
+    baseline = _results(a=1.0, b=1.0, c=1.0, e=1.0, f=1.0, g=1.0)
+    baseline["thresholds"] = {"f": 1.5}
+    rows = compare(current, baseline, threshold=0.1)
+    assert {r["name"]: r["status"] for r in rows} == dict(
+        a="regression",
+        b="same",
+        c="improvement",
+        d="new",
+        e="error",
+        f="same",
+        g="missing",
+    )
+    assert rows[0]["ratio"] == pytest.approx(1.2)
+    assert "regression" in format_comparison(rows)
+
+
+def test_save_and_load_results(tmp_path):
+    results = _results(a=1.0)
+    save_results(results, tmp_path / "a" / "results.json")
+    assert load_results(tmp_path / "a" / "results.json") == results
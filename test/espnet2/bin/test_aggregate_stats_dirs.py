@@ -1,9 +1,16 @@
 from argparse import ArgumentParser
 
+import numpy as np
 import pytest
+import torch
 
+from espnet2.bin.aggregate_stats_dirs import aggregate_stats_dirs
 from espnet2.bin.aggregate_stats_dirs import get_parser
 from espnet2.bin.aggregate_stats_dirs import main
+from espnet2.fileio.packed_array import PackedArrayReader
+from espnet2.fileio.packed_array import PackedArrayWriter
+from espnet2.main_funcs.collect_stats import batch_stats
+from espnet2.main_funcs.collect_stats import save_stats
 
 
 def test_get_parser():
@@ -13,3 +20,41 @@ def test_get_parser():
 def test_main():
     with pytest.raises(SystemExit):
         main()
+
+
+def test_aggregate_stats_dirs(tmp_path):
+    x = np.random.randn(10, 3)
+    for i, (start, end) in enumerate([(0, 4), (4, 10)]):
+        d = tmp_path / f"stats.{i}" / "train"
+        d.mkdir(parents=True)
+        (d / "batch_keys").write_text("feats\n")
+        (d / "stats_keys").write_text("feats\n")
+        (d / "feats_shape").write_text(f"b{i} 3\na{i} 3\n")
+        count, mean, m2 = batch_stats(torch.from_numpy(x[start:end]))
+        save_stats(
+            d / "feats_stats.npz",
+            (count, mean.numpy(), m2.numpy()),
+            (x[start:end].sum(0), (x[start:end] ** 2).sum(0)),
+        )
+        with PackedArrayWriter(d / "collect_feats" / "feats") as writer:
+            writer[f"a{i}"] = x[start:end]
+        for f in ["batch_keys", "stats_keys", "feats_shape", "feats_stats.npz"]:
+            (tmp_path / f"stats.{i}" / "valid").mkdir(exist_ok=True)
+            (tmp_path / f"stats.{i}" / "valid" / f).write_bytes((d / f).read_bytes())
+
+    aggregate_stats_dirs(
+        input_dir=[tmp_path / "stats.0", tmp_path / "stats.1"],
+        output_dir=tmp_path / "stats",
+        log_level="INFO",
+        skip_sum_stats=False,
+    )
+    assert (tmp_path / "stats" / "train" / "feats_shape").read_text() == (
+        "a0 3\nb0 3\na1 3\nb1 3\n"
+    )
+    with np.load(tmp_path / "stats" / "train" / "feats_stats.npz") as stats:
+        assert stats["count"] == 10
+        np.testing.assert_allclose(stats["sum"], x.sum(0))
+        np.testing.assert_allclose(stats["sum_square"], (x ** 2).sum(0))
+    reader = PackedArrayReader(tmp_path / "stats" / "train" / "collect_feats" / "feats")
+    assert list(reader) == ["a0", "a1"]
+    np.testing.assert_array_equal(reader["a1"], x[4:])
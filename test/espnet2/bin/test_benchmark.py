@@ -0,0 +1,58 @@
+from argparse import ArgumentParser
+
+import pytest
+
+from espnet2.benchmark.runner import load_results
+from espnet2.benchmark.runner import save_results
+from espnet2.bin.benchmark import benchmark
+from espnet2.bin.benchmark import get_parser
+from espnet2.bin.benchmark import main
+
+
+def test_get_parser():
+    assert isinstance(get_parser(), ArgumentParser)
+
+
+def test_main_list(capsys):
+    main(["--list", "--filter", "^attention/"])
+    assert capsys.readouterr().out.split() == [
+        "attention/mha",
+        "attention/rel_pos_mha",
+    ]
+
+
+def test_main_no_match():
+    with pytest.raises(RuntimeError):
+        main(["--filter", "^not_found$"])
+
+
+def _run(tmp_path, baseline=None):
+    return benchmark(
+        filter="^(length_regulator|sampler/sorted)$",
+        list_only=False,
+        warmup=0,
+        repeat=2,
+        num_threads=1,
+        seed=0,
+        output_file=str(tmp_path / "results.json"),
+        baseline=baseline,
+        threshold=0.1,
+        log_level="INFO",
+    )
+
+
+def test_benchmark(tmp_path):
+    results = _run(tmp_path)
+    assert load_results(tmp_path / "results.json") == results
+    assert list(results["results"]) == ["sampler/sorted", "length_regulator"]
+
+    # Regressed from the too fast baseline
+    for v in results["results"].values():
+        v["median"] *= 1e-6
+    save_results(results, tmp_path / "baseline.json")
+    with pytest.raises(RuntimeError):
+        _run(tmp_path, str(tmp_path / "baseline.json"))
+
+    results["thresholds"] = {k: 1e9 for k in results["results"]}
+    save_results(results, tmp_path / "baseline.json")
+    _run(tmp_path, str(tmp_path / "baseline.json"))
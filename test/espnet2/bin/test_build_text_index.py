@@ -0,0 +1,21 @@
+from argparse import ArgumentParser
+
+import pytest
+
+from espnet2.bin.build_text_index import get_parser
+from espnet2.bin.build_text_index import main
+from espnet2.fileio.text_index import TextIndexReader
+
+
+def test_get_parser():
+    assert isinstance(get_parser(), ArgumentParser)
+
+
+def test_main(tmp_path):
+    with pytest.raises(SystemExit):
+        main()
+
+    p = tmp_path / "wav.scp"
+    p.write_text("a a.wav\nb b.wav\n")
+    main(["--input", str(p)])
+    assert TextIndexReader(p)["b"] == "b.wav"
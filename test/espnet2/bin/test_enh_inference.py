@@ -1,7 +1,9 @@
 from argparse import ArgumentParser
 from pathlib import Path
 
+import numpy as np
 import pytest
+import soundfile
 import torch
 
 from espnet2.bin.enh_inference import get_parser
@@ -44,3 +46,97 @@ def test_SeparateSpeech(config_file, batch_size, input_size, segment_size, hop_s
     )
     wav = torch.rand(batch_size, input_size)
     separate_speech(wav, fs=8000)
+
+
+@pytest.fixture()
+def causal_config_file(tmp_path: Path):
+    # The outputs of the causal model don't depend on the padding
+    EnhancementTask.main(
+        cmd=[
+            "--dry_run",
+            "true",
+            "--output_dir",
+            str(tmp_path),
+            "--encoder",
+            "conv",
+            "--encoder_conf",
+            "{channel: 16, kernel_size: 16, stride: 8}",
+            "--decoder",
+            "conv",
+            "--decoder_conf",
+            "{channel: 16, kernel_size: 16, stride: 8}",
+            "--separator",
+            "tcn",
+            "--separator_conf",
+            "{layer: 2, stack: 1, bottleneck_dim: 8, hidden_dim: 8, "
+            "causal: true, norm_type: cLN}",
+            "--model_conf",
+            "{loss_type: si_snr}",
+        ]
+    )
+    return tmp_path / "config.yaml"
+
+
+def test_SeparateSpeech_batch_inference(causal_config_file):
+    separate_speech = SeparateSpeech(enh_train_config=causal_config_file)
+    wav = torch.rand(2, 1600)
+    lengths = torch.LongTensor([1600, 1000])
+    results = separate_speech.batch_inference(wav, lengths)
+    for b, length in enumerate(lengths.tolist()):
+        waves = separate_speech(wav[b : b + 1, :length])
+        for w, w_batch in zip(waves, results[b]):
+            assert len(w_batch) == length
+            # NOTE: The padded frames are overlapped with the last kernel_size samples
+            np.testing.assert_allclose(w_batch[:-16], w[0][:-16], atol=1e-6)
+
+
+@pytest.mark.parametrize("nj", [1, 2])
+def test_inference_batch_bins(causal_config_file, tmp_path: Path, nj):
+    lengths = {"a": 1200, "b": 800, "c": 1600, "d": 1000}
+    (tmp_path / "data").mkdir()
+    with (tmp_path / "data/wav.scp").open("w") as f, (
+        tmp_path / "data/speech_mix_shape"
+    ).open("w") as f2:
+        for k, length in lengths.items():
+            soundfile.write(
+                tmp_path / f"data/{k}.wav", np.random.randn(length) * 0.1, 8000
+            )
+            f.write(f"{k} {tmp_path / f'data/{k}.wav'}\n")
+            f2.write(f"{k} {length}\n")
+
+    model, _ = EnhancementTask.build_model_from_file(causal_config_file)
+    torch.save(model.state_dict(), tmp_path / "model.pth")
+    main(
+        cmd=[
+            "--enh_train_config",
+            str(causal_config_file),
+            "--enh_model_file",
+            str(tmp_path / "model.pth"),
+            "--output_dir",
+            str(tmp_path / "out"),
+            "--data_path_and_name_and_type",
+            f"{tmp_path / 'data/wav.scp'},speech_mix,sound",
+            "--shape_file",
+            str(tmp_path / "data/speech_mix_shape"),
+            "--batch_bins",
+            "3300",
+            "--num_workers",
+            "0",
+            "--nj",
+            str(nj),
+            "--num_threads",
+            "2",
+            "--profile_spans",
+            "true",
+            "--profile_window",
+            "0",
+            "1",
+        ]
+    )
+    assert (tmp_path / "out/profile/trace.json").exists()
+    with (tmp_path / "out/spk1.scp").open() as f:
+        outputs = [line.split() for line in f]
+    # The outputs are written in the original order without padding
+    assert [k for k, _ in outputs] == list(lengths)
+    for k, path in outputs:
+        assert len(soundfile.read(path)[0]) == lengths[k]
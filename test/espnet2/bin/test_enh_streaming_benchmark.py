@@ -0,0 +1,65 @@
+from argparse import ArgumentParser
+from pathlib import Path
+
+import pytest
+
+from espnet2.bin.enh_streaming_benchmark import get_parser
+from espnet2.bin.enh_streaming_benchmark import main
+from espnet2.tasks.enh import EnhancementTask
+
+
+def test_get_parser():
+    assert isinstance(get_parser(), ArgumentParser)
+
+
+def test_main():
+    with pytest.raises(SystemExit):
+        main()
+
+
+@pytest.fixture()
+def config_file(tmp_path: Path):
+    # Write the configuration file of a causal model
+    EnhancementTask.main(
+        cmd=[
+            "--dry_run",
+            "true",
+            "--output_dir",
+            str(tmp_path),
+            "--encoder",
+            "conv",
+            "--encoder_conf",
+            "{channel: 16, kernel_size: 16, stride: 8}",
+            "--decoder",
+            "conv",
+            "--decoder_conf",
+            "{channel: 16, kernel_size: 16, stride: 8}",
+            "--separator",
+            "tcn",
+            "--separator_conf",
+            "{layer: 2, stack: 1, bottleneck_dim: 8, hidden_dim: 8, "
+            "causal: true, norm_type: cLN}",
+            "--model_conf",
+            "{loss_type: si_snr}",
+        ]
+    )
+    return tmp_path / "config.yaml"
+
+
+@pytest.mark.execution_timeout(10)
+def test_enh_streaming_benchmark(config_file, tmp_path: Path):
+    main(
+        cmd=[
+            "--enh_train_config",
+            str(config_file),
+            "--duration",
+            "0.5",
+            "--chunk_size",
+            "100",
+            "--tolerance",
+            "1e-5",
+            "--output_file",
+            str(tmp_path / "results.json"),
+        ]
+    )
+    assert (tmp_path / "results.json").exists()
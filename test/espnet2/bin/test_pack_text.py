@@ -0,0 +1,48 @@
+from argparse import ArgumentParser
+
+import numpy as np
+import pytest
+
+from espnet2.bin.pack_text import get_parser
+from espnet2.bin.pack_text import main
+from espnet2.fileio.packed_text import PackedTextBlockReader
+from espnet2.fileio.packed_text import PackedTextReader
+
+
+def test_get_parser():
+    assert isinstance(get_parser(), ArgumentParser)
+
+
+def test_main():
+    with pytest.raises(SystemExit):
+        main()
+
+
+def test_pack_text(tmp_path):
+    with (tmp_path / "text").open("w") as f:
+        f.write("a abc\n")
+        f.write("b ca\n")
+    with (tmp_path / "tokens.txt").open("w") as f:
+        for t in ["<blank>", "<unk>", "a", "b", "c", "<sos/eos>"]:
+            f.write(f"{t}\n")
+
+    main(
+        cmd=[
+            "--input",
+            str(tmp_path / "text"),
+            "--output_dir",
+            str(tmp_path / "packed"),
+            "--token_list",
+            str(tmp_path / "tokens.txt"),
+            "--block_size",
+            "4",
+        ]
+    )
+    reader = PackedTextReader(tmp_path / "packed")
+    np.testing.assert_array_equal(reader["a"], [2, 3, 4])
+    np.testing.assert_array_equal(reader["b"], [4, 2])
+    reader = PackedTextBlockReader(tmp_path / "packed", 4)
+    np.testing.assert_array_equal(reader["block0"], [2, 3, 4, 5])
+    assert (tmp_path / "packed" / "text_shape.block4").read_text() == (
+        "block0 4\nblock1 3\n"
+    )
@@ -0,0 +1,66 @@
+from argparse import ArgumentParser
+
+import pytest
+
+from espnet2.bin.split_scps import get_parser
+from espnet2.bin.split_scps import main
+
+
+def test_get_parser():
+    assert isinstance(get_parser(), ArgumentParser)
+
+
+def test_main():
+    with pytest.raises(SystemExit):
+        main()
+
+
+@pytest.fixture
+def scps(tmp_path):
+    lengths = [10, 1, 8, 3, 5, 6]
+    with (tmp_path / "wav.scp").open("w") as f:
+        for i in range(len(lengths)):
+            f.write(f"utt{i} /some/where/{i}.wav\n")
+    with (tmp_path / "text").open("w") as f:
+        for i in range(len(lengths)):
+            f.write(f"utt{i} hello\n")
+    with (tmp_path / "speech_shape").open("w") as f:
+        for i, length in enumerate(lengths):
+            f.write(f"utt{i} {length},1\n")
+    return tmp_path
+
+
+@pytest.mark.parametrize("use_shape_file", [True, False])
+@pytest.mark.parametrize("max_open_files", [1, 256])
+def test_split_scps(scps, use_shape_file, max_open_files):
+    cmd = [
+        "--scps",
+        str(scps / "wav.scp"),
+        str(scps / "text"),
+        "--num_splits",
+        "2",
+        "--output_dir",
+        str(scps / "split"),
+        "--max_open_files",
+        str(max_open_files),
+    ]
+    if use_shape_file:
+        cmd += ["--shape_file", str(scps / "speech_shape")]
+    main(cmd)
+
+    keys = []
+    for n in range(2):
+        with (scps / "split" / "wav.scp" / f"split.{n}").open() as f:
+            wav_keys = [line.split()[0] for line in f]
+        with (scps / "split" / "text" / f"split.{n}").open() as f:
+            text_keys = [line.split()[0] for line in f]
+        assert wav_keys == text_keys
+        keys += wav_keys
+    assert sorted(keys) == [f"utt{i}" for i in range(6)]
+
+    with (scps / "split" / "wav.scp" / "split_manifest").open() as f:
+        manifest = [line.split() for line in f]
+    assert [m[0] for m in manifest] == ["split.0", "split.1"]
+    if use_shape_file:
+        # 10 + 5 + 1 vs 8 + 6 + 3
+        assert sorted(int(m[2]) for m in manifest) == [16, 17]
@@ -13,3 +13,33 @@ def test_get_parser():
 def test_main():
     with pytest.raises(SystemExit):
         main()
+
+
+@pytest.mark.parametrize("write_vocabulary", [True, False])
+def test_tokenize_nj(tmp_path, write_vocabulary):
+    text = tmp_path / "text"
+    with text.open("w") as f:
+        for i in range(50):
+            f.write(f"utt{i} hello world {i}\n")
+
+    outputs = []
+    for nj in [1, 2]:
+        output = tmp_path / f"output.{nj}"
+        main(
+            cmd=[
+                "--input",
+                str(text),
+                "--output",
+                str(output),
+                "--field",
+                "2-",
+                "--write_vocabulary",
+                str(write_vocabulary),
+                "--nj",
+                str(nj),
+                "--chunk_size",
+                "7",
+            ]
+        )
+        outputs.append(output.read_text())
+    assert outputs[0] == outputs[1]
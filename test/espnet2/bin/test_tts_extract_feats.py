@@ -0,0 +1,86 @@
+from argparse import ArgumentParser
+
+import numpy as np
+import pytest
+import soundfile
+import yaml
+
+from espnet2.bin.tts_extract_feats import get_parser
+from espnet2.bin.tts_extract_feats import main
+from espnet2.fileio.packed_array import PackedArrayReader
+
+
+def test_get_parser():
+    assert isinstance(get_parser(), ArgumentParser)
+
+
+def test_main():
+    with pytest.raises(SystemExit):
+        main()
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    rng = np.random.RandomState(0)
+    with (tmp_path / "wav.scp").open("w") as f, (tmp_path / "durations").open(
+        "w"
+    ) as fd:
+        for i in range(3):
+            nsamples = 4000 + 1000 * i
+            x = 0.5 * np.sin(2 * np.pi * 200 * np.arange(nsamples) / 16000)
+            x = (x + 0.01 * rng.randn(nsamples)).astype(np.float32)
+            soundfile.write(tmp_path / f"utt{i}.wav", x, 16000)
+            f.write(f"utt{i} {tmp_path / f'utt{i}.wav'}\n")
+            nframes = nsamples // 128 + 1
+            fd.write(f"utt{i} 5 0 {nframes - 5}\n")
+    with (tmp_path / "config.yaml").open("w") as f:
+        yaml.safe_dump(
+            dict(
+                pitch_extract="dio",
+                pitch_extract_conf=dict(fs=16000, n_fft=512, hop_length=128),
+                tts_conf=dict(reduction_factor=1),
+            ),
+            f,
+        )
+    return tmp_path
+
+
+@pytest.mark.parametrize("nj", [1, 2])
+def test_tts_extract_feats(data_dir, nj):
+    cmd = [
+        "--config",
+        str(data_dir / "config.yaml"),
+        "--data_path_and_name_and_type",
+        f"{data_dir / 'wav.scp'},speech,sound",
+        "--data_path_and_name_and_type",
+        f"{data_dir / 'durations'},durations,text_int",
+        "--output_dir",
+        str(data_dir / "out"),
+        "--nj",
+        str(nj),
+    ]
+    main(cmd)
+    reader = PackedArrayReader(data_dir / "out" / "pitch")
+    assert list(reader) == ["utt0", "utt1", "utt2"]
+    for key in reader:
+        assert reader[key].shape == (3, 1)
+        # The token having no frames
+        assert reader[key][1, 0] == 0.0
+    assert not (data_dir / "out" / "energy").exists()
+
+    # The up-to-date features are not extracted again
+    mtime = (data_dir / "out" / "pitch" / "values.bin").stat().st_mtime_ns
+    main(cmd)
+    assert (data_dir / "out" / "pitch" / "values.bin").stat().st_mtime_ns == mtime
+
+    # The parameters are changed
+    with (data_dir / "config.yaml").open("w") as f:
+        yaml.safe_dump(
+            dict(
+                pitch_extract="dio",
+                pitch_extract_conf=dict(fs=16000, n_fft=512, hop_length=128, f0min=60),
+            ),
+            f,
+        )
+    main(cmd)
+    assert PackedArrayReader(data_dir / "out" / "pitch").params["conf"]["f0min"] == 60
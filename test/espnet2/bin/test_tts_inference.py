@@ -3,6 +3,7 @@ from pathlib import Path
 import string
 
 import pytest
+import torch
 
 from espnet2.bin.tts_inference import get_parser
 from espnet2.bin.tts_inference import main
@@ -59,3 +60,16 @@ def test_Text2Speech(config_file):
     text2speech = Text2Speech(train_config=config_file)
     text = "aiueo"
     text2speech(text)
+
+
+@pytest.mark.execution_timeout(10)
+def test_Text2Speech_batch_inference(config_file):
+    text2speech = Text2Speech(train_config=config_file, maxlenratio=2.0)
+    text = torch.tensor([[1, 2, 3, 4], [5, 6, 0, 0]])
+    text_lengths = torch.tensor([4, 2])
+    results = text2speech.batch_inference(text, text_lengths)
+    assert len(results) == 2
+    for (wav, outs, outs_denorm, probs, att_ws, *_), ilen in zip(results, [4, 2]):
+        assert outs.shape == outs_denorm.shape
+        assert probs.size(0) == outs.size(0)
+        assert att_ws.size(-1) == ilen + 1
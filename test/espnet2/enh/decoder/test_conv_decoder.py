@@ -20,3 +20,21 @@ def test_ConvEncoder_backward(channel, kernel_size, stride):
     )
     y, flens = decoder(x, x_lens)
     y.sum().backward()
+
+
+@pytest.mark.parametrize("kernel_size, stride", [(16, 8), (5, 3), (4, 4)])
+def test_ConvDecoder_forward_streaming(kernel_size, stride):
+    decoder = ConvDecoder(channel=16, kernel_size=kernel_size, stride=stride)
+
+    x = torch.rand(2, 50, 16)
+    length = 49 * stride + kernel_size
+    y, _ = decoder(x, torch.tensor([length, length], dtype=torch.long))
+
+    state, ys, pos = None, [], 0
+    for chunk in [1, 7, 0, 30, 12]:
+        y_chunk, state = decoder.forward_streaming(
+            x[:, pos : pos + chunk], state, last=pos + chunk == 50
+        )
+        ys.append(y_chunk)
+        pos += chunk
+    torch.testing.assert_allclose(torch.cat(ys, dim=1), y)
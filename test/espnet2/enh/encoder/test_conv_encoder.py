@@ -18,3 +18,18 @@ def test_ConvEncoder_backward(channel, kernel_size, stride):
     x_lens = torch.tensor([32000, 30000], dtype=torch.long)
     y, flens = encoder(x, x_lens)
     y.sum().backward()
+
+
+@pytest.mark.parametrize("kernel_size, stride", [(16, 8), (5, 3), (4, 4)])
+def test_ConvEncoder_forward_streaming(kernel_size, stride):
+    encoder = ConvEncoder(channel=16, kernel_size=kernel_size, stride=stride)
+
+    x = torch.rand(2, 1000)
+    y, _ = encoder(x, torch.tensor([1000, 1000], dtype=torch.long))
+
+    state, ys, pos = None, [], 0
+    for chunk in [1, 7, 100, 3, 250, 639]:
+        y_chunk, state = encoder.forward_streaming(x[:, pos : pos + chunk], state)
+        ys.append(y_chunk)
+        pos += chunk
+    torch.testing.assert_allclose(torch.cat(ys, dim=1), y)
@@ -108,3 +108,25 @@ def test_rnn_separator_output():
         for n in range(num_spk):
             assert "mask_spk{}".format(n + 1) in others
             assert specs[n].shape == others["mask_spk{}".format(n + 1)].shape
+
+
+@pytest.mark.parametrize("rnn_type", ["rnn", "lstm", "gru"])
+def test_rnn_separator_forward_streaming(rnn_type):
+    model = RNNSeparator(input_dim=10, rnn_type=rnn_type, layer=2, unit=10, num_spk=2)
+    model.eval()
+    x = torch.rand(2, 20, 10)
+    specs, _, _ = model(x, torch.tensor([20, 20], dtype=torch.long))
+
+    states, outputs = None, [[], []]
+    for pos, chunk in [(0, 1), (1, 6), (7, 13)]:
+        specs_chunk, states = model.forward_streaming(x[:, pos : pos + chunk], states)
+        for out, spec in zip(outputs, specs_chunk):
+            out.append(spec)
+    for out, spec in zip(outputs, specs):
+        torch.testing.assert_allclose(torch.cat(out, dim=1), spec)
+
+
+def test_rnn_separator_forward_streaming_bidirectional():
+    model = RNNSeparator(input_dim=10, rnn_type="blstm", layer=2, unit=10)
+    with pytest.raises(NotImplementedError):
+        model.forward_streaming(torch.rand(2, 1, 10))
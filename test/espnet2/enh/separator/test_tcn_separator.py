@@ -137,3 +137,36 @@ def test_tcn_separator_output():
         for n in range(num_spk):
             assert "mask_spk{}".format(n + 1) in others
             assert specs[n].shape == others["mask_spk{}".format(n + 1)].shape
+
+
+@pytest.mark.parametrize("norm_type", ["cLN", "BN"])
+def test_tcn_separator_forward_streaming(norm_type):
+    model = TCNSeparator(
+        input_dim=10,
+        num_spk=2,
+        layer=3,
+        stack=2,
+        bottleneck_dim=4,
+        hidden_dim=6,
+        kernel=3,
+        causal=True,
+        norm_type=norm_type,
+    )
+    model.eval()
+    x = torch.rand(2, 20, 10)
+    specs, _, _ = model(x, torch.tensor([20, 20], dtype=torch.long))
+
+    states, outputs = None, [[], []]
+    for pos, chunk in [(0, 1), (1, 6), (7, 13)]:
+        specs_chunk, states = model.forward_streaming(x[:, pos : pos + chunk], states)
+        for out, spec in zip(outputs, specs_chunk):
+            out.append(spec)
+    for out, spec in zip(outputs, specs):
+        torch.testing.assert_allclose(torch.cat(out, dim=1), spec)
+
+
+def test_tcn_separator_forward_streaming_invalid():
+    for causal, norm_type in [(False, "cLN"), (True, "gLN")]:
+        model = TCNSeparator(input_dim=10, causal=causal, norm_type=norm_type)
+        with pytest.raises(NotImplementedError):
+            model.forward_streaming(torch.rand(2, 1, 10))
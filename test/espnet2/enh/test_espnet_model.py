@@ -260,3 +260,60 @@ def test_forward_with_beamformer_net(
         "dereverb_ref1": dereverb_ref1,
     }
     loss, stats, weight = enh_model(**kwargs)
+
+
+@pytest.mark.parametrize(
+    "separator",
+    [
+        RNNSeparator(input_dim=15, rnn_type="lstm", layer=1, unit=10, num_spk=2),
+        TCNSeparator(
+            input_dim=15,
+            num_spk=2,
+            layer=2,
+            stack=2,
+            bottleneck_dim=10,
+            hidden_dim=10,
+            kernel=3,
+            causal=True,
+            norm_type="cLN",
+        ),
+    ],
+)
+def test_forward_streaming(separator):
+    enh_model = ESPnetEnhancementModel(
+        encoder=conv_encoder,
+        separator=separator,
+        decoder=conv_decoder,
+        loss_type="si_snr",
+    )
+    enh_model.eval()
+
+    inputs = torch.randn(2, 300)
+    ilens = torch.LongTensor([300, 300])
+    with torch.no_grad():
+        feature_mix, flens = enh_model.encoder(inputs, ilens)
+        feature_pre, flens, _ = enh_model.separator(feature_mix, flens)
+        speech_pre = [enh_model.decoder(fp, ilens)[0] for fp in feature_pre]
+
+        states, outputs, pos = None, [[], []], 0
+        for chunk in [10, 1, 100, 150, 39]:
+            wavs, states = enh_model.forward_streaming(
+                inputs[:, pos : pos + chunk], states, last=pos + chunk == 300
+            )
+            for out, wav in zip(outputs, wavs):
+                out.append(wav)
+            pos += chunk
+    for out, wav in zip(outputs, speech_pre):
+        out = torch.cat(out, dim=1)
+        torch.testing.assert_allclose(out, wav[:, : out.size(1)])
+
+
+def test_forward_streaming_non_causal():
+    enh_model = ESPnetEnhancementModel(
+        encoder=stft_encoder,
+        separator=rnn_separator,
+        decoder=stft_decoder,
+        loss_type="mask_mse",
+    )
+    with pytest.raises(NotImplementedError):
+        enh_model.forward_streaming(torch.randn(2, 100))
@@ -27,3 +27,11 @@ def test_DatadirWriter(tmp_path: Path):
         f["aa2"]["ccccc"] = "aaa"
         # Duplicated warning
         f["aa2"]["ccccc"] = "def"
+
+
+def test_DatadirWriter_key_order(tmp_path: Path):
+    with DatadirWriter(tmp_path, key_order=["c", "a", "b"]) as writer:
+        for key in ["a", "b", "d", "c"]:
+            writer["text"][key] = key.upper()
+    with (tmp_path / "text").open("r", encoding="utf-8") as f:
+        assert f.read() == "c C\na A\nb B\nd D\n"
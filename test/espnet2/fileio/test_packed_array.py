@@ -0,0 +1,46 @@
+import pickle
+
+import numpy as np
+import pytest
+
+from espnet2.fileio.packed_array import PackedArrayReader
+from espnet2.fileio.packed_array import PackedArrayWriter
+
+
+@pytest.fixture
+def arrays():
+    return {
+        "a": np.random.randn(3, 1).astype(np.float32),
+        "b": np.random.randn(1, 1).astype(np.float32),
+        "c": np.zeros((0, 1), dtype=np.float32),
+    }
+
+
+def test_PackedArrayReader(tmp_path, arrays):
+    with PackedArrayWriter(tmp_path / "packed", params=dict(foo=[1, 2])) as writer:
+        for k, v in arrays.items():
+            writer[k] = v
+
+    reader = PackedArrayReader(tmp_path / "packed")
+    assert reader.params == dict(foo=[1, 2])
+    assert list(reader) == list(arrays)
+    for k, v in arrays.items():
+        assert reader[k].dtype == v.dtype
+        np.testing.assert_array_equal(reader[k], v)
+    assert "d" not in reader
+
+    reader2 = pickle.loads(pickle.dumps(reader))
+    np.testing.assert_array_equal(reader2["a"], arrays["a"])
+
+
+def test_PackedArrayReader_empty(tmp_path):
+    with PackedArrayWriter(tmp_path / "packed"):
+        pass
+    assert len(PackedArrayReader(tmp_path / "packed")) == 0
+
+
+def test_PackedArrayWriter_mismatch(tmp_path):
+    with PackedArrayWriter(tmp_path / "packed") as writer:
+        writer["a"] = np.zeros((3, 1), dtype=np.float32)
+        with pytest.raises(RuntimeError):
+            writer["b"] = np.zeros((3, 2), dtype=np.float32)
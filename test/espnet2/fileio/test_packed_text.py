@@ -0,0 +1,64 @@
+import pickle
+
+import numpy as np
+import pytest
+
+from espnet2.fileio.packed_text import PackedTextBlockReader
+from espnet2.fileio.packed_text import PackedTextReader
+from espnet2.fileio.packed_text import PackedTextWriter
+
+
+@pytest.fixture
+def sentences():
+    return {
+        "a": np.array([1, 2, 3]),
+        "b": np.array([4]),
+        "c": np.array([5, 6, 7, 8, 9]),
+    }
+
+
+@pytest.mark.parametrize("eos", [None, 10])
+def test_PackedTextReader(tmp_path, sentences, eos):
+    with PackedTextWriter(tmp_path / "packed", eos=eos) as writer:
+        for k, v in sentences.items():
+            writer[k] = v
+
+    reader = PackedTextReader(tmp_path / "packed")
+    assert list(reader) == list(sentences)
+    for k, v in sentences.items():
+        np.testing.assert_array_equal(reader[k], v)
+        assert reader[k].dtype == np.int64
+    assert "d" not in reader
+    with pytest.raises(KeyError):
+        reader["d"]
+
+    reader = pickle.loads(pickle.dumps(reader))
+    np.testing.assert_array_equal(reader["c"], sentences["c"])
+
+
+def test_PackedTextBlockReader(tmp_path, sentences):
+    with PackedTextWriter(tmp_path / "packed", eos=10) as writer:
+        for k, v in sentences.items():
+            writer[k] = v
+
+    reader = PackedTextBlockReader(tmp_path / "packed", 4)
+    assert list(reader) == ["block0", "block1", "block2"]
+    np.testing.assert_array_equal(reader["block0"], [1, 2, 3, 10])
+    assert reader["block0"].dtype == np.int64
+    np.testing.assert_array_equal(reader["block1"], [4, 10, 5, 6])
+    np.testing.assert_array_equal(reader["block2"], [7, 8, 9, 10])
+    assert reader.shape("block2") == 4
+    assert "block3" not in reader
+    with pytest.raises(KeyError):
+        reader["a"]
+
+
+def test_PackedTextReader_outdated_index(tmp_path, sentences):
+    with PackedTextWriter(tmp_path / "packed") as writer:
+        for k, v in sentences.items():
+            writer[k] = v
+    with (tmp_path / "packed" / "keys").open("a") as f:
+        f.write("d\n")
+
+    with pytest.raises(RuntimeError):
+        PackedTextReader(tmp_path / "packed")
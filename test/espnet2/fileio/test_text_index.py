@@ -0,0 +1,97 @@
+import multiprocessing
+import pickle
+
+import numpy as np
+import pytest
+
+from espnet2.fileio.read_text import load_2column_text
+from espnet2.fileio.read_text import read_2column_text
+from espnet2.fileio.text_index import load_text_index
+from espnet2.fileio.text_index import TextIndexReader
+from espnet2.fileio.text_index import write_text_index
+
+
+@pytest.fixture
+def shape_file(tmp_path):
+    p = tmp_path / "shape"
+    p.write_text("uttC 30,80\nuttA 10,80\nuttB 200,80\n")
+    return p
+
+
+def test_TextIndexReader(shape_file):
+    write_text_index(shape_file)
+    reader = TextIndexReader(shape_file)
+    assert len(reader) == 3
+    assert list(reader) == ["uttC", "uttA", "uttB"]
+    assert reader["uttA"] == "10,80"
+    assert reader["uttB"] == "200,80"
+    assert reader.shape("uttC") == (30, 80)
+    assert "uttA" in reader
+    assert "uttD" not in reader
+    with pytest.raises(KeyError):
+        reader["uttD"]
+    np.testing.assert_array_equal(
+        reader.shapes_in_order(), [[30, 80], [10, 80], [200, 80]]
+    )
+
+
+def test_TextIndexReader_pickle(shape_file):
+    write_text_index(shape_file)
+    reader = TextIndexReader(shape_file)
+    reader["uttA"]
+    reader2 = pickle.loads(pickle.dumps(reader))
+    assert reader2["uttB"] == "200,80"
+
+
+_forked_reader = None
+
+
+def _read_all(_):
+    return [_forked_reader[k] for k in ["uttA", "uttB", "uttC"] * 100]
+
+
+def test_TextIndexReader_fork(shape_file):
+    global _forked_reader
+    write_text_index(shape_file)
+    _forked_reader = TextIndexReader(shape_file)
+    # NOTE: The file opened in the parent is inherited by the forked processes
+    # without pickling, i.e. they share the file offset
+    _forked_reader["uttA"]
+    assert _forked_reader._file.tell() == 0
+    with multiprocessing.get_context("fork").Pool(4) as pool:
+        results = pool.map(_read_all, range(8))
+    assert all(r == ["10,80", "200,80", "30,80"] * 100 for r in results)
+
+
+def test_TextIndexReader_text(tmp_path):
+    p = tmp_path / "text"
+    p.write_text("b  hello world\na\nc こんにちは\n", encoding="utf-8")
+    write_text_index(p)
+    reader = TextIndexReader(p)
+    assert dict(reader) == {"b": "hello world", "a": "", "c": "こんにちは"}
+    assert not reader.has_shapes
+
+
+def test_TextIndexReader_unicode_whitespace(tmp_path):
+    p = tmp_path / "text"
+    p.write_text("a\u3000こんにちは\u3000世界\u3000\nb\xa0x\n", encoding="utf-8")
+    write_text_index(p)
+    assert dict(TextIndexReader(p)) == read_2column_text(p)
+
+
+def test_write_text_index_duplicated(tmp_path):
+    p = tmp_path / "text"
+    p.write_text("a 1\na 2\n")
+    with pytest.raises(RuntimeError):
+        write_text_index(p)
+
+
+def test_load_2column_text(shape_file):
+    assert isinstance(load_2column_text(shape_file), dict)
+    write_text_index(shape_file)
+    assert isinstance(load_2column_text(shape_file), TextIndexReader)
+
+    # The index is not used after the text file is changed
+    shape_file.write_text("uttA 10,80\n")
+    assert load_text_index(shape_file) is None
+    assert load_2column_text(shape_file) == {"uttA": "10,80"}
@@ -117,3 +117,15 @@ def test_new_style_stats_file(stats_file, stats_file2, norm_vars, norm_means):
     y, _ = layer(x)
     y2, _ = layer2(x)
     np.testing.assert_allclose(y.numpy(), y2.numpy())
+
+
+@pytest.mark.parametrize(
+    "norm_vars, norm_means",
+    [(True, True), (False, False), (True, False), (False, True)],
+)
+def test_scale_and_bias(stats_file, norm_vars, norm_means):
+    layer = GlobalMVN(stats_file, norm_means=norm_means, norm_vars=norm_vars)
+    x = torch.randn(1, 2, 80)
+    y, _ = layer(x.clone())
+    scale, bias = layer.scale_and_bias()
+    torch.testing.assert_allclose(x * scale.float() + bias.float(), y)
@@ -29,3 +29,16 @@ def test_backward_not_leaf_in():
     x = x + 2
     y, _ = layer(x)
     y.sum().backward()
+
+
+def test_fold_normalization():
+    layer = LogMel(n_fft=16, n_mels=2)
+    x = torch.randn(2, 4, 9).abs()
+    ilens = torch.tensor([4, 2], dtype=torch.long)
+    y, _ = layer(x, ilens)
+    layer.fold_normalization(torch.tensor([2.0, 0.5]), torch.tensor([1.0, -1.0]))
+    y2, _ = layer(x, ilens)
+    torch.testing.assert_allclose(
+        y2[0], y[0] * torch.tensor([2.0, 0.5]) + torch.tensor([1.0, -1.0])
+    )
+    assert (y2[1, 2:] == 0.0).all()
@@ -1,6 +1,7 @@
 import pytest
 import torch
 
+from espnet2.layers.mask_along_axis import make_axis_mask
 from espnet2.layers.mask_along_axis import MaskAlongAxis
 
 
@@ -32,3 +33,11 @@ def test_MaskAlongAxis_repr(dim, replace_with_zero):
         replace_with_zero=replace_with_zero,
     )
     print(freq_mask)
+
+
+def test_make_axis_mask_with_lengths():
+    lengths = torch.tensor([100, 10, 0])
+    mask = make_axis_mask(3, 100, mask_width_range=(5, 6), num_mask=1, lengths=lengths)
+    assert mask.shape == (3, 100)
+    assert mask.sum(1).tolist() == [5, 5, 5]
+    assert not mask[1, 10:].any()
@@ -56,3 +56,12 @@ def test_mel_scale():
     f_back = MelScale.invert(x)
     assert torch.abs(f_back - f) < 0.1
     MelScale.bank(128, 16000.0)
+
+
+def test_sinc_filters_freeze_for_inference():
+    filters = SincConv(in_channels=1, out_channels=16, kernel_size=101)
+    x = torch.randn([5, 1, 400])
+    y = filters(x)
+    filters.freeze_for_inference()
+    assert "sinc_filters" in dict(filters.named_buffers())
+    torch.testing.assert_allclose(filters(x), y)
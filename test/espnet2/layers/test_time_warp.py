@@ -1,6 +1,7 @@
 import pytest
 import torch
 
+from espnet2.layers.time_warp import batch_time_warp
 from espnet2.layers.time_warp import TimeWarp
 
 
@@ -19,3 +20,25 @@ def test_TimeWarp(x_lens, requires_grad):
 def test_TimeWarp_repr():
     time_warp = TimeWarp(window=10)
     print(time_warp)
+
+
+@pytest.mark.parametrize("x_lens", [None, torch.tensor([100, 78, 15])])
+@pytest.mark.parametrize("requires_grad", [False, True])
+def test_TimeWarp_batched(x_lens, requires_grad):
+    time_warp = TimeWarp(window=10, mode="bilinear", batched=True)
+    x = torch.randn(3, 100, 80, requires_grad=requires_grad)
+    y, y_lens = time_warp(x, x_lens)
+    assert y.shape == x.shape
+    if x_lens is not None:
+        assert (y[1, 78:] == 0).all()
+        # Shorter than 2 * window + 1: Not warped
+        torch.testing.assert_allclose(y[2, :15], x[2, :15])
+    if requires_grad:
+        y.sum().backward()
+
+
+def test_batch_time_warp_identity():
+    # warped == center for all samples if the lengths are too short
+    x = torch.randn(2, 2, 8, 5)
+    y = batch_time_warp(x, torch.tensor([8, 8]), window=4, mode="bilinear")
+    torch.testing.assert_allclose(y, x)
@@ -0,0 +1,117 @@
+import numpy as np
+import pytest
+import torch
+
+from espnet2.fileio.npy_scp import NpyScpReader
+from espnet2.fileio.packed_array import PackedArrayReader
+from espnet2.main_funcs.collect_stats import batch_stats
+from espnet2.main_funcs.collect_stats import batch_sums
+from espnet2.main_funcs.collect_stats import collect_stats
+from espnet2.main_funcs.collect_stats import load_stats
+from espnet2.main_funcs.collect_stats import merge_stats
+from espnet2.main_funcs.collect_stats import save_stats
+from espnet2.train.abs_espnet_model import AbsESPnetModel
+
+
+class DummyModel(AbsESPnetModel):
+    def forward(self, x, x_lengths):
+        pass
+
+    def collect_feats(self, x, x_lengths):
+        # Multi-channel float feats and integer feats
+        return dict(
+            feats=x[:, :, None].repeat(1, 1, 2, 1),
+            feats_lengths=x_lengths,
+            durations=x_lengths[:, None].repeat(1, 3),
+        )
+
+
+def test_batch_stats():
+    v = torch.randn(3, 7, 4)
+    lengths = torch.LongTensor([7, 2, 5])
+    count, mean, m2 = batch_stats(v, lengths)
+
+    frames = torch.cat([v[i, :lg] for i, lg in enumerate(lengths)]).double()
+    assert count == 14
+    np.testing.assert_allclose(mean.numpy(), frames.mean(0).numpy())
+    np.testing.assert_allclose(m2.numpy(), (frames.var(0) * 13).numpy())
+
+
+def test_batch_stats_without_lengths():
+    v = torch.randn(3, 4)
+    count, mean, m2 = batch_stats(v)
+    assert count == 3
+    np.testing.assert_allclose(mean.numpy(), v.double().mean(0).numpy())
+
+
+def test_batch_sums():
+    # NOTE: The square sum exceeds the precision of float64
+    v = torch.LongTensor([[[2 ** 30 + 1], [3]], [[5], [7]]])
+    sum_v, sum_square = batch_sums(v, torch.LongTensor([2, 1]))
+    assert sum_v.dtype == torch.int64
+    assert sum_v.tolist() == [2 ** 30 + 1 + 3 + 5]
+    assert sum_square.tolist() == [(2 ** 30 + 1) ** 2 + 3 ** 2 + 5 ** 2]
+
+
+@pytest.mark.parametrize("split", [0, 1, 5, 10])
+def test_merge_stats(split):
+    x = np.random.randn(10, 3) + 100.0
+    a = (split, x[:split].mean(0), ((x[:split] - x[:split].mean(0)) ** 2).sum(0))
+    b = (10 - split, x[split:].mean(0), ((x[split:] - x[split:].mean(0)) ** 2).sum(0))
+    count, mean, m2 = merge_stats(a, b)
+    assert count == 10
+    np.testing.assert_allclose(mean, x.mean(0))
+    np.testing.assert_allclose(m2, x.var(0) * 10)
+
+
+def test_save_and_load_stats(tmp_path):
+    x = np.random.randn(10, 3).astype(np.float32)
+    stats = (10, x.mean(0).astype(np.float64), x.var(0).astype(np.float64) * 10)
+    sums = (x.sum(0), (x ** 2).sum(0))
+    save_stats(tmp_path / "feats_stats.npz", stats, sums)
+    with np.load(tmp_path / "feats_stats.npz") as npz:
+        assert npz["sum"].dtype == np.float32
+        np.testing.assert_array_equal(npz["sum"], sums[0])
+        np.testing.assert_array_equal(npz["sum_square"], sums[1])
+        count, mean, m2 = load_stats(npz)
+    assert count == 10
+    np.testing.assert_allclose(mean, stats[1])
+
+    # The stats written by the older version have only count, sum, and sum_square
+    count, mean, m2 = load_stats(
+        dict(count=10, sum=x.sum(0), sum_square=(x ** 2).sum(0))
+    )
+    np.testing.assert_allclose(m2, stats[2], rtol=1e-4)
+
+
+@pytest.mark.parametrize("collected_feats_format", ["packed_array", "npy"])
+def test_collect_stats_write_collected_feats(tmp_path, collected_feats_format):
+    batch = dict(x=torch.randn(2, 4, 3), x_lengths=torch.LongTensor([4, 2]))
+    itr = [(["a", "b"], batch)]
+    collect_stats(
+        DummyModel(),
+        itr,
+        itr,
+        tmp_path,
+        0,
+        None,
+        True,
+        collected_feats_format=collected_feats_format,
+    )
+
+    p = tmp_path / "train" / "collect_feats"
+    if collected_feats_format == "npy":
+        feats = NpyScpReader(p / "feats.scp")
+        durations = NpyScpReader(p / "durations.scp")
+    else:
+        feats = PackedArrayReader(p / "feats")
+        durations = PackedArrayReader(p / "durations")
+    np.testing.assert_array_equal(
+        feats["b"], batch["x"][1, :2, None].repeat(1, 2, 1).numpy()
+    )
+    assert durations["a"].dtype == np.int64
+    np.testing.assert_array_equal(durations["a"], [[4, 4, 4]])
+
+    with np.load(tmp_path / "train" / "durations_stats.npz") as stats:
+        assert stats["sum"].dtype == np.int64
+        assert stats["sum_square"].tolist() == [20, 20, 20]
@@ -0,0 +1,49 @@
+import pytest
+
+from espnet2.samplers.inference_batch_sampler import InferenceBatchSampler
+
+
+@pytest.fixture()
+def shape_file(tmp_path):
+    p = tmp_path / "shape.txt"
+    with p.open("w") as f:
+        f.write("a 1000,80\n")
+        f.write("b 400,80\n")
+        f.write("c 800,80\n")
+        f.write("d 789,80\n")
+        f.write("e 1023,80\n")
+        f.write("f 999,80\n")
+    return str(p)
+
+
+@pytest.mark.parametrize("batch_bins, batch_size", [(0, 1), (0, 4), (2000, 1), (1, 1)])
+def test_InferenceBatchSampler(shape_file, batch_bins, batch_size):
+    sampler = InferenceBatchSampler(
+        [shape_file], batch_bins=batch_bins, batch_size=batch_size
+    )
+    batches = list(sampler)
+    assert len(sampler) == len(batches)
+    # Every utterance is used once
+    assert sorted(k for batch in batches for k in batch) == list("abcdef")
+    assert sampler.keys == list("abcdef")
+    # The longest ones come first
+    assert batches[0][0] == "e"
+    assert 0.0 < sampler.padding_efficiency <= 1.0
+    print(sampler)
+
+
+def test_InferenceBatchSampler_batch_bins(shape_file):
+    sampler = InferenceBatchSampler([shape_file], batch_bins=2100)
+    assert list(sampler) == [("e", "a", "f"), ("c", "d", "b")]
+    assert sampler.padding_efficiency == pytest.approx(
+        (1000 + 400 + 800 + 789 + 1023 + 999) / (1023 * 3 + 800 * 3)
+    )
+
+
+def test_InferenceBatchSampler_keys(shape_file):
+    sampler = InferenceBatchSampler([shape_file], batch_size=2, keys=["f", "b", "e"])
+    assert list(sampler) == [("e", "f"), ("b",)]
+    assert sampler.keys == ["f", "b", "e"]
+
+    with pytest.raises(RuntimeError):
+        InferenceBatchSampler([shape_file], keys=["a", "x"])
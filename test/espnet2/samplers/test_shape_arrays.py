@@ -0,0 +1,77 @@
+import numpy as np
+import pytest
+
+from espnet2.fileio.text_index import write_text_index
+from espnet2.samplers.length_batch_sampler import LengthBatchSampler
+from espnet2.samplers.shape_arrays import BatchList
+from espnet2.samplers.shape_arrays import greedy_batch_sizes
+from espnet2.samplers.shape_arrays import load_shape_arrays
+
+
+@pytest.fixture()
+def shape_files(tmp_path):
+    p1 = tmp_path / "shape1.txt"
+    p1.write_text("a 1000,80\nb 400,80\nc 800,80\n")
+    p2 = tmp_path / "shape2.txt"
+    p2.write_text("c 39\na 30\nb 50\n")
+    return str(p1), str(p2)
+
+
+@pytest.mark.parametrize("indexed", [(), (0,), (0, 1)])
+def test_load_shape_arrays(shape_files, indexed):
+    for i in indexed:
+        write_text_index(shape_files[i])
+    keys, (shape1, shape2) = load_shape_arrays(shape_files)
+    assert keys == ["a", "b", "c"]
+    np.testing.assert_array_equal(shape1, [[1000, 80], [400, 80], [800, 80]])
+    np.testing.assert_array_equal(shape2, [[30], [50], [39]])
+
+
+@pytest.mark.parametrize("indexed", [False, True])
+def test_load_shape_arrays_mismatch(shape_files, tmp_path, indexed):
+    p3 = tmp_path / "shape3.txt"
+    p3.write_text("a 30\nb 50\nd 39\n")
+    if indexed:
+        write_text_index(shape_files[0])
+        write_text_index(p3)
+    with pytest.raises(RuntimeError):
+        load_shape_arrays([shape_files[0], str(p3)])
+
+
+def test_BatchList():
+    batches = BatchList(["a", "b", "c"], [2, 0], [3, 2], reverse=True)
+    assert list(batches) == [("c",), ("b", "a")]
+    assert batches[1:] == [("b", "a")]
+    np.testing.assert_array_equal(batches.batch_sizes(), [1, 2])
+
+
+@pytest.mark.parametrize("padding", [True, False])
+@pytest.mark.parametrize("min_batch_size", [1, 3])
+def test_greedy_batch_sizes(padding, min_batch_size):
+    costs = np.sort(np.random.randint(1, 100, 1000))
+    batch_sizes, remainder = greedy_batch_sizes(
+        costs, 500, min_batch_size=min_batch_size, padding=padding
+    )
+
+    # The same as adding the samples one by one
+    desired, current = [], []
+    for c in costs:
+        current.append(c)
+        bins = len(current) * c if padding else sum(current)
+        if bins > 500 and len(current) >= min_batch_size:
+            desired.append(len(current))
+            current = []
+    assert batch_sizes == desired
+    assert remainder == len(current)
+
+
+def test_batch_cache(shape_files, tmp_path):
+    cache_dir = tmp_path / "cache"
+    sampler = LengthBatchSampler(100, shape_files, cache_dir=str(cache_dir))
+    assert len(list(cache_dir.glob("*.npz"))) == 1
+    cached = LengthBatchSampler(100, shape_files, cache_dir=str(cache_dir))
+    assert list(sampler) == list(cached)
+
+    # Another cache for other options
+    LengthBatchSampler(1000, shape_files, cache_dir=str(cache_dir))
+    assert len(list(cache_dir.glob("*.npz"))) == 2
@@ -132,3 +132,20 @@ def test_main(tmp_path):
             "1",
         ]
     )
+
+
+@pytest.mark.parametrize("legacy_format", [False, True])
+def test_build_model_from_file(tmp_path, legacy_format):
+    (tmp_path / "config.yaml").write_text("init: null\n")
+    model = TestModel()
+    torch.save(
+        model.state_dict(),
+        tmp_path / "model.pth",
+        _use_new_zipfile_serialization=not legacy_format,
+    )
+
+    loaded, _ = TestTask.build_model_from_file(
+        tmp_path / "config.yaml", tmp_path / "model.pth"
+    )
+    for k, v in model.state_dict().items():
+        assert torch.equal(loaded.state_dict()[k], v)
@@ -1,6 +1,10 @@
+import numpy as np
 import pytest
 
+from espnet2.fileio.packed_text import PackedTextWriter
+
 from espnet2.tasks.lm import LMTask
+from espnet2.train.dataset import ESPnetDataset
 
 
 def test_add_arguments():
@@ -34,3 +38,37 @@ def test_print_config_and_load_it(tmp_path):
         LMTask.print_config(f)
     parser = LMTask.get_parser()
     parser.parse_args(["--config", str(config_file)])
+
+
+@pytest.mark.parametrize(
+    "data_type, keys",
+    [("packed_text", ["a", "b"]), ("packed_text_4", ["block0", "block1"])],
+)
+def test_forward_packed_text(tmp_path, data_type, keys):
+    with (tmp_path / "tokens.txt").open("w") as f:
+        for t in ["<blank>", "<unk>", "a", "b", "c", "<sos/eos>"]:
+            f.write(f"{t}\n")
+    with PackedTextWriter(tmp_path / "packed", eos=5) as writer:
+        writer["a"] = np.array([2, 3, 4])
+        writer["b"] = np.array([4, 2])
+
+    args = LMTask.get_parser().parse_args(
+        [
+            "--token_list",
+            str(tmp_path / "tokens.txt"),
+            "--token_type",
+            "char",
+            "--lm_conf",
+            "unit=4",
+            "--lm_conf",
+            "nlayers=1",
+        ]
+    )
+    model = LMTask.build_model(args)
+    dataset = ESPnetDataset(
+        [(str(tmp_path / "packed"), "text", data_type)],
+        preprocess=LMTask.build_preprocess_fn(args, train=True),
+    )
+    _, batch = LMTask.build_collate_fn(args, train=True)([dataset[k] for k in keys])
+    loss, _, _ = model(**batch)
+    loss.backward()
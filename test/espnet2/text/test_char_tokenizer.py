@@ -25,3 +25,22 @@ def test_text2tokens(char_tokenizer: CharTokenizer):
 
 def test_token2text(char_tokenizer: CharTokenizer):
     assert char_tokenizer.tokens2text(["a", "b", "c"]) == "abc"
+
+
+def test_text2tokens_longest_match():
+    tokenizer = CharTokenizer(non_linguistic_symbols=["[foo", "[foo]", ""])
+    assert tokenizer.text2tokens("a [foo][fo") == [
+        "a",
+        "<space>",
+        "[foo]",
+        "[",
+        "f",
+        "o",
+    ]
+
+
+def test_text2tokens_remove_non_linguistic_symbols():
+    tokenizer = CharTokenizer(
+        non_linguistic_symbols=["[foo]"], remove_non_linguistic_symbols=True
+    )
+    assert tokenizer.text2tokens("a[foo]b") == ["a", "b"]
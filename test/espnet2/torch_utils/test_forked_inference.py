@@ -0,0 +1,88 @@
+from concurrent.futures.process import BrokenProcessPool
+import os
+
+import numpy as np
+import pytest
+
+from espnet2.tasks.lm import LMTask
+from espnet2.torch_utils.forked_inference import forked_inference
+from espnet2.train.collate_fn import CommonCollateFn
+
+
+@pytest.fixture()
+def data_dir(tmp_path):
+    with (tmp_path / "feats.scp").open("w") as f, (tmp_path / "feats_shape").open(
+        "w"
+    ) as f2:
+        for i, length in enumerate([3, 10, 5, 8, 1, 7]):
+            np.save(tmp_path / f"utt{i}.npy", np.random.randn(length, 2))
+            f.write(f"utt{i} {tmp_path / f'utt{i}.npy'}\n")
+            f2.write(f"utt{i} {length},2\n")
+    return tmp_path
+
+
+def _build_loader(data_dir, shape_files):
+    return LMTask.build_streaming_iterator(
+        [(str(data_dir / "feats.scp"), "text", "npy")],
+        preprocess_fn=None,
+        collate_fn=CommonCollateFn(),
+        dtype="float32",
+        batch_size=2,
+        num_workers=0,
+        shape_files=shape_files,
+    )
+
+
+def _inference(keys, batch):
+    return [
+        (feats[:length] * 2).sum(0)
+        for feats, length in zip(batch["text"], batch["text_lengths"])
+    ]
+
+
+@pytest.mark.parametrize("nj", [1, 2, 3])
+def test_forked_inference(data_dir, nj):
+    loader = _build_loader(data_dir, [str(data_dir / "feats_shape")])
+    outputs = {}
+    for keys, results in forked_inference(loader, _inference, nj=nj, num_threads=1):
+        assert len(keys) == len(results)
+        for key, result in zip(keys, results):
+            assert key not in outputs
+            outputs[key] = result
+
+    assert sorted(outputs) == [f"utt{i}" for i in range(6)]
+    for key, result in outputs.items():
+        expected = np.load(data_dir / f"{key}.npy").sum(0) * 2
+        np.testing.assert_allclose(result.numpy(), expected, atol=1e-5)
+
+
+def test_forked_inference_in_process_with_iterable_dataset(data_dir):
+    loader = _build_loader(data_dir, None)
+    keys = [
+        k for batch_keys, _ in forked_inference(loader, _inference) for k in batch_keys
+    ]
+    assert keys == [f"utt{i}" for i in range(6)]
+
+
+def test_forked_inference_requires_map_style_dataset(data_dir):
+    loader = _build_loader(data_dir, None)
+    with pytest.raises(RuntimeError):
+        next(forked_inference(loader, _inference, nj=2))
+
+
+def test_forked_inference_propagates_errors(data_dir):
+    def _raise(keys, batch):
+        raise ValueError(keys)
+
+    loader = _build_loader(data_dir, [str(data_dir / "feats_shape")])
+    with pytest.raises(ValueError):
+        list(forked_inference(loader, _raise, nj=2))
+
+
+def test_forked_inference_raises_if_worker_dies(data_dir):
+    def _exit(keys, batch):
+        os._exit(1)
+
+    loader = _build_loader(data_dir, [str(data_dir / "feats_shape")])
+    with pytest.raises(BrokenProcessPool):
+        list(forked_inference(loader, _exit, nj=2))
@@ -0,0 +1,72 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+import torch
+
+from espnet2.asr.frontend.default import DefaultFrontend
+from espnet2.asr.preencoder.sinc import LightweightSincConvs
+from espnet2.layers.global_mvn import GlobalMVN
+from espnet2.torch_utils.freeze_for_inference import freeze_for_inference
+
+
+@pytest.fixture()
+def stats_file(tmp_path: Path):
+    p = tmp_path / "stats.npz"
+    np.random.seed(0)
+    x = np.random.randn(10, 8) - 5.0
+    np.savez(p, sum=x.sum(0), sum_square=(x ** 2).sum(0), count=10)
+    return p
+
+
+class Model(torch.nn.Module):
+    def __init__(self, stats_file, norm_means, norm_vars):
+        super().__init__()
+        self.frontend = DefaultFrontend(
+            n_fft=16, n_mels=8, frontend_conf=None, apply_stft=False
+        )
+        self.normalize = GlobalMVN(
+            stats_file, norm_means=norm_means, norm_vars=norm_vars
+        )
+
+    def forward(self, x, ilens):
+        feats, feats_lengths = self.frontend(x, ilens)
+        if self.normalize is not None:
+            feats, feats_lengths = self.normalize(feats, feats_lengths)
+        return feats, feats_lengths
+
+
+@pytest.mark.parametrize(
+    "norm_means, norm_vars", [(True, True), (True, False), (False, True)]
+)
+def test_freeze_for_inference_fold_global_mvn(stats_file, norm_means, norm_vars):
+    model = Model(stats_file, norm_means, norm_vars).eval()
+    # (B, T, F, 2): The real and the imaginary parts of STFT
+    x = torch.randn(2, 10, 9, 2)
+    ilens = torch.LongTensor([10, 7])
+    y, _ = model(x, ilens)
+
+    freeze_for_inference(model)
+    assert model.normalize is None
+    assert all(not p.requires_grad for p in model.parameters())
+    y2, _ = model(x, ilens)
+    torch.testing.assert_allclose(y2, y)
+    assert (y2[1, 7:] == 0.0).all()
+
+    traced = torch.jit.trace(model, (x, ilens))
+    torch.testing.assert_allclose(traced(x, ilens)[0], y)
+
+
+def test_freeze_for_inference_sinc():
+    preencoder = LightweightSincConvs(out_channels=128).eval()
+    x = torch.randn(2, 3, 1, 400)
+    ilens = torch.LongTensor([3, 2])
+    y, _ = preencoder(x, ilens)
+
+    freeze_for_inference(preencoder)
+    assert preencoder.filters.frozen
+    y2, _ = preencoder(x, ilens)
+    torch.testing.assert_allclose(y2, y)
+
+    traced = torch.jit.trace(preencoder, (x, ilens))
+    torch.testing.assert_allclose(traced(x, ilens)[0], y)
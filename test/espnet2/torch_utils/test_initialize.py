@@ -2,6 +2,7 @@ import pytest
 import torch
 
 from espnet2.torch_utils.initialize import initialize
+from espnet2.torch_utils.initialize import skip_initialization
 
 initialize_types = {}
 
@@ -47,3 +48,11 @@ def test_5dim():
     model = Model2()
     with pytest.raises(NotImplementedError):
         initialize(model, "chainer")
+
+
+def test_skip_initialization():
+    with skip_initialization():
+        model = Model()
+        torch.nn.init.ones_(model.l1.bias)
+    assert torch.nn.init.ones_(model.l1.bias) is model.l1.bias
+    assert (model.l1.bias == 1).all()
@@ -0,0 +1,28 @@
+import pytest
+
+from espnet2.layers.abs_normalize import AbsNormalize
+from espnet2.layers.global_mvn import GlobalMVN
+from espnet2.train.class_choices import ClassChoices
+
+
+def test_get_class_from_path():
+    choices = ClassChoices(
+        "normalize",
+        classes=dict(global_mvn="espnet2.layers.global_mvn.GlobalMVN"),
+        type_check=AbsNormalize,
+        default="global_mvn",
+    )
+    assert choices.choices() == ("global_mvn",)
+    assert choices.get_class("global_mvn") is GlobalMVN
+    assert choices.get_class("Global_MVN") is GlobalMVN
+
+
+def test_get_class_from_path_type_check():
+    choices = ClassChoices(
+        "normalize",
+        classes=dict(a="espnet2.train.class_choices.ClassChoices"),
+        type_check=AbsNormalize,
+        default="a",
+    )
+    with pytest.raises(ValueError):
+        choices.get_class("a")
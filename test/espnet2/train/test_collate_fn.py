@@ -1,6 +1,8 @@
 import numpy as np
 import pytest
+import torch
 
+from espnet2.train.collate_fn import CollateBufferPool
 from espnet2.train.collate_fn import common_collate_fn
 from espnet2.train.collate_fn import CommonCollateFn
 
@@ -121,3 +123,49 @@ def test_CommonCollateFn_repr(float_pad_value, int_pad_value, not_sequence):
             not_sequence=not_sequence,
         )
     )
+
+
+def test_CollateBufferPool():
+    pool = CollateBufferPool(max_size=2)
+    a = pool.get((2, 3), np.float32)
+    assert a.shape == (2, 3) and a.dtype == np.float32
+    # Not reused while the tensor made from it is alive
+    t = torch.from_numpy(pool.get((4,), np.int64))[1:]
+    b = pool.get((2,), np.float64)
+    assert len(pool.buffers) == 2
+    assert not np.shares_memory(a, b)
+
+    del a, b
+    c = pool.get((1, 3), np.int32)
+    assert np.shares_memory(c, pool.buffers[0])
+    assert not np.shares_memory(c, t.numpy())
+
+    # Released on moving to the shared memory
+    t.share_memory_()
+    del c
+    d = pool.get((4,), np.int64)
+    assert np.shares_memory(d, pool.buffers[1])
+
+
+def test_common_collate_fn_buffer_pool():
+    pool = CollateBufferPool(max_size=1)
+    for i in range(3):
+        data = [
+            ("id", dict(a=np.random.randn(3 + i, 5).astype(np.float32))),
+            ("id2", dict(a=np.random.randn(2, 5).astype(np.float32))),
+        ]
+        _, t = common_collate_fn(data, float_pad_value=-1.0, buffer_pool=pool)
+        _, desired = common_collate_fn(data, float_pad_value=-1.0)
+        assert t["a"].dtype == torch.float32
+        np.testing.assert_array_equal(t["a"], desired["a"])
+        np.testing.assert_array_equal(t["a_lengths"], [3 + i, 2])
+        del t
+    assert len(pool.buffers) == 1
+
+
+@pytest.mark.skipif(not torch.cuda.is_available(), reason="Require cuda")
+def test_common_collate_fn_pin_memory():
+    data = [("id", dict(a=np.ones((3, 2)))), ("id2", dict(a=np.ones((2, 2))))]
+    _, t = CommonCollateFn(pin_memory=True)(data)
+    assert t["a"].is_pinned()
+    assert t["a"].pin_memory().data_ptr() == t["a"].data_ptr()
@@ -0,0 +1,36 @@
+import pytest
+import torch
+import torch.nn.functional as F
+
+from espnet2.tts.feats_extract.average_by_duration import average_by_duration
+
+
+def _average_by_duration_loop(x, d, positive_only):
+    d_cumsum = F.pad(d.cumsum(dim=0), (1, 0))
+    x_avg = []
+    for start, end in zip(d_cumsum[:-1], d_cumsum[1:]):
+        values = x[start:end]
+        if positive_only:
+            values = values.masked_select(values.gt(0.0))
+        x_avg.append(values.mean() if len(values) != 0 else x.new_tensor(0.0))
+    return torch.stack(x_avg)
+
+
+@pytest.mark.parametrize("positive_only", [False, True])
+def test_average_by_duration(positive_only):
+    torch.manual_seed(0)
+    x = torch.randn(3, 20)
+    durations = torch.LongTensor([[3, 0, 10, 7], [5, 5, 0, 0], [0, 2, 0, 0]])
+    y = average_by_duration(x, durations, positive_only=positive_only)
+    assert y.shape == (3, 4)
+    for i in range(3):
+        torch.testing.assert_allclose(
+            y[i], _average_by_duration_loop(x[i], durations[i], positive_only)
+        )
+
+
+def test_average_by_duration_backward():
+    x = torch.randn(2, 10, requires_grad=True)
+    durations = torch.LongTensor([[4, 6], [2, 0]])
+    average_by_duration(x, durations).sum().backward()
+    assert (x.grad[1, 2:] == 0).all()
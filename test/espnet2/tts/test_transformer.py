@@ -96,3 +96,70 @@ def test_tranformer(
         # teacher forcing
         inputs.update(speech=torch.randn(5, 5))
         model.inference(**inputs, use_teacher_forcing=True)
+
+
+@pytest.mark.parametrize("reduction_factor", [1, 3])
+@pytest.mark.parametrize("spk_embed_dim, use_gst", [(None, False), (2, True)])
+def test_transformer_batch_inference(reduction_factor, spk_embed_dim, use_gst):
+    torch.manual_seed(0)
+    # NOTE: The decoder prenet applies dropout even in evaluation
+    model = Transformer(
+        idim=10,
+        odim=5,
+        embed_dim=4,
+        eprenet_conv_layers=1,
+        eprenet_conv_filts=5,
+        dprenet_layers=1,
+        dprenet_units=4,
+        elayers=1,
+        eunits=6,
+        adim=4,
+        aheads=2,
+        dlayers=2,
+        dunits=4,
+        postnet_layers=1,
+        postnet_chans=4,
+        postnet_filts=5,
+        reduction_factor=reduction_factor,
+        spk_embed_dim=spk_embed_dim,
+        use_gst=use_gst,
+        gst_tokens=2,
+        gst_heads=4,
+        gst_conv_layers=2,
+        gst_conv_chans_list=[2, 4],
+        gst_conv_kernel_size=3,
+        gst_conv_stride=2,
+        gst_gru_layers=1,
+        gst_gru_units=4,
+        dprenet_dropout_rate=0.0,
+    )
+    model.eval()
+
+    text_lengths = torch.tensor([4, 1, 3])
+    inputs = dict(
+        text=torch.randint(1, 10, (3, 4)),
+        text_lengths=text_lengths,
+    )
+    if use_gst:
+        inputs.update(
+            speech=torch.randn(3, 6, 5), speech_lengths=torch.tensor([6, 4, 5])
+        )
+    if spk_embed_dim is not None:
+        inputs.update(spembs=torch.randn(3, spk_embed_dim))
+    decode_config = dict(threshold=0.5, minlenratio=0.5, maxlenratio=3.0)
+    with torch.no_grad():
+        outs, probs, att_ws, olens = model.batch_inference(**inputs, **decode_config)
+        for i, ilen in enumerate(text_lengths.tolist()):
+            kwargs = dict(text=inputs["text"][i, :ilen])
+            if use_gst:
+                kwargs.update(speech=inputs["speech"][i, : inputs["speech_lengths"][i]])
+            if spk_embed_dim is not None:
+                kwargs.update(spembs=inputs["spembs"][i])
+            out, prob, att_w = model.inference(**kwargs, **decode_config)
+            olen = int(olens[i])
+            assert olen == len(out)
+            torch.testing.assert_allclose(outs[i, :olen], out)
+            torch.testing.assert_allclose(probs[i, :olen], prob)
+            torch.testing.assert_allclose(
+                att_ws[i, :, :, : olen // reduction_factor, : ilen + 1], att_w
+            )
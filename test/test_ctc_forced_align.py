@@ -0,0 +1,71 @@
+import itertools
+
+import numpy as np
+import pytest
+import torch
+
+from espnet.nets.pytorch_backend.ctc import CTC
+from espnet.nets.pytorch_backend.ctc import ctc_forced_align
+
+
+def brute_force_best_score(lpz, y, blank_id=0):
+    ext = [blank_id]
+    for v in y:
+        ext += [v, blank_id]
+    best = -np.inf
+    for path in itertools.product(range(len(ext)), repeat=len(lpz)):
+        if path[0] > 1 or path[-1] < len(ext) - 2:
+            continue
+        valid = True
+        for s, next_s in zip(path, path[1:]):
+            step = next_s - s
+            skip = step == 2 and ext[next_s] != blank_id and ext[next_s] != ext[s]
+            if not (0 <= step <= 1 or skip):
+                valid = False
+                break
+        if valid:
+            best = max(best, sum(lpz[t, ext[s]] for t, s in enumerate(path)))
+    return best
+
+
+@pytest.mark.parametrize("y", [[1], [1, 2], [2, 2], [1, 3]])
+def test_ctc_forced_align_optimal(y):
+    torch.manual_seed(0)
+    lpz = torch.randn(1, 5, 4).log_softmax(-1)
+    alignment, _ = ctc_forced_align(
+        lpz, torch.LongTensor([5]), torch.LongTensor([y]), torch.LongTensor([len(y)])
+    )
+    score = sum(float(lpz[0, t, v]) for t, v in enumerate(alignment[0]))
+    expected = brute_force_best_score(lpz[0].double().numpy(), y)
+    np.testing.assert_allclose(score, expected, rtol=1e-5)
+
+
+def test_ctc_forced_align_batch():
+    torch.manual_seed(0)
+    lpz = torch.randn(3, 12, 5).log_softmax(-1)
+    ilens = torch.LongTensor([12, 9, 4])
+    ys = torch.LongTensor([[1, 2, 3, 4], [2, 2, 0, 0], [0, 0, 0, 0]])
+    olens = torch.LongTensor([4, 2, 0])
+    alignment, states = ctc_forced_align(lpz, ilens, ys, olens)
+    for i in range(3):
+        a, s = ctc_forced_align(
+            lpz[i : i + 1, : ilens[i]],
+            ilens[i : i + 1],
+            ys[i : i + 1, : olens[i]],
+            olens[i : i + 1],
+        )
+        assert alignment[i, : ilens[i]].tolist() == a[0].tolist()
+        assert states[i, : ilens[i]].tolist() == s[0].tolist()
+        assert (alignment[i, ilens[i] :] == -1).all()
+    # Only blanks for the empty label sequence
+    assert (alignment[2, :4] == 0).all()
+
+
+def test_CTC_forced_align():
+    ctc = CTC(5, 8, 0.0)
+    h = torch.randn(1, 10, 8)
+    y = np.array([1, 3, 3])
+    alignment = ctc.forced_align(h, y)
+    assert len(alignment) == 10
+    collapsed = [k for k, _ in itertools.groupby(alignment)]
+    assert [k for k in collapsed if k != 0] == [1, 3, 3]
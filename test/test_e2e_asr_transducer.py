@@ -14,6 +14,8 @@ from espnet.nets.beam_search_transducer import BeamSearchTransducer
 from espnet.nets.pytorch_backend.e2e_asr_transducer import E2E
 import espnet.nets.pytorch_backend.lm.default as lm_pytorch
 from espnet.nets.pytorch_backend.nets_utils import pad_list
+from espnet.nets.pytorch_backend.transducer.utils import DecoderStateCache
+from espnet.nets.transducer_decoder_interface import Hypothesis
 
 
 def get_default_train_args(**kwargs):
@@ -77,6 +79,7 @@ def get_default_recog_args(**kwargs):
         prefix_alpha=2,
         u_max=5,
         score_norm_transducer=True,
+        cache_size=4096,
         rnnlm=None,
         lm_weight=0.1,
     )
@@ -208,6 +211,9 @@ def prepare_inputs(idim, odim, ilens, olens, is_cuda=False):
         ),
         ({}, {"beam_size": 2, "search_type": "tsd", "rnnlm": get_lm()}),
         ({}, {"beam_size": 2, "search_type": "tsd", "rnnlm": get_wordlm()}),
+        ({}, {"beam_size": 2, "cache_size": 2}),
+        ({}, {"beam_size": 2, "search_type": "tsd", "cache_size": 2}),
+        ({}, {"beam_size": 2, "search_type": "alsd", "cache_size": 0}),
     ],
 )
 def test_pytorch_transducer_trainable_and_decodable(train_dic, recog_dic):
@@ -394,3 +400,46 @@ def test_invalid_aux_task_layer_list():
 
     with pytest.raises(ValueError):
         E2E(idim, odim, train_args)
+
+
+def test_decoder_state_cache_lru():
+    cache = DecoderStateCache(max_size=2)
+
+    cache[0] = "a"
+    cache[1] = "b"
+    assert cache[0] == "a"
+
+    cache[2] = "c"
+
+    assert len(cache) == 2
+    assert 1 not in cache
+    assert 0 in cache and 2 in cache
+
+
+def test_decoder_state_cache_key():
+    cache = DecoderStateCache()
+
+    hyp = Hypothesis(score=0.0, yseq=[0, 1], dec_state=None)
+    key = cache.key(hyp)
+    assert hyp.yseq_key == (2, key)
+
+    child = Hypothesis(
+        score=0.0, yseq=hyp.yseq + [2], dec_state=None, yseq_key=hyp.yseq_key
+    )
+    other = Hypothesis(score=0.0, yseq=[0, 1, 2], dec_state=None)
+    assert cache.key(child) == cache.key(other) != key
+
+    hyp.yseq.append(3)
+    assert cache.key(hyp) not in (key, cache.key(child))
+
+
+def test_decoder_state_cache_evicts_ids():
+    cache = DecoderStateCache(max_size=2)
+
+    hyp = Hypothesis(score=0.0, yseq=[0], dec_state=None)
+    for token in range(100):
+        hyp.yseq.append(token)
+        cache[cache.key(hyp)] = None
+
+    assert len(cache) == 2
+    assert len(cache._ids) <= 3
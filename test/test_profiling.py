@@ -0,0 +1,103 @@
+import json
+
+import pytest
+import torch
+
+from espnet.utils import profiling
+from espnet.utils.profiling import span
+from espnet.utils.profiling import SpanTimer
+from espnet.utils.profiling import StepProfiler
+from espnet.utils.profiling import ThroughputMeter
+
+
+def test_span_disabled():
+    # The shared no-op object is returned without any timer
+    assert span("a") is span("b")
+    with span("a"):
+        pass
+
+
+def test_SpanTimer():
+    with SpanTimer() as timer:
+        for _ in range(3):
+            with span("outer"):
+                with span("inner"):
+                    torch.randn(10, 10).sum()
+        assert timer.pop().keys() == {"outer", "inner"}
+        with span("outer"):
+            pass
+    with span("outer"):
+        pass
+
+    assert timer.counts == {"outer": 4, "inner": 3}
+    assert timer.totals["outer"] >= timer.totals["inner"]
+    assert list(timer.pop()) == ["outer"]
+    assert timer.pop() == {}
+    assert "outer" in timer.log_message()
+    assert profiling._timer is None
+
+
+def test_SpanTimer_nested():
+    with SpanTimer() as timer1:
+        with SpanTimer() as timer2:
+            with span("a"):
+                pass
+        with span("b"):
+            pass
+    assert list(timer1.totals) == ["b"]
+    assert list(timer2.totals) == ["a"]
+
+
+def test_SpanTimer_disabled():
+    with SpanTimer(enabled=False) as timer:
+        with span("a"):
+            pass
+    assert timer.totals == {}
+    assert timer.log_message() == "No spans are measured"
+
+
+def test_SpanTimer_iterate():
+    timer = SpanTimer()
+    for _ in timer.iterate(range(2)):
+        with span("a"):
+            pass
+    with span("a"):
+        pass
+    assert timer.counts == {"a": 2}
+    assert profiling._timer is None
+
+
+@pytest.mark.parametrize("start, num_steps", [(0, 1), (1, 2), (5, 1)])
+def test_StepProfiler(tmp_path, start, num_steps):
+    profiler = StepProfiler(tmp_path / "trace.json", start=start, num_steps=num_steps)
+    for _ in range(3):
+        with span("step"):
+            torch.randn(10, 10).sum()
+        profiler.step()
+        assert not profiling._profiling or profiler.num_done < start + num_steps
+    profiler.close()
+    assert not profiling._profiling
+
+    if start < 3:
+        with (tmp_path / "trace.json").open() as f:
+            trace = json.load(f)
+        names = [e.get("name") for e in trace["traceEvents"]]
+        assert "step" in names
+    else:
+        assert not (tmp_path / "trace.json").exists()
+
+
+def test_ThroughputMeter():
+    meter = ThroughputMeter()
+    meter.add(2, 3.0)
+    meter.add(1)
+    summary = meter.summary()
+    assert summary["num_utts"] == 3
+    assert summary["duration"] == 3.0
+    assert summary["rtf"] == pytest.approx(summary["elapsed"] / 3.0)
+    assert "RTF" in meter.log_message()
+
+    meter = ThroughputMeter()
+    meter.add(1)
+    assert "rtf" not in meter.summary()
+    assert "RTF" not in meter.log_message()
@@ -3,8 +3,13 @@ import numpy as np
 
 from espnet.transform.add_deltas import add_deltas
 from espnet.transform.cmvn import CMVN
+from espnet.transform.cmvn import UtteranceCMVN
+from espnet.transform.perturb import VolumePerturbation
 from espnet.transform.functional import FuncTrans
+from espnet.transform.spectrogram import batch_logmelspectrogram
+from espnet.transform.spectrogram import batch_stft
 from espnet.transform.spectrogram import logmelspectrogram
+from espnet.transform.spectrogram import stft
 from espnet.transform.transformation import Transformation
 
 
@@ -49,6 +54,65 @@ def test_preprocessing(tmpdir):
         np.testing.assert_allclose(processed_xs[idx], x)
 
 
+def test_batch_transformation(tmpdir):
+    cmvn_ark = str(tmpdir.join("cmvn.ark"))
+    samples = np.random.randn(100, 20)
+    stats = np.empty((2, 21), dtype=np.float32)
+    stats[0, :20] = samples.sum(axis=0)
+    stats[1, :20] = (samples ** 2).sum(axis=0)
+    stats[0, -1] = 100.0
+    stats[1, -1] = 0.0
+    kaldiio.save_mat(cmvn_ark, stats)
+
+    kwargs = {
+        "process": [
+            {"type": "volume_perturbation", "seed": 0},
+            {"type": "cmvn", "stats": cmvn_ark, "norm_vars": True},
+            {"type": "utterance_cmvn", "norm_vars": True},
+            {"type": "delta", "window": 2, "order": 1},
+        ],
+        "mode": "sequential",
+    }
+    preprocessing = Transformation(kwargs)
+    # The first three functions are fused and applied to the padded batch
+    assert preprocessing.stages == [(True, [0, 1, 2]), (False, [3])]
+
+    xs = [np.random.randn(n, 20).astype(np.float32) for n in [30, 50, 40]]
+    processed_xs = preprocessing(xs, train=True)
+
+    volume = VolumePerturbation(seed=0)
+    cmvn = CMVN(cmvn_ark, norm_vars=True)
+    utt_cmvn = UtteranceCMVN(norm_vars=True)
+    for x, processed_x in zip(xs, processed_xs):
+        x = add_deltas(utt_cmvn(cmvn(volume(x))), window=2, order=1)
+        np.testing.assert_allclose(processed_x, x, rtol=1e-4, atol=1e-4)
+
+
+def test_batch_logmelspectrogram():
+    opt = {"n_mels": 40, "fs": 16000, "n_fft": 512, "n_shift": 128, "fmax": 7600}
+    xs = [
+        np.random.randn(1000).astype(np.float32),
+        np.random.randn(1600).astype(np.float32),
+        np.random.randn(1300, 2).astype(np.float32),
+    ]
+    ys = batch_logmelspectrogram(xs, **opt)
+
+    for x, y in zip(xs, ys):
+        np.testing.assert_allclose(y, logmelspectrogram(x, **opt), atol=1e-4)
+
+
+def test_batch_stft():
+    xs = [
+        np.random.randn(1000).astype(np.float32),
+        np.random.randn(1300, 2).astype(np.float32),
+    ]
+    ys = batch_stft(xs, n_fft=256, n_shift=64, win_length=200, window="hamming")
+
+    for x, y in zip(xs, ys):
+        y_ref = stft(x, n_fft=256, n_shift=64, win_length=200, window="hamming")
+        np.testing.assert_allclose(y, y_ref, atol=1e-4)
+
+
 def test_optional_args():
     kwargs = {
         "process": [
@@ -0,0 +1,101 @@
+import threading
+
+import pytest
+import torch
+
+from espnet.nets.pytorch_backend.transformer.attention import capture_attention
+from espnet.nets.pytorch_backend.transformer.attention import MultiHeadedAttention
+from espnet.nets.pytorch_backend.transformer.attention import (
+    RelPositionMultiHeadedAttention,  # noqa: H301
+)
+
+
+def _reference_rel_shift(x):
+    zero_pad = torch.zeros((*x.size()[:3], 1), device=x.device, dtype=x.dtype)
+    x_padded = torch.cat([zero_pad, x], dim=-1)
+    x_padded = x_padded.view(*x.size()[:2], x.size(3) + 1, x.size(2))
+    return x_padded[:, :, 1:].view_as(x)[:, :, :, : x.size(-1) // 2 + 1]
+
+
+@pytest.mark.parametrize("mode", ["self", "kv", "cross"])
+def test_packed_qkv_projection(mode):
+    torch.manual_seed(0)
+    att = MultiHeadedAttention(4, 16, 0.0)
+    x = torch.randn(2, 5, 16)
+    y = torch.randn(2, 7, 16)
+    if mode == "self":
+        query, key, value = x, x, x
+    elif mode == "kv":
+        query, key, value = x, y, y
+    else:
+        query, key, value = x, y, y.clone()
+
+    q, k, v = att.forward_qkv(query, key, value)
+    for actual, linear, inp in [
+        (q, att.linear_q, query),
+        (k, att.linear_k, key),
+        (v, att.linear_v, value),
+    ]:
+        desired = linear(inp).view(2, -1, 4, 4).transpose(1, 2)
+        torch.testing.assert_allclose(actual, desired)
+
+
+def test_packed_qkv_projection_cache():
+    torch.manual_seed(0)
+    att = MultiHeadedAttention(4, 16, 0.0)
+    x = torch.randn(2, 5, 16)
+    with torch.no_grad():
+        att.forward_qkv(x, x, x)
+        # Updated in place
+        att.load_state_dict(MultiHeadedAttention(4, 16, 0.0).state_dict())
+        q, _, _ = att.forward_qkv(x, x, x)
+        weight, _ = att._packed_linear(("linear_q", "linear_k", "linear_v"))
+        assert weight is att._packed_linear(("linear_q", "linear_k", "linear_v"))[0]
+    torch.testing.assert_allclose(q, att.linear_q(x).view(2, -1, 4, 4).transpose(1, 2))
+
+    # The gradients are propagated to linear_q, linear_k, and linear_v
+    sum(t.sum() for t in att.forward_qkv(x, x, x)).backward()
+    for linear in [att.linear_q, att.linear_k, att.linear_v]:
+        assert linear.weight.grad is not None
+
+
+@pytest.mark.parametrize("time1", [1, 3, 8])
+def test_rel_shift(time1):
+    att = RelPositionMultiHeadedAttention(2, 8, 0.0)
+    x = torch.randn(3, 2, time1, 2 * time1 - 1)
+    torch.testing.assert_allclose(att.rel_shift(x), _reference_rel_shift(x))
+
+
+def test_capture_attention():
+    att = MultiHeadedAttention(2, 8, 0.0)
+    x = torch.randn(2, 5, 8)
+    att(x, x, x, None)
+    assert att.attn is None
+    with capture_attention():
+        att(x, x, x, None)
+    assert att.attn.shape == (2, 2, 5, 5)
+
+    att.store_attn = True
+    att(x, x, x, None)
+    assert att.attn.shape == (2, 2, 5, 5)
+
+
+def test_capture_attention_in_another_thread():
+    att = MultiHeadedAttention(2, 8, 0.0)
+    x = torch.randn(2, 5, 8)
+    entered, done = threading.Event(), threading.Event()
+
+    def _capture():
+        with capture_attention():
+            entered.set()
+            done.wait()
+
+    thread = threading.Thread(target=_capture)
+    thread.start()
+    entered.wait()
+    try:
+        att(x, x, x, None)
+        assert att.attn is None
+    finally:
+        done.set()
+        thread.join()
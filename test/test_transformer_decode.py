@@ -46,6 +46,40 @@ def test_decoder_cache(normalize_before):
         numpy.testing.assert_allclose(y.numpy(), y_fast.numpy(), rtol=RTOL)
 
 
+@pytest.mark.parametrize("normalize_before", [True, False])
+@pytest.mark.parametrize("concat_after", [True, False])
+def test_decoder_incremental(normalize_before, concat_after):
+    adim = 4
+    odim = 5
+    decoder = Decoder(
+        odim=odim,
+        attention_dim=adim,
+        linear_units=3,
+        num_blocks=2,
+        normalize_before=normalize_before,
+        concat_after=concat_after,
+        dropout_rate=0.0,
+    )
+    memory = torch.randn(2, 5, adim)
+    memory_mask = torch.tensor([[1, 1, 1, 1, 1], [1, 1, 1, 0, 0]]).bool()[:, None]
+
+    x = torch.randint(0, odim, (2, 6))
+    decoder.eval()
+    with torch.no_grad():
+        state = decoder.init_incremental_state(memory, x.size(1))
+        for i in range(x.size(1)):
+            y_fast = decoder.forward_incremental(
+                x[:, i : i + 1], memory_mask, state, offset=i
+            )
+            mask = subsequent_mask(i + 1).unsqueeze(0)
+            # the padded memory of the second sample is excluded
+            y0, _ = decoder.forward_one_step(x[:1, : i + 1], mask, memory[:1])
+            y1, _ = decoder.forward_one_step(x[1:, : i + 1], mask, memory[1:, :3])
+            numpy.testing.assert_allclose(
+                torch.cat([y0, y1]).numpy(), y_fast.numpy(), rtol=RTOL, atol=1e-6
+            )
+
+
 @pytest.mark.parametrize("normalize_before", [True, False])
 def test_encoder_cache(normalize_before):
     adim = 4
@@ -0,0 +1,49 @@
+import pytest
+import torch
+
+from espnet.nets.pytorch_backend.transformer.repeat import repeat
+
+
+class _Layer(torch.nn.Module):
+    def __init__(self):
+        super().__init__()
+        self.linear = torch.nn.Linear(4, 4)
+
+    def forward(self, xs, mask):
+        x, pos = xs
+        return (torch.tanh(self.linear(x)) + pos, pos), mask
+
+
+def _run(model, x, pos, mask):
+    (y, _), _ = model((x, pos), mask)
+    y.sum().backward()
+    return y, [p.grad.clone() for p in model.parameters()]
+
+
+@pytest.mark.parametrize("checkpoint_every", [1, 2, 3])
+def test_checkpoint_every(checkpoint_every):
+    torch.manual_seed(0)
+    plain = repeat(3, lambda n: _Layer())
+    ckpt = repeat(3, lambda n: _Layer(), checkpoint_every=checkpoint_every)
+    ckpt.load_state_dict(plain.state_dict())
+    x = torch.randn(2, 5, 4, requires_grad=True)
+    pos = torch.randn(1, 5, 4)
+    mask = torch.ones(2, 1, 5, dtype=torch.bool)
+
+    y1, grads1 = _run(plain, x, pos, mask)
+    y2, grads2 = _run(ckpt, x, pos, mask)
+    torch.testing.assert_allclose(y1, y2)
+    for g1, g2 in zip(grads1, grads2):
+        torch.testing.assert_allclose(g1, g2)
+
+
+def test_layer_drop():
+    model = repeat(4, lambda n: _Layer(), layer_drop_rate=1.0, checkpoint_every=2)
+    x = torch.randn(2, 5, 4)
+    pos = torch.randn(1, 5, 4)
+    (y, _), _ = model((x, pos), None)
+    assert y is x
+
+    model.eval()
+    (y, _), _ = model((x, pos), None)
+    assert y is not x
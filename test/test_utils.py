@@ -1,9 +1,12 @@
 #!/usr/bin/env python3
+import json
+
 import h5py
 import kaldiio
 import numpy as np
 import pytest
 
+from espnet.asr.asr_utils import StreamingResultsWriter
 from espnet.utils.io_utils import LoadInputsAndTargets
 from espnet.utils.io_utils import SoundHDF5File
 from espnet.utils.training.batchfy import make_batchset
@@ -291,3 +294,41 @@ def test_error_calculator_nospace(tmpdir):
     assert cer_ctc_val is not None
     assert _cer is not None
     assert _wer is not None
+
+
+def test_streaming_results_writer(tmpdir):
+    result_label = str(tmpdir.join("result.json"))
+    results = {
+        "utt_b": {"output": [{"rec_text": "あ b", "score": -1.5}], "utt2spk": "s"},
+        "utt_a": {"output": [{"rec_text": "a\nb", "score": -0.5}], "utt2spk": "s"},
+        "utt_c": {"output": [], "utt2spk": "t"},
+    }
+
+    writer = StreamingResultsWriter(result_label, fsync_interval=2)
+    writer["utt_b"] = results["utt_b"]
+    writer.close()
+    # Simulate a run killed while writing a result
+    with open(result_label + ".part", "ab") as f:
+        f.write(b'["utt_a", {"outp')
+
+    writer = StreamingResultsWriter(result_label)
+    assert "utt_b" in writer
+    assert "utt_a" not in writer
+    for key in ["utt_a", "utt_c"]:
+        writer[key] = results[key]
+    writer.merge()
+
+    with open(result_label, "rb") as f:
+        assert f.read() == json.dumps(
+            {"utts": results}, indent=4, ensure_ascii=False, sort_keys=True
+        ).encode("utf_8")
+    assert not tmpdir.join("result.json.part").exists()
+
+
+def test_streaming_results_writer_empty(tmpdir):
+    result_label = str(tmpdir.join("result.json"))
+    StreamingResultsWriter(result_label).merge()
+    with open(result_label, "rb") as f:
+        assert f.read() == json.dumps(
+            {"utts": {}}, indent=4, ensure_ascii=False, sort_keys=True
+        ).encode("utf_8")
@@ -0,0 +1,70 @@
+import numpy as np
+import pytest
+import torch
+
+from espnet.nets.pytorch_backend.wavenet import WaveNet
+
+
+def make_wavenet_args(**kwargs):
+    defaults = dict(
+        n_quantize=16,
+        n_aux=3,
+        n_resch=4,
+        n_skipch=5,
+        dilation_depth=3,
+        dilation_repeat=2,
+        kernel_size=2,
+        upsampling_factor=0,
+    )
+    defaults.update(kwargs)
+    return defaults
+
+
+@pytest.mark.parametrize("kernel_size", [2, 3])
+def test_wavenet_batch_generate_matches_forward(kernel_size):
+    torch.manual_seed(0)
+    model = WaveNet(**make_wavenet_args(kernel_size=kernel_size))
+    model.eval()
+
+    batch_size, n_samples = 2, 10
+    n_init = model.receptive_field
+    x = torch.randint(0, 16, (batch_size, n_init))
+    h = torch.randn(batch_size, n_init + n_samples, 3)
+
+    with torch.no_grad():
+        y = model.batch_generate(x, h, n_samples, mode="argmax")
+        assert y.shape == (batch_size, n_samples)
+
+        # each generated sample must be the argmax of the full-sequence forward
+        full = torch.cat([x, torch.from_numpy(y)], dim=1)
+        logits = model(full[:, :-1], h[:, : full.size(1) - 1].transpose(1, 2))
+        expected = logits[:, n_init - 1 :].argmax(-1).numpy()
+    np.testing.assert_array_equal(y, expected)
+
+
+def test_wavenet_generate_matches_batch_generate():
+    torch.manual_seed(0)
+    model = WaveNet(**make_wavenet_args())
+    model.eval()
+
+    x = torch.randint(0, 16, (2, 1))
+    h = torch.randn(2, 9, 3)
+
+    with torch.no_grad():
+        y_batch = model.batch_generate(x, h, 8, mode="argmax")
+        y_single = model.generate(x[1], h[1], 8, mode="argmax")
+    np.testing.assert_array_equal(y_batch[1], y_single)
+
+
+@pytest.mark.parametrize("mode", ["sampling", "argmax"])
+def test_wavenet_batch_generate_upsampling(mode):
+    model = WaveNet(**make_wavenet_args(upsampling_factor=4))
+    model.eval()
+
+    x = torch.randint(0, 16, (3, 1))
+    h = torch.randn(3, 5, 3)
+
+    with torch.no_grad():
+        y = model.batch_generate(x, h, 20, mode=mode)
+    assert y.shape == (3, 20)
+    assert y.min() >= 0 and y.max() < 16
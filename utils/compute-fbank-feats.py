@@ -5,12 +5,15 @@
 
 import argparse
 from distutils.util import strtobool
+import functools
 import logging
+import multiprocessing
 
 import kaldiio
 import numpy
 import resampy
 
+from espnet.transform.spectrogram import batch_logmelspectrogram
 from espnet.transform.spectrogram import logmelspectrogram
 from espnet.utils.cli_utils import get_commandline_args
 from espnet.utils.cli_writers import file_writer_helper
@@ -69,6 +72,14 @@ def get_parser():
         help="Specify the method(if mat) or " "gzip-level(if hdf5)",
     )
     parser.add_argument("--verbose", "-V", default=0, type=int, help="Verbose option")
+    parser.add_argument(
+        "--batch_size",
+        type=int,
+        default=1,
+        help="Number of utterances of similar length processed at once. "
+        "If > 1, the batched torch implementation is used",
+    )
+    parser.add_argument("--nj", type=int, default=1, help="Number of worker processes")
     parser.add_argument(
         "--normalize",
         choices=[1, 16, 24, 32],
@@ -89,6 +100,81 @@ def get_parser():
     return parser
 
 
+def compute_fbank(utts, args):
+    """Compute FBANK features of a chunk of utterances.
+
+    Utterances are sorted by length and processed in batches of
+    ``args.batch_size``. The features are returned in the input order.
+
+    Args:
+        utts (list): List of (utt_id, (rate, array))
+        args (Namespace): Parsed command line arguments
+
+    Returns:
+        list: List of (utt_id, lmspc)
+
+    """
+    arrays = []
+    for _, (rate, array) in utts:
+        array = array.astype(numpy.float32)
+        if args.fs is not None and rate != args.fs:
+            array = resampy.resample(array, rate, args.fs, axis=0)
+        if args.normalize is not None and args.normalize != 1:
+            array = array / (1 << (args.normalize - 1))
+        arrays.append((args.fs if args.fs is not None else rate, array))
+
+    opts = dict(
+        n_mels=args.n_mels,
+        n_fft=args.n_fft,
+        n_shift=args.n_shift,
+        win_length=args.win_length,
+        window=args.window,
+        fmin=args.fmin,
+        fmax=args.fmax,
+    )
+    lmspcs = [None] * len(utts)
+    if args.batch_size <= 1:
+        for i, (fs, array) in enumerate(arrays):
+            lmspcs[i] = logmelspectrogram(x=array, fs=fs, **opts)
+    else:
+        # Batch utterances of similar length with the same sampling rate
+        indices = sorted(
+            range(len(arrays)), key=lambda i: (arrays[i][0], len(arrays[i][1]))
+        )
+        for start in range(0, len(indices), args.batch_size):
+            batch = indices[start : start + args.batch_size]
+            for fs in sorted(set(arrays[i][0] for i in batch)):
+                sub_batch = [i for i in batch if arrays[i][0] == fs]
+                outs = batch_logmelspectrogram(
+                    [arrays[i][1] for i in sub_batch], fs=fs, **opts
+                )
+                for i, out in zip(sub_batch, outs):
+                    lmspcs[i] = out
+
+    return [(utt_id, lmspc) for (utt_id, _), lmspc in zip(utts, lmspcs)]
+
+
+def _chunks(reader, chunk_size):
+    chunk = []
+    for utt_id, (rate, array) in reader:
+        chunk.append((utt_id, (rate, array)))
+        if len(chunk) == chunk_size:
+            yield chunk
+            chunk = []
+    if len(chunk) > 0:
+        yield chunk
+
+
+def _init_worker():
+    try:
+        import torch
+
+        # Parallelism comes from the worker processes
+        torch.set_num_threads(1)
+    except ImportError:
+        pass
+
+
 def main():
     parser = get_parser()
     args = parser.parse_args()
@@ -100,6 +186,9 @@ def main():
         logging.basicConfig(level=logging.WARN, format=logfmt)
     logging.info(get_commandline_args())
 
+    # NOTE: Utterances are sorted by length within each chunk
+    chunk_size = max(args.batch_size, 1) * 10
+
     with kaldiio.ReadHelper(
         args.rspecifier, segments=args.segments
     ) as reader, file_writer_helper(
@@ -109,25 +198,22 @@ def main():
         compress=args.compress,
         compression_method=args.compression_method,
     ) as writer:
-        for utt_id, (rate, array) in reader:
-            array = array.astype(numpy.float32)
-            if args.fs is not None and rate != args.fs:
-                array = resampy.resample(array, rate, args.fs, axis=0)
-            if args.normalize is not None and args.normalize != 1:
-                array = array / (1 << (args.normalize - 1))
-
-            lmspc = logmelspectrogram(
-                x=array,
-                fs=args.fs if args.fs is not None else rate,
-                n_mels=args.n_mels,
-                n_fft=args.n_fft,
-                n_shift=args.n_shift,
-                win_length=args.win_length,
-                window=args.window,
-                fmin=args.fmin,
-                fmax=args.fmax,
-            )
-            writer[utt_id] = lmspc
+        func = functools.partial(compute_fbank, args=args)
+        if args.nj > 1:
+            pool = multiprocessing.Pool(args.nj, initializer=_init_worker)
+            results = pool.imap(func, _chunks(reader, chunk_size))
+        else:
+            pool = None
+            results = map(func, _chunks(reader, chunk_size))
+
+        try:
+            for feats in results:
+                for utt_id, lmspc in feats:
+                    writer[utt_id] = lmspc
+        finally:
+            if pool is not None:
+                pool.close()
+                pool.join()
 
 
 if __name__ == "__main__":
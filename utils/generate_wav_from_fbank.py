@@ -84,6 +84,12 @@ def get_parser():
         "--n_shift", type=int, default=256, help="Shift length in point"
     )
     parser.add_argument("--model", type=str, default=None, help="WaveNet model")
+    parser.add_argument(
+        "--batch_size",
+        type=int,
+        default=1,
+        help="Number of utterances generated in lockstep",
+    )
     parser.add_argument(
         "--filetype",
         type=str,
@@ -148,43 +154,55 @@ def main():
     model.eval()
     model.to(device)
 
-    for idx, (utt_id, lmspc) in enumerate(
-        file_reader_helper(args.rspecifier, args.filetype), 1
-    ):
-        logging.info("(%d) %s" % (idx, utt_id))
-
+    def _generate(batch):
         # perform preprocesing
         x = encode_mu_law(
-            np.zeros((1)), mu=train_args.n_quantize
+            np.zeros((len(batch), 1)), mu=train_args.n_quantize
         )  # quatize initial seed waveform
-        h = scaler.transform(lmspc)  # normalize features
-
-        # convert to tensor
-        x = torch.tensor(x, dtype=torch.long, device=device)  # (1,)
-        h = torch.tensor(h, dtype=torch.float, device=device)  # (T, n_aux)
+        hs = [scaler.transform(lmspc) for _, lmspc in batch]  # normalize features
 
         # get length of waveform
-        n_samples = (h.shape[0] - 1) * args.n_shift + args.n_fft
+        n_samples = [(h.shape[0] - 1) * args.n_shift + args.n_fft for h in hs]
+
+        # convert to tensor, padding features with the last frame
+        max_len = max(h.shape[0] for h in hs)
+        h = np.stack([np.pad(h, ((0, max_len - len(h)), (0, 0)), "edge") for h in hs])
+        x = torch.tensor(x, dtype=torch.long, device=device)  # (B, 1)
+        h = torch.tensor(h, dtype=torch.float, device=device)  # (B, T, n_aux)
 
         # generate
         start_time = time.time()
         with torch.no_grad():
-            y = model.generate(x, h, n_samples, interval=100)
+            ys = model.batch_generate(x, h, max(n_samples), interval=100)
         logging.info(
             "generation speed = %s (sec / sample)"
-            % ((time.time() - start_time) / (len(y) - 1))
+            % ((time.time() - start_time) / (sum(n_samples) - len(batch)))
         )
-        y = decode_mu_law(y, mu=train_args.n_quantize)
 
-        # apply mlsa filter for noise shaping
-        y = mlsa_filter(y)
+        for (utt_id, _), y, n in zip(batch, ys, n_samples):
+            y = decode_mu_law(y[:n], mu=train_args.n_quantize)
 
-        # save as .wav file
-        write(
-            os.path.join(args.outdir, "%s.wav" % utt_id),
-            args.fs,
-            (y * np.iinfo(np.int16).max).astype(np.int16),
-        )
+            # apply mlsa filter for noise shaping
+            y = mlsa_filter(y)
+
+            # save as .wav file
+            write(
+                os.path.join(args.outdir, "%s.wav" % utt_id),
+                args.fs,
+                (y * np.iinfo(np.int16).max).astype(np.int16),
+            )
+
+    batch = []
+    for idx, (utt_id, lmspc) in enumerate(
+        file_reader_helper(args.rspecifier, args.filetype), 1
+    ):
+        logging.info("(%d) %s" % (idx, utt_id))
+        batch.append((utt_id, lmspc))
+        if len(batch) == args.batch_size:
+            _generate(batch)
+            batch = []
+    if len(batch) > 0:
+        _generate(batch)
 
 
 if __name__ == "__main__":